@@ -0,0 +1,137 @@
+# Dateipfad: benchmarks/_common.py
+"""
+Gemeinsame Hilfen für die SmartDesk-Benchmarks.
+
+Die Benchmarks laufen als eigenständige Skripte (python benchmarks/bench_xyz.py).
+Dieses Modul richtet dafür dieselbe Umgebung ein wie tests/conftest.py:
+- src/ im sys.path
+- APPDATA auf ein temporäres Verzeichnis (falls nicht gesetzt)
+- Auf Nicht-Windows-Systemen Platzhalter für winreg/win32*/PySide6,
+  damit die plattformunabhängigen Teile importierbar sind.
+
+Dazu Messhilfen: measure()/print_table() für Durchsatz, sample_ms()/
+print_percentiles() für Latenzen (p50/p95), quiet() gegen Statusausgaben.
+"""
+
+import contextlib
+import io
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+from unittest.mock import MagicMock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+os.environ.setdefault("APPDATA", tempfile.mkdtemp(prefix="smartdesk_bench_"))
+
+
+def use_private_appdata(prefix: str) -> str:
+    """
+    Eigenes, leeres Datenverzeichnis (auch unter Windows) für Benchmarks,
+    die desktops.json, Einstellungen, Backups oder Traces schreiben.
+
+    Vor dem ersten Import aus smartdesk aufrufen: DATA_DIR wird beim Import festgelegt.
+    """
+    path = tempfile.mkdtemp(prefix=prefix)
+    os.environ["APPDATA"] = path
+    return path
+
+
+if sys.platform != "win32":
+    if "winreg" not in sys.modules:
+        _winreg = MagicMock()
+        _winreg.HKEY_CURRENT_USER = 0x80000001
+        _winreg.KEY_READ = 0x20019
+        _winreg.KEY_SET_VALUE = 0x0002
+        _winreg.REG_SZ = 1
+        _winreg.REG_EXPAND_SZ = 2
+        _winreg.REG_DWORD = 4
+        sys.modules["winreg"] = _winreg
+
+    for _lib in ["win32gui", "win32con", "win32api", "win32process", "PySide6", "PySide6.QtWidgets", "PySide6.QtGui", "PySide6.QtCore"]:
+        if _lib not in sys.modules:
+            sys.modules[_lib] = MagicMock()
+
+    # icon_service greift beim Import auf ctypes.windll zu
+    import ctypes
+
+    if not hasattr(ctypes, "windll"):
+        ctypes.windll = MagicMock()
+
+
+def measure(func: Callable[[], object], min_time: float = 1.0) -> Dict[str, float]:
+    """
+    Führt func so oft aus, bis mindestens min_time Sekunden vergangen sind.
+
+    Returns:
+        Dict mit calls, seconds, calls_per_sec und us_per_call
+    """
+    func()  # Aufwärmen
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+
+    return {
+        "calls": calls,
+        "seconds": elapsed,
+        "calls_per_sec": calls / elapsed,
+        "us_per_call": elapsed / calls * 1e6,
+    }
+
+
+def percentile(values, pct: float) -> float:
+    """Einfaches Perzentil (nearest-rank) über eine Werteliste."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def print_table(title: str, rows) -> None:
+    """Gibt eine einfache Ergebnistabelle aus: rows = [(label, dict), ...]."""
+    print(f"\n{title}")
+    print("-" * len(title))
+    for label, result in rows:
+        print(f"{label:<40} {result['calls_per_sec']:>12,.0f} calls/s  {result['us_per_call']:>10.1f} µs/call")
+
+
+def sample_ms(func: Callable[[], object], runs: int) -> List[float]:
+    """Ruft func runs-mal auf und gibt die Dauer je Aufruf in Millisekunden zurück."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def print_percentiles(title: str, rows: Sequence[Tuple[str, List[float]]], decimals: int = 0) -> None:
+    """Gibt p50/p95 je Zeile aus: rows = [(label, Werte in ms), ...]."""
+    print(f"\n{title}")
+    print("-" * len(title))
+    width = max(len(label) for label, _ in rows) + 2
+    for label, samples in rows:
+        print(f"{label:<{width}} p50 {percentile(samples, 50):>8.{decimals}f} ms  p95 {percentile(samples, 95):>8.{decimals}f} ms")
+
+
+@contextlib.contextmanager
+def quiet() -> Iterator[None]:
+    """Unterdrückt Log-Meldungen und Ausgaben auf stdout (Statusmeldungen der Services)."""
+    logging.disable(logging.CRITICAL)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
@@ -0,0 +1,104 @@
+# Dateipfad: benchmarks/bench_animation_handshake.py
+"""
+Benchmark: Wartezeiten zwischen Desktop-Wechsel und Fade-Animation.
+
+Eine Fake-Animation (ohne Tk) simuliert das Einblenden mit
+AnimationConfig.FADE_IN_DURATION und wartet dann auf das Ende des Wechsels.
+
+- alt: feste Pause von 0,5 s nach Popen; die Animation prüft alle 0,1 s,
+  ob das Lock-File gelöscht wurde
+- neu: Handshake (READY sobald verdeckt, DONE am Ende), Lock-File nur als
+  Fallback
+
+Gemessen werden p50/p95 von
+- Start: Popen bis Ende der Animationsstufe (Bildschirm muss verdeckt sein)
+- Ende: Lock-File gelöscht bzw. DONE gesendet bis die Animation ausblendet
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.shared.animations.handshake import AnimationChannel  # noqa: E402
+from smartdesk.shared.config import AnimationConfig  # noqa: E402
+
+RUNS = 15
+
+FAKE_ANIMATION = textwrap.dedent(
+    """
+    import os, sys, time
+    sys.path.insert(0, {animations_dir!r})
+    from handshake import SwitchLink
+
+    lock_file, out_file = sys.argv[1], sys.argv[2]
+    link = SwitchLink.from_env()
+    time.sleep({fade_in})  # Einblenden
+    if link:
+        link.send_ready()
+        while not link.poll_done(0.02) and os.path.exists(lock_file):
+            pass
+    else:
+        while os.path.exists(lock_file):
+            time.sleep(0.1)
+    with open(out_file, "w") as f:
+        f.write(repr(time.perf_counter()))
+    """
+)
+
+
+def run_once(script, work_dir, handshake):
+    lock_file = os.path.join(work_dir, "switch.lock")
+    out_file = os.path.join(work_dir, "out.txt")
+    open(lock_file, "w").close()
+    if os.path.exists(out_file):
+        os.remove(out_file)
+
+    env = dict(os.environ)
+    channel = AnimationChannel() if handshake else None
+    if channel:
+        env.update(channel.env())
+
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, script, lock_file, out_file], env=env)
+    if channel:
+        channel.wait_ready(0.5)
+    else:
+        time.sleep(0.5)
+    ready = time.perf_counter() - start
+
+    # Registry, Explorer-Neustart usw. (hier: nichts), dann Ende signalisieren
+    end_signal = time.perf_counter()
+    if channel:
+        channel.send_done()
+    os.remove(lock_file)
+    process.wait()
+    if channel:
+        channel.close()
+    with open(out_file) as f:
+        faded = float(f.read())
+    return ready * 1000, (faded - end_signal) * 1000
+
+
+def main():
+    work_dir = tempfile.mkdtemp(prefix="smartdesk_bench_fade_")
+    script = os.path.join(work_dir, "fake_fade.py")
+    with open(script, "w") as f:
+        f.write(FAKE_ANIMATION.format(animations_dir=os.path.join(_common.SRC_DIR, "smartdesk", "shared", "animations"), fade_in=AnimationConfig.FADE_IN_DURATION))
+
+    starts, ends = [], []
+    for label, handshake in (("alt: sleep(0.5) + Lock-File", False), ("neu: READY/DONE", True)):
+        runs = [run_once(script, work_dir, handshake) for _ in range(RUNS)]
+        starts.append((label, [ready_ms for ready_ms, _ in runs]))
+        ends.append((label, [end_ms for _, end_ms in runs]))
+
+    _common.print_percentiles(f"Start bis verdeckt ({RUNS} Läufe, Fade-In {AnimationConfig.FADE_IN_DURATION * 1000:.0f} ms)", starts)
+    _common.print_percentiles("Ende-Signal bis Ausblenden", ends, decimals=1)
+
+if __name__ == "__main__":
+    main()
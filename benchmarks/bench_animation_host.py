@@ -0,0 +1,110 @@
+# Dateipfad: benchmarks/bench_animation_host.py
+"""
+Benchmark: Animation pro Wechsel neu starten vs. warmer Animations-Host.
+
+Gemessen wird die Zeit vom Anstoß der Animation bis READY (Bildschirm
+verdeckt), also der Anteil, um den die Animationsstufe den Wechsel aufhält:
+
+- Prozess je Wechsel: Popen eines Interpreters, der tkinter und handshake
+  importiert und READY meldet (bisheriger Weg über screen_fade.py)
+- Host: START an einen bereits laufenden Host-Prozess, der sich mit dem
+  AnimationChannel verbindet und READY meldet (animation_host.py)
+
+Ohne Bildschirm (Tk-Fenster, Einblenden) gemessen: Fensteraufbau und
+Monitor-Abfrage fallen beim Host ebenfalls weg, die Einblenddauer ist in
+beiden Fällen gleich.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.shared.animations.handshake import AnimationChannel  # noqa: E402
+from smartdesk.shared.animations.host_controller import start_hosted_animation  # noqa: E402
+
+ANIMATIONS_DIR = os.path.join(_common.SRC_DIR, "smartdesk", "shared", "animations")
+RUNS = 20
+
+COLD = textwrap.dedent(
+    f"""
+    import sys, tkinter
+    sys.path.insert(0, {ANIMATIONS_DIR!r})
+    from handshake import SwitchLink
+    link = SwitchLink.from_env()
+    link.send_ready()
+    while not link.poll_done(0.02):
+        pass
+    """
+)
+
+HOST = textwrap.dedent(
+    f"""
+    import sys, tkinter
+    sys.path.insert(0, {ANIMATIONS_DIR!r})
+    from handshake import SwitchLink
+    from host_protocol import OK, START, HostServer
+    server = HostServer()
+    server.write_info(sys.argv[1])
+    while True:
+        for command in server.poll(0.02):
+            command.reply(OK)
+            if command.name != START:
+                sys.exit(0)
+            link = SwitchLink(command.args[0], command.args[1])
+            link.send_ready()
+            while not link.poll_done(0.02):
+                pass
+            link.close()
+    """
+)
+
+
+def _cold_run():
+    channel = AnimationChannel()
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-c", COLD], env={**os.environ, **channel.env()})
+    assert channel.wait_ready(10)
+    elapsed = (time.perf_counter() - start) * 1000
+    channel.send_done()
+    channel.close()
+    process.wait()
+    return elapsed
+
+
+def _warm_run(info_file):
+    channel = AnimationChannel()
+    start = time.perf_counter()
+    assert start_hosted_animation(channel.port, channel.token, None, info_file=info_file)
+    assert channel.wait_ready(10)
+    elapsed = (time.perf_counter() - start) * 1000
+    channel.send_done()
+    channel.close()
+    return elapsed
+
+
+def main():
+    info_file = os.path.join(tempfile.mkdtemp(prefix="smartdesk_host_"), "animation_host.json")
+    host = subprocess.Popen([sys.executable, "-c", HOST, info_file])
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(info_file):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        cold = [_cold_run() for _ in range(RUNS)]
+        warm = [_warm_run(info_file) for _ in range(RUNS)]
+    finally:
+        host.kill()
+        host.wait()
+
+    _common.print_percentiles(f"Anstoß bis READY ({RUNS} Läufe, ohne Fensteraufbau)", [("Prozess je Wechsel", cold), ("warmer Host", warm)], decimals=1)
+
+
+if __name__ == "__main__":
+    main()
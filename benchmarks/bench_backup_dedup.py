@@ -0,0 +1,103 @@
+# Dateipfad: benchmarks/bench_backup_dedup.py
+"""
+Benchmark: Registry-Backup vor dem Desktop-Wechsel.
+
+- alt: pro Wechsel os.listdir() + os.stat() je Datei + Sortieren für die
+  Aufbewahrung, danach eine neue .reg-Datei mit Zeitstempel im Namen
+- neu: inhaltsadressierte Dateien + backups/index.jsonl; gleiche Werte wie im
+  neuesten Backup schreiben nichts, wiederkehrende Werte nutzen die
+  vorhandene Datei
+
+Gemessen werden zwei Muster: wiederholtes Backup bei unveränderten Werten
+und abwechselnde Wechsel zwischen zwei Desktops. Die Registry-Werte kommen
+aus der In-Memory-Registry, gemessen wird nur der Dateianteil. Der neue
+Ablauf hält dabei das prozessübergreifende Index-Lock, der alte hatte keins.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.registry import REG_EXPAND_SZ, InMemoryRegistryBackend, RegistryValueCache, set_registry_cache  # noqa: E402
+from smartdesk.core.utils import backup_service  # noqa: E402
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME  # noqa: E402
+
+KEEP_COUNT = backup_service.DEFAULT_KEEP_COUNT
+
+
+def old_backup_before_switch(backup_dir, counter):
+    """Nachbau des bisherigen Ablaufs: Aufräumen per Verzeichnis-Scan, dann Schreiben."""
+    backups = []
+    for filename in os.listdir(backup_dir):
+        if filename.startswith("registry_") and filename.endswith(".reg"):
+            path = os.path.join(backup_dir, filename)
+            stat = os.stat(path)
+            backups.append((datetime.fromtimestamp(stat.st_ctime), path))
+    backups.sort(reverse=True)
+    for _, path in backups[KEEP_COUNT:]:
+        os.remove(path)
+
+    user_shell = backup_service._read_registry_value(KEY_USER_SHELL, VALUE_NAME)
+    legacy_shell = backup_service._read_registry_value(KEY_LEGACY_SHELL, VALUE_NAME)
+    # Zähler statt Sekunden-Zeitstempel, damit jeder Aufruf eine neue Datei schreibt
+    path = os.path.join(backup_dir, f"registry_before_switch_{counter:08d}_000000.reg")
+    with open(path, "w", encoding="utf-16") as f:
+        f.write("Windows Registry Editor Version 5.00\n\n")
+        f.write(f"[HKEY_CURRENT_USER\\{KEY_USER_SHELL}]\n")
+        f.write(f'"{VALUE_NAME}"=hex(2):{backup_service._string_to_reg_hex(user_shell)}\n\n')
+        f.write(f"[HKEY_CURRENT_USER\\{KEY_LEGACY_SHELL}]\n")
+        f.write(f'"{VALUE_NAME}"="{legacy_shell}"\n\n')
+        f.write(f"; Backup erstellt: {datetime.now().isoformat()}\n")
+    return path
+
+
+def main():
+    backend = InMemoryRegistryBackend()
+    set_registry_cache(RegistryValueCache(backend))
+    paths = ["C:\\Desktops\\A", "C:\\Desktops\\B"]
+    state = {"i": 0}
+
+    def set_desktop(path):
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, path, REG_EXPAND_SZ)
+        backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, path)
+
+    def alternate():
+        state["i"] += 1
+        set_desktop(paths[state["i"] % 2])
+
+    rows = []
+    writes = {}
+    for pattern, before in (("unverändert", lambda: None), ("A/B im Wechsel", alternate)):
+        set_desktop(paths[0])
+        for label in ("alt", "neu"):
+            backup_dir = tempfile.mkdtemp(prefix="smartdesk_bench_backup_")
+            created = set()
+
+            def old():
+                before()
+                created.add(old_backup_before_switch(backup_dir, len(created)))
+
+            def new():
+                before()
+                created.add(backup_service.create_backup_before_switch())
+
+            func = old if label == "alt" else new
+            with patch.object(backup_service, "BACKUP_DIR", backup_dir), patch.object(backup_service.logger, "disabled", True):
+                rows.append((f"{label}: {pattern}", _common.measure(func)))
+            writes[f"{label}: {pattern}"] = len(created)
+            shutil.rmtree(backup_dir)
+    set_registry_cache(None)
+
+    _common.print_table(f"Backup vor dem Wechsel (Aufbewahrung {KEEP_COUNT})", rows)
+    for label, count in writes.items():
+        print(f"Geschriebene Backup-Dateien, {label}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Dateipfad: benchmarks/bench_backup_restore.py
+"""
+Benchmark: Wiederherstellung eines Registry-Backups.
+
+- alt: subprocess.run(["reg", "import", ...]). Unter Linux gibt es kein
+  reg.exe; gemessen wird deshalb nur der Prozessstart eines leeren
+  Programms (/bin/true bzw. "cmd /c exit") als Untergrenze
+- neu: .reg-Datei im Prozess parsen, mit der Registry vergleichen und die
+  Werte als RegistryTransaction schreiben (In-Memory-Registry)
+- neu, dry_run: nur parsen und vergleichen
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.registry import REG_EXPAND_SZ, InMemoryRegistryBackend, RegistryValueCache, parse_reg_file, set_registry_cache  # noqa: E402
+from smartdesk.core.registry import transaction  # noqa: E402
+from smartdesk.core.utils import backup_service  # noqa: E402
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME  # noqa: E402
+
+SPAWN_COMMAND = ["cmd", "/c", "exit"] if sys.platform == "win32" else ["true"]
+
+
+def main():
+    backend = InMemoryRegistryBackend()
+    set_registry_cache(RegistryValueCache(backend))
+    backup_dir = tempfile.mkdtemp(prefix="smartdesk_bench_restore_")
+
+    def set_desktop(path):
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, path, REG_EXPAND_SZ)
+        backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, path)
+
+    set_desktop("C:\\Desktops\\A")
+    with patch.object(backup_service, "BACKUP_DIR", backup_dir):
+        backup_file = backup_service.create_registry_backup()
+
+    def spawn():
+        subprocess.run(SPAWN_COMMAND, capture_output=True)
+
+    def restore():
+        # Jede Runde hat etwas zurückzuschreiben
+        set_desktop("C:\\Desktops\\B")
+        assert backup_service.restore_from_backup(backup_file)
+
+    def dry_run():
+        assert backup_service.restore_from_backup(backup_file, dry_run=True)
+
+    rows = []
+    with patch.object(backup_service.logger, "disabled", True), patch.object(transaction.logger, "disabled", True):
+        rows.append((f"alt: Prozessstart ({' '.join(SPAWN_COMMAND)})", _common.measure(spawn)))
+        rows.append(("neu: nur parsen", _common.measure(lambda: parse_reg_file(backup_file))))
+        rows.append(("neu: parsen + vergleichen (dry_run)", _common.measure(dry_run)))
+        rows.append(("neu: parsen + vergleichen + Transaktion", _common.measure(restore)))
+    set_registry_cache(None)
+    shutil.rmtree(backup_dir)
+
+    _common.print_table("Wiederherstellung eines Backups", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# Dateipfad: benchmarks/bench_backup_worker.py
+"""
+Benchmark: Backup-Stufe des Desktop-Wechsels (kritischer Pfad).
+
+Wechsel zwischen zwei Desktops (A/B), die Registry-Werte kommen aus der
+In-Memory-Registry, Backups landen in einem temporären Ordner.
+
+- alt: create_registry_backup() synchron im Wechsel (Lock, Index, Datei)
+- neu: create_backup_before_switch() liest nur die Werte und reiht sie im
+  BackupWorker ein; geschrieben wird im Hintergrund
+
+Ausgegeben werden p50/p95 der Stufe, wie sie die Zeitmessung des Wechsels
+(StageTimer, Stufe "backup") sieht, sowie die Dauer von
+flush_pending_backups() am Ende.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.registry import REG_EXPAND_SZ, InMemoryRegistryBackend, RegistryValueCache, set_registry_cache  # noqa: E402
+from smartdesk.core.utils import backup_service  # noqa: E402
+from smartdesk.core.utils.stage_timer import StageTimer  # noqa: E402
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME  # noqa: E402
+
+SWITCHES = 500
+# Abstand zwischen zwei Wechseln (schnelles Umschalten per Hotkey)
+SWITCH_INTERVAL_S = 0.002
+
+
+def main():
+    backend = InMemoryRegistryBackend()
+    set_registry_cache(RegistryValueCache(backend))
+    paths = ["C:\\Desktops\\A", "C:\\Desktops\\B"]
+
+    def old_stage():
+        backup_service.create_registry_backup(reason="before_switch", keep_count=backup_service.DEFAULT_KEEP_COUNT)
+
+    def new_stage():
+        backup_service.create_backup_before_switch()
+
+    rows = []
+    for label, stage in (("alt: synchron", old_stage), ("neu: BackupWorker", new_stage)):
+        backup_dir = tempfile.mkdtemp(prefix="smartdesk_bench_worker_")
+        samples = []
+        with patch.object(backup_service, "BACKUP_DIR", backup_dir), patch.object(backup_service.logger, "disabled", True):
+            for i in range(SWITCHES):
+                timer = StageTimer()
+                with timer.stage("backup"):
+                    stage()
+                samples.append(timer.durations_ms["backup"] * 1000)
+                # Registry-Schritt des Wechsels, danach bis zum nächsten Wechsel warten
+                path = paths[i % 2]
+                backend.write_value(KEY_USER_SHELL, VALUE_NAME, path, REG_EXPAND_SZ)
+                backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, path)
+                time.sleep(SWITCH_INTERVAL_S)
+            start = time.perf_counter()
+            backup_service.flush_pending_backups()
+            flush_ms = (time.perf_counter() - start) * 1000
+            entries = len(backup_service.list_backups())
+        rows.append((label, _common.percentile(samples, 50), _common.percentile(samples, 95), flush_ms, entries))
+        shutil.rmtree(backup_dir)
+    set_registry_cache(None)
+
+    print(f"Backup-Stufe des Wechsels ({SWITCHES} Wechsel A/B, {SWITCH_INTERVAL_S * 1000:.0f} ms Abstand)")
+    print("-" * 60)
+    for label, p50, p95, flush_ms, entries in rows:
+        print(f"{label:<22} p50 {p50:>7.1f} µs  p95 {p95:>7.1f} µs  flush {flush_ms:>6.1f} ms  Index-Einträge {entries}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Dateipfad: benchmarks/bench_codec.py
+"""
+Benchmark: Alter vs. neuer Codec für desktops.json.
+
+Roundtrip (serialisieren + parsen + Desktop-Objekte bauen) für
+- 50 Desktops nur mit Layout-Referenz (aktuelles Format)
+- 10 Desktops mit je 10.000 Inline-Icons (altes Format, Migration)
+
+Alt: json.dumps mit indent=4 bzw. pro Desktop, Desktop/IconPosition.from_dict
+pro Eintrag. Neu: codec mit orjson (falls installiert) bzw. json, Bulk-
+Dekodierung der Icons über IconPosition.from_dicts.
+"""
+
+import json
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import Desktop, IconPosition  # noqa: E402
+from smartdesk.core.storage import codec  # noqa: E402
+
+
+def build_metadata_records(count=50):
+    return [
+        {
+            "name": f"Desktop {d:02d}",
+            "path": f"C:\\Users\\Bench\\Desktop_{d:02d}",
+            "is_active": d == 0,
+            "wallpaper_path": f"C:\\Wallpapers\\{d}.jpg",
+            "icon_layout": f"{d:040x}",
+            "protected": False,
+            "created_at": "2025-01-01T12:00:00",
+        }
+        for d in range(count)
+    ]
+
+
+def build_inline_records(count=10, icons=10_000):
+    records = build_metadata_records(count)
+    for d, record in enumerate(records):
+        del record["icon_layout"]
+        record["icon_positionen"] = [{"index": i, "name": f"Datei_{d}_{i}.txt", "x": (i % 20) * 75, "y": (i // 20) * 100} for i in range(icons)]
+    return records
+
+
+def old_roundtrip(records):
+    payload = json.dumps(records, indent=4, ensure_ascii=False).encode("utf-8")
+    desktops = []
+    for data in json.loads(payload):
+        desktop = Desktop(data["name"], data["path"], data.get("is_active", False), data.get("wallpaper_path", ""))
+        if "icon_positionen" in data:
+            desktop.icon_positionen = [IconPosition.from_dict(icon) for icon in data["icon_positionen"]]
+        desktops.append(desktop)
+    return desktops
+
+
+def new_roundtrip(records):
+    return codec.decode_desktops(codec.encode_records(records))
+
+
+def main():
+    rows = []
+    for label, records in (("50 Desktops, Metadaten", build_metadata_records()), ("10 × 10.000 Inline-Icons", build_inline_records())):
+        rows.append((f"{label}: alt (json indent=4, from_dict)", _common.measure(lambda: old_roundtrip(records))))
+        if codec.orjson is not None:
+            rows.append((f"{label}: neu (orjson, Bulk)", _common.measure(lambda: new_roundtrip(records))))
+        with patch.object(codec, "orjson", None):
+            rows.append((f"{label}: neu (json, Bulk)", _common.measure(lambda: new_roundtrip(records))))
+
+    _common.print_table(f"Codec-Roundtrip (JSON-Bibliothek: {codec.backend_name()})", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# Dateipfad: benchmarks/bench_desktop_lookups.py
+"""
+Benchmark: Registry-Sync und Zielsuche in desktop_service bei 1.000 Desktops.
+
+Jede Aktion (Wechsel, Löschen, Icons sichern, Wallpaper, Sync nach Neustart)
+beginnt mit get_all_desktops() + synchronize_desktops_with_registry() und
+sucht danach Ziel- und aktiven Desktop. Verglichen werden:
+- alt: normpath(expandvars()).lower() pro Desktop und Aufruf, next() linear
+- neu: zwischengespeicherter Desktop.path_key, DesktopList-Indizes
+"""
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import Desktop, DesktopList  # noqa: E402
+from smartdesk.core.services import desktop_service  # noqa: E402
+
+NUM_DESKTOPS = 1000
+
+
+def build_desktops():
+    desktops = [Desktop(f"Desktop {d:04d}", f"%USERPROFILE%\\Desktops\\Desktop_{d:04d}", d == 0) for d in range(NUM_DESKTOPS)]
+    for desktop in desktops:
+        desktop.path_key  # wie nach dem ersten Laden im Repository
+    return desktops
+
+
+def old_sync(desktops, registry_path):
+    norm_registry = os.path.normpath(os.path.expandvars(registry_path)).lower()
+    changed = False
+    for d in desktops:
+        should_be_active = os.path.normpath(os.path.expandvars(d.path)).lower() == norm_registry
+        if d.is_active != should_be_active:
+            d.is_active = should_be_active
+            changed = True
+    return changed
+
+
+def main():
+    base = build_desktops()
+    registry_path = os.path.expandvars("%USERPROFILE%\\Desktops\\Desktop_0500")
+    target_name = "Desktop 0750"
+
+    def old_action():
+        desktops = [d.copy() for d in base]
+        old_sync(desktops, registry_path)
+        next((d for d in desktops if d.name == target_name), None)
+        next((d for d in desktops if d.is_active), None)
+
+    def new_action():
+        desktops = DesktopList(d.copy() for d in base)
+        desktop_service.synchronize_desktops_with_registry(desktops, save_changes=False)
+        desktops.get_by_name(target_name)
+        desktops.get_active()
+
+    def old_sync_only():
+        old_sync(base, registry_path)
+
+    indexed = DesktopList(base)
+
+    def new_sync_only():
+        desktop_service.synchronize_desktops_with_registry(indexed, save_changes=False)
+
+    with patch.object(desktop_service, "get_cached_value", return_value=registry_path):
+        rows = [
+            ("Sync allein: alt (normpath pro Desktop)", _common.measure(old_sync_only)),
+            ("Sync allein: neu (Pfad-Index)", _common.measure(new_sync_only)),
+            ("Aktion: alt (Kopie + Sync + next())", _common.measure(old_action)),
+            ("Aktion: neu (Kopie + Sync + Index)", _common.measure(new_action)),
+        ]
+
+    _common.print_table(f"Desktop-Suche ({NUM_DESKTOPS} Desktops)", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Dateipfad: benchmarks/bench_desktop_repository.py
+"""
+Benchmark: get_all_desktops() ohne und mit DesktopRepository.
+
+Szenario: 50 Desktops mit je 500 Icons (25.000 Icon-Einträge in desktops.json).
+Verglichen werden:
+- load_desktops() + Sortierung (bisheriges Verhalten pro Aufruf)
+- DesktopRepository.get_all() bei unveränderter Datei (Cache-Treffer)
+- DesktopRepository.get_all() nach externer Änderung (Reparse)
+"""
+
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.storage import file_operations  # noqa: E402
+from smartdesk.core.storage.desktop_repository import DesktopRepository, sort_key  # noqa: E402
+
+NUM_DESKTOPS = 50
+ICONS_PER_DESKTOP = 500
+
+
+def build_data():
+    return [
+        {
+            "name": f"Desktop {d:02d}",
+            "path": f"C:\\Users\\Bench\\Desktop_{d:02d}",
+            "is_active": d == 0,
+            "wallpaper_path": "",
+            "icon_positionen": [{"index": i, "name": f"Datei_{d}_{i}.txt", "x": (i % 20) * 75, "y": (i // 20) * 100} for i in range(ICONS_PER_DESKTOP)],
+        }
+        for d in range(NUM_DESKTOPS)
+    ]
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="smartdesk_bench_repo_")
+    json_file = os.path.join(tmp_dir, "desktops.json")
+    with open(json_file, "w", encoding="utf-8") as f:
+        json.dump(build_data(), f, indent=4, ensure_ascii=False)
+
+    size_kb = os.path.getsize(json_file) / 1024
+    print(f"desktops.json: {NUM_DESKTOPS} Desktops × {ICONS_PER_DESKTOP} Icons, {size_kb:,.0f} KiB")
+
+    with patch.object(file_operations, "get_data_file_path", return_value=json_file):
+
+        def uncached():
+            desktops = file_operations.load_desktops()
+            desktops.sort(key=sort_key)
+            return desktops
+
+        repo = DesktopRepository()
+
+        def cached():
+            return repo.get_all()
+
+        counter = [0]
+
+        def reparse():
+            # Signatur ändern -> erzwingt Reparse wie bei einem Fremdprozess
+            counter[0] += 1
+            os.utime(json_file, ns=(counter[0], counter[0]))
+            return repo.get_all()
+
+        rows = [
+            ("load_desktops() + sort (uncached)", _common.measure(uncached)),
+            ("DesktopRepository.get_all() (Treffer)", _common.measure(cached)),
+            ("DesktopRepository.get_all() (Reparse)", _common.measure(reparse)),
+        ]
+
+    _common.print_table("get_all_desktops()", rows)
+    speedup = rows[1][1]["calls_per_sec"] / rows[0][1]["calls_per_sec"]
+    print(f"\nBeschleunigung Cache-Treffer gegenüber uncached: {speedup:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
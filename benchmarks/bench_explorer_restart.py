@@ -0,0 +1,112 @@
+# Dateipfad: benchmarks/bench_explorer_restart.py
+"""
+Benchmark: Erkennung des neu gestarteten Explorers nach dem Kill.
+
+Ein Supervisor startet einen Prozess namens "explorer.exe" (Python unter
+anderem Namen) und startet ihn wie Windows nach RESPAWN_DELAY_MS neu.
+Nur außerhalb von Windows, da sonst der echte Explorer beendet würde.
+
+- alt: wait_procs, dann alle 0,5 s process_iter(["name"]) über alle Prozesse
+- neu: system_service.restart_explorer() (Termination-Handles bzw.
+  wait_procs, danach nur neue PIDs, Abfrage alle POLL_INTERVAL)
+
+Gemessen wird die Zeit vom Kill bis zur Erkennung (p50/p95) sowie die
+Kosten eines Durchlaufs über die Prozesstabelle.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+import psutil  # noqa: E402
+
+from smartdesk.core.services import system_service  # noqa: E402
+
+RESPAWN_DELAY_MS = 150
+RUNS = 10
+
+SUPERVISOR = textwrap.dedent(
+    """
+    import os, subprocess, sys, time
+    exe, stop, respawn_delay = sys.argv[1], sys.argv[2], float(sys.argv[3])
+    while not os.path.exists(stop):
+        p = subprocess.Popen([exe, "-c", "import time; time.sleep(60)"])
+        while p.poll() is None and not os.path.exists(stop):
+            time.sleep(0.005)
+        if p.poll() is None:
+            p.kill()
+            p.wait()
+            break
+        time.sleep(respawn_delay)
+    """
+)
+
+
+def old_restart():
+    """Bisheriges Verfahren (ohne Ausgabe und Popen-Fallback)."""
+    procs = [p for p in psutil.process_iter(["name"]) if p.name().lower() == "explorer.exe"]
+    start = time.perf_counter()
+    for p in procs:
+        p.kill()
+    psutil.wait_procs(procs, timeout=5)
+    while time.perf_counter() - start < 5:
+        time.sleep(0.5)
+        if any(p.name().lower() == "explorer.exe" for p in psutil.process_iter(["name"])):
+            break
+    return (time.perf_counter() - start) * 1000
+
+
+def new_restart():
+    # Kein Desktop-ListView außerhalb von Windows
+    with patch.object(system_service, "_desktop_ready", return_value=True), _common.quiet():
+        return system_service.restart_explorer().respawn_ms
+
+
+def _wait_for_explorer():
+    while not any(p.info["name"] == "explorer.exe" for p in psutil.process_iter(["name"])):
+        time.sleep(0.01)
+
+
+def main():
+    if sys.platform == "win32":
+        print("Nur außerhalb von Windows (beendet sonst den echten Explorer).")
+        return
+
+    work_dir = tempfile.mkdtemp(prefix="smartdesk_bench_explorer_")
+    exe = os.path.join(work_dir, "explorer.exe")
+    os.symlink(os.path.realpath(sys.executable), exe)
+    script = os.path.join(work_dir, "supervisor.py")
+    with open(script, "w") as f:
+        f.write(SUPERVISOR)
+    stop = os.path.join(work_dir, "stop")
+    supervisor = subprocess.Popen([sys.executable, script, exe, stop, str(RESPAWN_DELAY_MS / 1000)])
+
+    rows = []
+    try:
+        for label, func in (("alt: process_iter alle 0,5 s", old_restart), ("neu: neue PIDs, Ereignis-Wartezeit", new_restart)):
+            samples = []
+            for _ in range(RUNS):
+                _wait_for_explorer()
+                samples.append(func())
+            rows.append((label, samples))
+    finally:
+        open(stop, "w").close()
+        supervisor.wait(5)
+    _common.print_percentiles(f"Explorer-Neustart: Kill bis Erkennung ({RUNS} Läufe, Neustart nach {RESPAWN_DELAY_MS} ms)", rows)
+
+    rows = [
+        ("process_iter(['name']) (alt)", _common.measure(lambda: list(psutil.process_iter(["name"])))),
+        ("psutil.pids() (neu)", _common.measure(psutil.pids)),
+    ]
+    _common.print_table(f"Ein Durchlauf über {len(psutil.pids())} Prozesse", rows)
+
+
+if __name__ == "__main__":
+    main()
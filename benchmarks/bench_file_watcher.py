@@ -0,0 +1,87 @@
+# Dateipfad: benchmarks/bench_file_watcher.py
+"""
+Benchmark: Reaktionszeit und Leerlauf-Kosten des Datei-Watchers.
+
+Verglichen werden das Betriebssystem-Backend (inotify bzw.
+ReadDirectoryChangesW) und Polling mit den bisherigen Intervallen
+(500 ms Control Panel, 1 s Tray). Gemessen werden:
+- Latenz vom atomaren Ersetzen der Datei bis zum Callback (p50/p95)
+- Aufwachvorgänge des Watcher-Threads pro Sekunde ohne Änderungen
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.shared import file_watcher  # noqa: E402
+from smartdesk.shared.file_watcher import FileWatcher, PollingBackend  # noqa: E402
+
+SAMPLES = 20
+IDLE_SECONDS = 3.0
+
+
+class CountingBackend:
+    """Zählt die Rückkehr aus wait() (= Aufwachen des Watcher-Threads)."""
+
+    def __init__(self, backend):
+        self._backend = backend
+        self.name = backend.name
+        self.wakeups = 0
+
+    def wait(self, timeout):
+        changed = self._backend.wait(timeout)
+        self.wakeups += 1
+        return changed
+
+    def __getattr__(self, name):
+        return getattr(self._backend, name)
+
+
+def bench_backend(label, backend, directory):
+    target = os.path.join(directory, f"{backend.name}.json")
+    counting = CountingBackend(backend)
+    watcher = FileWatcher(counting, debounce=0.0)
+    fired = threading.Event()
+    watcher.subscribe(target, lambda path: fired.set())
+
+    latencies = []
+    for i in range(SAMPLES):
+        fired.clear()
+        tmp = target + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(str(i))
+        start = time.perf_counter()
+        os.replace(tmp, target)
+        fired.wait(5)
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.05)
+
+    counting.wakeups = 0
+    time.sleep(IDLE_SECONDS)
+    idle_wakeups = counting.wakeups / IDLE_SECONDS
+    watcher.stop()
+
+    p50 = _common.percentile(latencies, 50) * 1000
+    p95 = _common.percentile(latencies, 95) * 1000
+    print(f"{label:<28} {p50:>10.2f} ms {p95:>10.2f} ms {idle_wakeups:>12.1f}")
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="smartdesk_bench_watch_")
+
+    print(f"{SAMPLES} atomare Ersetzungen, Leerlauf {IDLE_SECONDS:.0f} s")
+    print(f"\n{'Backend':<28} {'Latenz p50':>13} {'p95':>13} {'Aufwachen/s':>12}")
+    print("-" * 70)
+    native = file_watcher._detect_backend()
+    bench_backend(f"{native.name} (Betriebssystem)", native, directory)
+    bench_backend("Polling 500 ms", PollingBackend(interval=0.5), directory)
+    bench_backend("Polling 1 s", PollingBackend(interval=1.0), directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# Dateipfad: benchmarks/bench_icon_layouts.py
+"""
+Benchmark: Icon-Layouts inline in desktops.json vs. binäre Layout-Dateien.
+
+Szenario: 10 Desktops mit je 10.000 Icons.
+Gemessen werden:
+- Metadaten lesen (load_desktops ohne Icon-Zugriff): alt vs. neu
+- Icons eines Desktops laden: JSON-Dicts vs. read_layout() (mmap)
+- Speicherbedarf von 10.000 Icons: Dataclass mit __dict__ vs. __slots__
+"""
+
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import Desktop, IconPosition  # noqa: E402
+from smartdesk.core.storage import file_operations, icon_layout_store  # noqa: E402
+
+NUM_DESKTOPS = 10
+ICONS_PER_DESKTOP = 10_000
+
+
+@dataclass
+class LegacyIconPosition:
+    """Bisheriges Icon-Modell (Dataclass mit Instanz-__dict__) zum Vergleich."""
+
+    index: int
+    name: str
+    x: int
+    y: int
+
+
+def build_data():
+    return [
+        {
+            "name": f"Desktop {d:02d}",
+            "path": f"C:\\Users\\Bench\\Desktop_{d:02d}",
+            "is_active": d == 0,
+            "wallpaper_path": "",
+            "icon_positionen": [{"index": i, "name": f"Datei_{d}_{i}.txt", "x": (i % 20) * 75, "y": (i // 20) * 100} for i in range(ICONS_PER_DESKTOP)],
+        }
+        for d in range(NUM_DESKTOPS)
+    ]
+
+
+def peak_kib(func):
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak / 1024
+
+
+def main():
+    data = build_data()
+    legacy_dir = tempfile.mkdtemp(prefix="smartdesk_bench_legacy_")
+    legacy_file = os.path.join(legacy_dir, "desktops.json")
+    with open(legacy_file, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+
+    new_dir = tempfile.mkdtemp(prefix="smartdesk_bench_layout_")
+    new_file = os.path.join(new_dir, "desktops.json")
+    os.makedirs(os.path.dirname(file_operations.LOCK_FILE_PATH), exist_ok=True)
+    with patch.object(file_operations, "get_data_file_path", return_value=new_file):
+        file_operations.save_desktops([Desktop.from_dict(item) for item in data])
+
+    layout_dir = icon_layout_store.get_layout_dir(new_file)
+    layout_size = sum(os.path.getsize(os.path.join(layout_dir, n)) for n in os.listdir(layout_dir))
+    print(f"{NUM_DESKTOPS} Desktops × {ICONS_PER_DESKTOP:,} Icons")
+    print(f"  alt: desktops.json {os.path.getsize(legacy_file) / 1024:,.0f} KiB")
+    print(f"  neu: desktops.json {os.path.getsize(new_file) / 1024:,.1f} KiB + Layouts {layout_size / 1024:,.0f} KiB")
+
+    def legacy_metadata():
+        with patch.object(file_operations, "get_data_file_path", return_value=legacy_file):
+            return file_operations.load_desktops()
+
+    def new_metadata():
+        with patch.object(file_operations, "get_data_file_path", return_value=new_file):
+            return file_operations.load_desktops()
+
+    raw_icons = data[0]["icon_positionen"]
+    layout_path = icon_layout_store.get_layout_path(new_file, new_metadata()[0].icon_layout)
+
+    def legacy_icons():
+        return [IconPosition.from_dict(item) for item in json.loads(json.dumps(raw_icons))]
+
+    def new_icons():
+        return icon_layout_store.read_layout(layout_path)
+
+    _common.print_table(
+        "Parse-Zeit",
+        [
+            ("Metadaten, alt (inkl. aller Icons)", _common.measure(legacy_metadata)),
+            ("Metadaten, neu (nur Referenzen)", _common.measure(new_metadata)),
+            (f"{ICONS_PER_DESKTOP:,} Icons aus JSON", _common.measure(legacy_icons)),
+            (f"{ICONS_PER_DESKTOP:,} Icons aus Layout (mmap)", _common.measure(new_icons)),
+        ],
+    )
+
+    print("\nSpeicher (tracemalloc-Peak)")
+    print("---------------------------")
+    rows = [
+        ("load_desktops(), alt", lambda: legacy_metadata()),
+        ("load_desktops(), neu", lambda: new_metadata()),
+        (f"{ICONS_PER_DESKTOP:,} Icons als Dataclass (__dict__)", lambda: [LegacyIconPosition(i["index"], i["name"], i["x"], i["y"]) for i in raw_icons]),
+        (f"{ICONS_PER_DESKTOP:,} Icons mit __slots__", lambda: [IconPosition(i["index"], i["name"], i["x"], i["y"]) for i in raw_icons]),
+    ]
+    for label, func in rows:
+        print(f"{label:<40} {peak_kib(func):>12,.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
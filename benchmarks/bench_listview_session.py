@@ -0,0 +1,147 @@
+# Dateipfad: benchmarks/bench_listview_session.py
+"""
+Benchmark: Icons aus dem Desktop-ListView lesen (icon_service.py).
+
+Vergleicht das bisherige Verfahren (je Aufruf OpenProcess und drei
+VirtualAllocEx, je Icon zwei SendMessage, zwei ReadProcessMemory, ein
+WriteProcessMemory und neue ctypes-Puffer) mit Win32ListView über eine
+ListViewSession (Prozess-Handle und Arena bleiben offen, ein
+ReadProcessMemory je Icon, Puffer wiederverwendet).
+
+Gegen SimulatedWin32Api (platform/simulated_win32.py), einmal ohne
+Latenz (reiner Python-/ctypes-Aufwand) und einmal mit modellierten
+Kosten je Aufruf in den Explorer. Gemessen wird der erste Lesevorgang
+und ein Wechsel (set_icon_positions liest dreimal: vorher, nach dem
+Setzen, zur Kontrolle).
+
+Aufruf:
+    python benchmarks/bench_listview_session.py [--icons 500] [--runs 30]
+"""
+
+import argparse
+import ctypes
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import IconPosition  # noqa: E402
+from smartdesk.core.services.icon_service import (  # noqa: E402
+    LVIF_TEXT,
+    LVITEM,
+    LVM_GETITEMCOUNT,
+    LVM_GETITEMPOSITION,
+    LVM_GETITEMW,
+    MEM_COMMIT,
+    MEM_RELEASE,
+    PAGE_READWRITE,
+    Win32ListView,
+)
+from smartdesk.platform.simulated_win32 import SimulatedWin32Api  # noqa: E402
+
+# Modellierte Kosten: Kontextwechsel in den Explorer je Aufruf,
+# Öffnen/Reservieren zusätzlich (Handle-Tabelle, Seitentabellen)
+CALL_LATENCY = 5e-6
+ALLOC_LATENCY = 20e-6
+
+
+class LegacyListView:
+    """Das Verfahren vor ListViewSession, auf die Win32Api-Schnittstelle umgestellt."""
+
+    def __init__(self, api):
+        self.api = api
+
+    def read_items(self, handle):
+        api = self.api
+        icons = []
+        h_process = api.open_process(0x38, False, api.window_pid(handle))
+        if not h_process:
+            return []
+        item_count = api.send_message(handle, LVM_GETITEMCOUNT, 0, 0)
+        p_point = api.virtual_alloc_ex(h_process, 0, 8, MEM_COMMIT, PAGE_READWRITE)
+        p_lvitem = api.virtual_alloc_ex(h_process, 0, ctypes.sizeof(LVITEM), MEM_COMMIT, PAGE_READWRITE)
+        p_text_buffer = api.virtual_alloc_ex(h_process, 0, 520, MEM_COMMIT, PAGE_READWRITE)
+        try:
+            for i in range(item_count):
+                api.send_message(handle, LVM_GETITEMPOSITION, i, p_point)
+                # POINT unter Windows: zwei 32-Bit-LONGs
+                pt = (ctypes.c_int * 2)()
+                api.read_process_memory(h_process, p_point, ctypes.byref(pt), 8, None)
+
+                lv_item = LVITEM()
+                lv_item.mask = LVIF_TEXT
+                lv_item.iItem = i
+                lv_item.pszText = p_text_buffer
+                lv_item.cchTextMax = 260
+                api.write_process_memory(h_process, p_lvitem, ctypes.byref(lv_item), ctypes.sizeof(lv_item), None)
+                api.send_message(handle, LVM_GETITEMW, i, p_lvitem)
+
+                name_buffer = ctypes.create_unicode_buffer(260)
+                api.read_process_memory(h_process, p_text_buffer, name_buffer, 520, None)
+                name = ctypes.string_at(name_buffer, 520).decode("utf-16-le").split("\0", 1)[0]
+                if name:
+                    icons.append(IconPosition(index=i, name=name, x=pt[0], y=pt[1]))
+        finally:
+            for address in (p_point, p_lvitem, p_text_buffer):
+                api.virtual_free_ex(h_process, address, 0, MEM_RELEASE)
+            api.close_handle(h_process)
+        return icons
+
+
+def _items(icons: int):
+    return [(f"Verknüpfung {i:04d}.lnk", (i // 8) * 75, (i % 8) * 100) for i in range(icons)]
+
+
+def _measure(make_listview, api, runs: int, reads: int, check=None):
+    """Dauer je Durchlauf (ms): neues ListView, dann reads Lesevorgänge darauf."""
+    listviews = []
+
+    def run():
+        listviews.append(make_listview(api))
+        for _ in range(reads):
+            icons = listviews[-1].read_items(api.handle)
+            assert check is None or icons == check
+
+    durations = _common.sample_ms(run, runs)
+    # Schließen nicht mitmessen
+    for listview in listviews:
+        if hasattr(listview, "close"):
+            listview.close()
+    return durations
+
+
+def bench(icons: int, runs: int, call_latency: float, alloc_latency: float) -> None:
+    print(f"\n{icons} Icons, {call_latency * 1e6:.0f} µs je Aufruf, +{alloc_latency * 1e6:.0f} µs je Öffnen/Reservieren ({runs} Durchläufe)")
+    print("-" * 72)
+    print(f"{'':<20} {'1. Lesen p50':>13} {'Wechsel p50':>13} {'Aufrufe/Lesen':>14} {'RPM/Lesen':>10}")
+
+    for label, make_listview in (("bisher", LegacyListView), ("ListViewSession", Win32ListView)):
+        api = SimulatedWin32Api(_items(icons), call_latency=call_latency, alloc_latency=alloc_latency)
+        expected = [IconPosition(index=i, name=name, x=x, y=y) for i, (name, x, y) in enumerate(_items(icons))]
+        assert _measure(make_listview, api, 1, 1, check=expected)
+        first = _measure(make_listview, api, runs, 1)
+
+        api.calls.clear()
+        switch = _measure(make_listview, api, runs, 3)
+        reads = runs * 3
+        total_calls = sum(api.calls.values())
+        print(
+            f"{label:<20} {_common.percentile(first, 50):>11.2f}ms {_common.percentile(switch, 50):>11.2f}ms"
+            f" {total_calls / reads:>14.0f} {api.calls['ReadProcessMemory'] / reads:>10.0f}"
+        )
+        assert api.allocations == 0 and api.open_handles == 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--icons", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    bench(args.icons, args.runs, 0.0, 0.0)
+    bench(args.icons, args.runs, CALL_LATENCY, ALLOC_LATENCY)
+
+
+if __name__ == "__main__":
+    main()
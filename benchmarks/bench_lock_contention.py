@@ -0,0 +1,111 @@
+# Dateipfad: benchmarks/bench_lock_contention.py
+"""
+Benchmark: Lock-Contention mit N Leser-Prozessen und einem Schreiber.
+
+Jeder Leser liest desktops.json in einer Schleife unter dem Lese-Lock, der
+Schreiber schreibt sie alle 10 ms unter dem Schreib-Lock neu. Verglichen
+werden das bisherige O_EXCL-Spin-Lock und das Betriebssystem-Lock
+(flock bzw. LockFileEx) mit geteilten Lese-Locks.
+
+Ausgabe: Lesevorgänge pro Sekunde (alle Leser) sowie Wartezeit des
+Schreibers auf das Lock (p50/p95/max).
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.storage import locking  # noqa: E402
+
+NUM_READERS = 4
+DURATION = 2.0
+WRITE_INTERVAL = 0.01
+PAYLOAD = b"x" * 64 * 1024
+
+
+def _select_backend(backend_name):
+    if backend_name == "exclusive-file":
+        locking.set_lock_backend(locking.ExclusiveFileBackend())
+    else:
+        locking.set_lock_backend(None)
+
+
+def reader(backend_name, lock_file, data_file, start_at, result_queue):
+    _select_backend(backend_name)
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    reads = 0
+    deadline = start_at + DURATION
+    while time.time() < deadline:
+        with locking.file_lock(lock_file, shared=True):
+            with open(data_file, "rb") as f:
+                f.read()
+        reads += 1
+    result_queue.put(("reader", reads))
+
+
+def writer(backend_name, lock_file, data_file, start_at, result_queue):
+    _select_backend(backend_name)
+    while time.time() < start_at:
+        time.sleep(0.001)
+
+    waits = []
+    deadline = start_at + DURATION
+    while time.time() < deadline:
+        requested = time.perf_counter()
+        with locking.file_lock(lock_file):
+            waits.append(time.perf_counter() - requested)
+            with open(data_file, "wb") as f:
+                f.write(PAYLOAD)
+        time.sleep(WRITE_INTERVAL)
+    result_queue.put(("writer", waits))
+
+
+def run(backend_name):
+    tmp_dir = tempfile.mkdtemp(prefix="smartdesk_bench_lock_")
+    lock_file = os.path.join(tmp_dir, "desktops.lock")
+    data_file = os.path.join(tmp_dir, "desktops.json")
+    with open(data_file, "wb") as f:
+        f.write(PAYLOAD)
+
+    queue = multiprocessing.Queue()
+    start_at = time.time() + 1.0  # Zeit zum Starten aller Prozesse
+    args = (backend_name, lock_file, data_file, start_at, queue)
+    processes = [multiprocessing.Process(target=reader, args=args) for _ in range(NUM_READERS)]
+    processes.append(multiprocessing.Process(target=writer, args=args))
+    for p in processes:
+        p.start()
+
+    reads, waits = 0, []
+    for _ in processes:
+        kind, value = queue.get()
+        if kind == "reader":
+            reads += value
+        else:
+            waits = value
+    for p in processes:
+        p.join()
+
+    return reads / DURATION, waits
+
+
+def main():
+    print(f"{NUM_READERS} Leser-Prozesse + 1 Schreiber, {DURATION:.0f} s, Datei {len(PAYLOAD) // 1024} KiB")
+    print(f"\n{'Backend':<20} {'Lesen/s':>12} {'Schreiber p50':>15} {'p95':>10} {'max':>10} {'Writes':>8}")
+    print("-" * 80)
+    for backend_name in ("exclusive-file", locking.get_lock_backend().name):
+        reads_per_sec, waits = run(backend_name)
+        p50 = _common.percentile(waits, 50) * 1000
+        p95 = _common.percentile(waits, 95) * 1000
+        worst = max(waits) * 1000 if waits else 0.0
+        print(f"{backend_name:<20} {reads_per_sec:>12,.0f} {p50:>12.2f} ms {p95:>7.2f} ms {worst:>7.2f} ms {len(waits):>8}")
+
+
+if __name__ == "__main__":
+    main()
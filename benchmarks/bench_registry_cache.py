@@ -0,0 +1,83 @@
+# Dateipfad: benchmarks/bench_registry_cache.py
+"""
+Benchmark: Registry-Zugriffe von Sync und Backup mit und ohne RegistryValueCache.
+
+Eine typische Aktion (Wechsel, Löschen) liest den Desktop-Pfad mehrfach:
+Sync am Anfang, Prüfung vor dem Löschen, beide Werte fürs Backup. Das
+In-Memory-Backend simuliert pro Lesezugriff die Kosten von
+RegOpenKeyEx + RegQueryValueEx + RegCloseKey (SIMULATED_READ_US).
+
+- alt: Backend ohne Änderungs-Benachrichtigung, jeder Zugriff liest
+- neu: Cache, invalidiert durch Benachrichtigungen des Backends
+"""
+
+import os
+import sys
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import Desktop, DesktopList  # noqa: E402
+from smartdesk.core.registry import REG_EXPAND_SZ, InMemoryRegistryBackend, RegistryValueCache, set_registry_cache  # noqa: E402
+from smartdesk.core.services import desktop_service  # noqa: E402
+from smartdesk.core.utils import backup_service  # noqa: E402
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME  # noqa: E402
+
+SIMULATED_READ_US = 20
+NUM_DESKTOPS = 50
+
+
+class SimulatedRegistry(InMemoryRegistryBackend):
+    """In-Memory-Registry mit festen Kosten pro Lesezugriff."""
+
+    def read_value(self, key_path, value_name):
+        deadline = time.perf_counter() + SIMULATED_READ_US / 1e6
+        while time.perf_counter() < deadline:
+            pass
+        return super().read_value(key_path, value_name)
+
+
+class UnwatchedRegistry(SimulatedRegistry):
+    def watch_key(self, key_path, callback):
+        raise OSError("keine Benachrichtigungen")
+
+
+def build_backend(backend_cls):
+    backend = backend_cls()
+    backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\Desktop_07", REG_EXPAND_SZ)
+    backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Desktops\\Desktop_07")
+    return backend
+
+
+def main():
+    desktops = DesktopList(Desktop(f"Desktop {d:02d}", f"C:\\Desktops\\Desktop_{d:02d}") for d in range(NUM_DESKTOPS))
+
+    def action():
+        # Sync zu Beginn, erneuter Sync nach dem Wechsel, Prüfung vor dem Löschen, Backup
+        desktop_service.synchronize_desktops_with_registry(desktops, save_changes=False)
+        desktop_service.synchronize_desktops_with_registry(desktops, save_changes=False)
+        desktop_service.get_cached_value(KEY_USER_SHELL, VALUE_NAME)
+        backup_service._read_registry_value(KEY_USER_SHELL, VALUE_NAME)
+        backup_service._read_registry_value(KEY_LEGACY_SHELL, VALUE_NAME)
+
+    rows = []
+    reads = {}
+    for label, backend_cls in (("alt (jeder Zugriff liest)", UnwatchedRegistry), ("neu (Cache + Benachrichtigung)", SimulatedRegistry)):
+        backend = build_backend(backend_cls)
+        set_registry_cache(RegistryValueCache(backend))
+        with patch.object(desktop_service, "save_desktops"):
+            rows.append((f"Aktion: {label}", _common.measure(action)))
+            before = backend.reads
+            action()
+            reads[label] = backend.reads - before
+    set_registry_cache(None)
+
+    _common.print_table(f"Registry-Zugriffe pro Aktion (simuliert {SIMULATED_READ_US} µs pro Lesezugriff)", rows)
+    for label, count in reads.items():
+        print(f"Lesezugriffe pro Aktion, {label}: {count}")
+
+
+if __name__ == "__main__":
+    main()
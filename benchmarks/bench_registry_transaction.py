@@ -0,0 +1,107 @@
+# Dateipfad: benchmarks/bench_registry_transaction.py
+"""
+Benchmark: Registry-Schritt des Desktop-Wechsels auf der In-Memory-Registry.
+
+Das Backend simuliert feste Kosten pro Zugriff (SIMULATED_READ_US bzw.
+SIMULATED_WRITE_US, grob RegOpenKeyEx + Query/Set + RegCloseKey).
+
+- alt: zwei unabhängige Schreibzugriffe (wie update_registry_key() zweimal)
+- neu: RegistryTransaction (alte Werte sichern, schreiben, durch Lesen prüfen)
+- neu mit Fehler: zweiter Schreibzugriff schlägt fehl, beide werden zurückgesetzt
+
+Ausgegeben werden Durchsatz sowie p50/p95 der Einzelaufrufe.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.registry import REG_EXPAND_SZ, REG_SZ, InMemoryRegistryBackend, write_desktop_path  # noqa: E402
+from smartdesk.core.registry import transaction  # noqa: E402
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME  # noqa: E402
+
+SIMULATED_READ_US = 20
+SIMULATED_WRITE_US = 40
+SAMPLES = 2000
+
+
+def _spin(us):
+    deadline = time.perf_counter() + us / 1e6
+    while time.perf_counter() < deadline:
+        pass
+
+
+class SimulatedRegistry(InMemoryRegistryBackend):
+    """In-Memory-Registry mit festen Kosten pro Zugriff."""
+
+    def read_value(self, key_path, value_name):
+        _spin(SIMULATED_READ_US)
+        return super().read_value(key_path, value_name)
+
+    def write_value(self, key_path, value_name, data, value_type=REG_SZ):
+        _spin(SIMULATED_WRITE_US)
+        super().write_value(key_path, value_name, data, value_type)
+
+
+def build_backend():
+    backend = SimulatedRegistry()
+    backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\A", REG_EXPAND_SZ)
+    backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Desktops\\A")
+    return backend
+
+
+def latencies(func):
+    samples = []
+    for _ in range(SAMPLES):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples
+
+
+def main():
+    backend = build_backend()
+    paths = ["C:\\Desktops\\A", "C:\\Desktops\\B"]
+    state = {"i": 0}
+
+    def next_path():
+        state["i"] += 1
+        return paths[state["i"] % 2]
+
+    def old_switch():
+        path = next_path()
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, path, REG_EXPAND_SZ)
+        backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, path, REG_SZ)
+
+    def new_switch():
+        assert write_desktop_path(next_path(), backend).success
+
+    def failing_switch():
+        backend.fail_writes(KEY_LEGACY_SHELL)
+        assert write_desktop_path(next_path(), backend).rolled_back
+
+    # Fehlerpfad ohne Log-Ausgabe messen
+    transaction.logger.disabled = True
+
+    rows = []
+    percentiles = []
+    for label, func in (
+        ("alt: 2 unabhängige Schreibzugriffe", old_switch),
+        ("neu: Transaktion", new_switch),
+        ("neu: Transaktion mit Rollback", failing_switch),
+    ):
+        rows.append((label, _common.measure(func)))
+        samples = latencies(func)
+        percentiles.append((label, _common.percentile(samples, 50), _common.percentile(samples, 95)))
+
+    _common.print_table(f"Registry-Schritt des Wechsels (simuliert: Lesen {SIMULATED_READ_US} µs, Schreiben {SIMULATED_WRITE_US} µs)", rows)
+    print()
+    for label, p50, p95 in percentiles:
+        print(f"{label:<40} p50 {p50:>8.1f} µs  p95 {p95:>8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Dateipfad: benchmarks/bench_save_desktops.py
+"""
+Benchmark: Schreibpfad von save_desktops().
+
+Szenario wie bei einem Desktop-Wechsel: 20 Desktops mit je 300 Icons,
+vier Speichervorgänge hintereinander (Sync, Icon-Sicherung, Rollback, Sync).
+Verglichen werden:
+- bisheriges Schreiben an Ort und Stelle (json.dump unter dem Lock)
+- save_desktops() mit wechselndem Inhalt (atomar)
+- save_desktops() mit unverändertem Inhalt (Hash-Treffer, kein Schreiben)
+- vier Aufrufe innerhalb von save_batch() (ein Schreibvorgang)
+"""
+
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import Desktop  # noqa: E402
+from smartdesk.core.storage import file_operations  # noqa: E402
+
+NUM_DESKTOPS = 20
+ICONS_PER_DESKTOP = 300
+SAVES_PER_SWITCH = 4
+
+
+def build_desktops():
+    return [
+        Desktop.from_dict(
+            {
+                "name": f"Desktop {d:02d}",
+                "path": f"C:\\Users\\Bench\\Desktop_{d:02d}",
+                "is_active": d == 0,
+                "icon_positionen": [{"index": i, "name": f"Datei_{d}_{i}.txt", "x": (i % 20) * 75, "y": (i // 20) * 100} for i in range(ICONS_PER_DESKTOP)],
+            }
+        )
+        for d in range(NUM_DESKTOPS)
+    ]
+
+
+def legacy_save(data_file, desktops):
+    """Nachbildung des bisherigen Schreibpfads (ohne Listener)."""
+    with file_operations.file_lock(file_operations.LOCK_FILE_PATH):
+        data = [desktop.to_dict() for desktop in desktops]
+        with open(data_file, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4, ensure_ascii=False)
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="smartdesk_bench_save_")
+    json_file = os.path.join(tmp_dir, "desktops.json")
+    os.makedirs(os.path.dirname(file_operations.LOCK_FILE_PATH), exist_ok=True)
+    desktops = build_desktops()
+
+    with patch.object(file_operations, "get_data_file_path", return_value=json_file):
+
+        def legacy_switch():
+            for i in range(SAVES_PER_SWITCH):
+                desktops[0].is_active = i % 2 == 0
+                legacy_save(json_file, desktops)
+
+        def atomic_switch():
+            for i in range(SAVES_PER_SWITCH):
+                desktops[0].is_active = i % 2 == 0
+                file_operations.save_desktops(desktops)
+
+        def unchanged_switch():
+            for _ in range(SAVES_PER_SWITCH):
+                file_operations.save_desktops(desktops)
+
+        def batched_switch():
+            with file_operations.save_batch():
+                for i in range(SAVES_PER_SWITCH):
+                    desktops[0].is_active = i % 2 == 0
+                    file_operations.save_desktops(desktops)
+            desktops[0].wallpaper_path = str(os.urandom(4).hex())  # nächster Batch ist nie ein Hash-Treffer
+
+        rows = [
+            (f"{SAVES_PER_SWITCH}× an Ort und Stelle (bisher)", _common.measure(legacy_switch)),
+            (f"{SAVES_PER_SWITCH}× atomar, Inhalt geändert", _common.measure(atomic_switch)),
+            (f"{SAVES_PER_SWITCH}× atomar, Inhalt gleich", _common.measure(unchanged_switch)),
+            (f"{SAVES_PER_SWITCH}× in save_batch()", _common.measure(batched_switch)),
+        ]
+
+    _common.print_table("Speichervorgänge pro Desktop-Wechsel", rows)
+
+
+if __name__ == "__main__":
+    main()
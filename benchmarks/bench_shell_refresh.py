@@ -0,0 +1,74 @@
+# Dateipfad: benchmarks/bench_shell_refresh.py
+"""
+Benchmark: Explorer-Neustart vs. Aktualisierung ohne Neustart.
+
+Die Shell wird mit SimulatedShellBackend und typischen Laufzeiten
+nachgebildet (Faktor SCALE, damit der Benchmark schnell bleibt):
+
+- Neustart: RestartRefresher (bisheriges Verhalten, restart_explorer())
+- soft: SoftRefresher, die Shell übernimmt den Ordner nach der Benachrichtigung
+- soft, eskaliert: die Shell ignoriert die Benachrichtigung; nach
+  verify_timeout folgt der Neustart (schlechtester Fall)
+
+Ausgegeben werden p50/p95 der Dauer, hochgerechnet auf SCALE=1.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.shell import RestartRefresher, SimulatedShellBackend, SoftRefresher  # noqa: E402
+
+# Simulierte Laufzeiten in Millisekunden (Windows 11)
+NOTIFY_MS = 20  # SHChangeNotify + WM_SETTINGCHANGE-Broadcast
+APPLY_MS = 250  # bis das ListView den neuen Ordner zeigt
+RESTART_MS = 2000  # Kill, Warten auf Prozessende, Abfrage alle 0,5 s
+VERIFY_TIMEOUT_MS = 1500
+SCALE = 0.05
+RUNS = 20
+
+OLD = "C:\\Users\\me\\Desktop"
+NEW = "D:\\Desktops\\Arbeit"
+FOLDERS = {OLD: ["Spiele.lnk", "Notizen.txt"], NEW: ["Projekt.docx", "Tool.lnk"]}
+
+
+def _backend(soft_refresh_works=True):
+    backend = SimulatedShellBackend(
+        folders=FOLDERS,
+        shown_path=OLD,
+        soft_refresh_works=soft_refresh_works,
+        notify_latency=NOTIFY_MS / 1000 * SCALE,
+        apply_delay=APPLY_MS / 1000 * SCALE,
+        restart_duration=RESTART_MS / 1000 * SCALE,
+    )
+    backend.set_registry_path(NEW)
+    return backend
+
+
+def _soft(backend):
+    return SoftRefresher(backend, verify_timeout=VERIFY_TIMEOUT_MS / 1000 * SCALE, poll_interval=0.05 * SCALE)
+
+
+SCENARIOS = [
+    ("Neustart", lambda: RestartRefresher(_backend())),
+    ("soft", lambda: _soft(_backend())),
+    ("soft, eskaliert", lambda: _soft(_backend(soft_refresh_works=False))),
+]
+
+
+def main():
+    rows = []
+    # Warnung bei jeder Eskalation unterdrücken
+    with _common.quiet():
+        for label, factory in SCENARIOS:
+            # Aufbau des Backends nicht mitmessen
+            refreshers = iter([factory() for _ in range(RUNS)])
+            methods = set()
+            samples = [ms / SCALE for ms in _common.sample_ms(lambda: methods.add(next(refreshers).refresh(NEW, OLD).method), RUNS)]
+            rows.append((f"{label} ({', '.join(sorted(methods))})", samples))
+    _common.print_percentiles(f"Explorer-Aktualisierung mit simulierten Laufzeiten ({RUNS} Läufe, Faktor {SCALE})", rows)
+
+if __name__ == "__main__":
+    main()
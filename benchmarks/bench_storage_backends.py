@@ -0,0 +1,107 @@
+# Dateipfad: benchmarks/bench_storage_backends.py
+"""
+Benchmark: JSON-, Journal- und SQLite-Speicher-Engine.
+
+50 Desktops mit je 500 Icons. Gemessen werden pro Engine:
+- alle Desktops laden (nur Metadaten, Icons lazy)
+- alle Desktops inkl. aller Icons laden
+- Einzelabfrage per Name (ohne Repository-Cache)
+- Speichern nach einem Desktop-Wechsel (is_active zweier Desktops)
+- Speichern nach geänderten Icons eines Desktops
+
+Die Journal-Engine kompaktiert dabei wie im Betrieb im Hintergrund, sobald
+das Journal den Schwellwert überschreitet.
+"""
+
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.models.desktop import Desktop, IconPosition  # noqa: E402
+from smartdesk.core.storage import file_operations  # noqa: E402
+from smartdesk.core.storage.journal_engine import JournalStorageEngine  # noqa: E402
+from smartdesk.core.storage.sqlite_engine import SqliteStorageEngine  # noqa: E402
+
+NUM_DESKTOPS = 50
+ICONS_PER_DESKTOP = 500
+
+
+def build_desktops():
+    return [
+        Desktop(
+            f"Desktop {d:02d}",
+            f"C:\\Users\\Bench\\Desktop_{d:02d}",
+            d == 0,
+            icon_positionen=[IconPosition(i, f"Datei_{d}_{i}.txt", (i % 20) * 75, (i // 20) * 100) for i in range(ICONS_PER_DESKTOP)],
+        )
+        for d in range(NUM_DESKTOPS)
+    ]
+
+
+def bench_engine(label, engine):
+    engine.write_desktops(build_desktops())
+    state = {"active": 0, "icons": 0}
+
+    def load_metadata():
+        engine.read_desktops()
+
+    def load_with_icons():
+        for desktop in engine.read_desktops()[0]:
+            desktop.icon_positionen
+
+    def lookup():
+        engine.get_desktop("Desktop 42")
+
+    desktops, _ = engine.read_desktops()
+
+    def switch_save():
+        desktops[state["active"]].is_active = False
+        state["active"] = (state["active"] + 1) % NUM_DESKTOPS
+        desktops[state["active"]].is_active = True
+        engine.write_desktops(desktops)
+
+    def icon_save():
+        state["icons"] += 1
+        target = desktops[state["icons"] % NUM_DESKTOPS]
+        target.icon_positionen = [IconPosition(i, icon.name, icon.x + 1, icon.y) for i, icon in enumerate(target.icon_positionen)]
+        engine.write_desktops(desktops)
+
+    return [
+        (f"{label}: laden (Metadaten)", _common.measure(load_metadata)),
+        (f"{label}: laden inkl. Icons", _common.measure(load_with_icons)),
+        (f"{label}: Desktop per Name", _common.measure(lookup)),
+        (f"{label}: speichern nach Wechsel", _common.measure(switch_save)),
+        (f"{label}: speichern, 1 Layout geändert", _common.measure(icon_save)),
+    ]
+
+
+def main():
+    tmp_dir = tempfile.mkdtemp(prefix="smartdesk_bench_storage_")
+    json_file = os.path.join(tmp_dir, "desktops.json")
+    os.makedirs(os.path.dirname(file_operations.LOCK_FILE_PATH), exist_ok=True)
+
+    with patch.object(file_operations, "get_data_file_path", return_value=json_file):
+        rows = bench_engine("JSON", file_operations.JsonStorageEngine())
+
+    journal_file = os.path.join(tmp_dir, "journal", "desktops.json")
+    os.makedirs(os.path.dirname(journal_file))
+    with patch.object(file_operations, "get_data_file_path", return_value=journal_file):
+        journal_engine = JournalStorageEngine()
+        rows += bench_engine("Journal", journal_engine)
+        journal_engine.wait_for_compaction()
+
+    sqlite_engine = SqliteStorageEngine(os.path.join(tmp_dir, "smartdesk.db"))
+    try:
+        rows += bench_engine("SQLite", sqlite_engine)
+    finally:
+        sqlite_engine.close()
+
+    _common.print_table(f"Speicher-Engines ({NUM_DESKTOPS} Desktops × {ICONS_PER_DESKTOP} Icons)", rows)
+
+
+if __name__ == "__main__":
+    main()
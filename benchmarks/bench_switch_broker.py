@@ -0,0 +1,103 @@
+# Dateipfad: benchmarks/bench_switch_broker.py
+"""
+Benchmark: Schnelle Hotkey-Folgen (Alt+1, Alt+2, Alt+3, ...) ohne und mit SwitchBroker.
+
+Ein Wechsel wird mit simulierten Laufzeiten nachgebildet (Faktor SCALE):
+PRE_MS bis zur Registry-Stufe (dort darf er noch abbrechen), danach
+RESTART_MS für Registry und Explorer-Neustart.
+
+- direkt: Jeder Tastendruck führt switch_to_desktop() vollständig aus,
+  nacheinander im Listener (bisheriges Verhalten)
+- Broker: request_switch(wait=False); wartende Anfragen werden zum letzten
+  Ziel zusammengefasst, der laufende Wechsel bricht vor der Registry ab
+
+Ausgegeben werden die Explorer-Neustarts und die Zeit vom ersten
+Tastendruck bis zum Abschluss des letzten Ziels (hochgerechnet auf SCALE=1),
+dazu die Eigenkosten einer Anfrage ohne Wechsel.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.services.switch_broker import SwitchBroker  # noqa: E402
+
+# Simulierte Laufzeiten in Millisekunden
+PRE_MS = 300  # sync, Backup, Animation, Icons sichern
+RESTART_MS = 1700  # Registry, Explorer-Neustart, Icons setzen
+PRESS_INTERVAL_MS = 150  # Abstand der Tastendrücke
+SCALE = 0.05
+BURSTS = [1, 2, 3, 5]
+
+
+class SimulatedSwitch:
+    def __init__(self):
+        self.restarts = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, desktop_name, parent, cancelled, trace_attrs):
+        time.sleep(PRE_MS / 1000 * SCALE)
+        if cancelled():
+            return False
+        time.sleep(RESTART_MS / 1000 * SCALE)
+        with self.lock:
+            self.restarts += 1
+        return True
+
+
+def _direct(presses):
+    switch = SimulatedSwitch()
+    start = time.perf_counter()
+    # Der Listener ruft switch_to_desktop synchron auf; weitere Tastendrücke
+    # warten im Callback-Thread, bis der vorige Wechsel fertig ist.
+    for i in range(presses):
+        switch(f"Desktop {i + 1}", None, lambda: False, {})
+    return switch.restarts, (time.perf_counter() - start) * 1000
+
+
+def _broker(presses, directory):
+    switch = SimulatedSwitch()
+    broker = SwitchBroker(
+        queue_file=os.path.join(directory, f"queue_{presses}.json"),
+        owner_lock_file=os.path.join(directory, f"owner_{presses}.lock"),
+        execute=switch,
+    )
+    start = time.perf_counter()
+    for i in range(presses):
+        if i:
+            time.sleep(PRESS_INTERVAL_MS / 1000 * SCALE)
+        last = broker.request(f"Desktop {i + 1}", wait=False)
+    while broker.outcome(last.seq) is None:
+        time.sleep(0.001)
+    return switch.restarts, (time.perf_counter() - start) * 1000
+
+
+def main():
+    directory = tempfile.mkdtemp(prefix="smartdesk_broker_")
+    print(f"Hotkey-Folgen im Abstand von {PRESS_INTERVAL_MS} ms (Faktor {SCALE})")
+    print("-" * 72)
+    print(f"{'Tastendrücke':<14}{'direkt: Neustarts':>19}{'Zeit':>9}{'Broker: Neustarts':>21}{'Zeit':>9}")
+    for presses in BURSTS:
+        with _common.quiet():
+            direct_restarts, direct_ms = _direct(presses)
+            broker_restarts, broker_ms = _broker(presses, directory)
+        print(f"{presses:<14}{direct_restarts:>19}{direct_ms / SCALE:>7.0f}ms{broker_restarts:>21}{broker_ms / SCALE:>7.0f}ms")
+
+    # Eigenkosten des Brokers (Warteschlangen-Datei, Locks) ohne Wechsel
+    noop = SwitchBroker(
+        queue_file=os.path.join(directory, "queue_noop.json"),
+        owner_lock_file=os.path.join(directory, "owner_noop.lock"),
+        execute=lambda *args: True,
+    )
+    with _common.quiet():
+        result = _common.measure(lambda: noop.request("Arbeit"))
+    _common.print_table("Eigenkosten je Anfrage (ohne Wechsel, nicht skaliert)", [("request(wait=True)", result)])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Dateipfad: benchmarks/bench_switch_loadtest.py
+"""
+Lasttest: Tausende zufällige Wechsel, Neuanlagen, Löschungen, Icon-
+Verschiebungen und Hintergrundbilder über desktop_service gegen die
+simulierte Plattform (smartdesk.platform, läuft auch unter Linux).
+
+Ausgegeben werden p50/p95/p99/max je Operation und je Stufe des Wechsels
+sowie alle verletzten Invarianten (Registry, aktiver Desktop, angezeigter
+Ordner, wiederhergestellte Icons, Hintergrundbild). Exit-Code 1 bei Verstößen.
+
+Aufruf:
+    python benchmarks/bench_switch_loadtest.py [--operations 2000] [--seed 1]
+        [--restart-latency 0.05] [--apply-delay 0.01] [--no-soft-refresh]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+_common.use_private_appdata("smartdesk_loadtest_")
+
+from smartdesk.core.services import settings_service  # noqa: E402
+from smartdesk.platform import SimulatedPlatform  # noqa: E402
+from smartdesk.platform.loadtest import SwitchLoadTest, format_report  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--restart-latency", type=float, default=0.05, help="Dauer eines Explorer-Neustarts (s)")
+    parser.add_argument("--apply-delay", type=float, default=0.01, help="Zeit bis die Shell den neuen Ordner zeigt (s)")
+    parser.add_argument("--no-soft-refresh", action="store_true", help="Explorer ignoriert Benachrichtigungen")
+    args = parser.parse_args()
+
+    # Ohne Animation: keine Prozesse und kein Fenster je Wechsel
+    settings_service.set_setting("show_switch_animation", False)
+
+    platform = SimulatedPlatform(
+        restart_latency=args.restart_latency,
+        apply_delay=args.apply_delay,
+        soft_refresh_works=not args.no_soft_refresh,
+    )
+    root_dir = tempfile.mkdtemp(prefix="smartdesk_loadtest_desktops_")
+    loadtest = SwitchLoadTest(platform, root_dir, seed=args.seed)
+
+    # Statusausgaben der Services unterdrücken (auch erwartete Fehler wie
+    # das abgelehnte Löschen des aktiven Desktops)
+    with _common.quiet():
+        report = loadtest.run(args.operations)
+
+    print(f"Lasttest gegen die simulierte Plattform (seed {args.seed}, Neustart {args.restart_latency * 1000:.0f} ms)")
+    print("-" * 70)
+    print(format_report(report))
+    return 1 if report.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
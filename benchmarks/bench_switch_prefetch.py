@@ -0,0 +1,117 @@
+# Dateipfad: benchmarks/bench_switch_prefetch.py
+"""
+Benchmark: Vorausberechnung der Wiederherstellung (switch_prefetch.py).
+
+1. Vorhersage: Ein simulierter Benutzer wechselt nach festen Gewohnheiten
+   (je Desktop ein bevorzugtes Ziel mit 60 %, ein zweites mit 25 %, sonst
+   zufällig). Gezählt wird, wie oft das tatsächliche Ziel unter den
+   PREFETCH_TARGETS Vorhersagen von SwitchHistory.predict() war.
+2. Nach dem Neustart: Wechsel zwischen zwei Desktops mit je ICONS Icons
+   über desktop_service gegen die simulierte Plattform, ohne und mit
+   Payload (prefetch_now() zwischen den Wechseln). Ausgegeben werden
+   p50/p95 der Stufen apply und icon_restore aus dem Trace.
+
+Das Skalieren des Hintergrundbilds braucht Pillow; ohne Pillow wird nur
+die Icon-Seite gemessen.
+
+Aufruf:
+    python benchmarks/bench_switch_prefetch.py [--icons 500] [--switches 30]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+_common.use_private_appdata("smartdesk_prefetch_")
+
+from smartdesk.core.services import desktop_service, settings_service, wallpaper_service  # noqa: E402
+from smartdesk.core.services.switch_prefetch import PREFETCH_TARGETS, SwitchHistory, SwitchPrefetcher, set_switch_prefetcher  # noqa: E402
+from smartdesk.platform import SimulatedPlatform  # noqa: E402
+
+DESKTOPS = ["Arbeit", "Privat", "Spiele", "Musik", "Projekt", "Archiv"]
+
+
+def bench_prediction(switches: int, seed: int) -> None:
+    rng = random.Random(seed)
+    habits = {name: rng.sample([d for d in DESKTOPS if d != name], 2) for name in DESKTOPS}
+    history = SwitchHistory(path=None)
+    current, hits = DESKTOPS[0], 0
+    for _ in range(switches):
+        first, second = habits[current]
+        roll = rng.random()
+        target = first if roll < 0.6 else second if roll < 0.85 else rng.choice([d for d in DESKTOPS if d != current])
+        hits += target in history.predict(current, DESKTOPS, PREFETCH_TARGETS)
+        history.record(current, target, f"hotkey:{DESKTOPS.index(target) + 1}")
+        current = target
+
+    print(f"Vorhersage ({switches} Wechsel, {len(DESKTOPS)} Desktops, Top {PREFETCH_TARGETS})")
+    print("-" * 60)
+    print(f"Trefferquote {hits / switches:.0%} (zufällig geraten: {PREFETCH_TARGETS / (len(DESKTOPS) - 1):.0%})")
+
+
+def _run_switches(prefetcher: SwitchPrefetcher, switches: int, prefetch: bool):
+    apply_ms, restore_ms = [], []
+    for i in range(switches):
+        if prefetch:
+            prefetcher.prefetch_now()
+        desktop_service.switch_to_desktop(DESKTOPS[(i + 1) % 2])
+        timings = desktop_service.get_last_switch_timings()
+        apply_ms.append(timings.get("apply", 0.0))
+        restore_ms.append(timings.get("icon_restore", 0.0))
+    return apply_ms, restore_ms
+
+
+def bench_apply(icons: int, switches: int) -> None:
+    settings_service.set_setting("show_switch_animation", False)
+    root = tempfile.mkdtemp(prefix="smartdesk_prefetch_desktops_")
+    for name in DESKTOPS[:2]:
+        folder = os.path.join(root, name)
+        os.makedirs(folder)
+        for i in range(icons):
+            open(os.path.join(folder, f"{name.lower()}_{i:04d}.txt"), "w").close()
+
+    platform = SimulatedPlatform(desktop_path=os.path.join(root, DESKTOPS[0]))
+    prefetcher = SwitchPrefetcher(history=SwitchHistory(path=None), idle_delay=None)
+    set_switch_prefetcher(prefetcher)
+
+    rows = []
+    try:
+        with platform.installed(), _common.quiet():
+            for name in DESKTOPS[:2]:
+                desktop_service.create_desktop(name, os.path.join(root, name))
+            desktop_service.get_all_desktops()
+            # Eigene Anordnung auf beiden Desktops, damit es etwas wiederherzustellen gibt
+            for name in (DESKTOPS[1], DESKTOPS[0]):
+                desktop_service.switch_to_desktop(name)
+                for index, icon in enumerate(platform.listview.names()):
+                    platform.listview.drag(icon, 1000 - index, index)
+
+            for label, prefetch in (("ohne Payload", False), ("mit Payload", True)):
+                apply_ms, restore_ms = _run_switches(prefetcher, switches, prefetch)
+                rows += [(f"apply, {label}", apply_ms), (f"icon_restore, {label}", restore_ms)]
+    finally:
+        set_switch_prefetcher(None)
+
+    pillow = "ja" if wallpaper_service.Image else "nein"
+    _common.print_percentiles(f"Nach dem Neustart ({icons} Icons, {switches} Wechsel je Variante, Pillow: {pillow})", rows, decimals=2)
+    print(f"Treffer {prefetcher.hits}, Fehlgriffe {prefetcher.misses}, veraltet {prefetcher.stale}, vorab gerechnet {prefetcher.saved_ms:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--icons", type=int, default=500)
+    parser.add_argument("--switches", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    bench_prediction(2000, args.seed)
+    bench_apply(args.icons, args.switches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# Dateipfad: benchmarks/bench_switch_stages.py
+"""
+Benchmark: Desktop-Wechsel seriell vs. nach Abhängigkeiten parallel.
+
+Die Stufen werden durch time.sleep() mit typischen Laufzeiten ersetzt
+(Faktor SCALE, damit der Benchmark schnell bleibt). Der Graph ist derselbe
+wie in desktop_service.SWITCH_STAGES; "apply" besteht aus ListView-Warten,
+Wallpaper und Icon-Wiederherstellung wie in sync_desktop_state_and_apply_icons().
+
+- seriell: alle Stufen nacheinander (Verhalten vor dem Stufengraphen)
+- Graph: run_stages() mit Thread-Pool
+
+Ausgegeben werden p50/p95 der Gesamtdauer (hochgerechnet auf SCALE=1) und
+der kritische Pfad laut Summe der Laufzeiten.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.services.desktop_service import SWITCH_STAGES  # noqa: E402
+from smartdesk.core.utils.stage_graph import Stage, run_stages  # noqa: E402
+
+# Simulierte Laufzeiten in Millisekunden (Windows 11, Desktop mit ~50 Icons)
+LATENCY_MS = {
+    "sync": 5,
+    "backup": 1,
+    "path_check": 1,
+    "animation": 560,  # Prozessstart + 500 ms Fade-In
+    "icons": 150,  # get_current_icon_positions()
+    "registry": 5,
+    "explorer_restart": 1500,
+    "listview": 800,
+    "wallpaper": 200,
+    "icon_restore": 300,
+}
+APPLY_STAGES = [("listview", ()), ("wallpaper", ("listview",)), ("icon_restore", ("listview",))]
+SCALE = 0.05
+RUNS = 20
+
+
+def _sleep(name):
+    return lambda: time.sleep(LATENCY_MS[name] / 1000 * SCALE)
+
+
+def serial():
+    for stage in SWITCH_STAGES:
+        if stage.name == "apply":
+            for name, _ in APPLY_STAGES:
+                _sleep(name)()
+        else:
+            _sleep(stage.name)()
+
+
+def graph():
+    def apply():
+        run_stages([Stage(name, _sleep(name), after=after) for name, after in APPLY_STAGES])
+
+    run_stages([Stage(s.name, apply if s.name == "apply" else _sleep(s.name), after=s.after, inline=s.inline) for s in SWITCH_STAGES])
+
+
+def main():
+    rows = []
+    for label, func in (("seriell", serial), ("Graph (parallel)", graph)):
+        samples = []
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - start) * 1000 / SCALE)
+        rows.append((label, _common.percentile(samples, 50), _common.percentile(samples, 95)))
+
+    serial_sum = sum(LATENCY_MS.values())
+    critical = sum(LATENCY_MS[n] for n in ("sync", "path_check", "animation", "explorer_restart", "listview", "icon_restore"))
+    print(f"Desktop-Wechsel mit simulierten Laufzeiten ({RUNS} Läufe, Faktor {SCALE})")
+    print("-" * 60)
+    print(f"Summe aller Stufen {serial_sum} ms, kritischer Pfad {critical} ms")
+    for label, p50, p95 in rows:
+        print(f"{label:<18} p50 {p50:>7.0f} ms  p95 {p95:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# Dateipfad: benchmarks/bench_trace_overhead.py
+"""
+Benchmark: Kosten des Tracings beim Desktop-Wechsel und der Auswertung.
+
+- Wechsel-Overhead: acht leere Stufen mit StageTimer (vorher) vs. Trace mit
+  activate() und finish() (inkl. Anhängen einer JSON-Zeile an die Datei)
+- Auswertung: read_trace_records() + summarize() über N Datensätze, wie
+  smartdesk-trace sie aus listener/tray/gui liest
+
+Die Stufen selbst sind leer; gemessen wird nur, was das Tracing zu einem
+Wechsel von mehreren Sekunden hinzufügt.
+"""
+
+import os
+import random
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import _common  # noqa: E402
+
+from smartdesk.core.utils import tracing  # noqa: E402
+from smartdesk.core.utils.stage_timer import StageTimer  # noqa: E402
+from smartdesk.core.utils.trace_report import summarize  # noqa: E402
+from smartdesk.core.utils.tracing import Trace, read_trace_records, write_trace_record  # noqa: E402
+
+STAGES = ["sync", "backup", "path_check", "animation", "icons", "registry", "explorer_restart", "apply"]
+REPORT_SIZES = (1_000, 5_000)
+
+
+def main():
+    trace_dir = tempfile.mkdtemp(prefix="smartdesk_bench_trace_")
+    trace_file = os.path.join(trace_dir, "switch_trace.jsonl")
+
+    def old_switch():
+        timer = StageTimer()
+        for name in STAGES:
+            with timer.stage(name):
+                pass
+        timer.summary()
+
+    def new_switch():
+        trace = Trace("switch", desktop="Arbeit")
+        with trace.activate():
+            for name in STAGES:
+                with trace.stage(name):
+                    pass
+        trace.finish("ok")
+        trace.summary()
+
+    rows = []
+    with patch.object(tracing, "TRACE_FILE", trace_file):
+        rows.append(("Wechsel: StageTimer", _common.measure(old_switch)))
+        rows.append(("Wechsel: Trace + JSONL", _common.measure(new_switch)))
+
+    rng = random.Random(1)
+    # Ohne Rotation, damit alle N Datensätze in der Datei stehen
+    for size in REPORT_SIZES:
+        path = os.path.join(trace_dir, f"report_{size}.jsonl")
+        for _ in range(size):
+            record = Trace("switch").to_record("ok")
+            record["process"] = rng.choice(["listener", "tray", "gui"])
+            record["stages"] = [{"name": name, "start_ms": 0.0, "duration_ms": rng.uniform(1, 3000)} for name in STAGES]
+            with patch.object(tracing, "MAX_TRACE_BYTES", float("inf")):
+                write_trace_record(record, path)
+        rows.append((f"Auswertung {size} Datensätze", _common.measure(lambda: summarize(read_trace_records(path), by_process=True), min_time=2.0)))
+
+    shutil.rmtree(trace_dir)
+    _common.print_table("Tracing des Desktop-Wechsels", rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,11 @@ setup(
     packages=find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=["psutil", "pynput", "pywin32"],
+    extras_require={"fast": ["orjson>=3.9"]},
     entry_points={
         "console_scripts": [
             "smartdesk=smartdesk.main:main",
+            "smartdesk-trace=smartdesk.core.utils.trace_report:main",
         ],
     },
 )
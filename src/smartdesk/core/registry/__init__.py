@@ -0,0 +1,45 @@
+# SmartDesk Core Registry
+from .interfaces import RegistryBackend, RegistryValue, KeyWatch, REG_SZ, REG_EXPAND_SZ, REG_DWORD
+from .implementations import WinregBackend, InMemoryRegistryBackend, create_default_backend
+from .cache import (
+    RegistryValueCache,
+    get_registry_cache,
+    set_registry_cache,
+    get_cached_value,
+    invalidate_registry_cache,
+)
+from .transaction import (
+    RegistryTransaction,
+    RegistryWrite,
+    TransactionResult,
+    RegistryVerificationError,
+    write_desktop_path,
+)
+from .regfile import RegEntry, RegFileError, parse_reg, parse_reg_bytes, parse_reg_file
+
+__all__ = [
+    "RegistryBackend",
+    "RegistryValue",
+    "KeyWatch",
+    "REG_SZ",
+    "REG_EXPAND_SZ",
+    "REG_DWORD",
+    "WinregBackend",
+    "InMemoryRegistryBackend",
+    "create_default_backend",
+    "RegistryValueCache",
+    "get_registry_cache",
+    "set_registry_cache",
+    "get_cached_value",
+    "invalidate_registry_cache",
+    "RegistryTransaction",
+    "RegistryWrite",
+    "TransactionResult",
+    "RegistryVerificationError",
+    "write_desktop_path",
+    "RegEntry",
+    "RegFileError",
+    "parse_reg",
+    "parse_reg_bytes",
+    "parse_reg_file",
+]
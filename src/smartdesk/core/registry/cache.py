@@ -0,0 +1,243 @@
+# Dateipfad: src/smartdesk/core/registry/cache.py
+"""
+Prozessweiter Cache für die Desktop-Werte der Shell-Folder-Schlüssel.
+
+Sync, Löschen und Backups lesen den Desktop-Pfad aus "User Shell Folders"
+bzw. "Shell Folders" teils mehrfach pro Aktion. Der Cache hält diese Werte
+im Speicher und verwirft sie, sobald das Backend eine Änderung des
+Schlüssels meldet (RegNotifyChangeKeyValue unter Windows). Ändert der
+Benutzer den Desktop-Pfad im Explorer, erfahren Listener (add_listener)
+davon sofort statt bei der nächsten Aktion.
+
+Gecacht wird nur, solange der Schlüssel beobachtet wird. Kann das Backend
+ihn nicht beobachten oder verliert es die Beobachtung später, wird bei
+jedem Zugriff direkt gelesen.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .interfaces import KeyCallback, KeyWatch, RegistryBackend, RegistryValue
+from .implementations import create_default_backend
+from ...shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Standardmäßig gecachte Schlüssel
+CACHED_KEYS = (KEY_USER_SHELL, KEY_LEGACY_SHELL)
+
+
+class Listener:
+    """Registrierter Änderungs-Listener; cancel() meldet ihn ab."""
+
+    __slots__ = ("key", "callback", "_cache")
+
+    def __init__(self, cache: "RegistryValueCache", key: Optional[str], callback: KeyCallback):
+        self._cache = cache
+        self.key = key
+        self.callback = callback
+
+    def cancel(self) -> None:
+        """Meldet den Listener ab (mehrfacher Aufruf ist unschädlich)."""
+        self._cache.remove_listener(self)
+
+
+class RegistryValueCache:
+    """
+    Cacht Registry-Werte und verwirft sie bei Änderungs-Benachrichtigungen.
+
+    Attributes:
+        hits: Aus dem Cache beantwortete Zugriffe
+        misses: Zugriffe, die das Backend lesen mussten
+    """
+
+    def __init__(self, backend: Optional[RegistryBackend] = None, keys: Iterable[str] = CACHED_KEYS):
+        self._backend = backend
+        self._keys: Dict[str, str] = {key.lower(): key for key in keys}
+        self._lock = threading.Lock()
+        self._watch_lock = threading.Lock()
+        self._values: Dict[Tuple[str, str], Optional[RegistryValue]] = {}
+        # Wird bei jeder Änderung erhöht; verhindert, dass ein Lesevorgang,
+        # der vor der Benachrichtigung begann, einen alten Wert einträgt
+        self._generation: Dict[str, int] = {}
+        self._watches: Dict[str, KeyWatch] = {}
+        self._unwatchable: Set[str] = set()
+        self._listeners: List[Listener] = []
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def backend(self) -> RegistryBackend:
+        with self._lock:
+            if self._backend is None:
+                self._backend = create_default_backend()
+            return self._backend
+
+    def get(self, key_path: str, value_name: str) -> str:
+        """
+        Liest einen Wert wie get_registry_value().
+
+        Returns:
+            Die Daten des Werts oder "", wenn Schlüssel oder Wert fehlen
+        """
+        value = self.get_value(key_path, value_name)
+        return value.data if value is not None else ""
+
+    def get_value(self, key_path: str, value_name: str) -> Optional[RegistryValue]:
+        """Liest einen Wert samt Typ, für gecachte Schlüssel aus dem Speicher."""
+        key = key_path.lower()
+        if key not in self._keys:
+            return self.backend.read_value(key_path, value_name)
+
+        cache_key = (key, value_name.lower())
+        with self._lock:
+            if cache_key in self._values:
+                self.hits += 1
+                return self._values[cache_key]
+            self.misses += 1
+            generation = self._generation.get(key, 0)
+
+        # Erst beobachten, dann lesen: sonst ginge eine Änderung dazwischen verloren
+        if not self._ensure_watch(key_path):
+            return self.backend.read_value(key_path, value_name)
+
+        value = self.backend.read_value(key_path, value_name)
+        with self._lock:
+            if self._generation.get(key, 0) == generation:
+                self._values[cache_key] = value
+        return value
+
+    def invalidate(self, key_path: Optional[str] = None) -> None:
+        """
+        Verwirft gecachte Werte eines Schlüssels (bzw. aller Schlüssel).
+
+        Nach eigenen Schreibzugriffen aufrufen: die Benachrichtigung des
+        Backends kommt asynchron und ggf. erst nach dem nächsten Lesen.
+        """
+        with self._lock:
+            self._drop(key_path.lower() if key_path else None)
+
+    def add_listener(self, callback: KeyCallback, key_path: Optional[str] = None) -> Listener:
+        """
+        Ruft callback(key_path) auf, sobald sich ein gecachter Schlüssel ändert.
+
+        Args:
+            callback: Läuft im Thread des Backends (Qt: per Signal weiterreichen)
+            key_path: Nur diesen Schlüssel melden (Standard: alle gecachten)
+
+        Returns:
+            Listener, dessen cancel() ihn abmeldet
+        """
+        key = key_path.lower() if key_path else None
+        listener = Listener(self, key, callback)
+        with self._lock:
+            self._listeners.append(listener)
+        for watched in [key] if key else list(self._keys):
+            self._ensure_watch(self._keys.get(watched, key_path))
+        return listener
+
+    def remove_listener(self, listener: Listener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def close(self) -> None:
+        """Beendet alle Beobachtungen und leert den Cache."""
+        with self._watch_lock:
+            watches, self._watches = list(self._watches.values()), {}
+            self._unwatchable.clear()
+        for watch in watches:
+            watch.cancel()
+        with self._lock:
+            self._drop(None)
+            self._listeners.clear()
+
+    # ------------------------------------------------------------------
+    # Intern
+    # ------------------------------------------------------------------
+
+    def _drop(self, key: Optional[str]) -> None:
+        """Entfernt Einträge; Aufrufer hält self._lock."""
+        for cached in [k for k in self._values if key is None or k[0] == key]:
+            del self._values[cached]
+        for generation_key in [key] if key else list(self._keys):
+            self._generation[generation_key] = self._generation.get(generation_key, 0) + 1
+
+    def _ensure_watch(self, key_path: str) -> bool:
+        """Beobachtet den Schlüssel (einmalig). False, wenn das Backend es nicht kann."""
+        key = key_path.lower()
+        with self._watch_lock:
+            watch = self._watches.get(key)
+            if watch is not None and watch.active:
+                return True
+            if key in self._unwatchable:
+                return False
+            if watch is not None:
+                # Beobachtung verloren: nicht neu abonnieren, Änderungen seither fehlen
+                del self._watches[key]
+                watch.cancel()
+                self._disable(key, key_path, get_text("registry.info.watch_lost"))
+                return False
+            try:
+                self._watches[key] = self.backend.watch_key(key_path, self._on_key_changed)
+            except Exception as e:
+                self._disable(key, key_path, e)
+                return False
+            return True
+
+    def _disable(self, key: str, key_path: str, reason) -> None:
+        """Schaltet den Cache für einen Schlüssel ab; Aufrufer hält self._watch_lock."""
+        logger.debug(get_text("registry.info.cache_disabled", key_path=key_path, e=reason))
+        self._unwatchable.add(key)
+        with self._lock:
+            self._drop(key)
+
+    def _on_key_changed(self, key_path: str) -> None:
+        key = key_path.lower()
+        with self._lock:
+            self._drop(key)
+            listeners = [listener for listener in self._listeners if listener.key in (None, key)]
+        logger.debug(get_text("registry.info.key_changed", key_path=key_path))
+        for listener in listeners:
+            try:
+                listener.callback(self._keys.get(key, key_path))
+            except Exception as e:
+                logger.error(get_text("registry.error.callback", key_path=key_path, e=e))
+
+
+# Singleton
+_cache: Optional[RegistryValueCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_registry_cache() -> RegistryValueCache:
+    """Gibt den prozessweiten RegistryValueCache zurück."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RegistryValueCache()
+        return _cache
+
+
+def set_registry_cache(cache: Optional[RegistryValueCache]) -> None:
+    """Ersetzt den prozessweiten Cache (z.B. für Tests); der alte wird geschlossen."""
+    global _cache
+    with _cache_lock:
+        old, _cache = _cache, cache
+    if old is not None and old is not cache:
+        old.close()
+
+
+def get_cached_value(key_path: str, value_name: str) -> str:
+    """Kurzform für get_registry_cache().get()."""
+    return get_registry_cache().get(key_path, value_name)
+
+
+def invalidate_registry_cache(key_path: Optional[str] = None) -> None:
+    """Verwirft Werte im prozessweiten Cache, falls er bereits existiert."""
+    with _cache_lock:
+        cache = _cache
+    if cache is not None:
+        cache.invalidate(key_path)
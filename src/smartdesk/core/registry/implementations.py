@@ -0,0 +1,391 @@
+# Dateipfad: src/smartdesk/core/registry/implementations.py
+"""
+Konkrete Implementierungen des RegistryBackend Interfaces.
+
+Diese Datei enthält:
+- WinregBackend: Lesen/Schreiben via winreg, Beobachten via RegNotifyChangeKeyValue
+- InMemoryRegistryBackend: Registry im Speicher mit Fehlerinjektion
+  (Tests, Benchmarks, Linux)
+
+Jede Klasse implementiert RegistryBackend aus interfaces.py.
+"""
+
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+from .interfaces import REG_SZ, KeyCallback, RegistryValue
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# RegNotifyChangeKeyValue: Werte wurden gesetzt oder gelöscht
+_REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+_KEY_NOTIFY = 0x0010
+# Höchstens so lange wartet watch_key(), bis der Watcher-Thread scharf geschaltet hat
+_ARM_TIMEOUT = 2.0
+
+
+class _Watch:
+    """Abonnement eines Schlüssels bei einem Backend (KeyWatch)."""
+
+    __slots__ = ("key_path", "callback", "active", "_owner", "_armed", "_error")
+
+    def __init__(self, owner, key_path: str, callback: KeyCallback):
+        self._owner = owner
+        self.key_path = key_path
+        self.callback = callback
+        self.active = True
+        self._armed = threading.Event()
+        self._error: Optional[Exception] = None
+
+    def cancel(self) -> None:
+        self.active = False
+        self._owner._unsubscribe(self)
+
+
+def _lose(watches: List[_Watch]) -> None:
+    """Meldet Abonnenten, dass ihr Schlüssel nicht mehr beobachtet wird."""
+    for watch in watches:
+        watch.active = False
+    # Benachrichtigen, damit Caches den (nun unbeobachteten) Wert verwerfen
+    _notify(watches)
+
+
+def _notify(watches: List[_Watch]) -> None:
+    for watch in watches:
+        try:
+            watch.callback(watch.key_path)
+        except Exception as e:
+            logger.error(get_text("registry.error.callback", key_path=watch.key_path, e=e))
+
+
+# =============================================================================
+# Windows
+# =============================================================================
+
+
+class _KeyChangeWatcher:
+    """
+    Beobachtet beliebig viele Schlüssel mit einem Hintergrund-Thread.
+
+    RegNotifyChangeKeyValue wird asynchron mit je einem Event pro Schlüssel
+    aufgerufen; der Thread wartet blockierend mit WaitForMultipleObjects.
+    Die Benachrichtigung gilt nur für den Thread, der sie angefordert hat,
+    daher werden Schlüssel ausschließlich im Watcher-Thread geöffnet und
+    neu scharf geschaltet. subscribe() kehrt erst zurück, wenn der Schlüssel
+    scharf ist; ein danach gelesener Wert kann also nicht unbemerkt veralten.
+    Geht die Beobachtung später verloren, wird active des Abonnements False.
+    """
+
+    def __init__(self):
+        if sys.platform != "win32":
+            raise OSError("RegNotifyChangeKeyValue ist nur unter Windows verfügbar")
+        try:
+            import pywintypes
+            import win32api
+            import win32con
+            import win32event
+        except ImportError as e:
+            raise OSError(f"pywin32 nicht verfügbar: {e}") from e
+
+        self._pywintypes = pywintypes
+        self._win32api = win32api
+        self._win32con = win32con
+        self._win32event = win32event
+        # Auto-Reset-Event zum Aufwecken nach (Un-)Subscribe und stop()
+        self._wake_event = win32event.CreateEvent(None, False, False, None)
+        self._lock = threading.Lock()
+        self._watches: Dict[str, List[_Watch]] = {}
+        # Nur im Watcher-Thread: Schlüssel -> [hkey, event]
+        self._handles: Dict[str, list] = {}
+        # Schlüssel (klein) -> Fehler beim Öffnen/Scharfschalten
+        self._failed: Dict[str, Exception] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def subscribe(self, key_path: str, callback: KeyCallback) -> _Watch:
+        watch = _Watch(self, key_path, callback)
+        with self._lock:
+            self._watches.setdefault(key_path.lower(), []).append(watch)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SmartDeskRegistryWatcher", daemon=True)
+                self._thread.start()
+        if threading.current_thread() is self._thread:
+            # Aus einem Callback heraus: der Thread wartet gerade nicht, also selbst schalten
+            self._sync_handles()
+        else:
+            self._win32event.SetEvent(self._wake_event)
+
+        if not watch._armed.wait(_ARM_TIMEOUT) or watch._error is not None:
+            self._unsubscribe(watch)
+            raise OSError(f"{key_path} kann nicht beobachtet werden: {watch._error or 'Zeitüberschreitung'}")
+        return watch
+
+    def _unsubscribe(self, watch: _Watch) -> None:
+        key = watch.key_path.lower()
+        with self._lock:
+            watches = self._watches.get(key, [])
+            if watch not in watches:
+                return
+            watches.remove(watch)
+            if not watches:
+                del self._watches[key]
+        self._win32event.SetEvent(self._wake_event)
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+            self._watches.clear()
+        self._win32event.SetEvent(self._wake_event)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+
+    def _arm(self, hkey, event) -> None:
+        self._win32api.RegNotifyChangeKeyValue(hkey, False, _REG_NOTIFY_CHANGE_LAST_SET, event, True)
+
+    def _sync_handles(self) -> None:
+        with self._lock:
+            wanted = {key: watches[0].key_path for key, watches in self._watches.items()}
+
+        for key in [k for k in self._handles if k not in wanted]:
+            hkey, _ = self._handles.pop(key)
+            hkey.Close()
+        self._failed = {key: e for key, e in self._failed.items() if key in wanted}
+
+        for key, key_path in wanted.items():
+            if key in self._handles or key in self._failed:
+                continue
+            try:
+                hkey = self._win32api.RegOpenKeyEx(self._win32con.HKEY_CURRENT_USER, key_path, 0, _KEY_NOTIFY)
+                event = self._win32event.CreateEvent(None, False, False, None)
+                self._arm(hkey, event)
+            except self._pywintypes.error as e:
+                logger.warning(get_text("registry.warn.watch_failed", key_path=key_path, e=e))
+                self._failed[key] = e
+                continue
+            self._handles[key] = [hkey, event]
+
+        # Wartende subscribe()-Aufrufe freigeben
+        with self._lock:
+            pending = [watch for key in wanted for watch in self._watches.get(key, ()) if not watch._armed.is_set()]
+        for watch in pending:
+            watch._error = self._failed.get(watch.key_path.lower())
+            watch._armed.set()
+
+    def _run(self) -> None:
+        win32event = self._win32event
+        while True:
+            with self._lock:
+                if self._stopping:
+                    break
+            self._sync_handles()
+
+            keys = list(self._handles)
+            events = [self._wake_event] + [self._handles[key][1] for key in keys]
+            rc = win32event.WaitForMultipleObjects(events, False, win32event.INFINITE)
+            index = rc - win32event.WAIT_OBJECT_0
+            if index <= 0 or index > len(keys):
+                continue
+
+            key = keys[index - 1]
+            hkey, event = self._handles[key]
+            # Vor dem Callback neu scharf schalten, damit keine Änderung verloren geht
+            try:
+                self._arm(hkey, event)
+            except self._pywintypes.error as e:
+                # Kein stilles erneutes Öffnen: Änderungen bis dahin blieben unbemerkt
+                logger.warning(get_text("registry.warn.watch_failed", key_path=key, e=e))
+                self._handles.pop(key)
+                self._failed[key] = e
+                hkey.Close()
+            with self._lock:
+                watches = list(self._watches.get(key, ()))
+            if key in self._failed:
+                _lose(watches)
+            else:
+                _notify(watches)
+
+        for hkey, _ in self._handles.values():
+            hkey.Close()
+        self._handles.clear()
+
+
+class WinregBackend:
+    """
+    Registry-Backend basierend auf winreg.
+
+    Implementiert RegistryBackend Protocol. Änderungs-Benachrichtigungen
+    benötigen Windows und pywin32; ohne sie wirft watch_key() OSError.
+    """
+
+    name = "winreg"
+
+    def __init__(self):
+        import winreg
+
+        self._winreg = winreg
+        self._lock = threading.Lock()
+        self._watcher: Optional[_KeyChangeWatcher] = None
+
+    def read_value(self, key_path: str, value_name: str) -> Optional[RegistryValue]:
+        """Liest einen Wert aus HKEY_CURRENT_USER."""
+        winreg = self._winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_READ) as key:
+                data, value_type = winreg.QueryValueEx(key, value_name)
+        except OSError:
+            return None
+        return RegistryValue(data, value_type)
+
+    def write_value(self, key_path: str, value_name: str, data: Any, value_type: int = REG_SZ) -> None:
+        """Setzt einen Wert in HKEY_CURRENT_USER."""
+        winreg = self._winreg
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE) as key:
+            winreg.SetValueEx(key, value_name, 0, value_type, data)
+
+    def delete_value(self, key_path: str, value_name: str) -> bool:
+        """Löscht einen Wert in HKEY_CURRENT_USER."""
+        winreg = self._winreg
+        try:
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE) as key:
+                winreg.DeleteValue(key, value_name)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def watch_key(self, key_path: str, callback: KeyCallback) -> _Watch:
+        """Beobachtet einen Schlüssel via RegNotifyChangeKeyValue."""
+        with self._lock:
+            if self._watcher is None:
+                self._watcher = _KeyChangeWatcher()
+            watcher = self._watcher
+        return watcher.subscribe(key_path, callback)
+
+    def close(self) -> None:
+        """Beendet den Watcher-Thread."""
+        with self._lock:
+            watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+
+
+# =============================================================================
+# In-Memory
+# =============================================================================
+
+
+class InMemoryRegistryBackend:
+    """
+    Registry im Speicher.
+
+    Implementiert RegistryBackend Protocol. Schlüssel- und Wertnamen sind
+    wie unter Windows unabhängig von Groß-/Kleinschreibung, Schlüssel werden
+    beim Schreiben bei Bedarf angelegt. Schreibzugriffe gelten zugleich als
+    Änderung von außen (Explorer, regedit) und benachrichtigen Beobachter
+    synchron im aufrufenden Thread. fail_writes() simuliert Schreibfehler.
+
+    Attributes:
+        reads: Anzahl der read_value()-Aufrufe (für Tests und Benchmarks)
+        writes: Anzahl erfolgreicher write_value()/delete_value()-Aufrufe
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Schlüssel (klein) -> Wertname (klein) -> RegistryValue
+        self._keys: Dict[str, Dict[str, RegistryValue]] = {}
+        self._watches: Dict[str, List[_Watch]] = {}
+        # Schlüssel (klein) -> [zu überspringen, fehlschlagen, Exception]
+        self._faults: Dict[str, list] = {}
+        self.reads = 0
+        self.writes = 0
+
+    def read_value(self, key_path: str, value_name: str) -> Optional[RegistryValue]:
+        with self._lock:
+            self.reads += 1
+            return self._keys.get(key_path.lower(), {}).get(value_name.lower())
+
+    def write_value(self, key_path: str, value_name: str, data: Any, value_type: int = REG_SZ) -> None:
+        key = key_path.lower()
+        with self._lock:
+            self._check_fault(key)
+            self._keys.setdefault(key, {})[value_name.lower()] = RegistryValue(data, value_type)
+            self.writes += 1
+            watches = list(self._watches.get(key, ()))
+        _notify(watches)
+
+    def delete_value(self, key_path: str, value_name: str) -> bool:
+        key = key_path.lower()
+        with self._lock:
+            self._check_fault(key)
+            if self._keys.get(key, {}).pop(value_name.lower(), None) is None:
+                return False
+            self.writes += 1
+            watches = list(self._watches.get(key, ()))
+        _notify(watches)
+        return True
+
+    def fail_writes(self, key_path: str, count: int = 1, after: int = 0, error: Optional[OSError] = None) -> None:
+        """
+        Lässt Schreibzugriffe (write/delete) auf einen Schlüssel fehlschlagen.
+
+        Args:
+            key_path: Betroffener Schlüssel
+            count: Anzahl fehlschlagender Zugriffe
+            after: Anzahl Zugriffe, die vorher noch gelingen
+            error: Zu werfende Exception (Standard: PermissionError)
+        """
+        with self._lock:
+            self._faults[key_path.lower()] = [after, count, error or PermissionError(5, "Zugriff verweigert", key_path)]
+
+    def _check_fault(self, key: str) -> None:
+        """Wirft die injizierte Exception, falls fällig; Aufrufer hält self._lock."""
+        fault = self._faults.get(key)
+        if fault is None:
+            return
+        if fault[0] > 0:
+            fault[0] -= 1
+            return
+        fault[1] -= 1
+        if fault[1] <= 0:
+            del self._faults[key]
+        raise fault[2]
+
+    def watch_key(self, key_path: str, callback: KeyCallback) -> _Watch:
+        watch = _Watch(self, key_path, callback)
+        with self._lock:
+            self._watches.setdefault(key_path.lower(), []).append(watch)
+        return watch
+
+    def _unsubscribe(self, watch: _Watch) -> None:
+        key = watch.key_path.lower()
+        with self._lock:
+            watches = self._watches.get(key, [])
+            if watch in watches:
+                watches.remove(watch)
+            if not watches:
+                self._watches.pop(key, None)
+
+    def lose_watches(self, key_path: str) -> None:
+        """Simuliert den Verlust der Beobachtung (z.B. Schlüssel gelöscht)."""
+        with self._lock:
+            watches = self._watches.pop(key_path.lower(), [])
+        _lose(watches)
+
+    def watch_count(self, key_path: str) -> int:
+        """Anzahl aktiver Beobachter eines Schlüssels."""
+        with self._lock:
+            return len(self._watches.get(key_path.lower(), ()))
+
+
+def create_default_backend():
+    """Wählt das Backend für die aktuelle Plattform (winreg, sonst In-Memory)."""
+    try:
+        return WinregBackend()
+    except ImportError:
+        logger.warning(get_text("registry.warn.no_winreg"))
+        return InMemoryRegistryBackend()
@@ -0,0 +1,121 @@
+# Dateipfad: src/smartdesk/core/registry/interfaces.py
+"""
+Interfaces (Protocols) für den Registry-Zugriff.
+
+Diese Datei definiert die Schnittstellen für:
+- Registry-Backend (RegistryBackend): Werte lesen, schreiben, löschen und
+  Schlüssel beobachten
+- Abonnement einer Schlüssel-Beobachtung (KeyWatch)
+
+Alle Schlüsselpfade sind relativ zu HKEY_CURRENT_USER.
+
+Durch die Verwendung von Protocols können wir:
+1. Cache, Transaktionen und Desktop-Wechsel ohne Windows testen
+   (InMemoryRegistryBackend)
+2. Änderungen von außen (Explorer, regedit) und Schreibfehler gezielt simulieren
+3. Implementierungen austauschen ohne Core-Logik zu ändern
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Protocol
+
+# Werttypen wie in winreg (ohne winreg importieren zu müssen)
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_DWORD = 4
+
+# Callback bei Änderung eines Schlüssels, erhält den Schlüsselpfad
+KeyCallback = Callable[[str], None]
+
+
+@dataclass(frozen=True)
+class RegistryValue:
+    """
+    Ein gelesener Registry-Wert.
+
+    Attributes:
+        data: Der Wert (str bei REG_SZ/REG_EXPAND_SZ, int bei REG_DWORD)
+        value_type: Werttyp (REG_SZ, REG_EXPAND_SZ, ...)
+    """
+
+    data: Any
+    value_type: int = REG_SZ
+
+
+class KeyWatch(Protocol):
+    """
+    Abonnement einer Schlüssel-Beobachtung; cancel() beendet es.
+
+    Attributes:
+        active: False, sobald das Backend den Schlüssel nicht mehr beobachtet
+    """
+
+    active: bool
+
+    def cancel(self) -> None:
+        """Beendet das Abonnement (mehrfacher Aufruf ist unschädlich)."""
+        ...
+
+
+class RegistryBackend(Protocol):
+    """
+    Interface für den Zugriff auf die Registry (HKEY_CURRENT_USER).
+
+    Implementierung kann winreg (Windows) oder In-Memory (Tests,
+    Benchmarks) sein.
+    """
+
+    name: str
+
+    def read_value(self, key_path: str, value_name: str) -> Optional[RegistryValue]:
+        """
+        Liest einen Wert.
+
+        Args:
+            key_path: Schlüsselpfad unterhalb von HKEY_CURRENT_USER
+            value_name: Name des Werts
+
+        Returns:
+            RegistryValue oder None, wenn Schlüssel oder Wert fehlen
+        """
+        ...
+
+    def write_value(self, key_path: str, value_name: str, data: Any, value_type: int = REG_SZ) -> None:
+        """
+        Setzt einen Wert in einem bestehenden Schlüssel.
+
+        Args:
+            key_path: Schlüsselpfad unterhalb von HKEY_CURRENT_USER
+            value_name: Name des Werts
+            data: Der neue Wert
+            value_type: Werttyp (REG_SZ, REG_EXPAND_SZ, ...)
+
+        Raises:
+            OSError: Schlüssel fehlt oder Schreiben nicht erlaubt
+        """
+        ...
+
+    def delete_value(self, key_path: str, value_name: str) -> bool:
+        """
+        Löscht einen Wert.
+
+        Returns:
+            True wenn gelöscht, False wenn der Wert nicht existierte
+
+        Raises:
+            OSError: Löschen nicht erlaubt
+        """
+        ...
+
+    def watch_key(self, key_path: str, callback: KeyCallback) -> KeyWatch:
+        """
+        Ruft callback(key_path) auf, sobald sich ein Wert des Schlüssels ändert.
+
+        Der Callback kann in einem Hintergrund-Thread laufen. Kehrt erst
+        zurück, wenn die Beobachtung greift: ein danach gelesener Wert wird
+        bei jeder Änderung gemeldet.
+
+        Raises:
+            OSError: Das Backend kann den Schlüssel nicht beobachten
+        """
+        ...
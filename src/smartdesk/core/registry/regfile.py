@@ -0,0 +1,197 @@
+# Dateipfad: src/smartdesk/core/registry/regfile.py
+"""
+Parser für .reg-Dateien (Teilmenge, wie SmartDesk sie schreibt).
+
+Unterstützt:
+- Kopfzeile "Windows Registry Editor Version 5.00" (oder "REGEDIT4")
+- Kodierung UTF-16 mit BOM (regedit, Backups) oder UTF-8
+- Kommentare (;) und Leerzeilen
+- Schlüssel unterhalb von HKEY_CURRENT_USER ([HKEY_CURRENT_USER\\...])
+- "Name"="Text"         REG_SZ, Escapes \\\\ und \\"
+- "Name"=hex(2):xx,...  REG_EXPAND_SZ, UTF-16LE mit Null-Terminator,
+                        auch über mehrere Zeilen (",\\" am Zeilenende)
+
+Alles andere (andere Hives, Löschungen, weitere Werttypen) wird mit
+RegFileError abgelehnt statt stillschweigend übersprungen, damit eine
+Wiederherstellung nie nur teilweise passiert.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from .interfaces import REG_EXPAND_SZ, REG_SZ, RegistryValue
+
+HEADERS = ("Windows Registry Editor Version 5.00", "REGEDIT4")
+ROOTS = ("HKEY_CURRENT_USER", "HKCU")
+
+_HEX_BYTES = re.compile(r"[0-9a-fA-F]{2}(?:,[0-9a-fA-F]{2})*")
+
+
+class RegFileError(ValueError):
+    """Inhalt ist keine gültige .reg-Datei der unterstützten Teilmenge."""
+
+    def __init__(self, message: str, line: int = 0):
+        super().__init__(f"Zeile {line}: {message}" if line else message)
+        self.line = line
+
+
+@dataclass(frozen=True)
+class RegEntry:
+    """
+    Ein Wert aus einer .reg-Datei.
+
+    Attributes:
+        key_path: Schlüsselpfad unterhalb von HKEY_CURRENT_USER
+        value_name: Name des Werts
+        value: Wert und Typ
+        line: Zeile, in der der Wert beginnt
+    """
+
+    key_path: str
+    value_name: str
+    value: RegistryValue
+    line: int = 0
+
+
+def decode_reg_bytes(data: bytes) -> str:
+    """Dekodiert den Dateiinhalt anhand des BOM (UTF-16LE/BE, sonst UTF-8)."""
+    try:
+        if data.startswith(b"\xff\xfe") or data.startswith(b"\xfe\xff"):
+            return data.decode("utf-16")
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise RegFileError(f"Ungültige Kodierung: {e}") from e
+
+
+def parse_reg_bytes(data: bytes) -> List[RegEntry]:
+    """Wie parse_reg(), für den rohen Dateiinhalt."""
+    return parse_reg(decode_reg_bytes(data))
+
+
+def parse_reg_file(path: str) -> List[RegEntry]:
+    """Liest und parst eine .reg-Datei."""
+    with open(path, "rb") as f:
+        return parse_reg_bytes(f.read())
+
+
+def parse_reg(text: str) -> List[RegEntry]:
+    """
+    Parst den Text einer .reg-Datei.
+
+    Returns:
+        Alle Werte in Dateireihenfolge
+
+    Raises:
+        RegFileError: Bei Syntaxfehlern oder nicht unterstützten Einträgen
+    """
+    lines = _logical_lines(text)
+    first = next(lines, None)
+    if first is None or first[1].strip() not in HEADERS:
+        raise RegFileError("Kopfzeile fehlt", 1)
+
+    entries: List[RegEntry] = []
+    key_path: Optional[str] = None
+    for line_no, line in lines:
+        stripped = line.strip()
+        if not stripped or stripped.startswith(";"):
+            continue
+        if stripped.startswith("["):
+            key_path = _parse_key(stripped, line_no)
+            continue
+        if key_path is None:
+            raise RegFileError("Wert außerhalb eines Schlüssels", line_no)
+        value_name, value = _parse_value(stripped, line_no)
+        entries.append(RegEntry(key_path, value_name, value, line_no))
+    return entries
+
+
+def _logical_lines(text: str) -> Iterator[Tuple[int, str]]:
+    """Zeilen mit Nummer; umbrochene hex-Werte (",\\" am Ende) werden zusammengefügt."""
+    pending: Optional[Tuple[int, str]] = None
+    for line_no, line in enumerate(text.splitlines(), start=1):
+        if pending is not None:
+            line = pending[1] + line.lstrip()
+            line_no = pending[0]
+            pending = None
+        if _is_hex_continuation(line):
+            pending = (line_no, line.rstrip()[:-1])
+            continue
+        yield line_no, line
+    if pending is not None:
+        raise RegFileError("Zeilenfortsetzung am Dateiende", pending[0])
+
+
+def _is_hex_continuation(line: str) -> bool:
+    # Nur hex-Werte werden umbrochen; ein Text-Wert darf auf "\\" enden (escaptes Backslash)
+    stripped = line.rstrip()
+    return stripped.endswith(",\\") and "=hex" in stripped
+
+
+def _parse_key(line: str, line_no: int) -> str:
+    if not line.endswith("]"):
+        raise RegFileError("Schlüssel ohne ']'", line_no)
+    path = line[1:-1]
+    if path.startswith("-"):
+        raise RegFileError("Löschen von Schlüsseln wird nicht unterstützt", line_no)
+    root, _, key_path = path.partition("\\")
+    if root.upper() not in ROOTS:
+        raise RegFileError(f"Nur HKEY_CURRENT_USER wird unterstützt, nicht {root}", line_no)
+    if not key_path:
+        raise RegFileError("Leerer Schlüsselpfad", line_no)
+    return key_path
+
+
+def _parse_value(line: str, line_no: int) -> Tuple[str, RegistryValue]:
+    if not line.startswith('"'):
+        raise RegFileError("Wertname muss in Anführungszeichen stehen", line_no)
+    value_name, end = _parse_quoted(line, 1, line_no)
+    rest = line[end:]
+    if not rest.startswith("="):
+        raise RegFileError("'=' nach dem Wertnamen erwartet", line_no)
+    data = rest[1:].strip()
+
+    if data.startswith('"'):
+        text, end = _parse_quoted(data, 1, line_no)
+        if data[end:].strip():
+            raise RegFileError("Zeichen nach dem Textwert", line_no)
+        return value_name, RegistryValue(text, REG_SZ)
+
+    if data[:7].lower() == "hex(2):":
+        return value_name, RegistryValue(_parse_expand_sz(data[7:], line_no), REG_EXPAND_SZ)
+
+    raise RegFileError(f"Nicht unterstützter Werttyp: {data[:16]}", line_no)
+
+
+def _parse_quoted(line: str, start: int, line_no: int) -> Tuple[str, int]:
+    """Liest einen Text ab start (nach dem öffnenden "). Gibt (Text, Index nach dem ") zurück."""
+    chars = []
+    i = start
+    while i < len(line):
+        c = line[i]
+        if c == '"':
+            return "".join(chars), i + 1
+        if c == "\\":
+            if i + 1 >= len(line) or line[i + 1] not in '\\"':
+                raise RegFileError("Ungültige Escape-Sequenz", line_no)
+            chars.append(line[i + 1])
+            i += 2
+            continue
+        chars.append(c)
+        i += 1
+    raise RegFileError("Fehlendes schließendes Anführungszeichen", line_no)
+
+
+def _parse_expand_sz(hex_text: str, line_no: int) -> str:
+    hex_text = "".join(hex_text.split())
+    if hex_text and not _HEX_BYTES.fullmatch(hex_text):
+        raise RegFileError("Ungültige Hex-Daten", line_no)
+    data = bytes.fromhex(hex_text.replace(",", ""))
+    if len(data) % 2:
+        raise RegFileError("REG_EXPAND_SZ mit ungerader Byte-Anzahl", line_no)
+    try:
+        text = data.decode("utf-16-le")
+    except UnicodeDecodeError as e:
+        raise RegFileError(f"Ungültiges UTF-16: {e}", line_no) from e
+    # Null-Terminator (wie RegQueryValueEx) abschneiden
+    return text.split("\0", 1)[0]
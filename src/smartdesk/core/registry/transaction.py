@@ -0,0 +1,176 @@
+# Dateipfad: src/smartdesk/core/registry/transaction.py
+"""
+Transaktionales Schreiben mehrerer Registry-Werte.
+
+Ein Desktop-Wechsel setzt "User Shell Folders" und "Shell Folders". Schlägt
+der zweite Schreibzugriff fehl, zeigten beide Schlüssel bisher auf
+verschiedene Ordner. RegistryTransaction behandelt die Werte als Einheit:
+
+1. Alte Werte sichern
+2. Alle neuen Werte schreiben
+3. Durch erneutes Lesen prüfen, dass alle Werte wie geschrieben ankamen
+4. Bei einem Fehler in 2. oder 3. alle bereits geschriebenen Werte in
+   umgekehrter Reihenfolge zurücksetzen (fehlende Werte wieder löschen)
+
+Die Registry kennt keine Transaktionen über mehrere Werte hinweg; andere
+Prozesse können den Zwischenzustand kurz sehen.
+"""
+
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from .cache import get_registry_cache, invalidate_registry_cache
+from .interfaces import REG_EXPAND_SZ, REG_SZ, RegistryBackend, RegistryValue
+from ...shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class RegistryVerificationError(OSError):
+    """Ein geschriebener Wert war beim erneuten Lesen nicht wie erwartet."""
+
+
+def _verify(backend: RegistryBackend, key_path: str, value_name: str, expected: Optional[RegistryValue]) -> None:
+    """Liest einen Wert erneut und wirft RegistryVerificationError bei Abweichung."""
+    actual = backend.read_value(key_path, value_name)
+    if actual != expected:
+        raise RegistryVerificationError(
+            get_text(
+                "registry.error.verify",
+                key_path=key_path,
+                expected=expected.data if expected else None,
+                actual=actual.data if actual else None,
+            )
+        )
+
+
+@dataclass(frozen=True)
+class RegistryWrite:
+    """
+    Ein zu schreibender Wert.
+
+    Attributes:
+        key_path: Schlüsselpfad unterhalb von HKEY_CURRENT_USER
+        value_name: Name des Werts
+        data: Der neue Wert
+        value_type: Werttyp (REG_SZ, REG_EXPAND_SZ, ...)
+    """
+
+    key_path: str
+    value_name: str
+    data: Any
+    value_type: int = REG_SZ
+
+    @property
+    def expected(self) -> RegistryValue:
+        return RegistryValue(self.data, self.value_type)
+
+
+@dataclass(frozen=True)
+class TransactionResult:
+    """
+    Ergebnis einer Registry-Transaktion.
+
+    Attributes:
+        success: Ob alle Werte geschrieben und bestätigt wurden
+        message: Beschreibende Nachricht
+        rolled_back: Bei Fehlern: ob alle Werte wieder den alten Stand haben
+        error: Optionale Exception bei Fehlern
+    """
+
+    success: bool
+    message: str = ""
+    rolled_back: bool = False
+    error: Optional[Exception] = None
+
+
+class RegistryTransaction:
+    """
+    Schreibt mehrere Registry-Werte als Einheit.
+
+    Beispiel:
+        result = RegistryTransaction().set_value(KEY_A, "Desktop", path).set_value(KEY_B, "Desktop", path).commit()
+    """
+
+    def __init__(self, backend: Optional[RegistryBackend] = None):
+        """
+        Args:
+            backend: Registry-Backend (Standard: das des prozessweiten Registry-Caches)
+        """
+        self._backend = backend
+        self._writes: List[RegistryWrite] = []
+
+    @property
+    def writes(self) -> List[RegistryWrite]:
+        return list(self._writes)
+
+    def set_value(self, key_path: str, value_name: str, data: Any, value_type: int = REG_SZ) -> "RegistryTransaction":
+        """Merkt einen Wert für commit() vor."""
+        self._writes.append(RegistryWrite(key_path, value_name, data, value_type))
+        return self
+
+    def commit(self) -> TransactionResult:
+        """
+        Schreibt alle vorgemerkten Werte, prüft sie und setzt bei Fehlern alle zurück.
+
+        Returns:
+            TransactionResult; OSError des Backends wird nicht weitergereicht
+
+        Raises:
+            Exception: Andere Fehler (z.B. im Backend-Code) nach dem Rollback
+        """
+        backend = self._backend or get_registry_cache().backend
+        writes = self._writes
+        applied: List[RegistryWrite] = []
+        try:
+            # Direkt vom Backend, nicht aus dem Cache: der Rollback braucht den echten Stand
+            originals = [backend.read_value(w.key_path, w.value_name) for w in writes]
+            for write in writes:
+                # Vor dem Schreiben merken: auch ein fehlgeschlagener Zugriff kann
+                # den Wert verändert haben, das Zurücksetzen schadet dann nicht
+                applied.append(write)
+                backend.write_value(write.key_path, write.value_name, write.data, write.value_type)
+            for write in writes:
+                _verify(backend, write.key_path, write.value_name, write.expected)
+        except Exception as e:
+            logger.error(get_text("registry.error.transaction", e=e))
+            rolled_back = self._rollback(backend, applied, originals) if applied else True
+            if not isinstance(e, OSError):
+                raise
+            return TransactionResult(False, get_text("registry.error.transaction", e=e), rolled_back, e)
+        finally:
+            for write in writes:
+                invalidate_registry_cache(write.key_path)
+
+        return TransactionResult(True, get_text("registry.info.transaction_committed", count=len(writes)))
+
+    def _rollback(self, backend: RegistryBackend, applied: List[RegistryWrite], originals: List[Optional[RegistryValue]]) -> bool:
+        """Setzt geschriebene Werte zurück. True, wenn alle den alten Stand haben."""
+        success = True
+        for write, original in reversed(list(zip(applied, originals))):
+            try:
+                if original is None:
+                    backend.delete_value(write.key_path, write.value_name)
+                else:
+                    backend.write_value(write.key_path, write.value_name, original.data, original.value_type)
+                _verify(backend, write.key_path, write.value_name, original)
+            except Exception as e:
+                # Weiter mit den übrigen Werten, auch bei unerwarteten Fehlern
+                logger.error(get_text("registry.error.rollback", key_path=write.key_path, e=e))
+                success = False
+        if success:
+            logger.info(get_text("registry.info.rolled_back", count=len(applied)))
+        return success
+
+
+def write_desktop_path(path: str, backend: Optional[RegistryBackend] = None) -> TransactionResult:
+    """
+    Setzt den Desktop-Pfad in "User Shell Folders" (REG_EXPAND_SZ) und
+    "Shell Folders" (REG_SZ) als eine Transaktion.
+    """
+    transaction = RegistryTransaction(backend)
+    transaction.set_value(KEY_USER_SHELL, VALUE_NAME, path, REG_EXPAND_SZ)
+    transaction.set_value(KEY_LEGACY_SHELL, VALUE_NAME, path, REG_SZ)
+    return transaction.commit()
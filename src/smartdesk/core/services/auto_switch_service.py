@@ -7,8 +7,10 @@ from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 from ...shared.config import DATA_DIR
+from ...shared.file_watcher import watch_file
 from ...shared.logging_config import get_logger
 from ...shared.localization import get_text
+from ..storage import file_operations
 from . import desktop_service
 from . import settings_service
 
@@ -27,13 +29,27 @@ class AutoSwitchService:
         self._cooldown_seconds = 60  # Minimum time between auto-switches
         self._lock = threading.RLock()
         self._rules_mtime = 0
+        self._rules_signature = None  # nur bei Regeln in der Datenbank
+        # Datei-Watcher: Regeln nur nach gemeldeter Änderung neu prüfen
+        self._rules_subscriptions = []
+        self._rules_changed = False
 
         # Load rules on init
         self.load_rules()
 
     def load_rules(self):
-        """Loads rules from the JSON file."""
+        """Loads rules from the JSON file (or the storage engine, if it manages them)."""
         with self._lock:
+            store = file_operations.get_rule_store()
+            if store is not None:
+                try:
+                    self._rules_signature = store.signature()
+                    self._rules = store.load_rules()
+                except Exception as e:
+                    logger.error(get_text("auto_switch.error.load_rules", e=e))
+                    self._rules = {}
+                return
+
             if not os.path.exists(RULES_FILE):
                 self._rules = {}
                 return
@@ -48,8 +64,43 @@ class AutoSwitchService:
                 logger.error(get_text("auto_switch.error.load_rules", e=e))
                 self._rules = {}
 
+    def _on_rules_changed(self, path: str):
+        self._rules_changed = True
+
+    def _watch_rules(self):
+        """Subscribes to change notifications for the rules storage."""
+        store = file_operations.get_rule_store()
+        paths = file_operations.get_storage_engine().watch_paths() if store is not None else [RULES_FILE]
+        try:
+            for path in paths:
+                self._rules_subscriptions.append(watch_file(path, self._on_rules_changed))
+        except Exception as e:
+            # Ohne Watcher wird wie bisher bei jedem Durchlauf geprüft
+            logger.warning(get_text("auto_switch.warn.watch_failed", e=e))
+            self._unwatch_rules()
+
+    def _unwatch_rules(self):
+        for subscription in self._rules_subscriptions:
+            subscription.cancel()
+        self._rules_subscriptions = []
+
     def _check_rules_file(self):
         """Reloads rules if file has changed on disk."""
+        if self._rules_subscriptions:
+            if not self._rules_changed:
+                return
+            self._rules_changed = False
+
+        store = file_operations.get_rule_store()
+        if store is not None:
+            try:
+                if store.signature() != self._rules_signature:
+                    logger.debug(get_text("auto_switch.debug.reload"))
+                    self.load_rules()
+            except Exception as e:
+                logger.error(get_text("auto_switch.error.load_rules", e=e))
+            return
+
         if not os.path.exists(RULES_FILE):
             return
 
@@ -62,8 +113,17 @@ class AutoSwitchService:
             pass
 
     def save_rules(self):
-        """Saves current rules to the JSON file."""
+        """Saves current rules to the JSON file (or the storage engine, if it manages them)."""
         with self._lock:
+            store = file_operations.get_rule_store()
+            if store is not None:
+                try:
+                    store.save_rules(self._rules)
+                    self._rules_signature = store.signature()
+                except Exception as e:
+                    logger.error(get_text("auto_switch.error.save_rules", e=e))
+                return
+
             try:
                 # Ensure directory exists
                 os.makedirs(os.path.dirname(RULES_FILE), exist_ok=True)
@@ -107,6 +167,7 @@ class AutoSwitchService:
             return
 
         self._running = True
+        self._watch_rules()
         self._thread = threading.Thread(target=self._monitor_loop, daemon=True)
         self._thread.start()
         logger.info(get_text("auto_switch.info.started"))
@@ -114,6 +175,7 @@ class AutoSwitchService:
     def stop(self):
         """Stops the monitoring thread."""
         self._running = False
+        self._unwatch_rules()
         if self._thread:
             self._thread.join(timeout=2)
         logger.info(get_text("auto_switch.info.stopped"))
@@ -205,7 +267,7 @@ class AutoSwitchService:
         if target_desktop_name:
             if active_desktop.name != target_desktop_name:
                 logger.info(get_text("auto_switch.info.switching", desktop=target_desktop_name, process=matched_process))
-                success = desktop_service.switch_to_desktop(target_desktop_name)
+                success = desktop_service.request_switch(target_desktop_name).success
                 if success:
                     self._last_switch_time = datetime.now()
             else:
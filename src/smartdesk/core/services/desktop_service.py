@@ -1,20 +1,28 @@
 # Dateipfad: src/smartdesk/core/services/desktop_service.py
 
-import winreg
 import os
 import shutil
 import sys
 import time
 import subprocess
 import tempfile
-from typing import List
-
-from ...shared.config import KEY_USER_SHELL, KEY_LEGACY_SHELL, VALUE_NAME, get_resource_path
-from ..services.system_service import restart_explorer
-from ..utils.registry_operations import update_registry_key, get_registry_value
+from dataclasses import dataclass, replace
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+from ...shared.config import KEY_USER_SHELL, VALUE_NAME, get_resource_path
+from ...platform.current import restart_explorer
+from ..registry import get_cached_value, get_registry_cache, write_desktop_path
+from ..shell import get_shell_refresher
+from .switch_broker import SwitchOutcome, get_switch_broker
+from .switch_prefetch import get_switch_prefetcher
 from ..utils.path_validator import ensure_directory_exists
-from ..models.desktop import Desktop
-from ..storage.file_operations import load_desktops, save_desktops
+from ..utils.stage_graph import Stage, run_stages
+from ..utils.stage_timer import StageTimer
+from ..utils.tracing import Trace, get_current_trace, get_process_role
+from ..models.desktop import Desktop, DesktopList, path_key
+from ..storage.file_operations import load_desktops, save_desktops, save_batch
+from ..storage.desktop_repository import get_desktop_repository
 from ...shared.localization import get_text
 from ...shared.logging_config import get_logger
 from .icon_service import get_current_icon_positions, set_icon_positions, wait_for_desktop_listview
@@ -24,6 +32,12 @@ from ...ui.gui.dialogs import show_choice_dialog, show_confirmation_dialog
 
 logger = get_logger(__name__)
 
+# Längste Wartezeit auf READY der Animation (vorher: feste Pause von 0,5 s)
+ANIMATION_READY_TIMEOUT = 0.5
+
+# Zeitmessung des letzten Desktop-Wechsels in diesem Prozess
+_last_switch_timer: Optional[StageTimer] = None
+
 
 def create_desktop(name: str, path: str, create_if_missing: bool = True) -> bool:
     """
@@ -38,9 +52,9 @@ def create_desktop(name: str, path: str, create_if_missing: bool = True) -> bool
             logger.error(msg)
             return False
 
-    desktops = load_desktops()
+    desktops = DesktopList.of(load_desktops())
 
-    if any(d.name == name for d in desktops):
+    if desktops.get_by_name(name) is not None:
         msg = get_text("desktop_handler.error.name_exists", name=name)
         logger.error(msg)
         return False
@@ -59,8 +73,8 @@ def create_desktop(name: str, path: str, create_if_missing: bool = True) -> bool
 
 def update_desktop(old_name: str, new_name: str, new_path: str) -> bool:
     """Aktualisiert Name und Pfad eines existierenden Desktops."""
-    desktops = load_desktops()
-    target_desktop = next((d for d in desktops if d.name == old_name), None)
+    desktops = DesktopList.of(load_desktops())
+    target_desktop = desktops.get_by_name(old_name)
 
     if not target_desktop:
         msg = get_text("desktop_handler.error.not_found", old_name=old_name)
@@ -73,7 +87,7 @@ def update_desktop(old_name: str, new_name: str, new_path: str) -> bool:
         logger.error(msg)
         return False
 
-    if new_name != old_name and any(d.name == new_name for d in desktops):
+    if new_name != old_name and desktops.get_by_name(new_name) is not None:
         msg = get_text("desktop_handler.error.new_name_exists", new_name=new_name)
         logger.error(msg)
         return False
@@ -118,10 +132,10 @@ def delete_desktop(name: str, delete_folder: bool = False, skip_confirm: bool =
     Löscht einen Desktop aus der Datenbank, inkl. Bestätigungsabfrage.
     Geschützte Desktops (z.B. Original) können nicht gelöscht werden.
     """
-    desktops = get_all_desktops()
+    desktops = DesktopList.of(get_all_desktops())
     synchronize_desktops_with_registry(desktops, save_changes=True)
 
-    target_desktop = next((d for d in desktops if d.name == name), None)
+    target_desktop = desktops.get_by_name(name)
 
     if not target_desktop:
         msg = get_text("desktop_handler.error.not_found_delete", name=name)
@@ -148,13 +162,10 @@ def delete_desktop(name: str, delete_folder: bool = False, skip_confirm: bool =
         logger.error(msg)
         return False
 
-    real_registry_path = get_registry_value(KEY_USER_SHELL, VALUE_NAME)
+    real_registry_path = get_cached_value(KEY_USER_SHELL, VALUE_NAME)
 
     if real_registry_path:
-        norm_target = os.path.normpath(target_desktop.path).lower()
-        norm_registry = os.path.normpath(os.path.expandvars(real_registry_path)).lower()
-
-        if norm_registry == norm_target:
+        if path_key(real_registry_path) == target_desktop.path_key:
             msg = get_text("desktop_handler.error.delete_critical", path=target_desktop.path)
             logger.error(msg)
             logger.info(get_text("desktop_handler.info.delete_denied"))
@@ -204,19 +215,12 @@ def synchronize_desktops_with_registry(desktops: List[Desktop], save_changes: bo
         save_changes: Wenn True, werden Änderungen direkt in desktops.json gespeichert.
     """
     try:
-        real_registry_path = get_registry_value(KEY_USER_SHELL, VALUE_NAME)
+        real_registry_path = get_cached_value(KEY_USER_SHELL, VALUE_NAME)
 
         if real_registry_path:
-            norm_registry = os.path.normpath(os.path.expandvars(real_registry_path)).lower()
-            data_changed = False
-
-            for d in desktops:
-                norm_desktop = os.path.normpath(os.path.expandvars(d.path)).lower()
-                should_be_active = norm_desktop == norm_registry
-
-                if d.is_active != should_be_active:
-                    d.is_active = should_be_active
-                    data_changed = True
+            # Pfad-Index statt normpath() pro Desktop und Aufruf
+            index = DesktopList.of(desktops)
+            data_changed = index.set_active(index.get_by_path(real_registry_path))
 
             if data_changed:
                 if save_changes:
@@ -230,216 +234,399 @@ def synchronize_desktops_with_registry(desktops: List[Desktop], save_changes: bo
     return False
 
 
-def get_all_desktops() -> List[Desktop]:
+def watch_active_desktop():
     """
-    Gibt eine Liste aller Desktops zurück.
-    Geschützte Desktops werden immer zuerst angezeigt.
+    Übernimmt Änderungen des Desktop-Pfads von außen (z.B. Explorer) sofort.
+
+    Meldet der Registry-Cache eine Änderung von "User Shell Folders", wird
+    der aktive Desktop synchronisiert und gespeichert. Andere Prozesse
+    erfahren davon über ihren Datei-Watcher auf desktops.json.
+
+    Returns:
+        Listener, dessen cancel() die Beobachtung beendet
     """
-    desktops = load_desktops()
 
-    # Sortierung: Geschützte Desktops zuerst, dann alphabetisch
-    desktops.sort(key=lambda d: (not d.protected, d.name.lower()))
+    def on_change(_key_path: str) -> None:
+        logger.info(get_text("desktop_handler.info.registry_changed"))
+        synchronize_desktops_with_registry(get_all_desktops(), save_changes=True)
 
-    return desktops
+    return get_registry_cache().add_listener(on_change, KEY_USER_SHELL)
 
 
-def switch_to_desktop(desktop_name: str, parent=None) -> bool:
+def get_all_desktops() -> List[Desktop]:
     """
-    Führt den kompletten Desktop-Wechsel durch:
-    1. Animation starten (Lock-File-gesteuert)
-    2. Registry-Einträge ändern
-    3. Explorer neustarten
-    4. Icons und Wallpaper setzen
-    5. Animation beenden
+    Gibt eine Liste aller Desktops zurück.
+    Geschützte Desktops werden immer zuerst angezeigt.
+
+    Die Liste kommt vorsortiert aus dem prozessweiten DesktopRepository;
+    desktops.json wird nur neu geparst, wenn sie sich auf der Platte geändert hat.
     """
-    from ..utils.backup_service import create_backup_before_switch
+    return get_desktop_repository().get_all()
 
-    desktops = get_all_desktops()
-    synchronize_desktops_with_registry(desktops, save_changes=True)
 
-    target_desktop = next((d for d in desktops if d.name == desktop_name), None)
-    if not target_desktop:
-        msg = get_text("desktop_handler.error.switch_not_found", name=desktop_name)
-        logger.error(msg)
+@dataclass
+class SwitchContext:
+    """
+    Zustand eines Desktop-Wechsels, den die Stufen untereinander weitergeben.
+
+    Attributes:
+        desktop_name: Name des Ziel-Desktops
+        parent: Eltern-Widget für Dialoge
+        trace: Trace des Wechsels (Zeitmessung je Stufe)
+        desktops: Geladene und mit der Registry abgeglichene Desktops
+        target: Ziel-Desktop
+        active: Bisher aktiver Desktop
+        lock_file: Lock-File der Animation (None, wenn keine läuft)
+        clean_path: Normalisierter Pfad des Ziels, wie er in die Registry geschrieben wird
+        animation: AnimationChannel zur laufenden Animation (None ohne Handshake)
+        cancelled: Abfrage, ob der Wechsel zugunsten einer neueren Anfrage entfallen soll
+        outcome: Ergebnis für den Trace-Datensatz (ok, aborted, failed, cancelled, error)
+    """
+
+    desktop_name: str
+    parent: Any
+    trace: Trace
+    desktops: Optional[DesktopList] = None
+    target: Optional[Desktop] = None
+    active: Optional[Desktop] = None
+    lock_file: Optional[str] = None
+    clean_path: Optional[str] = None
+    animation: Any = None
+    cancelled: Optional[Callable[[], bool]] = None
+    outcome: str = "error"
+
+
+def _stage_sync(ctx: SwitchContext) -> bool:
+    """Desktops laden, mit der Registry abgleichen und das Ziel bestimmen."""
+    ctx.desktops = DesktopList.of(get_all_desktops())
+    synchronize_desktops_with_registry(ctx.desktops, save_changes=True)
+
+    ctx.target = ctx.desktops.get_by_name(ctx.desktop_name)
+    if not ctx.target:
+        logger.error(get_text("desktop_handler.error.switch_not_found", name=ctx.desktop_name))
         return False
 
-    if target_desktop.is_active:
-        msg = get_text("desktop_handler.info.already_active", name=desktop_name)
-        logger.info(msg)
+    if ctx.target.is_active:
+        logger.info(get_text("desktop_handler.info.already_active", name=ctx.desktop_name))
         return False
+    return True
 
-    # Automatisches Backup vor dem Wechsel
-    backup_path = create_backup_before_switch()
-    if backup_path:
-        logger.info(get_text("desktop_handler.info.backup_created"))
 
-    target_path = os.path.normpath(os.path.expandvars(target_desktop.path))
+def _stage_backup(ctx: SwitchContext) -> bool:
+    """Automatisches Backup: Werte werden jetzt gelesen, geschrieben wird im Hintergrund."""
+    from ..utils.backup_service import create_backup_before_switch
 
-    if not os.path.exists(target_path):
-        msg = get_text("desktop_handler.warn.path_not_found", name=desktop_name)
-        logger.warning(msg)
-        logger.info(get_text("desktop_handler.info.path_is", path=target_path))
+    if create_backup_before_switch():
+        logger.info(get_text("desktop_handler.info.backup_scheduled"))
+    return True
 
-        title = get_text("desktop_handler.prompts.path_not_found_title")
-        message = get_text("desktop_handler.prompts.path_not_found_message")
 
-        choices = [
-            get_text("desktop_handler.prompts.path_recreate"),
-            get_text("desktop_handler.prompts.path_remove"),
-            get_text("desktop_handler.prompts.path_abort"),
-        ]
+def _stage_path_check(ctx: SwitchContext) -> bool:
+    """Prüft den Zielordner; fehlt er, entscheidet der Benutzer (neu anlegen, entfernen, abbrechen)."""
+    target_path = os.path.normpath(os.path.expandvars(ctx.target.path))
+    if os.path.exists(target_path):
+        return True
 
-        choice_text = show_choice_dialog(parent, title, message, choices)
+    logger.warning(get_text("desktop_handler.warn.path_not_found", name=ctx.desktop_name))
+    logger.info(get_text("desktop_handler.info.path_is", path=target_path))
 
-        if choice_text == get_text("desktop_handler.prompts.path_recreate"):
-            msg = get_text("desktop_handler.info.recreating_folder", path=target_path)
-            logger.info(msg)
-            if ensure_directory_exists(target_path):
-                msg = get_text("desktop_handler.success.recreating_folder")
-                logger.info(msg)
-            else:
-                msg = get_text("desktop_handler.error.recreating_folder")
-                logger.error(msg)
-                logger.info(get_text("desktop_handler.info.aborting_switch"))
-                return False
+    title = get_text("desktop_handler.prompts.path_not_found_title")
+    message = get_text("desktop_handler.prompts.path_not_found_message")
 
-        elif choice_text == get_text("desktop_handler.prompts.path_remove"):
-            msg = get_text("desktop_handler.info.removing_config", name=desktop_name)
-            logger.info(msg)
-            try:
-                desktops.remove(target_desktop)
-                save_desktops(desktops)
-                msg = get_text("desktop_handler.success.removing_config", name=desktop_name)
-                logger.info(msg)
-            except (ValueError, OSError) as e:
-                msg = get_text("desktop_handler.error.removing_config", e=e)
-                logger.error(msg)
+    choices = [
+        get_text("desktop_handler.prompts.path_recreate"),
+        get_text("desktop_handler.prompts.path_remove"),
+        get_text("desktop_handler.prompts.path_abort"),
+    ]
 
-            logger.info(get_text("desktop_handler.info.aborting_switch"))
-            return False
-        else:  # Abort or no choice
-            logger.info(get_text("desktop_handler.info.aborting_switch"))
-            return False
+    choice_text = show_choice_dialog(ctx.parent, title, message, choices)
 
-    # 1. Lock-File für Animation erstellen (nur wenn aktiviert)
-    show_animation = settings_service.get_setting("show_switch_animation", True)
-    lock_file = None
+    if choice_text == get_text("desktop_handler.prompts.path_recreate"):
+        logger.info(get_text("desktop_handler.info.recreating_folder", path=target_path))
+        if ensure_directory_exists(target_path):
+            logger.info(get_text("desktop_handler.success.recreating_folder"))
+            return True
+        logger.error(get_text("desktop_handler.error.recreating_folder"))
 
-    if show_animation:
-        lock_file = os.path.join(tempfile.gettempdir(), "smartdesk_switch.lock")
+    elif choice_text == get_text("desktop_handler.prompts.path_remove"):
+        logger.info(get_text("desktop_handler.info.removing_config", name=ctx.desktop_name))
         try:
-            with open(lock_file, "w") as f:
-                f.write("Switching...")
-        except Exception as e:
-            logger.warning(get_text("desktop_handler.warn.lock_file_create", e=e))
-            lock_file = None
+            ctx.desktops.remove(ctx.target)
+            save_desktops(ctx.desktops)
+            logger.info(get_text("desktop_handler.success.removing_config", name=ctx.desktop_name))
+        except (ValueError, OSError) as e:
+            logger.error(get_text("desktop_handler.error.removing_config", e=e))
+
+    logger.info(get_text("desktop_handler.info.aborting_switch"))
+    return False
+
+
+def _stage_animation(ctx: SwitchContext) -> bool:
+    """
+    Lock-File anlegen und die Überblend-Animation starten (nur wenn aktiviert).
 
-    # 2. Animation starten (nur wenn aktiviert)
-    if show_animation:
+    Die Animation spielt der warme Animations-Host des Trays ab; läuft keiner
+    (oder ist er beschäftigt), wird screen_fade.py wie bisher gestartet.
+    Die Stufe endet, sobald die Animation READY meldet (Bildschirm verdeckt),
+    spätestens nach ANIMATION_READY_TIMEOUT wie früher mit der festen Wartezeit.
+    """
+    from ...shared.animations.handshake import AnimationChannel
+    from ...shared.animations.host_controller import start_hosted_animation
+
+    if not settings_service.get_setting("show_switch_animation", True):
+        return True
+
+    lock_file = os.path.join(tempfile.gettempdir(), "smartdesk_switch.lock")
+    try:
+        with open(lock_file, "w") as f:
+            f.write("Switching...")
+        ctx.lock_file = lock_file
+    except Exception as e:
+        logger.warning(get_text("desktop_handler.warn.lock_file_create", e=e))
+
+    try:
         try:
+            ctx.animation = AnimationChannel()
+        except OSError as e:
+            logger.warning(get_text("desktop_handler.warn.animation_channel_failed", e=e))
+
+        # Warmer Animations-Host des Trays; sonst wie bisher eigener Prozess
+        if ctx.animation and start_hosted_animation(ctx.animation.port, ctx.animation.token, ctx.lock_file):
+            ctx.trace.set(animation_host="warm")
+        else:
             animation_script = get_resource_path("smartdesk/shared/animations/screen_fade.py")
 
             if not os.path.exists(animation_script):
                 logger.warning(get_text("desktop_handler.warn.animation_script_missing", path=animation_script))
-            else:
-                cmd = [sys.executable, animation_script]
-                if lock_file:
-                    cmd.append(lock_file)
-
-                subprocess.Popen(
-                    cmd,
-                    creationflags=subprocess.CREATE_NO_WINDOW,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                )
-                # Kurz warten, damit das Fenster sichtbar wird (Fade-In)
-                time.sleep(0.5)
-        except (OSError, ValueError, FileNotFoundError) as e:
-            logger.warning(get_text("desktop_handler.warn.animation_start_failed", e=e))
-
-    # 3. Icons des aktuellen Desktops sichern
-    active_desktop = next((d for d in desktops if d.is_active), None)
-    if active_desktop:
-        msg = get_text("desktop_handler.info.saving_icons", name=active_desktop.name)
-        logger.info(msg)
-        try:
-            active_desktop.icon_positionen = get_current_icon_positions(timeout_seconds=3)
-            active_desktop.is_active = False
-            save_desktops(desktops)
-            msg = get_text("desktop_handler.success.db_update")
-            logger.info(msg)
-        except Exception as e:
-            logger.warning(get_text("desktop_handler.warn.icon_save_failed", e=e))
-            active_desktop.is_active = False
-            save_desktops(desktops)
-    else:
-        msg = get_text("desktop_handler.warn.no_active_desktop")
-        logger.warning(msg)
+                return True
+
+            cmd = [sys.executable, animation_script]
+            if ctx.lock_file:
+                cmd.append(ctx.lock_file)
+
+            # Die Animation erbt die Trace-ID (SMARTDESK_TRACE_ID) und Port/Token des Handshakes
+            env = ctx.trace.env()
+            if ctx.animation:
+                env.update(ctx.animation.env())
+
+            subprocess.Popen(
+                cmd,
+                creationflags=subprocess.CREATE_NO_WINDOW,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=env,
+            )
+            ctx.trace.set(animation_host="spawn")
+
+        if ctx.animation and ctx.animation.wait_ready(ANIMATION_READY_TIMEOUT):
+            ctx.trace.set(animation="ready")
+        elif ctx.animation:
+            # Keine Rückmeldung: so lange gewartet wie früher mit der festen Pause
+            logger.debug(get_text("desktop_handler.debug.animation_ready_timeout", timeout=ANIMATION_READY_TIMEOUT))
+            ctx.trace.set(animation="timeout")
+        else:
+            # Kurz warten, damit das Fenster sichtbar wird (Fade-In)
+            time.sleep(ANIMATION_READY_TIMEOUT)
+            ctx.trace.set(animation="sleep")
+    except (OSError, ValueError, FileNotFoundError) as e:
+        logger.warning(get_text("desktop_handler.warn.animation_start_failed", e=e))
+    return True
+
+
+def _stage_icons(ctx: SwitchContext) -> bool:
+    """Icon-Positionen des aktuellen Desktops übernehmen (gespeichert wird in der Registry-Stufe)."""
+    ctx.active = ctx.desktops.get_active()
+    if not ctx.active:
+        logger.warning(get_text("desktop_handler.warn.no_active_desktop"))
+        return True
+
+    logger.info(get_text("desktop_handler.info.saving_icons", name=ctx.active.name))
+    try:
+        ctx.active.icon_positionen = get_current_icon_positions(timeout_seconds=3)
+    except Exception as e:
+        logger.warning(get_text("desktop_handler.warn.icon_save_failed", e=e))
+    ctx.active.is_active = False
+    return True
+
+
+def _stage_registry(ctx: SwitchContext) -> bool:
+    """Desktops speichern und beide Registry-Schlüssel als Einheit umstellen."""
+    # Letzte Gelegenheit zum Abbruch: Ab hier ändert der Wechsel das System
+    if ctx.cancelled and ctx.cancelled():
+        logger.info(get_text("desktop_handler.info.switch_cancelled", name=ctx.desktop_name))
+        ctx.outcome = "cancelled"
+        return False
 
-    # 4. Registry ändern
     # WICHTIG: Pfad muss absolut sauber normalisiert sein (Windows Backslashes),
     # sonst kommt der Fehler 'Ungültiges Gerät' beim Umbenennen von Dateien.
-    clean_path = os.path.normpath(os.path.expandvars(target_desktop.path))
+    clean_path = ctx.clean_path = os.path.normpath(os.path.expandvars(ctx.target.path))
+
+    # Icon-Sicherung und ggf. Rollback landen gebündelt in einem
+    # einzigen Schreibvorgang, bevor der Explorer neu startet.
+    with save_batch():
+        save_desktops(ctx.desktops)
+        if ctx.active:
+            logger.info(get_text("desktop_handler.success.db_update"))
+
+        logger.info(get_text("desktop_handler.info.switching_registry", name=ctx.target.name, path=clean_path))
+
+        # Bei einem Fehler werden beide Schlüssel zurückgesetzt
+        result = write_desktop_path(clean_path)
+        if not result.success:
+            logger.error(get_text("desktop_handler.error.registry_update_failed"))
+            # Rollback: Aktiv-Status
+            if ctx.active:
+                ctx.active.is_active = True
+                save_desktops(ctx.desktops)
+            ctx.outcome = "failed"
+            return False
+    return True
 
-    msg = get_text(
-        "desktop_handler.info.switching_registry",
-        name=target_desktop.name,
-        path=clean_path,
-    )
-    logger.info(msg)
 
-    reg_success = True
-    if not update_registry_key(KEY_USER_SHELL, VALUE_NAME, clean_path, winreg.REG_EXPAND_SZ):
-        reg_success = False
-    if not update_registry_key(KEY_LEGACY_SHELL, VALUE_NAME, clean_path, winreg.REG_SZ):
-        reg_success = False
+def _stage_explorer_restart(ctx: SwitchContext) -> bool:
+    """
+    Explorer den neuen Desktop-Pfad anzeigen lassen.
 
-    if not reg_success:
-        msg = get_text("desktop_handler.error.registry_update_failed")
-        logger.error(msg)
-        # Rollback: Aktiv-Status
-        if active_desktop:
-            active_desktop.is_active = True
-            save_desktops(desktops)
+    Standard für Neuinstallationen ist die Aktualisierung ohne Neustart
+    (siehe core/shell); mit explorer_refresh_mode = "restart" (auch der
+    Standard bestehender Installationen) wird der Explorer immer neu gestartet.
+    """
+    if settings_service.get_setting("explorer_refresh_mode") == "restart":
+        restart_explorer()
+        ctx.trace.set(shell_refresh="restart")
+        return True
 
-        # Aufräumen: Lock-File entfernen, damit Animation stoppt
-        if lock_file and os.path.exists(lock_file):
-            try:
-                os.remove(lock_file)
-            except Exception:
-                pass
-        return False
+    old_path = os.path.normpath(os.path.expandvars(ctx.active.path)) if ctx.active else None
+    result = get_shell_refresher().refresh(ctx.clean_path, old_path)
+    ctx.trace.set(shell_refresh=result.method)
+    return True
 
-    # 5. Explorer neustarten
-    restart_explorer()
 
-    # 6. Icons und Wallpaper für den neuen Desktop setzen (Sync)
-    # Da wir in switch_to_desktop sind und die Registry geändert haben,
-    # synchronisieren wir jetzt den Status.
+def _stage_apply(ctx: SwitchContext) -> bool:
+    """Status synchronisieren, Icons und Wallpaper des neuen Desktops setzen."""
     sync_desktop_state_and_apply_icons()
+    return True
 
-    # 7. Lock-File löschen -> Animation beendet sich
-    if lock_file and os.path.exists(lock_file):
-        try:
-            os.remove(lock_file)
-            logger.debug(f"Lock-File entfernt: {lock_file}")
-        except Exception as e:
-            logger.warning(get_text("desktop_handler.warn.lock_file_remove_failed", e=e))
+
+# Stufen eines Desktop-Wechsels mit ihren Abhängigkeiten (run erhält den
+# SwitchContext). Unabhängige Stufen laufen parallel (siehe stage_graph.py):
+# Backup, Animation (inkl. Fade-In) und Icon-Sicherung überlappen sich.
+# Festgelegt sind u.a.: Icons sichern und Backup vor dem Registry-Schreiben,
+# Explorer-Neustart erst, wenn die Animation den Bildschirm verdeckt.
+# sync und path_check laufen im aufrufenden Thread (Dialog bei fehlendem Ordner).
+# Gibt eine Stufe False zurück, endet der Wechsel (Ergebnis "aborted", sofern
+# die Stufe nichts anderes gesetzt hat).
+SWITCH_STAGES: List[Stage] = [
+    Stage("sync", _stage_sync, inline=True),
+    Stage("backup", _stage_backup, after=("sync",)),
+    Stage("path_check", _stage_path_check, after=("sync",), inline=True),
+    Stage("animation", _stage_animation, after=("path_check",)),
+    Stage("icons", _stage_icons, after=("path_check",)),
+    Stage("registry", _stage_registry, after=("icons", "backup")),
+    Stage("explorer_restart", _stage_explorer_restart, after=("registry", "animation")),
+    Stage("apply", _stage_apply, after=("explorer_restart",)),
+]
+
+
+def switch_to_desktop(
+    desktop_name: str,
+    parent=None,
+    cancelled: Optional[Callable[[], bool]] = None,
+    trace_attrs: Optional[Dict[str, Any]] = None,
+) -> bool:
+    """
+    Führt den kompletten Desktop-Wechsel in den Stufen aus SWITCH_STAGES durch:
+    sync, backup, path_check, animation, icons, registry, explorer_restart, apply.
+
+    Jede Stufe wird im Trace des Wechsels gemessen; am Ende wird der
+    Datensatz an die Trace-Datei angehängt (siehe tracing.py) und das
+    Lock-File entfernt, damit sich die Animation beendet.
+
+    Aufrufer sollten request_switch() verwenden, damit Wechsel aus mehreren
+    Prozessen nicht gleichzeitig laufen.
+
+    Args:
+        cancelled: Wird vor dem Registry-Schreiben abgefragt; True bricht
+                   den Wechsel ab (Ergebnis "cancelled")
+        trace_attrs: Zusätzliche Attribute für den Trace (z.B. Warteschlange)
+    """
+    global _last_switch_timer
+    trace = _last_switch_timer = Trace("switch", desktop=desktop_name, **(trace_attrs or {}))
+    ctx = SwitchContext(desktop_name=desktop_name, parent=parent, trace=trace, cancelled=cancelled)
+    # Während des Wechsels nichts vorausberechnen (siehe switch_prefetch.py)
+    prefetcher = get_switch_prefetcher() if settings_service.get_setting("switch_prefetch", True) else None
+    if prefetcher:
+        prefetcher.hold()
+
+    try:
+        with trace.activate():
+            stages = [replace(stage, run=partial(stage.run, ctx)) for stage in SWITCH_STAGES]
+            if not run_stages(stages, timer=trace):
+                if ctx.outcome == "error":
+                    ctx.outcome = "aborted"
+                return False
+        ctx.outcome = "ok"
+        if prefetcher:
+            source = trace.attrs.get("source") or get_process_role()
+            prefetcher.record_switch(ctx.active.name if ctx.active else None, ctx.target.name, source)
+    finally:
+        if prefetcher:
+            prefetcher.release()
+        # DONE senden und Lock-File löschen -> Animation blendet aus
+        if ctx.animation:
+            ctx.animation.send_done()
+            ctx.animation.close()
+        if ctx.lock_file and os.path.exists(ctx.lock_file):
+            try:
+                os.remove(ctx.lock_file)
+                logger.debug(f"Lock-File entfernt: {ctx.lock_file}")
+            except Exception as e:
+                logger.warning(get_text("desktop_handler.warn.lock_file_remove_failed", e=e))
+        trace.finish(ctx.outcome)
+        logger.debug(get_text("desktop_handler.debug.switch_timings", trace_id=trace.trace_id, summary=trace.summary()))
 
     logger.info(get_text("desktop_handler.info.registry_success"))
     return True
 
 
+def request_switch(desktop_name: str, parent=None, wait: bool = True, source: Optional[str] = None) -> SwitchOutcome:
+    """
+    Fordert einen Desktop-Wechsel über den prozessübergreifenden SwitchBroker an.
+
+    Schnell aufeinanderfolgende Anfragen (auch aus anderen Prozessen) werden
+    zum letzten Ziel zusammengefasst; es läuft immer höchstens ein Wechsel.
+
+    Args:
+        wait: False kehrt sofort zurück (z.B. im Hotkey-Listener)
+        source: Herkunft für Log, Trace und Wechsel-Historie, z.B. "hotkey:2"
+                (Standard: Prozessrolle)
+
+    Returns:
+        SwitchOutcome (success ist True, wenn genau dieser Wechsel gelang)
+    """
+    return get_switch_broker().request(desktop_name, parent=parent, wait=wait, source=source)
+
+
+def get_last_switch_timings() -> Dict[str, float]:
+    """
+    Dauer je Stufe des letzten Desktop-Wechsels in diesem Prozess (Millisekunden).
+
+    Stufen siehe SWITCH_STAGES (bei abgebrochenen Wechseln nur die erreichten).
+    """
+    timer = _last_switch_timer
+    return timer.durations_ms if timer else {}
+
+
 def sync_desktop_state_and_apply_icons():
     """
     Führt die Aktionen *nach* dem Explorer-Neustart aus.
     """
     logger.info(get_text("desktop_handler.info.sync_after_restart"))
 
-    desktops = get_all_desktops()
+    desktops = DesktopList.of(get_all_desktops())
     synchronize_desktops_with_registry(desktops, save_changes=True)
 
-    new_active_desktop = next((d for d in desktops if d.is_active), None)
+    new_active_desktop = desktops.get_active()
 
     if not new_active_desktop:
         msg = get_text("desktop_handler.error.sync_no_active")
@@ -453,19 +640,42 @@ def sync_desktop_state_and_apply_icons():
     msg = get_text("desktop_handler.info.sync_desktop_active", name=new_active_desktop.name)
     logger.info(msg)
 
-    # Warten, bis der Explorer nach dem Neustart vollständig geladen ist
-    # Dies verhindert, dass Wallpaper oder Icons ins Leere gesetzt werden.
-    if not wait_for_desktop_listview(timeout=15, check_items=False):
-        logger.warning(get_text("desktop_handler.warn.explorer_timeout"))
-
-    if new_active_desktop.wallpaper_path:
-        logger.info(get_text("desktop_handler.info.setting_wallpaper"))
-        wallpaper_service.set_wallpaper(new_active_desktop.wallpaper_path)
-
-    msg = get_text("desktop_handler.info.sync_restoring_icons", name=new_active_desktop.name)
-    logger.info(msg)
-    set_icon_positions(new_active_desktop.icon_positionen)
-    logger.info(get_text("desktop_handler.info.sync_icons_done"))
+    # Im Leerlauf vorbereitete Wiederherstellung (Icons, skaliertes Bild)
+    payload = None
+    trace = get_current_trace()
+    if settings_service.get_setting("switch_prefetch", True):
+        payload, status = get_switch_prefetcher().take(new_active_desktop)
+        if trace:
+            trace.set(prefetch=status)
+            if payload:
+                trace.set(prefetch_saved_ms=round(payload.build_ms, 3))
+
+    def wait_for_listview() -> None:
+        # Warten, bis der Explorer nach dem Neustart vollständig geladen ist
+        # Dies verhindert, dass Wallpaper oder Icons ins Leere gesetzt werden.
+        if not wait_for_desktop_listview(timeout=15, check_items=False):
+            logger.warning(get_text("desktop_handler.warn.explorer_timeout"))
+
+    def apply_wallpaper() -> None:
+        if new_active_desktop.wallpaper_path:
+            logger.info(get_text("desktop_handler.info.setting_wallpaper"))
+            wallpaper_service.set_wallpaper(payload.wallpaper_path if payload else new_active_desktop.wallpaper_path)
+
+    def restore_icons() -> None:
+        logger.info(get_text("desktop_handler.info.sync_restoring_icons", name=new_active_desktop.name))
+        set_icon_positions(payload.plan if payload else new_active_desktop.icon_positionen)
+        logger.info(get_text("desktop_handler.info.sync_icons_done"))
+
+    # Wallpaper (SystemParametersInfo) und Icons (ListView) sind unabhängig
+    # und laufen parallel, beide erst nach dem ListView.
+    run_stages(
+        [
+            Stage("listview", wait_for_listview),
+            Stage("wallpaper", apply_wallpaper, after=("listview",)),
+            Stage("icon_restore", restore_icons, after=("listview",)),
+        ],
+        timer=trace,
+    )
 
 
 def save_current_desktop_icons() -> bool:
@@ -473,10 +683,10 @@ def save_current_desktop_icons() -> bool:
     Findet den aktuell aktiven Desktop, liest seine
     Icon-Positionen aus und speichert sie.
     """
-    desktops = get_all_desktops()
+    desktops = DesktopList.of(get_all_desktops())
     synchronize_desktops_with_registry(desktops, save_changes=True)
 
-    active_desktop = next((d for d in desktops if d.is_active), None)
+    active_desktop = desktops.get_active()
 
     if not active_desktop:
         msg = get_text("desktop_handler.error.save_icons_no_active")
@@ -509,10 +719,10 @@ def assign_wallpaper(desktop_name: str, source_image_path: str) -> bool:
         logger.error(msg)
         return False
 
-    desktops = get_all_desktops()
+    desktops = DesktopList.of(get_all_desktops())
     synchronize_desktops_with_registry(desktops, save_changes=True)
 
-    target_desktop = next((d for d in desktops if d.name == desktop_name), None)
+    target_desktop = desktops.get_by_name(desktop_name)
 
     if not target_desktop:
         msg = get_text("desktop_handler.error.not_found", old_name=desktop_name)
@@ -2,16 +2,20 @@
 
 import ctypes
 from ctypes import wintypes
+import struct
+import threading
 import time
 import win32gui
 import win32process
 import win32con
 from threading import Thread
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
 from ...shared.localization import get_text
 from ...shared.style import PREFIX_ERROR, PREFIX_OK, PREFIX_WARN
 from ..models.desktop import IconPosition
+from ...platform.current import get_platform
+from ...platform.interfaces import pack_position
 
 
 # --- C-Strukturen ---
@@ -57,48 +61,282 @@ GWL_STYLE = -16
 LVS_AUTOARRANGE = 0x0100
 LVS_SNAPTOGRID = 0x0800
 
-get_last_error = ctypes.windll.kernel32.GetLastError
-read_process_memory = ctypes.windll.kernel32.ReadProcessMemory
-write_process_memory = ctypes.windll.kernel32.WriteProcessMemory
+LVM_GETITEMTEXTW = LVM_FIRST + 115
+
+# Arena im Speicher des Explorers (ein VirtualAllocEx je Sitzung): POINT,
+# direkt dahinter der Textpuffer (ein ReadProcessMemory liest beides),
+# danach das LVITEM. POINT besteht unter Windows aus zwei 32-Bit-LONGs.
+_POINT = struct.Struct("<ii")
+_TEXT_CHARS = 260
+_TEXT_OFFSET = _POINT.size
+_LVITEM_OFFSET = _TEXT_OFFSET + 2 * _TEXT_CHARS
+
+
+class Win32Api:
+    """
+    Die Win32-Funktionen, über die Win32ListView das ListView im Explorer
+    liest. Austauschbar, z.B. gegen platform/simulated_win32.py im Benchmark.
+
+    Nutzt eine eigene Instanz von kernel32 mit Signaturen, damit 64-Bit-Adressen
+    und Handles nicht auf int gekürzt werden.
+    """
+
+    def __init__(self):
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        signatures = {
+            "OpenProcess": (wintypes.HANDLE, (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)),
+            "CloseHandle": (wintypes.BOOL, (wintypes.HANDLE,)),
+            "VirtualAllocEx": (wintypes.LPVOID, (wintypes.HANDLE, wintypes.LPVOID, ctypes.c_size_t, wintypes.DWORD, wintypes.DWORD)),
+            "VirtualFreeEx": (wintypes.BOOL, (wintypes.HANDLE, wintypes.LPVOID, ctypes.c_size_t, wintypes.DWORD)),
+            "ReadProcessMemory": (wintypes.BOOL, (wintypes.HANDLE, wintypes.LPCVOID, wintypes.LPVOID, ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t))),
+            "WriteProcessMemory": (wintypes.BOOL, (wintypes.HANDLE, wintypes.LPVOID, wintypes.LPCVOID, ctypes.c_size_t, ctypes.POINTER(ctypes.c_size_t))),
+        }
+        for name, (restype, argtypes) in signatures.items():
+            func = getattr(kernel32, name)
+            func.restype, func.argtypes = restype, argtypes
+        self.open_process = kernel32.OpenProcess
+        self.close_handle = kernel32.CloseHandle
+        self.virtual_alloc_ex = kernel32.VirtualAllocEx
+        self.virtual_free_ex = kernel32.VirtualFreeEx
+        self.read_process_memory = kernel32.ReadProcessMemory
+        self.write_process_memory = kernel32.WriteProcessMemory
+        self.send_message = win32gui.SendMessage
+
+    def window_pid(self, hwnd: int) -> int:
+        """PID des Prozesses, dem das Fenster gehört."""
+        return win32process.GetWindowThreadProcessId(hwnd)[1]
+
+
+class ListViewSession:
+    """
+    Lesezugriff auf das Desktop-ListView im Speicher eines Explorer-Prozesses.
+
+    Hält das Prozess-Handle und eine Arena im Explorer über beliebig viele
+    Lesevorgänge; die lokalen ctypes-Puffer werden wiederverwendet. Je Icon
+    fallen zwei SendMessage und ein ReadProcessMemory an (Position und Name
+    in einem Block), je Lesevorgang ein WriteProcessMemory für das LVITEM.
+
+    Gehört zu genau einer PID; nach einem Explorer-Neustart wird eine neue
+    Sitzung geöffnet (siehe Win32ListView.session()).
+
+    Raises:
+        OSError: Prozess nicht zu öffnen bzw. Speicher nicht zu reservieren
+    """
+
+    def __init__(self, api: Win32Api, pid: int):
+        self.api = api
+        self.pid = pid
+        self.reads = 0
+        self._lock = threading.Lock()
+        self._process = api.open_process(PROCESS_VM_READ | PROCESS_VM_OPERATION | PROCESS_VM_WRITE, False, pid)
+        if not self._process:
+            raise OSError(f"OpenProcess für PID {pid} fehlgeschlagen")
+        self._arena = api.virtual_alloc_ex(self._process, 0, _LVITEM_OFFSET + ctypes.sizeof(LVITEM), MEM_COMMIT, PAGE_READWRITE)
+        if not self._arena:
+            api.close_handle(self._process)
+            self._process = None
+            raise OSError(f"VirtualAllocEx im Explorer (PID {pid}) fehlgeschlagen")
+
+        self._lvitem = LVITEM()
+        self._lvitem.mask = LVIF_TEXT
+        self._lvitem.pszText = self._arena + _TEXT_OFFSET
+        self._lvitem.cchTextMax = _TEXT_CHARS
+        self._buffer = ctypes.create_string_buffer(_LVITEM_OFFSET)
+
+    @property
+    def closed(self) -> bool:
+        return self._process is None
+
+    def read_items(self, handle: int, count: int) -> List[IconPosition]:
+        """
+        Namen und Positionen der ersten count Icons.
+
+        Raises:
+            OSError: Speicherzugriff fehlgeschlagen (z.B. Explorer beendet)
+        """
+        with self._lock:
+            if self._process is None:
+                raise OSError("ListViewSession ist geschlossen")
+            api, process, buffer = self.api, self._process, self._buffer
+            remote_lvitem = self._arena + _LVITEM_OFFSET
+            # Einmal je Lesevorgang: Der Explorer darf das LVITEM verändern
+            if not api.write_process_memory(process, remote_lvitem, ctypes.byref(self._lvitem), ctypes.sizeof(self._lvitem), None):
+                raise OSError(f"WriteProcessMemory im Explorer (PID {self.pid}) fehlgeschlagen")
+
+            icons = []
+            for i in range(count):
+                length = min(api.send_message(handle, LVM_GETITEMTEXTW, i, remote_lvitem), _TEXT_CHARS - 1)
+                if length <= 0:
+                    continue
+                api.send_message(handle, LVM_GETITEMPOSITION, i, self._arena)
+                size = _TEXT_OFFSET + 2 * length
+                if not api.read_process_memory(process, self._arena, buffer, size, None):
+                    raise OSError(f"ReadProcessMemory im Explorer (PID {self.pid}) fehlgeschlagen")
+                x, y = _POINT.unpack_from(buffer)
+                icons.append(IconPosition(index=i, name=buffer[_TEXT_OFFSET:size].decode("utf-16-le", "surrogatepass"), x=x, y=y))
+            self.reads += 1
+            return icons
+
+    def close(self) -> None:
+        """Gibt Arena und Prozess-Handle frei (mehrfacher Aufruf unschädlich)."""
+        with self._lock:
+            if self._process is None:
+                return
+            self.api.virtual_free_ex(self._process, self._arena, 0, MEM_RELEASE)
+            self.api.close_handle(self._process)
+            self._process = None
+
+
+class Win32ListView:
+    """
+    Das SysListView32 des Desktops über die Win32-API.
+
+    Implementiert DesktopListView aus platform/interfaces.py. Gelesen wird
+    über eine ListViewSession, die bis zum nächsten Explorer-Neustart
+    (neue PID) bestehen bleibt.
+
+    Args:
+        api: Win32-Funktionen (Standard: Win32Api, beim ersten Zugriff erzeugt)
+    """
+
+    def __init__(self, api: Optional[Win32Api] = None):
+        self._api = api
+        self._session: Optional[ListViewSession] = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def api(self) -> Win32Api:
+        if self._api is None:
+            self._api = Win32Api()
+        return self._api
+
+    def find(self):
+        """Findet das Handle des Desktop-ListView-Fensters."""
+        h_progman = win32gui.FindWindow("Progman", "Program Manager")
+        h_shell_def_view = win32gui.FindWindowEx(h_progman, 0, "SHELLDLL_DefView", None)
+        if h_shell_def_view == 0:
+            h_workerw = 0
+            while True:
+                h_workerw = win32gui.FindWindowEx(0, h_workerw, "WorkerW", None)
+                if not h_workerw:
+                    break
+                h_shell_def_view = win32gui.FindWindowEx(h_workerw, 0, "SHELLDLL_DefView", None)
+                if h_shell_def_view:
+                    break
+        if h_shell_def_view == 0:
+            return None
+        return win32gui.FindWindowEx(h_shell_def_view, 0, "SysListView32", "FolderView")
+
+    def session(self, handle: int) -> Optional[ListViewSession]:
+        """
+        Sitzung für den Explorer, dem handle gehört. Hat sich dessen PID
+        geändert (Neustart), wird die alte Sitzung geschlossen und eine neue
+        geöffnet; None, wenn das nicht gelingt.
+        """
+        pid = self.api.window_pid(handle)
+        with self._session_lock:
+            session = self._session
+            if session is not None and (session.closed or session.pid != pid):
+                session.close()
+                session = self._session = None
+            if session is None and pid:
+                try:
+                    session = self._session = ListViewSession(self.api, pid)
+                except OSError as e:
+                    print(f"{PREFIX_WARN} {get_text('icon_manager.warn.session_failed', error=e)}")
+            return session
+
+    def close(self) -> None:
+        """Schließt die offene Sitzung."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def item_count(self, handle: int) -> int:
+        return self.api.send_message(handle, LVM_GETITEMCOUNT, 0, 0)
+
+    def read_items(self, handle: int) -> List[IconPosition]:
+        item_count = self.item_count(handle)
+        if item_count <= 0:
+            return []
+        session = self.session(handle)
+        if session is None:
+            return []
+        try:
+            return session.read_items(handle, item_count)
+        except OSError as e:
+            # z.B. Explorer beendet: Der nächste Aufruf öffnet eine neue Sitzung
+            print(f"{PREFIX_WARN} {get_text('icon_manager.warn.session_failed', error=e)}")
+            session.close()
+            return []
+
+    def set_item_position(self, handle: int, index: int, x: int, y: int) -> bool:
+        return self.set_item_lparam(handle, index, pack_position(x, y))
+
+    def set_item_lparam(self, handle: int, index: int, lparam: int) -> bool:
+        return bool(self.api.send_message(handle, LVM_SETITEMPOSITION, index, lparam))
+
+    def get_style(self, handle: int) -> int:
+        return win32gui.GetWindowLong(handle, GWL_STYLE)
+
+    def set_style(self, handle: int, style: int) -> None:
+        win32gui.SetWindowLong(handle, GWL_STYLE, style)
+
+    def redraw(self, handle: int) -> None:
+        win32gui.InvalidateRect(handle, None, True)
+        win32gui.UpdateWindow(handle)
+
+
+class IconRestorePlan:
+    """
+    Vorbereitete Icon-Wiederherstellung: Zielposition und gepackter lParam
+    je Icon-Name.
+
+    Die Zuordnung Name -> ListView-Index ist erst nach dem Laden des
+    ListViews bekannt; alles andere lässt sich vorab berechnen (siehe
+    switch_prefetch.py). Bei doppelten Namen gilt der letzte Eintrag.
+    """
+
+    __slots__ = ("positions", "lparams")
+
+    def __init__(self, positions: Dict[str, Tuple[int, int]]):
+        self.positions = positions
+        self.lparams = {name: pack_position(x, y) for name, (x, y) in positions.items()}
+
+    @classmethod
+    def of(cls, icons: List[IconPosition]) -> "IconRestorePlan":
+        return cls({icon.name: (icon.x, icon.y) for icon in icons})
+
+    def __len__(self) -> int:
+        return len(self.lparams)
 
 
 def _get_desktop_listview_handle():
     """Findet das Handle des Desktop-ListView-Fensters."""
-    h_progman = win32gui.FindWindow("Progman", "Program Manager")
-    h_shell_def_view = win32gui.FindWindowEx(h_progman, 0, "SHELLDLL_DefView", None)
-    if h_shell_def_view == 0:
-        h_workerw = 0
-        while True:
-            h_workerw = win32gui.FindWindowEx(0, h_workerw, "WorkerW", None)
-            if not h_workerw:
-                break
-            h_shell_def_view = win32gui.FindWindowEx(h_workerw, 0, "SHELLDLL_DefView", None)
-            if h_shell_def_view:
-                break
-    if h_shell_def_view == 0:
-        return None
-    return win32gui.FindWindowEx(h_shell_def_view, 0, "SysListView32", "FolderView")
+    return get_platform().listview.find()
 
 
 def wait_for_desktop_listview(timeout: int = 10, check_items: bool = True) -> int:
     """
     Wartet, bis das Desktop-ListView verfügbar ist und (optional) Items enthält.
     """
+    listview = get_platform().listview
     start_time = time.time()
     while time.time() - start_time < timeout:
-        hwnd = _get_desktop_listview_handle()
+        hwnd = listview.find()
         if hwnd:
             if not check_items:
                 return hwnd
             
             # Prüfen, ob Items geladen sind (Explorer lädt asynchron)
-            count = win32gui.SendMessage(hwnd, LVM_GETITEMCOUNT, 0, 0)
+            count = listview.item_count(hwnd)
             if count > 0:
                 return hwnd
         
         time.sleep(0.5)
     
-    return _get_desktop_listview_handle() or 0
+    return listview.find() or 0
 
 
 def get_current_icon_positions(timeout_seconds=5) -> List[IconPosition]:
@@ -106,77 +344,30 @@ def get_current_icon_positions(timeout_seconds=5) -> List[IconPosition]:
     Liest die Positionen aller Icons vom Windows-Desktop aus.
     Stabile Version mit Einzelabfragen.
     """
-    icons = []
-    h_listview = _get_desktop_listview_handle()
+    listview = get_platform().listview
+    h_listview = listview.find()
     if not h_listview:
         return []
 
     try:
-        pid = win32process.GetWindowThreadProcessId(h_listview)[1]
-        h_process = ctypes.windll.kernel32.OpenProcess(PROCESS_VM_READ | PROCESS_VM_OPERATION | PROCESS_VM_WRITE, False, pid)
-        if not h_process:
-            return []
-
-        item_count = win32gui.SendMessage(h_listview, LVM_GETITEMCOUNT, 0, 0)
-        if item_count <= 0:
-            ctypes.windll.kernel32.CloseHandle(h_process)
-            return []
-
-        # Speicher im Zielprozess reservieren
-        p_point = ctypes.windll.kernel32.VirtualAllocEx(h_process, 0, ctypes.sizeof(POINT), MEM_COMMIT, PAGE_READWRITE)
-        p_lvitem = ctypes.windll.kernel32.VirtualAllocEx(h_process, 0, ctypes.sizeof(LVITEM), MEM_COMMIT, PAGE_READWRITE)
-        p_text_buffer = ctypes.windll.kernel32.VirtualAllocEx(h_process, 0, 520, MEM_COMMIT, PAGE_READWRITE)
-
-        if not all([p_point, p_lvitem, p_text_buffer]):
-            if p_point: ctypes.windll.kernel32.VirtualFreeEx(h_process, p_point, 0, MEM_RELEASE)
-            if p_lvitem: ctypes.windll.kernel32.VirtualFreeEx(h_process, p_lvitem, 0, MEM_RELEASE)
-            if p_text_buffer: ctypes.windll.kernel32.VirtualFreeEx(h_process, p_text_buffer, 0, MEM_RELEASE)
-            ctypes.windll.kernel32.CloseHandle(h_process)
-            return []
-
-        try:
-            for i in range(item_count):
-                # Position holen
-                win32gui.SendMessage(h_listview, LVM_GETITEMPOSITION, i, p_point)
-                pt = POINT()
-                read_process_memory(h_process, p_point, ctypes.byref(pt), ctypes.sizeof(pt), None)
-
-                # Name holen
-                lv_item = LVITEM()
-                lv_item.mask = LVIF_TEXT
-                lv_item.iItem = i
-                lv_item.pszText = p_text_buffer
-                lv_item.cchTextMax = 260
-
-                write_process_memory(h_process, p_lvitem, ctypes.byref(lv_item), ctypes.sizeof(lv_item), None)
-                win32gui.SendMessage(h_listview, LVM_GETITEMW, i, p_lvitem)
-
-                name_buffer = ctypes.create_unicode_buffer(260)
-                read_process_memory(h_process, p_text_buffer, name_buffer, 520, None)
-
-                name = name_buffer.value
-                if name:
-                    icons.append(IconPosition(index=i, name=name, x=pt.x, y=pt.y))
-        finally:
-            ctypes.windll.kernel32.VirtualFreeEx(h_process, p_point, 0, MEM_RELEASE)
-            ctypes.windll.kernel32.VirtualFreeEx(h_process, p_lvitem, 0, MEM_RELEASE)
-            ctypes.windll.kernel32.VirtualFreeEx(h_process, p_text_buffer, 0, MEM_RELEASE)
-            ctypes.windll.kernel32.CloseHandle(h_process)
+        return listview.read_items(h_listview)
     except Exception as e:
         print(f"Fehler beim Lesen der Icons: {e}")
-
-    return icons
+        return []
 
 
-def set_icon_positions(saved_icons: List[IconPosition]):
+def set_icon_positions(saved_icons: Union[List[IconPosition], IconRestorePlan]):
     """
     Setzt die Positionen der Icons.
     Wartet bis zu 10 Sekunden auf den Explorer und die Icons.
     Nutzt Namens-Matching für maximale Zuverlässigkeit.
     Deaktiviert temporär AutoArrange/SnapToGrid.
+
+    saved_icons kann ein vorab berechneter IconRestorePlan sein.
     """
     if not saved_icons:
         return
+    plan = saved_icons if isinstance(saved_icons, IconRestorePlan) else IconRestorePlan.of(saved_icons)
 
     # Warten, bis der Desktop bereit ist
     h_listview = wait_for_desktop_listview(timeout=10, check_items=True)
@@ -185,14 +376,16 @@ def set_icon_positions(saved_icons: List[IconPosition]):
         print(f"{PREFIX_ERROR} {get_text('icon_manager.error.listview_not_found')}")
         return
 
+    listview = get_platform().listview
+
     # --- Style Handling ---
-    original_style = win32gui.GetWindowLong(h_listview, GWL_STYLE)
+    original_style = listview.get_style(h_listview)
     
     # AutoArrange und SnapToGrid ausschalten für das Setzen
     temp_style = original_style & ~LVS_AUTOARRANGE & ~LVS_SNAPTOGRID
     
     if temp_style != original_style:
-        win32gui.SetWindowLong(h_listview, GWL_STYLE, temp_style)
+        listview.set_style(h_listview, temp_style)
 
     try:
         # Retry-Schleife für Icon-Mapping
@@ -208,18 +401,16 @@ def set_icon_positions(saved_icons: List[IconPosition]):
             return
 
         name_to_index = {icon.name: icon.index for icon in current_icons}
-        current_item_count = win32gui.SendMessage(h_listview, LVM_GETITEMCOUNT, 0, 0)
+        current_item_count = listview.item_count(h_listview)
 
         restored, failed = 0, 0
-        for saved in saved_icons:
-            index = name_to_index.get(saved.name)
+        for name, lparam in plan.lparams.items():
+            index = name_to_index.get(name)
 
             if index is not None and index < current_item_count:
-                lParam = ((saved.y & 0xFFFF) << 16) | (saved.x & 0xFFFF)
-                
                 success = False
                 for _ in range(3):
-                    if win32gui.SendMessage(h_listview, LVM_SETITEMPOSITION, index, lParam):
+                    if listview.set_item_lparam(h_listview, index, lparam):
                         success = True
                         break
                     time.sleep(0.1)
@@ -247,10 +438,9 @@ def set_icon_positions(saved_icons: List[IconPosition]):
             # Wir zwingen es auf AUS, damit das Layout bleibt
             final_style &= ~LVS_AUTOARRANGE
             
-        win32gui.SetWindowLong(h_listview, GWL_STYLE, final_style)
+        listview.set_style(h_listview, final_style)
         
         # Refresh erzwingen
-        win32gui.InvalidateRect(h_listview, None, True)
-        win32gui.UpdateWindow(h_listview)
+        listview.redraw(h_listview)
 
     print(f"{PREFIX_OK} {get_text('icon_manager.info.restore_complete', restored=restored, failed=failed)}")
@@ -24,6 +24,15 @@ DEFAULTS = {
     "action_modifier": "Alt",
     "hold_duration": 0.5,
     "github_pat": None,
+    "storage_engine": "json",  # "json", "journal" oder "sqlite", wirkt nach Neustart
+    "explorer_refresh_mode": "soft",  # "soft" (Benachrichtigung, notfalls Neustart) oder "restart"
+    "switch_prefetch": True,  # Wiederherstellung des nächsten Desktops im Leerlauf vorausberechnen
+}
+
+# Abweichende Standardwerte für bestehende Installationen (settings.json ohne
+# den Schlüssel): geändertes Verhalten gilt dort erst, wenn der Benutzer es wählt
+LEGACY_DEFAULTS = {
+    "explorer_refresh_mode": "restart",
 }
 
 
@@ -37,6 +46,7 @@ def load_settings() -> dict:
             data = json.load(f)
             # Merge mit Defaults, falls neue Keys dazu kamen
             settings = DEFAULTS.copy()
+            settings.update(LEGACY_DEFAULTS)
             settings.update(data)
             return settings
     except Exception as e:
@@ -0,0 +1,358 @@
+# Dateipfad: src/smartdesk/core/services/switch_broker.py
+"""
+Prozessübergreifende Warteschlange für Desktop-Wechsel.
+
+Wechsel können gleichzeitig vom Hotkey-Listener, vom AutoSwitchService im
+Tray und aus der GUI kommen. Damit nie zwei Wechsel parallel den Explorer
+neu starten oder die Registry schreiben, laufen alle Anfragen über den
+SwitchBroker:
+
+- Anfragen landen in DATA_DIR/switch_queue.json (Zugriff unter file_lock).
+- Ausgeführt wird nur vom Halter des Besitzer-Locks (switch_owner.lock).
+  Das ist der Prozess, der es als erster bekommt; er arbeitet die
+  Warteschlange ab und gibt das Lock danach frei. Stirbt er, gibt das
+  Betriebssystem das Lock frei und der nächste Anfragende übernimmt.
+- Es gibt nur einen Platz für die nächste Anfrage: Eine neue Anfrage
+  ersetzt die wartende (Ergebnis "superseded"), so wird bei schnell
+  aufeinanderfolgenden Anfragen nur das letzte Ziel ausgeführt.
+- Ein laufender Wechsel fragt vor dem Registry-Schreiben nach, ob eine
+  Anfrage mit anderem Ziel wartet, und bricht dann ab ("cancelled").
+  Alt+1, Alt+2, Alt+3 kurz hintereinander kosten so einen Explorer-Neustart.
+
+Wartezeit und Warteschlangenlänge stehen im Log und im Trace des Wechsels
+(queue_wait_ms, queue_depth).
+
+Datei switch_queue.json:
+    {"next_seq": 8,
+     "pending": {"seq": 7, "desktop": "Spiele", "source": "listener", "pid": 123,
+                 "requested": 1700000000.1, "count": 2},
+     "running": {... wie pending, zusätzlich "started"},
+     "results": {"6": {"status": "ok", "desktop": "Arbeit", ...}}}
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from ..storage.file_operations import write_atomic
+from ..storage.locking import file_lock, get_lock_backend
+from ..utils.tracing import get_process_role
+from ...shared.config import DATA_DIR
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+QUEUE_FILE = os.path.join(DATA_DIR, "switch_queue.json")
+OWNER_LOCK_FILE = os.path.join(DATA_DIR, "switch_owner.lock")
+
+# Abstand, in dem Wartende das Ergebnis abfragen
+POLL_INTERVAL = 0.05
+
+# Längste Wartezeit auf das Ergebnis einer Anfrage (wait=True)
+RESULT_TIMEOUT = 120.0
+
+# Anzahl der aufbewahrten Ergebnisse
+RESULT_HISTORY = 32
+
+# Führt einen Wechsel aus: (Ziel, Eltern-Widget, Abbruch-Abfrage, Trace-Attribute) -> Erfolg
+SwitchExecutor = Callable[[str, Any, Callable[[], bool], Dict[str, Any]], bool]
+
+
+@dataclass(frozen=True)
+class SwitchOutcome:
+    """
+    Ergebnis einer Wechsel-Anfrage.
+
+    Attributes:
+        status: "ok", "failed", "cancelled" (zugunsten einer neueren Anfrage
+                abgebrochen), "superseded" (durch eine neuere Anfrage ersetzt,
+                nie gestartet), "queued" (wait=False) oder "timeout"
+        desktop_name: Ziel der Anfrage
+        seq: Laufende Nummer der Anfrage
+        queue_wait_ms: Zeit von der Anfrage bis zum Start des Wechsels
+        queue_depth: Anzahl der Anfragen, die in diesem Wechsel zusammengefasst wurden
+    """
+
+    status: str
+    desktop_name: str
+    seq: int
+    queue_wait_ms: float = 0.0
+    queue_depth: int = 0
+
+    @property
+    def success(self) -> bool:
+        return self.status == "ok"
+
+
+def _run_switch(desktop_name: str, parent: Any, cancelled: Callable[[], bool], trace_attrs: Dict[str, Any]) -> bool:
+    from . import desktop_service
+
+    return desktop_service.switch_to_desktop(desktop_name, parent=parent, cancelled=cancelled, trace_attrs=trace_attrs)
+
+
+class SwitchBroker:
+    """
+    Nimmt Wechsel-Anfragen entgegen und führt sie einzeln aus.
+
+    Args:
+        queue_file: Datei der Warteschlange (Standard: QUEUE_FILE)
+        owner_lock_file: Lock-Datei des ausführenden Prozesses (Standard: OWNER_LOCK_FILE)
+        execute: Führt einen Wechsel aus (Standard: desktop_service.switch_to_desktop)
+    """
+
+    def __init__(self, queue_file: Optional[str] = None, owner_lock_file: Optional[str] = None, execute: Optional[SwitchExecutor] = None):
+        self.queue_file = queue_file or QUEUE_FILE
+        self.owner_lock_file = owner_lock_file or OWNER_LOCK_FILE
+        self._execute = execute or _run_switch
+        # Eltern-Widgets der Anfragen dieses Prozesses (nur hier gültig)
+        self._parents: Dict[int, Any] = {}
+        self._parents_lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # Öffentliche Schnittstelle
+    # -------------------------------------------------------------------------
+
+    def request(self, desktop_name: str, parent: Any = None, wait: bool = True, source: Optional[str] = None, timeout: float = RESULT_TIMEOUT) -> SwitchOutcome:
+        """
+        Fordert einen Wechsel zu desktop_name an.
+
+        Args:
+            parent: Eltern-Widget für Dialoge, nur wenn dieser Prozess den
+                    Wechsel selbst ausführt
+            wait: True: bis zum Ergebnis warten (und ggf. selbst ausführen).
+                  False: sofort zurückkehren; ausgeführt wird in einem
+                  Hintergrund-Thread oder vom aktuellen Besitzer
+            source: Herkunft für Log und Trace (Standard: Prozessrolle)
+        """
+        seq = self._enqueue(desktop_name, source or get_process_role())
+        if parent is not None:
+            with self._parents_lock:
+                self._parents[seq] = parent
+
+        if not wait:
+            threading.Thread(target=self.drain, name="smartdesk-switch-broker", daemon=True).start()
+            return SwitchOutcome("queued", desktop_name, seq)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            self.drain()
+            outcome = self.outcome(seq)
+            if outcome is not None:
+                return outcome
+            if time.monotonic() >= deadline:
+                logger.warning(get_text("switch_broker.warn.timeout", desktop=desktop_name, timeout=timeout))
+                return SwitchOutcome("timeout", desktop_name, seq)
+            time.sleep(POLL_INTERVAL)
+
+    def outcome(self, seq: int) -> Optional[SwitchOutcome]:
+        """Ergebnis der Anfrage seq, None solange sie wartet oder läuft."""
+        result = self._load().get("results", {}).get(str(seq))
+        if result is None:
+            return None
+        return SwitchOutcome(result["status"], result["desktop"], seq, result.get("queue_wait_ms", 0.0), result.get("queue_depth", 0))
+
+    def drain(self) -> None:
+        """
+        Arbeitet die Warteschlange ab, falls kein anderer Prozess/Thread
+        das bereits tut. Kehrt sofort zurück, wenn das Besitzer-Lock belegt ist.
+        """
+        # Nach dem Freigeben erneut prüfen: Eine Anfrage, die während des
+        # letzten Wechsels kam, hat das Lock evtl. nicht bekommen.
+        while self._drain_once():
+            pass
+
+    # -------------------------------------------------------------------------
+    # Warteschlange
+    # -------------------------------------------------------------------------
+
+    def _enqueue(self, desktop_name: str, source: str) -> int:
+        """Trägt die Anfrage ein und gibt die Nummer zurück, auf deren Ergebnis zu warten ist."""
+        with self._state() as state:
+            pending, running = state.get("pending"), state.get("running")
+
+            if pending and pending["desktop"] == desktop_name:
+                pending["count"] += 1
+                return pending["seq"]
+
+            if running and running["desktop"] == desktop_name:
+                # Ziel läuft bereits: eine wartende Anfrage würde ihn nur abbrechen
+                if pending:
+                    self._supersede(state, pending, desktop_name)
+                    state["pending"] = None
+                return running["seq"]
+
+            seq = state.get("next_seq", 1)
+            state["next_seq"] = seq + 1
+            count = 1
+            if pending:
+                self._supersede(state, pending, desktop_name)
+                count += pending["count"]
+            state["pending"] = {"seq": seq, "desktop": desktop_name, "source": source, "pid": os.getpid(), "requested": time.time(), "count": count}
+            return seq
+
+    def _supersede(self, state: Dict[str, Any], pending: Dict[str, Any], by: str) -> None:
+        logger.info(get_text("switch_broker.info.superseded", desktop=pending["desktop"], by=by))
+        self._store_result(state, pending, "superseded")
+        with self._parents_lock:
+            self._parents.pop(pending["seq"], None)
+
+    def _take_pending(self) -> Optional[Dict[str, Any]]:
+        with self._state() as state:
+            request = state.get("pending")
+            if not request:
+                return None
+            request["started"] = time.time()
+            state["pending"] = None
+            state["running"] = request
+            return dict(request)
+
+    def _has_pending(self) -> bool:
+        return bool(self._load().get("pending"))
+
+    def _newer_target_waiting(self, request: Dict[str, Any]) -> bool:
+        pending = self._load().get("pending")
+        return bool(pending) and pending["desktop"] != request["desktop"]
+
+    def _finish(self, request: Dict[str, Any], status: str) -> None:
+        with self._state() as state:
+            running = state.get("running")
+            if running and running["seq"] == request["seq"]:
+                state["running"] = None
+            self._store_result(state, request, status)
+
+    def _store_result(self, state: Dict[str, Any], request: Dict[str, Any], status: str) -> None:
+        results = state.setdefault("results", {})
+        results[str(request["seq"])] = {
+            "status": status,
+            "desktop": request["desktop"],
+            "queue_wait_ms": _wait_ms(request),
+            "queue_depth": request["count"],
+            "finished": time.time(),
+        }
+        for key in sorted(results, key=int)[:-RESULT_HISTORY]:
+            del results[key]
+
+    # -------------------------------------------------------------------------
+    # Ausführung
+    # -------------------------------------------------------------------------
+
+    def _drain_once(self) -> bool:
+        """
+        Führt wartende Anfragen aus, solange dieser Aufrufer das Besitzer-Lock hält.
+
+        Returns:
+            True, wenn nach dem Freigeben schon wieder eine Anfrage wartet
+        """
+        backend = get_lock_backend()
+        handle = backend.open(self.owner_lock_file)
+        try:
+            if not backend.try_acquire(handle, False):
+                return False
+            try:
+                self._discard_interrupted()
+                while True:
+                    request = self._take_pending()
+                    if request is None:
+                        break
+                    self._run(request)
+            finally:
+                backend.release(handle)
+        finally:
+            backend.close(handle)
+        return self._has_pending()
+
+    def _discard_interrupted(self) -> None:
+        """Ein "running"-Eintrag ohne Besitzer stammt von einem abgestürzten Prozess."""
+        with self._state() as state:
+            running = state.get("running")
+            if running:
+                logger.warning(get_text("switch_broker.warn.interrupted", desktop=running["desktop"], pid=running.get("pid")))
+                state["running"] = None
+                self._store_result(state, running, "failed")
+
+    def _run(self, request: Dict[str, Any]) -> None:
+        seq = request["seq"]
+        with self._parents_lock:
+            parent = self._parents.pop(seq, None)
+
+        cancelled = []
+
+        def is_cancelled() -> bool:
+            if self._newer_target_waiting(request):
+                cancelled.append(True)
+                return True
+            return False
+
+        wait_ms = _wait_ms(request)
+        logger.info(get_text("switch_broker.info.executing", desktop=request["desktop"], source=request["source"], depth=request["count"], wait_ms=wait_ms))
+        trace_attrs = {"queue_seq": seq, "queue_wait_ms": wait_ms, "queue_depth": request["count"], "source": request["source"]}
+
+        try:
+            ok = bool(self._execute(request["desktop"], parent, is_cancelled, trace_attrs))
+        except Exception as e:
+            logger.error(get_text("switch_broker.error.execute", desktop=request["desktop"], e=e))
+            ok = False
+
+        if ok:
+            status = "ok"
+        elif cancelled:
+            status = "cancelled"
+            logger.info(get_text("switch_broker.info.cancelled", desktop=request["desktop"]))
+        else:
+            status = "failed"
+        self._finish(request, status)
+
+    # -------------------------------------------------------------------------
+    # Datei
+    # -------------------------------------------------------------------------
+
+    def _load(self) -> Dict[str, Any]:
+        with file_lock(self.queue_file + ".lock", shared=True):
+            return self._read()
+
+    def _read(self) -> Dict[str, Any]:
+        try:
+            with open(self.queue_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            return state if isinstance(state, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        """Liest den Zustand unter exklusivem Lock und schreibt ihn danach zurück."""
+        with file_lock(self.queue_file + ".lock"):
+            state = self._read()
+            yield state
+            write_atomic(self.queue_file, json.dumps(state).encode("utf-8"))
+
+
+def _wait_ms(request: Dict[str, Any]) -> float:
+    started = request.get("started")
+    return round((started - request["requested"]) * 1000, 1) if started else 0.0
+
+
+# Prozessweiter Broker (wird beim ersten Zugriff erzeugt)
+_broker: Optional[SwitchBroker] = None
+_broker_lock = threading.Lock()
+
+
+def get_switch_broker() -> SwitchBroker:
+    """Gibt den prozessweiten SwitchBroker zurück."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = SwitchBroker()
+        return _broker
+
+
+def set_switch_broker(broker: Optional[SwitchBroker]) -> None:
+    """Ersetzt den prozessweiten Broker (z.B. für Tests)."""
+    global _broker
+    with _broker_lock:
+        _broker = broker
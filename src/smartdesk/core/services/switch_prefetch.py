@@ -0,0 +1,428 @@
+# Dateipfad: src/smartdesk/core/services/switch_prefetch.py
+"""
+Vorausberechnung der Wiederherstellung für den wahrscheinlich nächsten
+Desktop.
+
+Nach dem Explorer-Neustart muss ein Wechsel Icons und Hintergrundbild des
+Ziels setzen. Bis auf die Zuordnung Name -> ListView-Index (erst nach dem
+Laden des ListViews bekannt) lässt sich das vorab erledigen:
+
+- SwitchHistory merkt sich die letzten HISTORY_LENGTH Wechsel (von, nach,
+  Quelle) und zählt je Quelle (z.B. "hotkey:2", "gui"), wie oft welcher
+  Desktop das Ziel war. predict() bewertet die Kandidaten nach Wechseln vom
+  aktuellen Desktop (neuere zählen mehr) und allgemeiner Häufigkeit.
+- SwitchPrefetcher baut im Leerlauf (IDLE_DELAY nach dem letzten Wechsel,
+  nie während eines Wechsels) für die PREFETCH_TARGETS besten Kandidaten
+  ein RestorePayload: IconRestorePlan (Name -> Position und gepackter
+  lParam, Layout bereits geladen) und das auf Bildschirmgröße skalierte
+  Hintergrundbild (wallpaper_service.prepare_wallpaper()).
+- Der Wechsel holt das Payload mit take() ab. Passt es nicht mehr zum
+  Desktop (Layout-Referenz oder Hintergrundbild geändert), wird es
+  verworfen.
+
+Im Trace des Wechsels stehen prefetch ("hit", "miss", "stale") und bei
+einem Treffer prefetch_saved_ms (Rechenzeit, die vorab im Leerlauf statt
+nach dem Neustart anfiel); smartdesk-trace --prefetch fasst das zusammen.
+
+Die Historie liegt in DATA_DIR/switch_history.json, damit Listener, Tray
+und GUI (die jeweils selbst Wechsel ausführen können) dasselbe Modell
+nutzen. Gespeichert wird im Leerlauf; zeitgleiche Änderungen zweier
+Prozesse können sich dabei überschreiben (die Historie ist nur ein Hinweis).
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..models.desktop import Desktop
+from ..storage import icon_layout_store
+from ..storage.file_operations import write_atomic
+from ...shared.config import DATA_DIR
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+from .icon_service import IconRestorePlan
+from . import wallpaper_service
+
+logger = get_logger(__name__)
+
+HISTORY_FILE = os.path.join(DATA_DIR, "switch_history.json")
+
+# Anzahl der gemerkten Wechsel
+HISTORY_LENGTH = 50
+
+# Anzahl der Desktops, für die ein Payload bereitliegt
+PREFETCH_TARGETS = 2
+
+# Ruhezeit nach dem letzten Wechsel, bevor vorausberechnet wird (Sekunden)
+IDLE_DELAY = 2.0
+
+# Gewicht der allgemeinen Häufigkeit gegenüber den Wechseln vom aktuellen Desktop
+FREQUENCY_WEIGHT = 1.0
+
+
+@dataclass(frozen=True)
+class Transition:
+    """Ein abgeschlossener Wechsel (from_desktop ist None ohne bisher aktiven Desktop)."""
+
+    from_desktop: Optional[str]
+    to_desktop: str
+    source: str
+    time: float
+
+
+class SwitchHistory:
+    """
+    Letzte Wechsel und Häufigkeit je Quelle.
+
+    Args:
+        path: JSON-Datei der Historie (None: nur im Speicher)
+        length: Anzahl der gemerkten Wechsel
+    """
+
+    def __init__(self, path: Optional[str] = HISTORY_FILE, length: int = HISTORY_LENGTH):
+        self.path = path
+        self._transitions: Deque[Transition] = deque(maxlen=length)
+        self._frequency: Dict[str, Dict[str, int]] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._reload()
+
+    @property
+    def transitions(self) -> List[Transition]:
+        with self._lock:
+            return list(self._transitions)
+
+    @property
+    def frequency(self) -> Dict[str, Dict[str, int]]:
+        """{Quelle: {Desktop: Anzahl}}"""
+        with self._lock:
+            return {source: dict(counts) for source, counts in self._frequency.items()}
+
+    def record(self, from_desktop: Optional[str], to_desktop: str, source: str) -> None:
+        """Vermerkt einen abgeschlossenen Wechsel."""
+        with self._lock:
+            self._reload()
+            self._transitions.append(Transition(from_desktop, to_desktop, source, time.time()))
+            counts = self._frequency.setdefault(source, {})
+            counts[to_desktop] = counts.get(to_desktop, 0) + 1
+            self._dirty = True
+
+    def predict(self, current: Optional[str], candidates: Iterable[str], limit: int = PREFETCH_TARGETS) -> List[str]:
+        """
+        Die limit wahrscheinlichsten nächsten Ziele unter candidates (ohne current).
+
+        Jeder Wechsel von current nach d zählt 1 bis 2 Punkte (je neuer,
+        desto mehr), dazu kommt der Anteil von d an allen bisherigen Zielen
+        (FREQUENCY_WEIGHT). Desktops ohne Punkte werden nicht vorgeschlagen.
+        """
+        allowed = set(candidates)
+        allowed.discard(current)
+        scores: Dict[str, float] = {}
+        with self._lock:
+            length = len(self._transitions)
+            for i, transition in enumerate(self._transitions):
+                if transition.from_desktop == current and transition.to_desktop in allowed:
+                    scores[transition.to_desktop] = scores.get(transition.to_desktop, 0.0) + 1.0 + i / length
+            totals: Dict[str, int] = {}
+            for counts in self._frequency.values():
+                for name, count in counts.items():
+                    totals[name] = totals.get(name, 0) + count
+        overall = sum(totals.values())
+        for name, count in totals.items():
+            if name in allowed:
+                scores[name] = scores.get(name, 0.0) + FREQUENCY_WEIGHT * count / overall
+        ranked = sorted(scores, key=lambda name: (-scores[name], name))
+        return ranked[:limit]
+
+    def save(self) -> bool:
+        """Schreibt die Historie, falls sie sich seit dem Laden geändert hat."""
+        with self._lock:
+            if not self._dirty or not self.path:
+                return True
+            state = {
+                "transitions": [[t.from_desktop, t.to_desktop, t.source, t.time] for t in self._transitions],
+                "frequency": self._frequency,
+            }
+            try:
+                write_atomic(self.path, json.dumps(state).encode("utf-8"))
+                self._stamp = _file_stamp(self.path)
+            except OSError as e:
+                logger.warning(get_text("switch_prefetch.warn.history_save_failed", path=self.path, e=e))
+                return False
+            self._dirty = False
+            return True
+
+    def _reload(self) -> None:
+        """Aufruf mit self._lock: Datei neu einlesen, wenn ein anderer Prozess sie geändert hat."""
+        if not self.path or self._dirty:
+            return
+        stamp = _file_stamp(self.path)
+        if stamp is None or stamp == self._stamp:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            transitions = [Transition(*entry) for entry in state.get("transitions", [])]
+            frequency = {str(source): {str(name): int(n) for name, n in counts.items()} for source, counts in state.get("frequency", {}).items()}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning(get_text("switch_prefetch.warn.history_load_failed", path=self.path, e=e))
+            return
+        self._transitions.clear()
+        self._transitions.extend(transitions)
+        self._frequency = frequency
+        self._stamp = stamp
+
+
+@dataclass(frozen=True)
+class RestorePayload:
+    """
+    Vorab berechnete Wiederherstellung eines Desktops.
+
+    Attributes:
+        desktop_name: Name des Desktops
+        layout_key: Layout-Referenz bzw. Inhalts-Hash der Icons beim Erstellen
+        plan: Zielpositionen und gepackte lParam-Werte
+        wallpaper_source: Hintergrundbild des Desktops ("" ohne)
+        wallpaper_stamp: Größe und Änderungszeit von wallpaper_source
+        wallpaper_path: Zu setzendes Bild (skaliert, sonst wallpaper_source)
+        build_ms: Rechenzeit für das Payload
+    """
+
+    desktop_name: str
+    layout_key: str
+    plan: IconRestorePlan
+    wallpaper_source: str
+    wallpaper_stamp: Optional[Tuple[int, int]]
+    wallpaper_path: str
+    build_ms: float
+
+    @classmethod
+    def build(cls, desktop: Desktop) -> "RestorePayload":
+        start = time.perf_counter()
+        plan = IconRestorePlan.of(desktop.icon_positionen)
+        source = desktop.wallpaper_path or ""
+        stamp = _file_stamp(source) if source else None
+        wallpaper_path = (wallpaper_service.prepare_wallpaper(source) or source) if stamp else source
+        return cls(desktop.name, _layout_key(desktop), plan, source, stamp, wallpaper_path, (time.perf_counter() - start) * 1000)
+
+    def matches(self, desktop: Desktop) -> bool:
+        """True, wenn Icons und Hintergrundbild des Desktops unverändert sind."""
+        source = desktop.wallpaper_path or ""
+        return (
+            desktop.name == self.desktop_name
+            and source == self.wallpaper_source
+            and (not source or _file_stamp(source) == self.wallpaper_stamp)
+            and (self.wallpaper_path == source or os.path.exists(self.wallpaper_path))
+            and _layout_key(desktop) == self.layout_key
+        )
+
+
+class SwitchPrefetcher:
+    """
+    Hält Payloads für die wahrscheinlich nächsten Ziele bereit.
+
+    Args:
+        history: Wechsel-Historie (Standard: SwitchHistory mit HISTORY_FILE)
+        idle_delay: Ruhezeit vor dem Vorausberechnen (None: kein Leerlauf-Thread,
+            nur prefetch_now(), z.B. in Tests)
+        targets: Anzahl der vorbereiteten Desktops
+
+    Attributes:
+        hits / misses / stale: Ergebnisse von take() in diesem Prozess
+        saved_ms: Summe von build_ms aller Treffer
+    """
+
+    def __init__(self, history: Optional[SwitchHistory] = None, idle_delay: Optional[float] = IDLE_DELAY, targets: int = PREFETCH_TARGETS):
+        self.history = history if history is not None else SwitchHistory()
+        self.idle_delay = idle_delay
+        self.targets = targets
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.saved_ms = 0.0
+        self._payloads: Dict[str, RestorePayload] = {}
+        self._holds = 0
+        self._due: Optional[float] = None
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+
+    # -------------------------------------------------------------------------
+    # Wechsel
+    # -------------------------------------------------------------------------
+
+    def hold(self) -> None:
+        """Ein Wechsel beginnt: bis release() wird nichts vorausberechnet."""
+        with self._cond:
+            self._holds += 1
+
+    def release(self) -> None:
+        """Der Wechsel ist beendet; nach idle_delay wird vorausberechnet."""
+        with self._cond:
+            self._holds = max(0, self._holds - 1)
+        self.schedule()
+
+    def record_switch(self, from_desktop: Optional[str], to_desktop: str, source: str) -> None:
+        """Vermerkt einen erfolgreichen Wechsel in der Historie."""
+        self.history.record(from_desktop, to_desktop, source)
+        self.schedule()
+
+    def take(self, desktop: Desktop) -> Tuple[Optional[RestorePayload], str]:
+        """
+        Holt das Payload für desktop ab.
+
+        Returns:
+            (Payload, "hit"), (None, "miss") ohne Payload oder
+            (None, "stale"), wenn es nicht mehr zum Desktop passt
+        """
+        with self._cond:
+            payload = self._payloads.pop(desktop.name, None)
+        if payload is None:
+            status = "miss"
+        elif payload.matches(desktop):
+            status = "hit"
+        else:
+            payload, status = None, "stale"
+        with self._cond:
+            if status == "hit":
+                self.hits += 1
+                self.saved_ms += payload.build_ms
+            elif status == "stale":
+                self.stale += 1
+            else:
+                self.misses += 1
+        return payload, status
+
+    def payload_names(self) -> List[str]:
+        """Desktops, für die gerade ein Payload bereitliegt."""
+        with self._cond:
+            return sorted(self._payloads)
+
+    # -------------------------------------------------------------------------
+    # Vorausberechnung
+    # -------------------------------------------------------------------------
+
+    def prefetch_now(self) -> List[str]:
+        """
+        Berechnet die Payloads für die wahrscheinlich nächsten Ziele sofort
+        (sonst Aufgabe des Leerlauf-Threads) und speichert die Historie.
+
+        Returns:
+            Namen der Desktops, für die jetzt ein Payload bereitliegt
+        """
+        from .desktop_service import get_all_desktops
+
+        self.history.save()
+        desktops = get_all_desktops()
+        active = next((d for d in desktops if d.is_active), None)
+        by_name = {d.name: d for d in desktops}
+        targets = self.history.predict(active.name if active else None, by_name, self.targets)
+
+        with self._cond:
+            current = {name: payload for name, payload in self._payloads.items() if name in targets}
+        for name in targets:
+            payload = current.get(name)
+            if payload is None or not payload.matches(by_name[name]):
+                try:
+                    current[name] = RestorePayload.build(by_name[name])
+                except Exception as e:
+                    logger.warning(get_text("switch_prefetch.warn.build_failed", name=name, e=e))
+                    current.pop(name, None)
+        with self._cond:
+            self._payloads = current
+        logger.debug(get_text("switch_prefetch.debug.prefetched", names=", ".join(sorted(current)) or "-"))
+        return sorted(current)
+
+    def schedule(self) -> None:
+        """Vorausberechnung idle_delay nach jetzt (bzw. nach dem Ende laufender Wechsel)."""
+        with self._cond:
+            if self._stopped or self.idle_delay is None:
+                return
+            self._due = time.monotonic() + self.idle_delay
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="smartdesk-switch-prefetch", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Beendet den Leerlauf-Thread und speichert die Historie."""
+        with self._cond:
+            self._stopped = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join(timeout)
+        self.history.save()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._stopped:
+                    if self._due is not None and not self._holds:
+                        remaining = self._due - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    else:
+                        self._cond.wait()
+                if self._stopped:
+                    return
+                self._due = None
+            try:
+                self.prefetch_now()
+            except Exception as e:
+                logger.warning(get_text("switch_prefetch.warn.prefetch_failed", e=e))
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _layout_key(desktop: Desktop) -> str:
+    """Layout-Referenz des Desktops; ohne Referenz (z.B. SQLite) der Hash der Icons."""
+    if desktop.icon_layout and not desktop.icons_dirty:
+        return desktop.icon_layout
+    return icon_layout_store.layout_ref_for(icon_layout_store.encode_layout(desktop.icon_positionen))
+
+
+# Prozessweiter Prefetcher (wird beim ersten Zugriff erzeugt)
+_prefetcher: Optional[SwitchPrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_switch_prefetcher() -> SwitchPrefetcher:
+    """Gibt den prozessweiten SwitchPrefetcher zurück."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = SwitchPrefetcher()
+        return _prefetcher
+
+
+def set_switch_prefetcher(prefetcher: Optional[SwitchPrefetcher]) -> None:
+    """Ersetzt den prozessweiten Prefetcher (z.B. für Tests); None setzt ihn zurück."""
+    global _prefetcher
+    with _prefetcher_lock:
+        old, _prefetcher = _prefetcher, prefetcher
+    if old is not None and old is not prefetcher:
+        old.shutdown()
+
+
+def _save_history() -> None:
+    """Beim Beenden: Wechsel seit der letzten Vorausberechnung noch speichern."""
+    prefetcher = _prefetcher
+    if prefetcher is not None:
+        prefetcher.history.save()
+
+
+atexit.register(_save_history)
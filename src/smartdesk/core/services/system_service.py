@@ -1,51 +1,196 @@
 # Dateipfad: src/smartdesk/core/services/system_service.py
 
 import subprocess
+import sys
 import time
 import psutil
 import os
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import List, Optional, Set
 
+from ..utils.tracing import get_current_trace
 from ...shared.localization import get_text
 
+# Abstand, in dem nach neuen Prozessen und dem Desktop-ListView gesehen wird
+# (vorher 0,5 s mit vollständigem Prozess-Scan)
+POLL_INTERVAL = 0.02
 
-def restart_explorer():
+# Längste Wartezeit auf das Ende der alten Prozesse
+EXIT_TIMEOUT = 5.0
+
+# Längste Wartezeit, bis Windows den Explorer selbst neu startet
+RESPAWN_TIMEOUT = 5.0
+
+# Längste Wartezeit auf das Desktop-ListView des neuen Explorers
+READY_TIMEOUT = 5.0
+
+_SYNCHRONIZE = 0x00100000
+_WAIT_TIMEOUT = 0x102
+
+
+@dataclass
+class ExplorerRestart:
+    """
+    Ablauf eines Explorer-Neustarts (Zeiten in Millisekunden seit dem Kill).
+
+    Attributes:
+        killed_pids: PIDs der beendeten Explorer-Prozesse
+        new_pid: PID des neuen Explorers (None, wenn keiner gefunden wurde)
+        started_by: "system" (Windows hat neu gestartet) oder "fallback" (Popen)
+        exited_ms: Alle alten Prozesse beendet
+        respawn_ms: Neuer Explorer-Prozess erkannt bzw. gestartet
+        ready_ms: Desktop-ListView vorhanden (None nach Zeitüberschreitung)
+    """
+
+    killed_pids: List[int] = field(default_factory=list)
+    new_pid: Optional[int] = None
+    started_by: str = "system"
+    exited_ms: Optional[float] = None
+    respawn_ms: Optional[float] = None
+    ready_ms: Optional[float] = None
+
+
+def _is_explorer(proc: psutil.Process) -> bool:
+    try:
+        return proc.name().lower() == "explorer.exe"
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
+
+
+def _open_exit_handles(pids: List[int]) -> Optional[list]:
+    """
+    Öffnet die Prozess-Handles vor dem Kill (danach könnte die PID schon
+    neu vergeben sein). None außerhalb von Windows.
+    """
+    if sys.platform != "win32":
+        return None
+    import win32api
+
+    handles = []
+    for pid in pids:
+        try:
+            handles.append(win32api.OpenProcess(_SYNCHRONIZE, False, pid))
+        except Exception:
+            pass  # Prozess schon beendet
+    return handles
+
+
+def _wait_for_exit(procs: List[psutil.Process], handles: Optional[list], timeout: float) -> bool:
+    """Wartet auf die Termination-Handles der Prozesse; True, wenn alle beendet sind."""
+    if handles is None:
+        _, alive = psutil.wait_procs(procs, timeout=timeout)
+        return not alive
+    if not handles:
+        return True
+
+    import win32api
+    import win32event
+
+    try:
+        result = win32event.WaitForMultipleObjects(handles, True, int(timeout * 1000))
+        return result != _WAIT_TIMEOUT
+    finally:
+        for handle in handles:
+            win32api.CloseHandle(handle)
+
+
+def _wait_for_new_explorer(known_pids: Set[int], timeout: float) -> Optional[int]:
+    """
+    Wartet auf einen Explorer-Prozess, der nach dem Kill entstanden ist.
+
+    Pro Durchlauf wird nur die PID-Liste gelesen (ohne Handles zu öffnen);
+    den Namen fragt die Schleife nur für neue PIDs ab, jede PID einmal.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        for pid in set(psutil.pids()) - known_pids:
+            known_pids.add(pid)
+            try:
+                proc = psutil.Process(pid)
+            except psutil.NoSuchProcess:
+                continue
+            if _is_explorer(proc):
+                return pid
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(POLL_INTERVAL)
+
+
+def _desktop_ready() -> bool:
+    """True, sobald der Explorer das Desktop-ListView angelegt hat."""
+    from .icon_service import _get_desktop_listview_handle
+
+    return bool(_get_desktop_listview_handle())
+
+
+def _wait_for_desktop(timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while not _desktop_ready():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(POLL_INTERVAL)
+    return True
+
+
+def restart_explorer() -> ExplorerRestart:
     """
     Startet den Windows Explorer Prozess neu.
-    Nutzt psutil für einen effizienten Prozess-Kill und prüft anschließend,
-    ob Windows den Prozess automatisch neu startet.
+
+    Die Explorer-Prozesse werden einmal gesucht und beendet; gewartet wird
+    auf ihre Termination-Handles. Danach werden nur Prozesse betrachtet, die
+    seit dem Kill entstanden sind, bis Windows den Explorer neu gestartet
+    hat (sonst: manueller Start). Zum Schluss wird auf das Desktop-ListView
+    gewartet.
+
+    Kill, Neustart und Bereitschaft werden als Stufen explorer_kill,
+    explorer_respawn und explorer_ready im laufenden Trace gemessen.
     """
     print(get_text("system.info.restarting"))
 
+    trace = get_current_trace()
+    stage = trace.stage if trace else (lambda name: nullcontext())
+    result = ExplorerRestart()
+
     try:
-        # Beende den Explorer via psutil (effizienter als PowerShell Subprozess)
+        # Einmaliger Scan: Explorer-Prozesse und alle bekannten PIDs
         procs = []
+        known_pids: Set[int] = set()
         for p in psutil.process_iter(['name']):
+            known_pids.add(p.pid)
             if p.name().lower() == 'explorer.exe':
                 procs.append(p)
+        result.killed_pids = [p.pid for p in procs]
+
+        killed_at = time.perf_counter()
+        with stage("explorer_kill"):
+            handles = _open_exit_handles(result.killed_pids)
+            for p in procs:
                 try:
                     p.kill()
                 except psutil.NoSuchProcess:
                     pass
+            if procs and not _wait_for_exit(procs, handles, EXIT_TIMEOUT):
+                print(get_text("system.warning.explorer_timeout"))
+        result.exited_ms = (time.perf_counter() - killed_at) * 1000
 
-        if procs:
-            # Warte bis die Prozesse beendet sind
-            psutil.wait_procs(procs, timeout=5)
-
-        # Warte kurz und prüfe, ob Windows den Explorer selbstständig neu gestartet hat
-        max_wait = 5
-        start_check = time.time()
-        restarted_by_system = False
+        # Beendete PIDs dürfen für den neuen Explorer wiederverwendet werden
+        known_pids.difference_update(result.killed_pids)
 
-        while time.time() - start_check < max_wait:
-            time.sleep(0.5)
-            if any(p.name().lower() == "explorer.exe" for p in psutil.process_iter(["name"])):
-                restarted_by_system = True
-                break
+        with stage("explorer_respawn"):
+            result.new_pid = _wait_for_new_explorer(known_pids, RESPAWN_TIMEOUT)
+            if result.new_pid is None:
+                # Fallback: Falls der Autostart von Windows deaktiviert ist, manuell starten
+                result.new_pid = subprocess.Popen("explorer.exe").pid
+                result.started_by = "fallback"
+        result.respawn_ms = (time.perf_counter() - killed_at) * 1000
 
-        if not restarted_by_system:
-            # Fallback: Falls der Autostart von Windows deaktiviert ist, manuell starten
-            subprocess.Popen("explorer.exe")
+        with stage("explorer_ready"):
+            if _wait_for_desktop(READY_TIMEOUT):
+                result.ready_ms = (time.perf_counter() - killed_at) * 1000
 
+        if trace:
+            trace.set(explorer_pid=result.new_pid, explorer_started_by=result.started_by)
         print(get_text("system.info.restarted"))
 
     except Exception as e:
@@ -56,19 +201,14 @@ def restart_explorer():
         except Exception:
             pass
 
+    return result
+
 
 def restart_explorer_simple():
     """
     Vereinfachte Version des Explorer-Neustarts.
+
+    Entspricht inzwischen restart_explorer() (früher Stop-Process über
+    PowerShell und eine feste Pause).
     """
-    print(get_text("system.info.restarting"))
-    try:
-        # Direkter Stop via PowerShell (schneller Einzeiler)
-        subprocess.run(["powershell.exe", "-NoProfile", "-Command", "Stop-Process -Name explorer -Force"], capture_output=True)
-        time.sleep(0.5)
-        # Sicherstellen, dass er läuft
-        if not any(p.name().lower() == "explorer.exe" for p in psutil.process_iter(["name"])):
-            subprocess.Popen("explorer.exe")
-        print(get_text("system.info.restarted"))
-    except Exception:
-        subprocess.Popen("explorer.exe")
+    return restart_explorer()
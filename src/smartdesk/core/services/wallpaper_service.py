@@ -1,18 +1,51 @@
 # Dateipfad: src/smartdesk/core/services/wallpaper_service.py
 
 import ctypes
+import hashlib
 import os
 import shutil
-from typing import Optional
+from typing import Optional, Tuple
 
 from ...shared.config import WALLPAPERS_DIR
 from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
 from ...shared.style import PREFIX_ERROR, PREFIX_OK
+from ...platform.current import get_platform
+
+try:  # Pillow ist optional: ohne wird das Originalbild gesetzt
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - abhängig von der Umgebung
+    Image = ImageOps = None
+
+logger = get_logger(__name__)
 
 # Windows API Konstanten
 SPI_SETDESKWALLPAPER = 0x0014
 SPIF_UPDATEINIFILE = 0x01
 SPIF_SENDWININICHANGE = 0x02
+SM_CXSCREEN = 0
+SM_CYSCREEN = 1
+
+# Auf Bildschirmgröße skalierte Bilder (siehe prepare_wallpaper())
+SCALED_DIR_NAME = "scaled"
+MAX_SCALED_WALLPAPERS = 8
+
+
+class Win32Wallpaper:
+    """
+    Hintergrundbild über SystemParametersInfoW.
+
+    Implementiert WallpaperSetter aus platform/interfaces.py.
+    """
+
+    def apply(self, path: str) -> bool:
+        path_c = ctypes.c_wchar_p(path)
+        return bool(ctypes.windll.user32.SystemParametersInfoW(SPI_SETDESKWALLPAPER, 0, path_c, SPIF_UPDATEINIFILE | SPIF_SENDWININICHANGE))
+
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        width = ctypes.windll.user32.GetSystemMetrics(SM_CXSCREEN)
+        height = ctypes.windll.user32.GetSystemMetrics(SM_CYSCREEN)
+        return (width, height) if width > 0 and height > 0 else None
 
 
 def set_wallpaper(path: str) -> bool:
@@ -24,8 +57,7 @@ def set_wallpaper(path: str) -> bool:
         return False
 
     try:
-        path_c = ctypes.c_wchar_p(path)
-        result = ctypes.windll.user32.SystemParametersInfoW(SPI_SETDESKWALLPAPER, 0, path_c, SPIF_UPDATEINIFILE | SPIF_SENDWININICHANGE)
+        result = get_platform().wallpaper.apply(path)
 
         if result:
             print(f"{PREFIX_OK} {get_text('wallpaper_manager.success.set')}")
@@ -39,6 +71,80 @@ def set_wallpaper(path: str) -> bool:
         return False
 
 
+def prepare_wallpaper(path: str, size: Optional[Tuple[int, int]] = None) -> Optional[str]:
+    """
+    Skaliert ein Hintergrundbild vorab auf Bildschirmgröße (wie "Ausfüllen":
+    bildschirmfüllend, mittig zugeschnitten) und legt es als BMP in
+    WALLPAPERS_DIR/scaled ab. Windows muss das Bild beim Setzen dann weder
+    dekodieren noch skalieren.
+
+    Das Ergebnis ist nach Quelldatei (Pfad, Größe, Änderungszeit) und
+    Bildschirmgröße zwischengespeichert; es bleiben höchstens
+    MAX_SCALED_WALLPAPERS Dateien erhalten.
+
+    Args:
+        size: Zielgröße (Standard: screen_size() der Plattform)
+
+    Returns:
+        Pfad des skalierten Bildes oder None (Pillow fehlt, Größe
+        unbekannt, Bild nicht lesbar)
+    """
+    if Image is None:
+        return None
+    target = scaled_wallpaper_path(path, size)
+    if target is None:
+        return None
+    if os.path.exists(target):
+        return target
+
+    size = size or get_platform().wallpaper.screen_size()
+    scaled_dir = os.path.dirname(target)
+    try:
+        os.makedirs(scaled_dir, exist_ok=True)
+        with Image.open(path) as image:
+            scaled = ImageOps.fit(image.convert("RGB"), size)
+        tmp_path = target + ".tmp"
+        scaled.save(tmp_path, format="BMP")
+        os.replace(tmp_path, target)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        logger.warning(get_text("wallpaper_manager.warn.prepare_failed", path=path, e=e))
+        return None
+
+    _prune_scaled_wallpapers(scaled_dir)
+    return target
+
+
+def scaled_wallpaper_path(path: str, size: Optional[Tuple[int, int]] = None) -> Optional[str]:
+    """
+    Pfad, unter dem prepare_wallpaper() die skalierte Fassung von path
+    ablegt (unabhängig davon, ob sie existiert); None, wenn Bild oder
+    Bildschirmgröße unbekannt sind.
+    """
+    size = size or get_platform().wallpaper.screen_size()
+    if not size:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = hashlib.sha1(f"{os.path.abspath(path)}|{stat.st_size}|{stat.st_mtime_ns}|{size[0]}x{size[1]}".encode("utf-8")).hexdigest()[:20]
+    return os.path.join(WALLPAPERS_DIR, SCALED_DIR_NAME, key + ".bmp")
+
+
+def _prune_scaled_wallpapers(scaled_dir: str) -> None:
+    """Löscht die ältesten skalierten Bilder über MAX_SCALED_WALLPAPERS hinaus."""
+    try:
+        with os.scandir(scaled_dir) as it:
+            entries = sorted((e for e in it if e.name.endswith(".bmp")), key=lambda e: e.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in entries[MAX_SCALED_WALLPAPERS:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
 def copy_wallpaper_to_datadir(source_path: str, desktop_name: str) -> Optional[str]:
     """
     Kopiert ein Bild in den AppData-Ordner von SmartDesk.
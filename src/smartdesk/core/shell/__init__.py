@@ -0,0 +1,26 @@
+# SmartDesk Core Shell
+from .interfaces import RefreshResult, ShellBackend, ShellRefresher
+from .implementations import WindowsShellBackend, SimulatedShellBackend, create_default_backend
+from .refresher import (
+    RestartRefresher,
+    SoftRefresher,
+    can_verify,
+    listview_shows_folder,
+    get_shell_refresher,
+    set_shell_refresher,
+)
+
+__all__ = [
+    "RefreshResult",
+    "ShellBackend",
+    "ShellRefresher",
+    "WindowsShellBackend",
+    "SimulatedShellBackend",
+    "create_default_backend",
+    "RestartRefresher",
+    "SoftRefresher",
+    "can_verify",
+    "listview_shows_folder",
+    "get_shell_refresher",
+    "set_shell_refresher",
+]
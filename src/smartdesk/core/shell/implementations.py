@@ -0,0 +1,204 @@
+# Dateipfad: src/smartdesk/core/shell/implementations.py
+"""
+Konkrete Implementierungen des ShellBackend Interfaces.
+
+Diese Datei enthält:
+- WindowsShellBackend: SHChangeNotify, WM_SETTINGCHANGE und das
+  Desktop-ListView über die Win32-API
+- SimulatedShellBackend: Shell mit einstellbaren Laufzeiten und
+  wirkungsloser Benachrichtigung (Tests, Benchmarks, Linux)
+
+Jede Klasse implementiert ShellBackend aus interfaces.py.
+"""
+
+import os
+import stat
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from ...shared.config import KEY_USER_SHELL
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# SHChangeNotify
+_SHCNE_ASSOCCHANGED = 0x08000000
+_SHCNE_UPDATEDIR = 0x00001000
+_SHCNF_IDLIST = 0x0000
+_SHCNF_PATHW = 0x0005
+
+# WM_SETTINGCHANGE an alle Top-Level-Fenster
+_HWND_BROADCAST = 0xFFFF
+_WM_SETTINGCHANGE = 0x001A
+_SMTO_ABORTIFHUNG = 0x0002
+_BROADCAST_TIMEOUT_MS = 200
+
+# Befehl "Aktualisieren" (F5) der Desktop-Ansicht SHELLDLL_DefView
+_WM_COMMAND = 0x0111
+_DEFVIEW_REFRESH = 0x7103
+
+_HIDDEN_ATTRIBUTES = getattr(stat, "FILE_ATTRIBUTE_HIDDEN", 0x2) | getattr(stat, "FILE_ATTRIBUTE_SYSTEM", 0x4)
+
+
+# =============================================================================
+# Windows
+# =============================================================================
+
+
+class WindowsShellBackend:
+    """
+    Shell-Operationen über die Win32-API.
+
+    Die Benachrichtigung besteht aus SHChangeNotify (SHCNE_ASSOCCHANGED und
+    SHCNE_UPDATEDIR für den neuen Ordner), WM_SETTINGCHANGE mit dem
+    Shell-Folders-Schlüssel und dem Befehl "Aktualisieren" an die
+    Desktop-Ansicht.
+    """
+
+    def __init__(self):
+        import ctypes
+
+        self._ctypes = ctypes
+        self._shell32 = ctypes.windll.shell32
+        self._user32 = ctypes.windll.user32
+
+    def notify_shell_change(self, new_path: str) -> None:
+        ctypes = self._ctypes
+        self._shell32.SHChangeNotify(_SHCNE_ASSOCCHANGED, _SHCNF_IDLIST, None, None)
+        self._shell32.SHChangeNotify(_SHCNE_UPDATEDIR, _SHCNF_PATHW, ctypes.c_wchar_p(new_path), None)
+
+        result = ctypes.c_size_t()
+        self._user32.SendMessageTimeoutW(
+            _HWND_BROADCAST,
+            _WM_SETTINGCHANGE,
+            0,
+            ctypes.c_wchar_p(KEY_USER_SHELL),
+            _SMTO_ABORTIFHUNG,
+            _BROADCAST_TIMEOUT_MS,
+            ctypes.byref(result),
+        )
+
+        import win32gui
+        from ..services.icon_service import _get_desktop_listview_handle
+
+        listview = _get_desktop_listview_handle()
+        if listview:
+            win32gui.PostMessage(win32gui.GetParent(listview), _WM_COMMAND, _DEFVIEW_REFRESH, 0)
+
+    def listview_items(self) -> Optional[List[str]]:
+        from ..services.icon_service import _get_desktop_listview_handle, get_current_icon_positions
+
+        if not _get_desktop_listview_handle():
+            return None
+        return [icon.name for icon in get_current_icon_positions(timeout_seconds=1)]
+
+    def folder_entries(self, path: str) -> List[str]:
+        try:
+            with os.scandir(path) as it:
+                return [entry.name for entry in it if not _is_hidden(entry)]
+        except OSError:
+            return []
+
+    def restart_explorer(self) -> None:
+        from ..services.system_service import restart_explorer
+
+        restart_explorer()
+
+
+def _is_hidden(entry: os.DirEntry) -> bool:
+    try:
+        attributes = getattr(entry.stat(follow_symlinks=False), "st_file_attributes", 0)
+    except OSError:
+        return True
+    return bool(attributes & _HIDDEN_ATTRIBUTES) or entry.name.startswith(".")
+
+
+# =============================================================================
+# Simulation
+# =============================================================================
+
+
+class SimulatedShellBackend:
+    """
+    Shell im Speicher mit einstellbaren Laufzeiten.
+
+    Args:
+        folders: Inhalt der Desktop-Ordner (Pfad -> Namen der Einträge)
+        shown_path: Ordner, den das ListView anfangs zeigt
+        soft_refresh_works: False simuliert einen Explorer, der die
+            Benachrichtigung ignoriert (dann hilft nur ein Neustart)
+        notify_latency: Dauer von notify_shell_change() in Sekunden
+        apply_delay: Zeit nach der Benachrichtigung, bis das ListView den
+            neuen Ordner zeigt
+        restart_duration: Dauer von restart_explorer() in Sekunden
+
+    Attributes:
+        notify_calls / restart_calls: Anzahl der Aufrufe (für Tests)
+    """
+
+    def __init__(
+        self,
+        folders: Optional[Dict[str, List[str]]] = None,
+        shown_path: Optional[str] = None,
+        soft_refresh_works: bool = True,
+        notify_latency: float = 0.0,
+        apply_delay: float = 0.0,
+        restart_duration: float = 0.0,
+    ):
+        self.folders = dict(folders or {})
+        self.shown_path = shown_path
+        self.soft_refresh_works = soft_refresh_works
+        self.notify_latency = notify_latency
+        self.apply_delay = apply_delay
+        self.restart_duration = restart_duration
+        self.notify_calls = 0
+        self.restart_calls = 0
+        self._target_path = shown_path
+        self._pending: Optional[tuple] = None  # (Pfad, Zeitpunkt der Übernahme)
+        self._lock = threading.Lock()
+
+    def set_registry_path(self, path: str) -> None:
+        """Simuliert den Registry-Eintrag, den der Explorer beim Start liest."""
+        with self._lock:
+            self._target_path = path
+
+    def notify_shell_change(self, new_path: str) -> None:
+        with self._lock:
+            self.notify_calls += 1
+            self._target_path = new_path
+        if self.notify_latency:
+            time.sleep(self.notify_latency)
+        if self.soft_refresh_works:
+            with self._lock:
+                self._pending = (new_path, time.monotonic() + self.apply_delay)
+
+    def listview_items(self) -> Optional[List[str]]:
+        with self._lock:
+            if self._pending and time.monotonic() >= self._pending[1]:
+                self.shown_path = self._pending[0]
+                self._pending = None
+            return list(self.folders.get(self.shown_path, [])) if self.shown_path else None
+
+    def folder_entries(self, path: str) -> List[str]:
+        return list(self.folders.get(path, []))
+
+    def restart_explorer(self) -> None:
+        with self._lock:
+            self.restart_calls += 1
+            self.shown_path = None
+            self._pending = None
+        if self.restart_duration:
+            time.sleep(self.restart_duration)
+        with self._lock:
+            self.shown_path = self._target_path
+
+
+def create_default_backend():
+    """Wählt das Backend für die aktuelle Plattform (Win32, sonst Simulation)."""
+    if sys.platform == "win32":
+        return WindowsShellBackend()
+    logger.warning(get_text("shell.warn.simulated_backend"))
+    return SimulatedShellBackend()
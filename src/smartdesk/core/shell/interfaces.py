@@ -0,0 +1,77 @@
+# Dateipfad: src/smartdesk/core/shell/interfaces.py
+"""
+Interfaces für das Aktualisieren der Windows-Shell nach einem Desktop-Wechsel.
+
+Nach dem Umstellen des Desktop-Pfads in der Registry muss der Explorer den
+neuen Ordner anzeigen. Dafür gibt es zwei Ebenen:
+
+- ShellBackend: Einzelne Operationen an der Shell (Benachrichtigen,
+  ListView auslesen, Explorer neu starten). Auf Windows über die Win32-API,
+  sonst simuliert.
+- ShellRefresher: Strategie, die diese Operationen kombiniert, z.B.
+  "immer neu starten" oder "benachrichtigen, prüfen, notfalls neu starten".
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Protocol
+
+
+@dataclass(frozen=True)
+class RefreshResult:
+    """
+    Ergebnis einer Shell-Aktualisierung.
+
+    Attributes:
+        method: "soft" (nur Benachrichtigung), "escalated" (Benachrichtigung
+                reichte nicht, Explorer neu gestartet) oder "restart"
+        verified: True, wenn das ListView nachweislich den neuen Ordner zeigt
+        duration_ms: Gesamtdauer der Aktualisierung
+    """
+
+    method: str
+    verified: bool
+    duration_ms: float
+
+
+class ShellBackend(Protocol):
+    """Operationen an der Windows-Shell, die ein ShellRefresher benötigt."""
+
+    def notify_shell_change(self, new_path: str) -> None:
+        """
+        Benachrichtigt die Shell, dass sich der Desktop-Ordner geändert hat.
+
+        Kehrt sofort zurück; die Shell liest den Ordner asynchron neu ein.
+        """
+        ...
+
+    def listview_items(self) -> Optional[List[str]]:
+        """
+        Liefert die Namen der Icons im Desktop-ListView.
+
+        Returns:
+            Liste der angezeigten Namen, None wenn kein ListView existiert
+            (z.B. während der Explorer neu startet)
+        """
+        ...
+
+    def folder_entries(self, path: str) -> List[str]:
+        """Liefert die sichtbaren Einträge eines Desktop-Ordners (leer, falls nicht lesbar)."""
+        ...
+
+    def restart_explorer(self) -> None:
+        """Beendet den Explorer und wartet, bis er wieder läuft."""
+        ...
+
+
+class ShellRefresher(Protocol):
+    """Strategie, mit der die Shell einen neuen Desktop-Ordner übernimmt."""
+
+    def refresh(self, new_path: str, old_path: Optional[str] = None) -> RefreshResult:
+        """
+        Sorgt dafür, dass der Explorer new_path als Desktop anzeigt.
+
+        Args:
+            new_path: Neuer Desktop-Ordner (bereits in der Registry eingetragen)
+            old_path: Bisheriger Desktop-Ordner, falls bekannt (zur Prüfung)
+        """
+        ...
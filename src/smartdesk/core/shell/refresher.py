@@ -0,0 +1,135 @@
+# Dateipfad: src/smartdesk/core/shell/refresher.py
+"""
+Strategien, mit denen der Explorer einen neuen Desktop-Ordner übernimmt.
+
+- RestartRefresher: Explorer beenden und neu starten (bisheriges Verhalten;
+  setzt auch Taskleiste und Infobereich zurück)
+- SoftRefresher: Shell benachrichtigen und prüfen, ob das Desktop-ListView
+  den neuen Ordner zeigt; erst wenn das nicht innerhalb von verify_timeout
+  gelingt, wird der Explorer neu gestartet
+
+Geprüft wird über Namen: Ein Eintrag, den es nur im alten Ordner gibt, darf
+nicht mehr sichtbar sein, und (falls vorhanden) muss ein Eintrag, den es nur
+im neuen Ordner gibt, sichtbar sein. Unterscheiden sich die Ordner nicht
+(z.B. beide leer), ist keine Prüfung möglich und der Explorer wird direkt
+neu gestartet.
+"""
+
+import os
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from .interfaces import RefreshResult, ShellBackend, ShellRefresher
+from .implementations import create_default_backend
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _is_shown(entry: str, shown: set) -> bool:
+    """Explorer zeigt Dateien mit oder ohne Endung an (z.B. Verknüpfungen immer ohne)."""
+    name = entry.lower()
+    return name in shown or os.path.splitext(name)[0] in shown
+
+
+def can_verify(new_entries: Iterable[str], old_entries: Iterable[str]) -> bool:
+    """True, wenn sich die Ordner in mindestens einem Eintrag unterscheiden."""
+    return {e.lower() for e in new_entries} != {e.lower() for e in old_entries}
+
+
+def listview_shows_folder(items: Optional[List[str]], new_entries: List[str], old_entries: List[str]) -> bool:
+    """
+    Prüft, ob das ListView den neuen statt des alten Ordners zeigt.
+
+    Args:
+        items: Namen im Desktop-ListView (None: kein ListView vorhanden)
+        new_entries: Einträge des neuen Desktop-Ordners
+        old_entries: Einträge des bisherigen Desktop-Ordners
+    """
+    if items is None:
+        return False
+    shown = {item.lower() for item in items}
+    new_names = {e.lower() for e in new_entries}
+    old_names = {e.lower() for e in old_entries}
+
+    if any(_is_shown(e, shown) for e in old_entries if e.lower() not in new_names):
+        return False
+    new_only = [e for e in new_entries if e.lower() not in old_names]
+    return not new_only or any(_is_shown(e, shown) for e in new_only)
+
+
+class RestartRefresher:
+    """Startet den Explorer bei jedem Wechsel neu."""
+
+    def __init__(self, backend: ShellBackend):
+        self.backend = backend
+
+    def refresh(self, new_path: str, old_path: Optional[str] = None) -> RefreshResult:
+        start = time.perf_counter()
+        self.backend.restart_explorer()
+        return RefreshResult("restart", False, (time.perf_counter() - start) * 1000)
+
+
+class SoftRefresher:
+    """
+    Benachrichtigt die Shell und startet den Explorer nur neu, wenn das
+    ListView danach nicht den neuen Ordner zeigt.
+
+    Args:
+        backend: Shell-Operationen
+        verify_timeout: Längste Wartezeit auf das aktualisierte ListView
+        poll_interval: Abstand zwischen zwei Prüfungen
+    """
+
+    def __init__(self, backend: ShellBackend, verify_timeout: float = 1.5, poll_interval: float = 0.05):
+        self.backend = backend
+        self.verify_timeout = verify_timeout
+        self.poll_interval = poll_interval
+
+    def refresh(self, new_path: str, old_path: Optional[str] = None) -> RefreshResult:
+        start = time.perf_counter()
+        new_entries = self.backend.folder_entries(new_path)
+        old_entries = self.backend.folder_entries(old_path) if old_path else []
+
+        if not can_verify(new_entries, old_entries):
+            logger.info(get_text("shell.info.not_verifiable", path=new_path))
+            self.backend.restart_explorer()
+            return RefreshResult("restart", False, (time.perf_counter() - start) * 1000)
+
+        self.backend.notify_shell_change(new_path)
+        deadline = time.monotonic() + self.verify_timeout
+        while True:
+            if listview_shows_folder(self.backend.listview_items(), new_entries, old_entries):
+                duration_ms = (time.perf_counter() - start) * 1000
+                logger.info(get_text("shell.info.soft_refreshed", duration_ms=duration_ms))
+                return RefreshResult("soft", True, duration_ms)
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(self.poll_interval)
+
+        logger.warning(get_text("shell.warn.escalating", timeout=self.verify_timeout))
+        self.backend.restart_explorer()
+        return RefreshResult("escalated", False, (time.perf_counter() - start) * 1000)
+
+
+# Prozessweiter Refresher (wird beim ersten Zugriff erzeugt)
+_refresher: Optional[ShellRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def get_shell_refresher() -> ShellRefresher:
+    """Gibt den prozessweiten ShellRefresher zurück (Standard: SoftRefresher)."""
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = SoftRefresher(create_default_backend())
+        return _refresher
+
+
+def set_shell_refresher(refresher: Optional[ShellRefresher]) -> None:
+    """Ersetzt den prozessweiten Refresher (z.B. für Tests oder Benchmarks)."""
+    global _refresher
+    with _refresher_lock:
+        _refresher = refresher
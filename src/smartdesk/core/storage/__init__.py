@@ -1,4 +1,16 @@
 # SmartDesk Core Storage
-from .file_operations import load_desktops, save_desktops, get_data_file_path
+from .file_operations import load_desktops, save_desktops, save_batch, get_data_file_path, migrate_icon_layouts, get_storage_engine, write_atomic, write_json
+from .desktop_repository import DesktopRepository, get_desktop_repository
 
-__all__ = ["load_desktops", "save_desktops", "get_data_file_path"]
+__all__ = [
+    "load_desktops",
+    "save_desktops",
+    "save_batch",
+    "get_data_file_path",
+    "migrate_icon_layouts",
+    "get_storage_engine",
+    "write_atomic",
+    "write_json",
+    "DesktopRepository",
+    "get_desktop_repository",
+]
@@ -0,0 +1,148 @@
+# Dateipfad: src/smartdesk/core/storage/codec.py
+"""
+Codec für desktops.json: versioniertes Dateiformat und Migrationen.
+
+Dateiformat (Version 2, ein Desktop pro Zeile):
+    {"schema_version":2,"desktops":[
+    {"name":"...","path":"...",...},
+    ...
+    ]}
+
+Ältere Formate werden beim Lesen über die Migrationskette MIGRATIONS
+schrittweise auf SCHEMA_VERSION gebracht und beim nächsten Speichern im
+aktuellen Format geschrieben:
+    1: reine Liste von Desktops (bis 0.5.x), ggf. mit Inline-Icons
+
+Ist orjson installiert, wird es zum Parsen und Serialisieren verwendet,
+sonst das json-Modul der Standardbibliothek. Beide erzeugen dieselbe
+kompakte Ausgabe.
+"""
+
+import json
+from typing import Any, Callable, Dict, List
+
+from ..models.desktop import Desktop
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+SCHEMA_VERSION = 2
+
+# Version, die eine Datei ohne "schema_version" hat (reine Liste)
+LEGACY_SCHEMA_VERSION = 1
+
+# Wiederverwendeter Encoder: json.dumps() mit Optionen baut sonst bei jedem
+# Aufruf einen neuen
+_json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+
+class SchemaVersionError(ValueError):
+    """Die Datei wurde von einer neueren SmartDesk-Version geschrieben."""
+
+    def __init__(self, version: int):
+        super().__init__(f"Schema-Version {version} ist neuer als die unterstützte Version {SCHEMA_VERSION}")
+        self.version = version
+
+
+# ----------------------------------------------------------------------
+# JSON-Backend
+# ----------------------------------------------------------------------
+
+
+def backend_name() -> str:
+    """Name der verwendeten JSON-Bibliothek ("orjson" oder "json")."""
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(payload: bytes) -> Any:
+    """Parst JSON aus bytes (UTF-8)."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialisiert kompakt nach UTF-8 (ohne Leerzeichen, Umlaute unverändert)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _json_encoder.encode(obj).encode("utf-8")
+
+
+# ----------------------------------------------------------------------
+# Migrationen
+# ----------------------------------------------------------------------
+
+
+def _migrate_1_to_2(data: Any) -> Dict[str, Any]:
+    # Reine Liste -> Umschlag mit Versionsnummer; Einträge bleiben gleich
+    return {"schema_version": 2, "desktops": data}
+
+
+# Quellversion -> Funktion, die das Dokument auf Quellversion + 1 hebt
+MIGRATIONS: Dict[int, Callable[[Any], Dict[str, Any]]] = {
+    1: _migrate_1_to_2,
+}
+
+
+def schema_version_of(data: Any) -> int:
+    """Schema-Version eines geparsten Dokuments."""
+    if isinstance(data, list):
+        return LEGACY_SCHEMA_VERSION
+    if isinstance(data, dict) and isinstance(data.get("schema_version"), int):
+        return data["schema_version"]
+    raise ValueError("Unbekanntes Format von desktops.json")
+
+
+def migrate(data: Any) -> Dict[str, Any]:
+    """
+    Hebt ein geparstes Dokument über die Migrationskette auf SCHEMA_VERSION.
+
+    Raises:
+        SchemaVersionError: Dokument ist neuer als diese Version
+        ValueError: Unbekanntes Format oder fehlende Migration
+    """
+    version = schema_version_of(data)
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionError(version)
+    while version < SCHEMA_VERSION:
+        step = MIGRATIONS.get(version)
+        if step is None:
+            raise ValueError(f"Keine Migration von Schema-Version {version}")
+        data = step(data)
+        version = schema_version_of(data)
+    return data
+
+
+# ----------------------------------------------------------------------
+# Desktops
+# ----------------------------------------------------------------------
+
+
+def decode_records(payload: bytes) -> List[Dict[str, Any]]:
+    """
+    Parst desktops.json (beliebige bekannte Version) in Desktop-Dicts.
+
+    Raises:
+        SchemaVersionError, ValueError
+    """
+    return migrate(loads(payload))["desktops"]
+
+
+def decode_desktops(payload: bytes) -> List[Desktop]:
+    """Parst desktops.json in Desktop-Objekte (Icons nur bei Inline-Icons)."""
+    return [Desktop.from_dict(record) for record in decode_records(payload)]
+
+
+def encode_records(records: List[Dict[str, Any]]) -> bytes:
+    """Serialisiert Desktop-Dicts im aktuellen Format (ein Desktop pro Zeile)."""
+    header = b'{"schema_version":' + str(SCHEMA_VERSION).encode("ascii") + b',"desktops":['
+    if not records:
+        return header + b"]}\n"
+    return header + b"\n" + b",\n".join(map(dumps, records)) + b"\n]}\n"
+
+
+def encode_desktops(desktops: List[Desktop]) -> bytes:
+    """Serialisiert Desktops ohne Icons (nur Layout-Referenz) im aktuellen Format."""
+    return encode_records([desktop.to_dict(include_icons=False) for desktop in desktops])
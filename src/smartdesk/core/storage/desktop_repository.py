@@ -0,0 +1,179 @@
+# Dateipfad: src/smartdesk/core/storage/desktop_repository.py
+"""
+Prozessweiter In-Memory-Cache für die Desktop-Liste.
+
+load_desktops() liest und parst bei jedem Aufruf die komplette desktops.json
+(inkl. aller Icon-Positionen). Da get_all_desktops() aus Timern (Control Panel,
+Auto-Switch) und mehrfach pro Desktop-Wechsel aufgerufen wird, hält das
+DesktopRepository die geparste, vorsortierte Liste samt Indizes im Speicher.
+
+Validierung:
+    Vor jedem Zugriff wird die Signatur der Speicher-Engine geprüft (JSON: ein
+    stat() auf desktops.json, SQLite: PRAGMA data_version). Nur wenn sie sich
+    geändert hat - also ein anderer Prozess geschrieben hat - wird neu
+    gelesen. Eigene Speichervorgänge aktualisieren den Cache direkt über einen
+    Save-Listener, ohne erneutes Parsen.
+
+Aufrufer erhalten immer flache Kopien der Desktop-Objekte, damit Änderungen
+(z.B. is_active) den Cache nicht unbemerkt verfälschen.
+"""
+
+import threading
+from typing import Dict, Hashable, List, Optional
+
+from ..models.desktop import Desktop, DesktopList, path_key
+from . import file_operations
+from ...shared.logging_config import get_logger
+from ...shared.localization import get_text
+
+logger = get_logger(__name__)
+
+
+def sort_key(desktop: Desktop):
+    """Sortierung: Geschützte Desktops zuerst, dann alphabetisch."""
+    return (not desktop.protected, desktop.name.lower())
+
+
+class DesktopRepository:
+    """
+    Cache für die Desktops der aktiven Speicher-Engine.
+
+    Hält die Desktops in Datei-Reihenfolge, vorsortiert sowie als
+    Name- und Pfad-Index. Thread-sicher über ein RLock.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._data_file: Optional[str] = None
+        self._signature: Optional[Hashable] = None
+        self._desktops: List[Desktop] = []
+        self._sorted: List[Desktop] = []
+        self._by_name: Dict[str, Desktop] = {}
+        self._by_path: Dict[str, Desktop] = {}
+        self._active: Optional[Desktop] = None
+
+        # Statistik (für Benchmarks und Debugging)
+        self.hits = 0
+        self.reloads = 0
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    def load(self) -> DesktopList:
+        """Alle Desktops in Datei-Reihenfolge (Kopien)."""
+        with self._lock:
+            self._ensure_fresh()
+            return DesktopList(d.copy() for d in self._desktops)
+
+    def get_all(self) -> DesktopList:
+        """Alle Desktops, geschützte zuerst, dann alphabetisch (Kopien)."""
+        with self._lock:
+            self._ensure_fresh()
+            return DesktopList(d.copy() for d in self._sorted)
+
+    def get_by_name(self, name: str) -> Optional[Desktop]:
+        """Desktop anhand des Namens in O(1) (Kopie) oder None."""
+        with self._lock:
+            self._ensure_fresh()
+            desktop = self._by_name.get(name)
+            return desktop.copy() if desktop else None
+
+    def get_by_path(self, path: str) -> Optional[Desktop]:
+        """Desktop anhand des (normalisierten) Pfads in O(1) (Kopie) oder None."""
+        with self._lock:
+            self._ensure_fresh()
+            desktop = self._by_path.get(path_key(path))
+            return desktop.copy() if desktop else None
+
+    def get_active(self) -> Optional[Desktop]:
+        """Den als aktiv markierten Desktop (Kopie) oder None."""
+        with self._lock:
+            self._ensure_fresh()
+            return self._active.copy() if self._active else None
+
+    def invalidate(self) -> None:
+        """Verwirft den Cache; der nächste Zugriff liest die Datei neu."""
+        with self._lock:
+            self._signature = None
+            self._data_file = None
+
+    def on_saved(self, data_file: str, desktops: List[Desktop], signature: Optional[Hashable]) -> None:
+        """
+        Save-Listener: Übernimmt den gerade geschriebenen Stand in den Cache.
+
+        Gespeichert werden Kopien, da Aufrufer ihre Objekte nach dem Speichern
+        weiterverwenden und verändern.
+        """
+        with self._lock:
+            if signature is None:
+                self.invalidate()
+                return
+            self._rebuild(data_file, [d.copy() for d in desktops], signature)
+
+    # ------------------------------------------------------------------
+    # Interna
+    # ------------------------------------------------------------------
+
+    def _ensure_fresh(self) -> None:
+        # Vorgemerkte Speichervorgänge (save_batch) zuerst schreiben
+        file_operations.flush_pending_saves()
+
+        engine = file_operations.get_storage_engine()
+        data_file = engine.location()
+        signature = engine.signature()
+
+        if signature is None:
+            # Datei existiert (noch) nicht
+            self._rebuild(data_file, [], None)
+            return
+
+        if data_file == self._data_file and signature == self._signature:
+            self.hits += 1
+            return
+
+        try:
+            desktops, read_signature = engine.read_desktops()
+        except Exception as e:
+            logger.error(get_text("storage.error.load", e=e))
+            # Nichts cachen, damit der nächste Aufruf es erneut versucht
+            self._rebuild(data_file, [], None)
+            return
+
+        self.reloads += 1
+        self._rebuild(data_file, desktops, read_signature)
+
+    def _rebuild(self, data_file: str, desktops: List[Desktop], signature: Optional[Hashable]) -> None:
+        self._data_file = data_file if signature is not None else None
+        self._signature = signature
+        self._desktops = desktops
+        self._sorted = sorted(desktops, key=sort_key)
+        self._by_name = {d.name: d for d in desktops}
+        self._by_path = {d.path_key: d for d in desktops}
+        self._active = next((d for d in desktops if d.is_active), None)
+
+
+# Singleton
+_repository: Optional[DesktopRepository] = None
+_repository_lock = threading.Lock()
+
+
+def get_desktop_repository() -> DesktopRepository:
+    """Gibt das prozessweite DesktopRepository zurück."""
+    global _repository
+    with _repository_lock:
+        if _repository is None:
+            _repository = DesktopRepository()
+            file_operations.add_save_listener(_repository.on_saved)
+        return _repository
+
+
+def set_desktop_repository(repository: Optional[DesktopRepository]) -> None:
+    """Ersetzt das prozessweite Repository (z.B. für Tests)."""
+    global _repository
+    with _repository_lock:
+        if _repository is not None:
+            file_operations.remove_save_listener(_repository.on_saved)
+        _repository = repository
+        if repository is not None:
+            file_operations.add_save_listener(repository.on_saved)
@@ -1,55 +1,68 @@
 # Dateipfad: src/smartdesk/core/storage/file_operations.py
 
-import json
+import hashlib
 import os
-import random
+import tempfile
+import threading
 import time
 from contextlib import contextmanager
-from typing import List
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
-from ..models.desktop import Desktop
+from ..models.desktop import Desktop, IconPosition, path_key
+from . import codec, icon_layout_store
+from .interfaces import RuleStore, StorageEngine
+from .locking import file_lock
 from ...shared.config import DATA_DIR
+from ...shared.logging_config import get_logger
+from ...shared.localization import get_text
+
+logger = get_logger(__name__)
 
 DATA_FILE_PATH = os.path.join(DATA_DIR, "desktops.json")
 LOCK_FILE_PATH = os.path.join(DATA_DIR, "desktops.lock")
 
+# (st_mtime_ns, st_size, st_ino) - identifiziert einen konkreten Dateistand
+FileSignature = Tuple[int, int, int]
 
-@contextmanager
-def file_lock(lock_file, timeout=10):
+# Auswahl der Speicher-Engine ("json", "journal" oder "sqlite"); die Umgebungsvariable
+# hat Vorrang vor der Einstellung "storage_engine"
+STORAGE_ENGINE_ENV = "SMARTDESK_STORAGE_ENGINE"
+DEFAULT_STORAGE_ENGINE = "json"
+
+# Callbacks, die nach jedem erfolgreichen Speichern aufgerufen werden:
+# listener(location, desktops, signature) - location/signature der Engine
+_save_listeners: List[Callable[[str, List[Desktop], Optional[Hashable]], None]] = []
+
+# Zuletzt geschriebener Stand je Datei: data_file -> (Inhalts-Hash, Signatur).
+# Erlaubt es, identische Speichervorgänge komplett zu überspringen.
+_written_state: Dict[str, Tuple[str, FileSignature]] = {}
+
+
+class _BatchState(threading.local):
     """
-    A context manager for file-based locking.
-    Uses exponential backoff to reduce polling frequency.
+    Schreib-Batching je Thread: Innerhalb von save_batch() werden
+    Speichervorgänge nur vorgemerkt (letzter Stand gewinnt) und beim
+    Verlassen einmalig geschrieben. Thread-lokal, damit ein Batch im
+    Wechsel-Thread die Speichervorgänge anderer Threads (Tray, Broker,
+    Prefetch) nicht aufhält.
+
+    pending: location -> (Engine, Desktops des Aufrufers, Kopien zum Schreiben)
     """
-    start_time = time.time()
-    sleep_time = 0.001  # Start with 1ms
-    max_sleep = 0.1  # Cap at 100ms
 
-    while True:
-        try:
-            # Try to create the lock file in exclusive mode
-            fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-            os.close(fd)
-            break
-        except FileExistsError:
-            if time.time() - start_time >= timeout:
-                raise TimeoutError("Could not acquire lock within the specified timeout.")
+    def __init__(self):
+        self.depth = 0
+        self.pending: Dict[str, Tuple[StorageEngine, List[Desktop], List[Desktop]]] = {}
 
-            # Add jitter to prevent thundering herd
-            jitter = random.uniform(0, sleep_time * 0.1)
-            time.sleep(sleep_time + jitter)
 
-            # Exponential backoff: double the wait time, but cap it
-            sleep_time = min(sleep_time * 2, max_sleep)
+_batch = _BatchState()
 
-    try:
-        yield
-    finally:
-        # Remove the lock file
-        try:
-            os.remove(lock_file)
-        except OSError:
-            # Ignore errors during removal (e.g. if file was already removed)
-            pass
+_engine: Optional[StorageEngine] = None
+_engine_lock = threading.Lock()
+
+# os.replace kann unter Windows kurzzeitig fehlschlagen, wenn ein anderer
+# Prozess (z.B. Virenscanner) die Zieldatei geöffnet hat.
+REPLACE_RETRIES = 5
+REPLACE_RETRY_DELAY = 0.01
 
 
 def get_data_file_path() -> str:
@@ -57,33 +70,211 @@ def get_data_file_path() -> str:
     return DATA_FILE_PATH
 
 
-def load_desktops() -> List[Desktop]:
+def stat_signature(path: str) -> Optional[FileSignature]:
     """
-    Lädt alle Desktops aus der desktops.json Datei.
-    Gibt eine leere Liste zurück, wenn die Datei nicht existiert.
+    Liefert die (mtime, size, inode)-Signatur einer Datei oder None,
+    wenn sie nicht existiert. Ein einzelner stat()-Aufruf, kein Lesen.
     """
-    data_file = get_data_file_path()
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def add_save_listener(listener: Callable[[str, List[Desktop], Optional[Hashable]], None]) -> None:
+    """Registriert einen Callback, der nach jedem erfolgreichen save_desktops() läuft."""
+    if listener not in _save_listeners:
+        _save_listeners.append(listener)
 
-    if not os.path.exists(data_file):
-        return []
+
+def remove_save_listener(listener: Callable[[str, List[Desktop], Optional[Hashable]], None]) -> None:
+    """Entfernt einen zuvor registrierten Save-Callback."""
+    if listener in _save_listeners:
+        _save_listeners.remove(listener)
+
+
+def read_desktops_file(data_file: str) -> Tuple[List[Desktop], Optional[FileSignature]]:
+    """
+    Liest und parst eine desktops.json unter dem (geteilten) Datei-Lock.
+
+    Die Signatur wird über den geöffneten Datei-Deskriptor ermittelt und passt
+    damit garantiert zu dem Inhalt, der gerade gelesen wurde.
+
+    Raises:
+        OSError, ValueError, TimeoutError bei Lese-/Parse-/Lock-Fehlern
+    """
+    with file_lock(LOCK_FILE_PATH, shared=True):
+        with open(data_file, "rb") as f:
+            st = os.fstat(f.fileno())
+            payload = f.read()
+
+    try:
+        desktops = codec.decode_desktops(payload)
+    except codec.SchemaVersionError as e:
+        logger.error(get_text("storage.error.file_schema_version", path=data_file, version=e.version, supported=codec.SCHEMA_VERSION))
+        raise
+    for desktop in desktops:
+        # Icons aus Layout-Dateien erst beim ersten Zugriff laden
+        if desktop.icon_layout and not desktop.icons_loaded:
+            desktop.attach_icon_loader(layout_loader(data_file, desktop.icon_layout))
+    return desktops, (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def layout_loader(data_file: str, layout_ref: str) -> Callable[[], List[IconPosition]]:
+    """Erzeugt den Lazy-Loader für ein Icon-Layout."""
+    path = icon_layout_store.get_layout_path(data_file, layout_ref)
+
+    def load() -> List[IconPosition]:
+        try:
+            return icon_layout_store.read_layout(path)
+        except (OSError, ValueError) as e:
+            logger.error(get_text("storage.error.layout_read", path=path, e=e))
+            return []
+
+    return load
+
+
+def load_desktops() -> List[Desktop]:
+    """
+    Lädt alle Desktops über die konfigurierte Speicher-Engine.
+    Gibt eine leere Liste zurück, wenn noch nichts gespeichert wurde.
+    """
+    flush_pending_saves()
 
     try:
-        with file_lock(LOCK_FILE_PATH):
-            with open(data_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                desktops = []
-                for item in data:
-                    desktop = Desktop.from_dict(item)
-                    desktops.append(desktop)
-                return desktops
+        desktops, _ = get_storage_engine().read_desktops()
+        return desktops
     except Exception as e:
         print(f"Fehler beim Laden der Desktops: {e}")
         return []
 
 
+def serialize_desktops(desktops: List[Desktop]) -> bytes:
+    """
+    Serialisiert die Desktops in das Dateiformat von desktops.json.
+
+    Ein Desktop pro Zeile im versionierten Format (siehe codec), damit die
+    Datei trotzdem zeilenweise lesbar/diffbar bleibt.
+
+    Icon-Positionen stehen nicht in der Datei, sondern nur die Referenz auf
+    die Layout-Datei (siehe store_icon_layouts).
+    """
+    return codec.encode_desktops(desktops)
+
+
+def write_atomic(data_file: str, payload: bytes) -> None:
+    """
+    Schreibt payload crash-sicher nach data_file (desktops.json, Layout-Datei,
+    Journal, aber auch Zustandsdateien anderer Module).
+
+    Der Inhalt landet zuerst in einer temporären Datei im selben Verzeichnis,
+    wird per fsync auf die Platte gebracht und dann per os.replace atomar
+    an die Stelle der alten Datei gesetzt. Leser sehen so immer entweder den
+    alten oder den neuen, nie einen halb geschriebenen Stand.
+    """
+    directory = os.path.dirname(data_file) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix="." + os.path.basename(data_file) + "-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        for attempt in range(REPLACE_RETRIES):
+            try:
+                os.replace(tmp_path, data_file)
+                break
+            except PermissionError:
+                if attempt == REPLACE_RETRIES - 1:
+                    raise
+                time.sleep(REPLACE_RETRY_DELAY)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _notify_save_listeners(location: str, desktops: List[Desktop], signature: Optional[Hashable]) -> None:
+    for listener in list(_save_listeners):
+        try:
+            listener(location, desktops, signature)
+        except Exception as e:
+            logger.error(get_text("storage.error.save_listener", e=e))
+
+
+def store_icon_layouts(data_file: str, desktops: List[Desktop]) -> None:
+    """Schreibt geänderte Icon-Layouts und setzt die Referenzen der Desktops."""
+    for desktop in desktops:
+        if not desktop.icons_dirty:
+            continue
+        icons = desktop.icon_positionen
+        layout_ref = icon_layout_store.write_layout(data_file, icons, write_atomic) if icons else ""
+        desktop.mark_icons_saved(layout_ref)
+
+
+def _remove_unreferenced_layouts(data_file: str, desktops: List[Desktop]) -> None:
+    referenced = {d.icon_layout for d in desktops if d.icon_layout}
+    for path, e in icon_layout_store.remove_unreferenced_layouts(data_file, referenced):
+        logger.warning(get_text("storage.warn.layout_cleanup", path=path, e=e))
+
+
+def write_json(data_file: str, desktops: List[Desktop]) -> Optional[FileSignature]:
+    """
+    Schreibt desktops.json sofort (atomar, mit Hash-Vergleich).
+
+    Raises:
+        OSError, TimeoutError bei Schreib-/Lock-Fehlern
+    """
+    # Stelle sicher, dass das Verzeichnis existiert
+    os.makedirs(os.path.dirname(data_file), exist_ok=True)
+
+    with file_lock(LOCK_FILE_PATH):
+        # Layouts unter dem Lock schreiben, damit die Bereinigung eines
+        # anderen Prozesses sie nicht vor dem Schreiben der JSON entfernt
+        store_icon_layouts(data_file, desktops)
+
+        payload = serialize_desktops(desktops)
+        digest = hashlib.sha1(payload).hexdigest()
+        signature = stat_signature(data_file)
+        written = _written_state.get(data_file)
+
+        # Inhalt unverändert und Datei seitdem nicht von außen angefasst
+        # -> Schreiben komplett überspringen
+        if not (written and signature is not None and written == (digest, signature)):
+            write_atomic(data_file, payload)
+            signature = stat_signature(data_file)
+            if signature is not None:
+                _written_state[data_file] = (digest, signature)
+            _remove_unreferenced_layouts(data_file, desktops)
+
+    return signature
+
+
+def _write_desktops(engine: StorageEngine, desktops: List[Desktop]) -> bool:
+    """Schreibt die Desktops sofort über die Engine und benachrichtigt die Listener."""
+    try:
+        signature = engine.write_desktops(desktops)
+    except Exception as e:
+        print(f"Fehler beim Speichern der Desktops: {e}")
+        return False
+
+    _notify_save_listeners(engine.location(), desktops, signature)
+    return True
+
+
 def save_desktops(desktops: List[Desktop]) -> bool:
     """
-    Speichert alle Desktops in die desktops.json Datei.
+    Speichert alle Desktops über die konfigurierte Speicher-Engine.
+
+    JSON: Die Datei wird atomar ersetzt. Ist der serialisierte Inhalt
+    identisch mit dem zuletzt geschriebenen, entfällt der Schreibvorgang.
+    SQLite: Nur geänderte Zeilen werden in einer Transaktion geschrieben.
+    Journal: Nur geänderte Desktops werden als eine Zeile angehängt.
+    Innerhalb von save_batch() wird nur vorgemerkt und beim Verlassen
+    einmal geschrieben.
 
     Args:
         desktops: Liste der zu speichernden Desktop-Objekte
@@ -91,21 +282,232 @@ def save_desktops(desktops: List[Desktop]) -> bool:
     Returns:
         True bei Erfolg, False bei Fehler
     """
-    data_file = get_data_file_path()
+    engine = get_storage_engine()
 
-    # Stelle sicher, dass das Verzeichnis existiert
-    os.makedirs(os.path.dirname(data_file), exist_ok=True)
+    if _batch.depth > 0:
+        # Kopien, damit spätere Änderungen des Aufrufers den
+        # vorgemerkten Stand nicht verändern
+        _batch.pending[engine.location()] = (engine, list(desktops), [d.copy() for d in desktops])
+        return True
 
-    try:
-        with file_lock(LOCK_FILE_PATH):
-            data = []
-            for desktop in desktops:
-                data.append(desktop.to_dict())
+    return _write_desktops(engine, desktops)
+
+
+def _adopt_saved_layouts(originals: List[Desktop], saved: List[Desktop]) -> None:
+    """
+    Übernimmt nach dem Schreiben vorgemerkter Kopien deren Layout-Referenz
+    auf die Desktops des Aufrufers (wie beim direkten Speichern).
+
+    Wurden dem Original seit dem Vormerken neue Icons zugewiesen
+    (icons_revision), bleibt es als geändert markiert.
+    """
+    for original, copy in zip(originals, saved):
+        if original.icons_dirty and not copy.icons_dirty and original.icons_revision == copy.icons_revision:
+            original.mark_icons_saved(copy.icon_layout)
 
-            with open(data_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
 
+def flush_pending_saves() -> bool:
+    """
+    Schreibt die in save_batch() vorgemerkten Speichervorgänge des
+    aufrufenden Threads sofort.
+
+    Wird vor jedem Lesen aufgerufen, damit auch innerhalb eines Batches
+    immer der zuletzt gespeicherte Stand gelesen wird.
+
+    Returns:
+        True, wenn alle Schreibvorgänge erfolgreich waren
+    """
+    pending = _batch.pending
+    if not pending:
         return True
+
+    entries = list(pending.values())
+    pending.clear()
+
+    success = True
+    for engine, originals, copies in entries:
+        if _write_desktops(engine, copies):
+            _adopt_saved_layouts(originals, copies)
+        else:
+            success = False
+    return success
+
+
+@contextmanager
+def save_batch():
+    """
+    Fasst alle save_desktops()-Aufrufe des aufrufenden Threads im Block zu
+    einem Schreibvorgang zusammen.
+
+    Verschachtelbar; geschrieben wird beim Verlassen des äußersten Blocks
+    (auch bei Exceptions), und zwar der zuletzt gespeicherte Stand.
+    Speichervorgänge anderer Threads werden sofort geschrieben.
+
+    Bewusst an einen Block gebunden statt an ein Zeitfenster: Fehler kommen
+    beim Verlassen des Blocks an, und beim Beenden des Prozesses bleibt
+    nichts ungeschrieben.
+    """
+    _batch.depth += 1
+    try:
+        yield
+    finally:
+        _batch.depth -= 1
+        if _batch.depth == 0:
+            flush_pending_saves()
+
+
+def migrate_icon_layouts() -> int:
+    """
+    Migriert Inline-Icons (altes Format von desktops.json) in Layout-Dateien.
+
+    Das passiert auch automatisch beim nächsten Speichern; diese Funktion
+    erzwingt es, damit Leser sofort von der kleinen desktops.json profitieren.
+
+    Returns:
+        Anzahl der migrierten Desktops
+    """
+    if get_storage_engine().name != JsonStorageEngine.name:
+        return 0
+
+    desktops = load_desktops()
+    count = sum(1 for d in desktops if d.icons_dirty and d.icon_positionen)
+    if count and save_desktops(desktops):
+        logger.info(get_text("storage.info.layouts_migrated", count=count))
+        return count
+    return 0
+
+
+def save_icon_layout(name: str, icons: List[IconPosition]) -> bool:
+    """
+    Speichert nur das Icon-Layout eines einzelnen Desktops.
+
+    Bei SQLite eine einzelne Zeile, bei JSON eine neue Layout-Datei plus
+    aktualisierte Referenz in desktops.json.
+
+    Returns:
+        True, wenn der Desktop existiert und gespeichert wurde
+    """
+    flush_pending_saves()
+    try:
+        # Kein Save-Listener: Das Repository erkennt die Änderung an der Signatur
+        return get_storage_engine().update_icon_layout(name, icons)
     except Exception as e:
-        print(f"Fehler beim Speichern der Desktops: {e}")
+        logger.error(get_text("storage.error.icon_layout_save", name=name, e=e))
         return False
+
+
+# ----------------------------------------------------------------------
+# Speicher-Engines
+# ----------------------------------------------------------------------
+
+
+class JsonStorageEngine:
+    """
+    Implementiert StorageEngine über desktops.json und Layout-Dateien.
+
+    Standard-Engine. Alle Pfade werden bei jedem Aufruf über
+    get_data_file_path() ermittelt.
+    """
+
+    name = "json"
+
+    def location(self) -> str:
+        return get_data_file_path()
+
+    def watch_paths(self) -> List[str]:
+        return [get_data_file_path()]
+
+    def signature(self) -> Optional[FileSignature]:
+        return stat_signature(get_data_file_path())
+
+    def read_desktops(self) -> Tuple[List[Desktop], Optional[FileSignature]]:
+        data_file = get_data_file_path()
+        if not os.path.exists(data_file):
+            return [], None
+        return read_desktops_file(data_file)
+
+    def write_desktops(self, desktops: List[Desktop]) -> Optional[FileSignature]:
+        return write_json(get_data_file_path(), desktops)
+
+    def get_desktop(self, name: str) -> Optional[Desktop]:
+        desktops, _ = self.read_desktops()
+        return next((d for d in desktops if d.name == name), None)
+
+    def find_desktop_by_path(self, path: str) -> Optional[Desktop]:
+        key = path_key(path)
+        desktops, _ = self.read_desktops()
+        return next((d for d in desktops if d.path_key == key), None)
+
+    def update_icon_layout(self, name: str, icons: List[IconPosition]) -> bool:
+        desktops, _ = self.read_desktops()
+        desktop = next((d for d in desktops if d.name == name), None)
+        if desktop is None:
+            return False
+        desktop.icon_positionen = icons
+        write_json(get_data_file_path(), desktops)
+        return True
+
+
+def _configured_engine_name() -> str:
+    name = os.environ.get(STORAGE_ENGINE_ENV)
+    if not name:
+        # Lazy-Import: services hängen von storage ab, nicht umgekehrt
+        from ..services import settings_service
+
+        name = settings_service.get_setting("storage_engine", DEFAULT_STORAGE_ENGINE)
+    return (name or DEFAULT_STORAGE_ENGINE).strip().lower()
+
+
+def _create_engine(name: str) -> StorageEngine:
+    if name == "sqlite":
+        from .sqlite_engine import SqliteStorageEngine, get_database_path, import_from_json
+
+        data_file = get_data_file_path()
+        db_path = get_database_path(data_file)
+        is_new = not os.path.exists(db_path)
+        engine = SqliteStorageEngine(db_path)
+        if is_new and os.path.exists(data_file):
+            # Erster Start mit SQLite: bestehende JSON-Daten übernehmen
+            try:
+                import_from_json(engine, data_file, os.path.join(os.path.dirname(data_file), "rules.json"))
+            except Exception as e:
+                logger.error(get_text("storage.error.load", e=e))
+        return engine
+    if name == "journal":
+        from .journal_engine import JournalStorageEngine
+
+        return JournalStorageEngine()
+    if name != JsonStorageEngine.name:
+        logger.warning(get_text("storage.warn.unknown_engine", name=name, default=DEFAULT_STORAGE_ENGINE))
+    return JsonStorageEngine()
+
+
+def get_storage_engine() -> StorageEngine:
+    """
+    Gibt die konfigurierte Speicher-Engine zurück.
+
+    Wird beim ersten Aufruf aus SMARTDESK_STORAGE_ENGINE bzw. der Einstellung
+    "storage_engine" bestimmt; ein Wechsel wirkt nach dem Neustart.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = _create_engine(_configured_engine_name())
+        return _engine
+
+
+def set_storage_engine(engine: Optional[StorageEngine]) -> None:
+    """Ersetzt die Speicher-Engine (z.B. für Tests); None wählt neu aus der Konfiguration."""
+    global _engine
+    flush_pending_saves()
+    with _engine_lock:
+        _engine = engine
+
+
+def get_rule_store() -> Optional[RuleStore]:
+    """
+    Die Engine, falls sie auch die Auto-Switch-Regeln verwaltet, sonst None
+    (dann bleiben die Regeln in rules.json).
+    """
+    engine = get_storage_engine()
+    return engine if hasattr(engine, "load_rules") and hasattr(engine, "save_rules") else None
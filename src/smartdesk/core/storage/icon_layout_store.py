@@ -0,0 +1,167 @@
+# Dateipfad: src/smartdesk/core/storage/icon_layout_store.py
+"""
+Kompakter Binär-Speicher für Icon-Layouts.
+
+Statt die Icon-Positionen jedes Desktops als {"index", "name", "x", "y"}-Dicts
+in desktops.json einzubetten, liegt pro Layout eine Binärdatei in
+<Datenverzeichnis>/layouts/. desktops.json enthält nur noch eine Referenz
+("icon_layout"), Metadaten-Zugriffe parsen damit keine Icon-Daten mehr.
+
+Dateiformat (Little Endian):
+    Header      <4sHHII>  Magic b"SDIL", Version, reserviert, Anzahl, Länge der String-Tabelle
+    Koordinaten int32[Anzahl * 3]  (index, x, y) je Icon
+    Strings     UTF-8, Icon-Namen durch NUL getrennt
+
+Die Dateien sind inhaltsadressiert: Der Dateiname ist der SHA-1 des Inhalts.
+Jede Layout-Änderung ändert damit auch die Referenz in desktops.json, sodass
+der Stat-Cache des DesktopRepository Änderungen anderer Prozesse erkennt.
+Gleiche Layouts werden automatisch dedupliziert.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Iterable, List, Set, Tuple
+
+from ..models.desktop import IconPosition
+
+LAYOUT_DIR_NAME = "layouts"
+LAYOUT_SUFFIX = ".sdl"
+
+MAGIC = b"SDIL"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+
+
+class LayoutFormatError(ValueError):
+    """Die Layout-Datei ist beschädigt oder hat ein unbekanntes Format."""
+
+
+def get_layout_dir(data_file: str) -> str:
+    """Verzeichnis der Layout-Dateien neben der desktops.json."""
+    return os.path.join(os.path.dirname(data_file), LAYOUT_DIR_NAME)
+
+
+def get_layout_path(data_file: str, layout_ref: str) -> str:
+    """Pfad der Layout-Datei zu einer Referenz aus desktops.json."""
+    return os.path.join(get_layout_dir(data_file), layout_ref + LAYOUT_SUFFIX)
+
+
+def encode_layout(icons: List[IconPosition]) -> bytes:
+    """Kodiert Icon-Positionen in das Binärformat."""
+    coords = array("i")
+    for icon in icons:
+        coords.append(icon.index)
+        coords.append(icon.x)
+        coords.append(icon.y)
+    if sys.byteorder != "little":
+        coords.byteswap()
+
+    names = "\0".join(icon.name for icon in icons).encode("utf-8")
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(icons), len(names))
+    return header + coords.tobytes() + names
+
+
+def layout_ref_for(payload: bytes) -> str:
+    """Inhaltsadresse (Dateiname ohne Endung) eines kodierten Layouts."""
+    return hashlib.sha1(payload).hexdigest()
+
+
+def decode_layout(buffer) -> List[IconPosition]:
+    """
+    Dekodiert ein Layout aus einem bytes-artigen Objekt (bytes, mmap, memoryview).
+
+    Raises:
+        LayoutFormatError bei falschem Magic, unbekannter Version oder Größe
+    """
+    if len(buffer) < _HEADER.size:
+        raise LayoutFormatError("Datei zu kurz")
+
+    magic, version, _reserved, count, names_size = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise LayoutFormatError("Unbekanntes Dateiformat")
+    if version != VERSION:
+        raise LayoutFormatError(f"Nicht unterstützte Version {version}")
+
+    coords_start = _HEADER.size
+    names_start = coords_start + count * 12
+    if len(buffer) != names_start + names_size:
+        raise LayoutFormatError("Dateigröße passt nicht zum Header")
+
+    if count == 0:
+        return []
+
+    coords = array("i")
+    coords.frombytes(buffer[coords_start:names_start])
+    if sys.byteorder != "little":
+        coords.byteswap()
+
+    names = bytes(buffer[names_start:]).decode("utf-8").split("\0")
+    if len(names) != count:
+        raise LayoutFormatError("String-Tabelle passt nicht zur Anzahl")
+
+    # Gestaffelte Slices + map() statt Index-Arithmetik pro Icon
+    return list(map(IconPosition, coords[0::3], names, coords[1::3], coords[2::3]))
+
+
+def read_layout(path: str) -> List[IconPosition]:
+    """
+    Liest eine Layout-Datei per Memory-Mapping.
+
+    Raises:
+        OSError, LayoutFormatError
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < _HEADER.size:
+            raise LayoutFormatError("Datei zu kurz")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return decode_layout(mm)
+
+
+def write_layout(data_file: str, icons: List[IconPosition], write_atomic) -> str:
+    """
+    Schreibt ein Layout (falls noch nicht vorhanden) und gibt seine Referenz zurück.
+
+    Args:
+        data_file: Pfad der zugehörigen desktops.json
+        icons: Zu speichernde Icon-Positionen
+        write_atomic: Funktion (path, payload) für crash-sicheres Schreiben
+    """
+    payload = encode_layout(icons)
+    layout_ref = layout_ref_for(payload)
+    path = get_layout_path(data_file, layout_ref)
+
+    # Inhaltsadressiert: existiert die Datei, ist der Inhalt identisch
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        write_atomic(path, payload)
+    return layout_ref
+
+
+def remove_unreferenced_layouts(data_file: str, referenced: Iterable[str]) -> List[Tuple[str, OSError]]:
+    """
+    Löscht Layout-Dateien, auf die keine Referenz mehr zeigt.
+
+    Returns:
+        Liste von (Pfad, Fehler) für Dateien, die nicht gelöscht werden konnten
+    """
+    layout_dir = get_layout_dir(data_file)
+    keep: Set[str] = {ref + LAYOUT_SUFFIX for ref in referenced}
+    failed = []
+
+    try:
+        entries = os.listdir(layout_dir)
+    except OSError:
+        return failed
+
+    for entry in entries:
+        if entry.endswith(LAYOUT_SUFFIX) and entry not in keep:
+            try:
+                os.remove(os.path.join(layout_dir, entry))
+            except OSError as e:
+                failed.append((os.path.join(layout_dir, entry), e))
+    return failed
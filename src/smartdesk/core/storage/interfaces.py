@@ -0,0 +1,149 @@
+# Dateipfad: src/smartdesk/core/storage/interfaces.py
+"""
+Interfaces (Protocols) für die Speicher-Engines.
+
+Diese Datei definiert die Schnittstellen für:
+- Desktop-Speicherung inkl. Icon-Layouts (StorageEngine)
+- Auto-Switch-Regeln (RuleStore, optional)
+
+load_desktops()/save_desktops() in file_operations delegieren an die
+konfigurierte Engine. Standard ist die JSON-Engine (desktops.json plus
+Layout-Dateien); alternativ ein Änderungsjournal neben desktops.json
+(siehe journal_engine) oder eine SQLite-Datenbank (siehe sqlite_engine).
+"""
+
+from typing import Dict, Hashable, List, Optional, Protocol, Tuple
+
+from ..models.desktop import Desktop, IconPosition
+
+
+class StorageEngine(Protocol):
+    """
+    Interface für die Persistierung der Desktops.
+
+    Attributes:
+        name: Kurzname der Engine ("json", "journal", "sqlite")
+    """
+
+    name: str
+
+    def location(self) -> str:
+        """
+        Speicherort der Engine (Datei bzw. Datenbank).
+
+        Returns:
+            Pfad, unter dem die Engine ihre Daten ablegt
+        """
+        ...
+
+    def signature(self) -> Optional[Hashable]:
+        """
+        Günstige Änderungskennung des gespeicherten Stands.
+
+        Ändert sich, sobald ein anderer Prozess (oder eine andere Verbindung)
+        geschrieben hat. Wird vom DesktopRepository vor jedem Zugriff geprüft.
+
+        Returns:
+            Vergleichbarer Wert oder None, wenn (noch) nichts gespeichert ist
+        """
+        ...
+
+    def watch_paths(self) -> List[str]:
+        """
+        Dateien, deren Änderung einen neuen Stand bedeutet (für den Datei-Watcher).
+
+        Returns:
+            Liste von Dateipfaden
+        """
+        ...
+
+    def read_desktops(self) -> Tuple[List[Desktop], Optional[Hashable]]:
+        """
+        Liest alle Desktops in gespeicherter Reihenfolge.
+
+        Icon-Positionen werden wenn möglich erst beim ersten Zugriff geladen.
+
+        Returns:
+            (Desktops, Signatur des gelesenen Stands)
+
+        Raises:
+            Exception bei Lese-/Parse-Fehlern
+        """
+        ...
+
+    def write_desktops(self, desktops: List[Desktop]) -> Optional[Hashable]:
+        """
+        Schreibt die komplette Desktop-Liste (alles oder nichts).
+
+        Args:
+            desktops: Die zu speichernden Desktops
+
+        Returns:
+            Signatur des geschriebenen Stands
+
+        Raises:
+            Exception bei Schreibfehlern (der alte Stand bleibt erhalten)
+        """
+        ...
+
+    def get_desktop(self, name: str) -> Optional[Desktop]:
+        """
+        Lädt einen einzelnen Desktop anhand des Namens.
+
+        Returns:
+            Den Desktop oder None
+        """
+        ...
+
+    def find_desktop_by_path(self, path: str) -> Optional[Desktop]:
+        """
+        Lädt einen einzelnen Desktop anhand des (normalisierten) Pfads.
+
+        Returns:
+            Den Desktop oder None
+        """
+        ...
+
+    def update_icon_layout(self, name: str, icons: List[IconPosition]) -> bool:
+        """
+        Ersetzt nur das Icon-Layout eines Desktops.
+
+        Args:
+            name: Name des Desktops
+            icons: Neue Icon-Positionen
+
+        Returns:
+            True, wenn der Desktop existiert und aktualisiert wurde
+        """
+        ...
+
+
+class RuleStore(Protocol):
+    """
+    Interface für die Auto-Switch-Regeln (Prozessname -> Desktop-Name).
+
+    Optional: Nur Engines, die auch die Regeln verwalten, implementieren es.
+    Ohne RuleStore bleibt AutoSwitchService bei rules.json.
+    """
+
+    def load_rules(self) -> Dict[str, str]:
+        """
+        Lädt alle Regeln.
+
+        Returns:
+            Dict Prozessname -> Desktop-Name
+        """
+        ...
+
+    def save_rules(self, rules: Dict[str, str]) -> None:
+        """
+        Ersetzt alle Regeln in einer Transaktion.
+
+        Args:
+            rules: Dict Prozessname -> Desktop-Name
+        """
+        ...
+
+    def signature(self) -> Optional[Hashable]:
+        """Änderungskennung (siehe StorageEngine.signature)."""
+        ...
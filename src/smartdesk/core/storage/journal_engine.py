@@ -0,0 +1,356 @@
+# Dateipfad: src/smartdesk/core/storage/journal_engine.py
+"""
+Journal-Speicher-Engine: Snapshot plus Append-only-Änderungsjournal.
+
+Kleine Änderungen (is_active beim Wechsel, Umbenennen, Icons eines Desktops)
+schreiben bei der JSON-Engine jedes Mal die komplette desktops.json. Diese
+Engine hängt stattdessen nur die geänderten Desktops als eine Zeile an
+"desktops.journal" an; desktops.json dient als Snapshot. Aktivierung über
+"storage_engine": "journal" bzw. SMARTDESK_STORAGE_ENGINE=journal.
+
+Journal-Format (eine Zeile = ein Speichervorgang, kompaktes JSON):
+    {"ops": [["put", {...Desktop ohne Icons...}], ["del", "Name"], ["order", [...]]]}
+
+    put    Desktop anlegen/ersetzen (Icons als Referenz auf die Layout-Datei)
+    del    Desktop entfernen
+    order  neue Reihenfolge (nur wenn sie sich geändert hat)
+
+    Alle Operationen sind idempotent. Eine abgebrochene letzte Zeile (Absturz
+    beim Schreiben) wird beim Lesen ignoriert und vor dem nächsten Anhängen
+    abgeschnitten.
+
+Lesen:
+    Der zuletzt gelesene Stand bleibt im Speicher. Ist nur das Journal
+    gewachsen, wird ausschließlich das neue Ende gelesen und angewendet;
+    nur nach einer Kompaktierung wird der Snapshot neu geparst.
+
+Kompaktierung:
+    Überschreitet das Journal COMPACT_THRESHOLD Bytes, schreibt ein
+    Hintergrund-Thread den aktuellen Stand als neuen Snapshot und ersetzt das
+    Journal durch ein leeres. Beides unter dem exklusiven Datei-Lock; bricht
+    der Vorgang dazwischen ab, wird das alte Journal beim Lesen einfach
+    erneut (idempotent) auf den neuen Snapshot angewendet.
+"""
+
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.desktop import Desktop, IconPosition, path_key
+from . import codec, file_operations, icon_layout_store
+from .locking import file_lock
+from ...shared.logging_config import get_logger
+from ...shared.localization import get_text
+
+logger = get_logger(__name__)
+
+JOURNAL_FILE_NAME = "desktops.journal"
+
+# Ab dieser Journal-Größe (Bytes) wird im Hintergrund kompaktiert
+COMPACT_THRESHOLD = 64 * 1024
+
+# (Snapshot-Signatur, Journal-Signatur)
+JournalSignature = Tuple[Optional[file_operations.FileSignature], Optional[file_operations.FileSignature]]
+
+
+def get_journal_path(data_file: str) -> str:
+    """Pfad des Journals neben der desktops.json."""
+    return os.path.join(os.path.dirname(data_file), JOURNAL_FILE_NAME)
+
+
+def apply_ops(state: Dict[str, Dict[str, Any]], ops: List[list]) -> None:
+    """Wendet Journal-Operationen auf den Stand (Name -> Desktop-Dict) an."""
+    for op in ops:
+        kind = op[0]
+        if kind == "put":
+            record = op[1]
+            state[record["name"]] = record
+        elif kind == "del":
+            state.pop(op[1], None)
+        elif kind == "order":
+            ordered = {name: state[name] for name in op[1] if name in state}
+            # Unbekannte Desktops behalten ihre relative Position am Ende
+            for name, record in state.items():
+                ordered.setdefault(name, record)
+            state.clear()
+            state.update(ordered)
+
+
+def diff_ops(state: Dict[str, Dict[str, Any]], records: List[Dict[str, Any]]) -> List[list]:
+    """Berechnet die Operationen, die state in records überführen."""
+    ops: List[list] = []
+    names = [record["name"] for record in records]
+    wanted = set(names)
+
+    for name in state:
+        if name not in wanted:
+            ops.append(["del", name])
+    for record in records:
+        if state.get(record["name"]) != record:
+            ops.append(["put", record])
+
+    # Reihenfolge nach Anwenden von del/put (neue Desktops landen am Ende)
+    remaining = [name for name in state if name in wanted]
+    resulting = remaining + [name for name in names if name not in state]
+    if resulting != names:
+        ops.append(["order", names])
+    return ops
+
+
+def replay_journal(records: List[Dict[str, Any]], journal_file: str) -> List[Dict[str, Any]]:
+    """
+    Wendet ein Journal ohne Engine und ohne Lock auf Snapshot-Einträge an.
+
+    Für Leser außerhalb des Kernprozesses (z.B. die Übersicht), denen ein
+    kurzzeitig veralteter Stand genügt.
+
+    Args:
+        records: Einträge aus desktops.json (Dicts, siehe codec.decode_records)
+        journal_file: Pfad des Journals (fehlt es, bleibt records unverändert)
+    """
+    state = {record["name"]: record for record in records}
+    try:
+        with open(journal_file, "rb") as f:
+            data = f.read()
+    except OSError:
+        return records
+    for line in data[: data.rfind(b"\n") + 1].splitlines():
+        try:
+            apply_ops(state, codec.loads(line)["ops"])
+        except (ValueError, KeyError, IndexError, TypeError):
+            continue
+    return list(state.values())
+
+
+class JournalStorageEngine:
+    """
+    Implementiert StorageEngine über Snapshot (desktops.json) und Journal.
+
+    Thread-sicher über ein RLock, prozessübergreifend über das Datei-Lock
+    der JSON-Engine.
+    """
+
+    name = "journal"
+
+    def __init__(self, compact_threshold: int = COMPACT_THRESHOLD):
+        self.compact_threshold = compact_threshold
+        self._lock = threading.RLock()
+        self._data_file: Optional[str] = None
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._snapshot_signature: Optional[file_operations.FileSignature] = None
+        self._journal_ino: Optional[int] = None
+        self._journal_offset = 0
+        self._compactor: Optional[threading.Thread] = None
+
+        # Statistik (für Benchmarks und Debugging)
+        self.snapshot_loads = 0
+        self.compactions = 0
+
+    # ------------------------------------------------------------------
+    # StorageEngine
+    # ------------------------------------------------------------------
+
+    def location(self) -> str:
+        return get_journal_path(file_operations.get_data_file_path())
+
+    def watch_paths(self) -> List[str]:
+        data_file = file_operations.get_data_file_path()
+        return [data_file, get_journal_path(data_file)]
+
+    def signature(self) -> Optional[JournalSignature]:
+        data_file = file_operations.get_data_file_path()
+        snapshot = file_operations.stat_signature(data_file)
+        journal = file_operations.stat_signature(get_journal_path(data_file))
+        if snapshot is None and journal is None:
+            return None
+        return (snapshot, journal)
+
+    def read_desktops(self) -> Tuple[List[Desktop], Optional[JournalSignature]]:
+        data_file = file_operations.get_data_file_path()
+        with self._lock:
+            with file_lock(file_operations.LOCK_FILE_PATH, shared=True):
+                self._refresh(data_file)
+                signature = self.signature()
+            return self._build_desktops(data_file), signature
+
+    def write_desktops(self, desktops: List[Desktop]) -> Optional[JournalSignature]:
+        data_file = file_operations.get_data_file_path()
+        os.makedirs(os.path.dirname(data_file), exist_ok=True)
+
+        with self._lock:
+            with file_lock(file_operations.LOCK_FILE_PATH):
+                # Layouts zuerst (inhaltsadressiert), damit das Journal nur
+                # auf bereits vorhandene Dateien verweist
+                file_operations.store_icon_layouts(data_file, desktops)
+                self._refresh(data_file)
+
+                ops = diff_ops(self._state, [d.to_dict(include_icons=False) for d in desktops])
+                if ops:
+                    self._append(data_file, ops)
+                signature = self.signature()
+
+            self._maybe_compact()
+        return signature
+
+    def get_desktop(self, name: str) -> Optional[Desktop]:
+        desktops, _ = self.read_desktops()
+        return next((d for d in desktops if d.name == name), None)
+
+    def find_desktop_by_path(self, path: str) -> Optional[Desktop]:
+        key = path_key(path)
+        desktops, _ = self.read_desktops()
+        return next((d for d in desktops if d.path_key == key), None)
+
+    def update_icon_layout(self, name: str, icons: List[IconPosition]) -> bool:
+        data_file = file_operations.get_data_file_path()
+        with self._lock:
+            with file_lock(file_operations.LOCK_FILE_PATH):
+                self._refresh(data_file)
+                record = self._state.get(name)
+                if record is None:
+                    return False
+                record = dict(record)
+                record.pop("icon_layout", None)
+                if icons:
+                    record["icon_layout"] = icon_layout_store.write_layout(data_file, icons, file_operations.write_atomic)
+                # Schlüsselreihenfolge wie Desktop.to_dict, damit diff_ops
+                # den Stand später als unverändert erkennt
+                record = Desktop.from_dict(record).to_dict(include_icons=False)
+                self._append(data_file, [["put", record]])
+            self._maybe_compact()
+        return True
+
+    # ------------------------------------------------------------------
+    # Kompaktierung
+    # ------------------------------------------------------------------
+
+    def compact(self) -> bool:
+        """
+        Schreibt den aktuellen Stand als Snapshot und leert das Journal.
+
+        Returns:
+            True, wenn kompaktiert wurde (Journal war nicht leer)
+        """
+        data_file = file_operations.get_data_file_path()
+        journal_file = get_journal_path(data_file)
+
+        with self._lock:
+            with file_lock(file_operations.LOCK_FILE_PATH):
+                self._refresh(data_file)
+                if self._journal_offset == 0:
+                    return False
+                size = self._journal_offset
+
+                # 1. Snapshot mit vollständigem Stand (inkl. Layout-Bereinigung)
+                file_operations.write_json(data_file, self._build_desktops(data_file))
+                # 2. Leeres Journal atomar an die Stelle des alten
+                file_operations.write_atomic(journal_file, b"")
+
+                self._snapshot_signature = file_operations.stat_signature(data_file)
+                journal_signature = file_operations.stat_signature(journal_file)
+                self._journal_ino = journal_signature[2] if journal_signature else None
+                self._journal_offset = 0
+                self.compactions += 1
+
+        logger.info(get_text("storage.info.journal_compacted", path=journal_file, size=size))
+        return True
+
+    def _maybe_compact(self) -> None:
+        if self._journal_offset < self.compact_threshold:
+            return
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        self._compactor = threading.Thread(target=self._compact_in_background, name="SmartDeskJournalCompactor", daemon=True)
+        self._compactor.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as e:
+            logger.error(get_text("storage.error.journal_compact", e=e))
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Wartet auf eine laufende Hintergrund-Kompaktierung (z.B. beim Beenden)."""
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Interna (alle unter self._lock und dem Datei-Lock)
+    # ------------------------------------------------------------------
+
+    def _refresh(self, data_file: str) -> None:
+        """Bringt den Stand im Speicher auf den Stand von Snapshot + Journal."""
+        snapshot_signature = file_operations.stat_signature(data_file)
+        journal_file = get_journal_path(data_file)
+        journal_signature = file_operations.stat_signature(journal_file)
+        journal_ino = journal_signature[2] if journal_signature else None
+        journal_size = journal_signature[1] if journal_signature else 0
+
+        # Neuer Snapshot oder neues/kürzeres Journal (Kompaktierung durch
+        # einen anderen Prozess): Stand komplett neu aufbauen
+        if (
+            data_file != self._data_file
+            or snapshot_signature != self._snapshot_signature
+            or journal_ino != self._journal_ino
+            or journal_size < self._journal_offset
+        ):
+            self._state = {}
+            if snapshot_signature is not None:
+                desktops, snapshot_signature = file_operations.read_desktops_file(data_file)
+                # Inline-Icons (altes Format) in Layout-Dateien auslagern,
+                # der Stand enthält nur Referenzen
+                file_operations.store_icon_layouts(data_file, desktops)
+                self._state = {d.name: d.to_dict(include_icons=False) for d in desktops}
+            self.snapshot_loads += 1
+            self._data_file = data_file
+            self._snapshot_signature = snapshot_signature
+            self._journal_ino = journal_ino
+            self._journal_offset = 0
+
+        if journal_size > self._journal_offset:
+            self._replay(journal_file)
+
+    def _replay(self, journal_file: str) -> None:
+        """Liest das Journal ab dem bekannten Offset und wendet es an."""
+        with open(journal_file, "rb") as f:
+            f.seek(self._journal_offset)
+            data = f.read()
+
+        # Nur vollständige Zeilen; ein abgebrochenes Ende bleibt liegen
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                apply_ops(self._state, codec.loads(line)["ops"])
+            except (ValueError, KeyError, IndexError, TypeError):
+                logger.warning(get_text("storage.warn.journal_corrupt", path=journal_file, offset=self._journal_offset))
+        self._journal_offset += end
+
+    def _append(self, data_file: str, ops: List[list]) -> None:
+        journal_file = get_journal_path(data_file)
+        line = codec.dumps({"ops": ops}) + b"\n"
+
+        with open(journal_file, "ab") as f:
+            # Abgebrochenes Ende eines früheren Absturzes abschneiden, damit
+            # der neue Eintrag in einer eigenen Zeile beginnt
+            if f.tell() > self._journal_offset:
+                f.truncate(self._journal_offset)
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+            st = os.fstat(f.fileno())
+
+        apply_ops(self._state, ops)
+        self._journal_offset += len(line)
+        self._journal_ino = st.st_ino
+
+    def _build_desktops(self, data_file: str) -> List[Desktop]:
+        desktops = []
+        for record in self._state.values():
+            desktop = Desktop.from_dict(record)
+            if desktop.icon_layout:
+                desktop.attach_icon_loader(file_operations.layout_loader(data_file, desktop.icon_layout))
+            desktops.append(desktop)
+        return desktops
@@ -0,0 +1,707 @@
+# Dateipfad: src/smartdesk/core/storage/locking.py
+"""
+Prozessübergreifende Reader/Writer-Locks für die Datendateien.
+
+Ersetzt das frühere O_EXCL-Spin-Lock (Lock-Datei anlegen/löschen, Polling mit
+Backoff) durch Betriebssystem-Locks auf einer dauerhaft existierenden
+Lock-Datei:
+
+- Mehrere Leser gleichzeitig (shared), Schreiber exklusiv
+- Blockierendes Warten statt Polling
+- Stirbt der Halter, gibt das Betriebssystem das Lock automatisch frei
+
+Backends (LockBackend Protocol), automatisch gewählt:
+- FcntlLockBackend:    fcntl.flock (Linux/macOS)
+- Win32LockBackend:    LockFileEx via pywin32 (Windows, shared + exklusiv)
+- MsvcrtLockBackend:   msvcrt.locking (Windows ohne pywin32, nur exklusiv)
+- ExclusiveFileBackend: O_EXCL-Lock-Datei als letzter Ausweg
+
+Lock-Besitzer (LockOwner):
+    Exklusive Halter hinterlegen PID, Prozess-Startzeit und einen Lease-
+    Zeitstempel. Beim O_EXCL-Fallback steht der Eintrag in der Lock-Datei
+    selbst; Wartende übernehmen ein Lock, dessen Besitzer tot ist oder dessen
+    Lease abgelaufen ist, innerhalb von Millisekunden. Bei den OS-Backends
+    gibt das Betriebssystem das Lock ohnehin frei; der Eintrag in
+    "<lock_file>.owner" dient dort der Erkennung abgestürzter Halter und der
+    Diagnose bei Timeouts. Übernahmen werden gezählt (get_lock_stats) und geloggt.
+"""
+
+import errno
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Protocol
+
+from ...shared.logging_config import get_logger
+from ...shared.localization import get_text
+
+logger = get_logger(__name__)
+
+
+class LockBackend(Protocol):
+    """
+    Interface für ein Datei-Lock-Backend.
+
+    Ein Handle repräsentiert eine geöffnete Lock-Datei; Locks gelten pro Handle,
+    d.h. auch zwei Threads desselben Prozesses schließen sich gegenseitig aus.
+    """
+
+    name: str
+    supports_shared: bool
+    supports_blocking: bool
+
+    def open(self, lock_file: str) -> Any:
+        """Öffnet (bzw. erzeugt) die Lock-Datei und gibt ein Handle zurück."""
+        ...
+
+    def close(self, handle: Any) -> None:
+        """Schließt das Handle (ein gehaltenes Lock wird dabei freigegeben)."""
+        ...
+
+    def try_acquire(self, handle: Any, shared: bool) -> bool:
+        """Versucht das Lock ohne Warten zu bekommen."""
+        ...
+
+    def acquire_blocking(self, handle: Any, shared: bool) -> None:
+        """Wartet blockierend auf das Lock (nur wenn supports_blocking)."""
+        ...
+
+    def release(self, handle: Any) -> None:
+        """Gibt das Lock frei."""
+        ...
+
+
+# =============================================================================
+# Lock-Besitzer und Lease
+# =============================================================================
+
+# Maximale Haltedauer eines exklusiven Locks. Legitime Halter brauchen nur
+# Millisekunden; danach gilt ein (hängender) Besitzer als abgelaufen.
+DEFAULT_LEASE = 5.0
+
+# Toleranz beim Vergleich der Prozess-Startzeit (PID-Wiederverwendung)
+_CREATE_TIME_TOLERANCE = 1.0
+
+
+@dataclass(frozen=True)
+class LockOwner:
+    """
+    Besitzer eines exklusiven Locks.
+
+    Attributes:
+        pid: Prozess-ID des Halters
+        create_time: Startzeit des Prozesses (psutil), erkennt wiederverwendete PIDs
+        acquired_at: Zeitpunkt der Übernahme (time.time())
+        lease: Gültigkeitsdauer in Sekunden ab acquired_at
+    """
+
+    pid: int
+    create_time: float
+    acquired_at: float
+    lease: float = DEFAULT_LEASE
+
+    @classmethod
+    def current(cls, lease: float = DEFAULT_LEASE) -> "LockOwner":
+        """Besitzer-Eintrag für den aktuellen Prozess."""
+        return cls(pid=os.getpid(), create_time=_own_create_time(), acquired_at=time.time(), lease=lease)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """True, wenn die Lease abgelaufen ist."""
+        return (now if now is not None else time.time()) > self.acquired_at + self.lease
+
+    def to_json(self) -> str:
+        return json.dumps({"pid": self.pid, "create_time": self.create_time, "acquired_at": self.acquired_at, "lease": self.lease})
+
+    @classmethod
+    def from_json(cls, text: str) -> Optional["LockOwner"]:
+        """Parst einen Eintrag; None bei leerem oder ungültigem Inhalt."""
+        try:
+            data = json.loads(text)
+            return cls(pid=int(data["pid"]), create_time=float(data["create_time"]), acquired_at=float(data["acquired_at"]), lease=float(data.get("lease", DEFAULT_LEASE)))
+        except (ValueError, TypeError, KeyError):
+            return None
+
+
+@dataclass
+class LockStats:
+    """Zähler für Lock-Ereignisse (prozessweit)."""
+
+    recoveries: int = 0
+    timeouts: int = 0
+
+
+_stats = LockStats()
+_stats_lock = threading.Lock()
+_create_time: Optional[float] = None
+
+
+def get_lock_stats() -> LockStats:
+    """Kopie der aktuellen Lock-Zähler."""
+    with _stats_lock:
+        return LockStats(recoveries=_stats.recoveries, timeouts=_stats.timeouts)
+
+
+def reset_lock_stats() -> None:
+    """Setzt die Lock-Zähler zurück (z.B. für Tests)."""
+    with _stats_lock:
+        _stats.recoveries = 0
+        _stats.timeouts = 0
+
+
+def _own_create_time() -> float:
+    global _create_time
+    if _create_time is None:
+        try:
+            import psutil
+
+            _create_time = psutil.Process(os.getpid()).create_time()
+        except Exception:
+            _create_time = 0.0
+    return _create_time
+
+
+def is_owner_alive(owner: LockOwner) -> bool:
+    """
+    Prüft, ob der Prozess eines Lock-Besitzers noch lebt.
+
+    Nutzt is_process_running() aus registry_operations und vergleicht
+    zusätzlich die Prozess-Startzeit, damit eine wiederverwendete PID nicht
+    als lebender Besitzer gilt.
+    """
+    if owner.pid == os.getpid():
+        return owner.create_time == _own_create_time()
+
+    try:
+        import psutil
+        from ..utils.registry_operations import is_process_running
+    except ImportError:
+        # Ohne psutil/winreg keine Aussage möglich -> konservativ "lebt"
+        return True
+
+    if not is_process_running(owner.pid):
+        return False
+    try:
+        return abs(psutil.Process(owner.pid).create_time() - owner.create_time) < _CREATE_TIME_TOLERANCE
+    except psutil.NoSuchProcess:
+        return False
+    except psutil.AccessDenied:
+        return True
+
+
+def read_owner(path: str) -> Optional[LockOwner]:
+    """Liest einen Besitzer-Eintrag; None wenn nicht vorhanden oder ungültig."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return LockOwner.from_json(f.read())
+    except OSError:
+        return None
+
+
+def _record_recovery(lock_file: str, owner: Optional[LockOwner], reason: str) -> None:
+    with _stats_lock:
+        _stats.recoveries += 1
+    pid = owner.pid if owner else "?"
+    logger.warning(get_text("storage.warn.lock_recovered", path=lock_file, pid=pid, reason=reason))
+
+
+def _stale_reason(owner: Optional[LockOwner], mtime: float, lease: float) -> Optional[str]:
+    """Grund, warum ein Lock verwaist ist, oder None wenn es gültig ist."""
+    if owner is None:
+        # Leere Datei: alte Version oder Besitzer zwischen Anlegen und
+        # Beschreiben - nur über das Alter entscheidbar
+        return get_text("storage.lock_reason.legacy") if time.time() - mtime > lease else None
+    if not is_owner_alive(owner):
+        return get_text("storage.lock_reason.dead")
+    if owner.is_expired():
+        return get_text("storage.lock_reason.expired")
+    return None
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+class _FdBackend:
+    """Gemeinsame Basis für Backends, die auf einem Datei-Deskriptor arbeiten."""
+
+    def open(self, lock_file: str) -> int:
+        return os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def close(self, handle: int) -> None:
+        os.close(handle)
+
+
+class FcntlLockBackend(_FdBackend):
+    """flock()-basierte Locks (POSIX)."""
+
+    name = "fcntl"
+    supports_shared = True
+    supports_blocking = True
+
+    def __init__(self):
+        import fcntl
+
+        self._fcntl = fcntl
+
+    def _mode(self, shared: bool) -> int:
+        return self._fcntl.LOCK_SH if shared else self._fcntl.LOCK_EX
+
+    def try_acquire(self, handle: int, shared: bool) -> bool:
+        try:
+            self._fcntl.flock(handle, self._mode(shared) | self._fcntl.LOCK_NB)
+            return True
+        except OSError as e:
+            if e.errno in (errno.EAGAIN, errno.EACCES, errno.EWOULDBLOCK):
+                return False
+            raise
+
+    def acquire_blocking(self, handle: int, shared: bool) -> None:
+        self._fcntl.flock(handle, self._mode(shared))
+
+    def release(self, handle: int) -> None:
+        self._fcntl.flock(handle, self._fcntl.LOCK_UN)
+
+
+class Win32LockBackend(_FdBackend):
+    """LockFileEx-basierte Locks (Windows, benötigt pywin32)."""
+
+    name = "win32"
+    supports_shared = True
+    supports_blocking = True
+
+    # Gesamten (64-Bit-)Bereich sperren
+    _RANGE_LOW = 0xFFFFFFFF
+    _RANGE_HIGH = 0xFFFFFFFF
+    _ERROR_LOCK_VIOLATION = 33
+
+    def __init__(self):
+        import msvcrt
+        import pywintypes
+        import win32con
+        import win32file
+
+        self._msvcrt = msvcrt
+        self._pywintypes = pywintypes
+        self._win32con = win32con
+        self._win32file = win32file
+
+    def _lock(self, handle: int, shared: bool, blocking: bool) -> None:
+        flags = 0 if shared else self._win32con.LOCKFILE_EXCLUSIVE_LOCK
+        if not blocking:
+            flags |= self._win32con.LOCKFILE_FAIL_IMMEDIATELY
+        hfile = self._msvcrt.get_osfhandle(handle)
+        self._win32file.LockFileEx(hfile, flags, self._RANGE_LOW, self._RANGE_HIGH, self._pywintypes.OVERLAPPED())
+
+    def try_acquire(self, handle: int, shared: bool) -> bool:
+        try:
+            self._lock(handle, shared, blocking=False)
+            return True
+        except self._pywintypes.error as e:
+            if e.winerror == self._ERROR_LOCK_VIOLATION:
+                return False
+            raise
+
+    def acquire_blocking(self, handle: int, shared: bool) -> None:
+        self._lock(handle, shared, blocking=True)
+
+    def release(self, handle: int) -> None:
+        hfile = self._msvcrt.get_osfhandle(handle)
+        self._win32file.UnlockFileEx(hfile, self._RANGE_LOW, self._RANGE_HIGH, self._pywintypes.OVERLAPPED())
+
+
+class MsvcrtLockBackend(_FdBackend):
+    """
+    msvcrt.locking()-basierte Locks (Windows ohne pywin32).
+
+    Kennt nur exklusive Locks und kein unbegrenztes Warten; shared wird daher
+    exklusiv behandelt und gewartet wird per Polling.
+    """
+
+    name = "msvcrt"
+    supports_shared = False
+    supports_blocking = False
+
+    def __init__(self):
+        import msvcrt
+
+        self._msvcrt = msvcrt
+
+    def try_acquire(self, handle: int, shared: bool) -> bool:
+        os.lseek(handle, 0, os.SEEK_SET)
+        try:
+            self._msvcrt.locking(handle, self._msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+
+    def acquire_blocking(self, handle: int, shared: bool) -> None:
+        raise NotImplementedError
+
+    def release(self, handle: int) -> None:
+        os.lseek(handle, 0, os.SEEK_SET)
+        self._msvcrt.locking(handle, self._msvcrt.LK_UNLCK, 1)
+
+
+class ExclusiveFileBackend:
+    """
+    Bisheriges Verfahren: Lock = Existenz der Lock-Datei (O_CREAT | O_EXCL).
+
+    Nur exklusiv und nur Polling. Wird nur verwendet, wenn kein
+    Betriebssystem-Lock verfügbar ist. Die Lock-Datei enthält den LockOwner;
+    ist der Besitzer tot oder seine Lease abgelaufen, wird das Lock übernommen.
+    """
+
+    name = "exclusive-file"
+    supports_shared = False
+    supports_blocking = False
+
+    def __init__(self, lease: float = DEFAULT_LEASE):
+        self.lease = lease
+
+    def open(self, lock_file: str) -> str:
+        return lock_file
+
+    def close(self, handle: str) -> None:
+        pass
+
+    def _create(self, path: str) -> bool:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        try:
+            os.write(fd, LockOwner.current(self.lease).to_json().encode("utf-8"))
+        finally:
+            os.close(fd)
+        return True
+
+    def try_acquire(self, handle: str, shared: bool) -> bool:
+        if self._create(handle):
+            return True
+
+        try:
+            st = os.stat(handle)
+        except FileNotFoundError:
+            # Gerade freigegeben
+            return self._create(handle)
+
+        owner = read_owner(handle)
+        reason = _stale_reason(owner, st.st_mtime, self.lease)
+        if reason is None or not self._take_over(handle, st):
+            return False
+
+        _record_recovery(handle, owner, reason)
+        return self._create(handle)
+
+    def _take_over(self, path: str, stale_stat: os.stat_result) -> bool:
+        """
+        Entfernt eine verwaiste Lock-Datei.
+
+        Umbenennen ist atomar, d.h. nur ein Wartender gewinnt. Hat zwischen
+        Prüfung und Umbenennen bereits ein anderer das Lock neu angelegt,
+        wird dessen Datei per os.link zurückgelegt.
+        """
+        stale_path = f"{path}.stale-{os.getpid()}-{uuid.uuid4().hex}"
+        try:
+            os.rename(path, stale_path)
+        except OSError:
+            return False
+
+        try:
+            st = os.stat(stale_path)
+            if (st.st_ino, st.st_mtime_ns) != (stale_stat.st_ino, stale_stat.st_mtime_ns):
+                try:
+                    os.link(stale_path, path)
+                except OSError:
+                    pass
+                return False
+            return True
+        finally:
+            try:
+                os.remove(stale_path)
+            except OSError:
+                pass
+
+    def acquire_blocking(self, handle: str, shared: bool) -> None:
+        raise NotImplementedError
+
+    def release(self, handle: str) -> None:
+        try:
+            os.remove(handle)
+        except OSError:
+            # Datei wurde bereits entfernt
+            pass
+
+
+def _detect_backend() -> LockBackend:
+    """Wählt das beste verfügbare Backend für die aktuelle Plattform."""
+    candidates = (Win32LockBackend, MsvcrtLockBackend) if sys.platform == "win32" else (FcntlLockBackend,)
+    for backend_cls in candidates:
+        try:
+            return backend_cls()
+        except ImportError:
+            continue
+
+    logger.warning(get_text("storage.warn.lock_fallback"))
+    return ExclusiveFileBackend()
+
+
+_backend: Optional[LockBackend] = None
+_backend_lock = threading.Lock()
+
+
+def get_lock_backend() -> LockBackend:
+    """Gibt das prozessweite Lock-Backend zurück."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = _detect_backend()
+        return _backend
+
+
+def set_lock_backend(backend: Optional[LockBackend]) -> None:
+    """Ersetzt das Lock-Backend (None = automatisch wählen, z.B. für Tests)."""
+    global _backend
+    with _backend_lock:
+        _backend = backend
+
+
+# =============================================================================
+# Lock-Verwaltung
+# =============================================================================
+
+# Vom aktuellen Thread gehaltene Locks: lock_file -> [handle, shared, Tiefe]
+_held = threading.local()
+
+
+def _held_locks() -> Dict[str, list]:
+    locks = getattr(_held, "locks", None)
+    if locks is None:
+        locks = _held.locks = {}
+    return locks
+
+
+def _wait_in_thread(backend: LockBackend, handle: Any, shared: bool, timeout: float) -> bool:
+    """
+    Wartet blockierend auf das Lock, aber höchstens timeout Sekunden.
+
+    Das blockierende Warten läuft in einem Hilfsthread. Läuft der Timeout ab,
+    übernimmt der Hilfsthread das Handle und gibt Lock und Handle frei,
+    sobald er es doch noch bekommt.
+    """
+    done = threading.Event()
+    guard = threading.Lock()
+    state = {"acquired": False, "abandoned": False, "error": None}
+
+    def worker():
+        acquired = False
+        try:
+            backend.acquire_blocking(handle, shared)
+            acquired = True
+        except Exception as e:
+            state["error"] = e
+        with guard:
+            if state["abandoned"]:
+                if acquired:
+                    backend.release(handle)
+                backend.close(handle)
+            else:
+                state["acquired"] = acquired
+        done.set()
+
+    threading.Thread(target=worker, name="smartdesk-lock-wait", daemon=True).start()
+
+    if not done.wait(timeout):
+        with guard:
+            if not done.is_set():
+                state["abandoned"] = True
+                return False
+
+    if state["error"] is not None:
+        raise state["error"]
+    return state["acquired"]
+
+
+def _poll(backend: LockBackend, handle: Any, shared: bool, timeout: float) -> bool:
+    """Polling mit exponentiellem Backoff für Backends ohne blockierendes Warten."""
+    deadline = time.monotonic() + timeout
+    sleep_time = 0.001  # Start mit 1ms
+    max_sleep = 0.1  # Maximal 100ms
+
+    while True:
+        if backend.try_acquire(handle, shared):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+
+        # Jitter gegen gleichzeitiges Aufwachen vieler Warter
+        jitter = random.uniform(0, sleep_time * 0.1)
+        time.sleep(min(sleep_time + jitter, max(0.0, deadline - time.monotonic())))
+        sleep_time = min(sleep_time * 2, max_sleep)
+
+
+def _acquire(backend: LockBackend, lock_file: str, shared: bool, deadline: float) -> Any:
+    """
+    Öffnet lock_file und wartet bis deadline auf das Lock.
+
+    Returns:
+        Das Handle mit gehaltenem Lock
+
+    Raises:
+        TimeoutError: Lock nicht rechtzeitig erhalten
+    """
+    handle = backend.open(lock_file)
+    try:
+        acquired = backend.try_acquire(handle, shared)
+        if not acquired:
+            remaining = max(0.0, deadline - time.monotonic())
+            if backend.supports_blocking:
+                acquired = _wait_in_thread(backend, handle, shared, remaining)
+                if not acquired:
+                    # Handle gehört jetzt dem Hilfsthread
+                    handle = None
+            else:
+                acquired = _poll(backend, handle, shared, remaining)
+    except BaseException:
+        if handle is not None:
+            backend.close(handle)
+        raise
+
+    if not acquired:
+        if handle is not None:
+            backend.close(handle)
+        raise TimeoutError("Could not acquire lock within the specified timeout.")
+    return handle
+
+
+def _release(backend: LockBackend, handle: Any) -> None:
+    try:
+        backend.release(handle)
+    finally:
+        backend.close(handle)
+
+
+@contextmanager
+def file_lock(lock_file: str, timeout: float = 10, shared: bool = False):
+    """
+    Prozessübergreifendes Lock auf lock_file als Context Manager.
+
+    Args:
+        lock_file: Pfad der Lock-Datei (wird bei Bedarf angelegt und bleibt bestehen)
+        timeout: Maximale Wartezeit in Sekunden
+        shared: True für ein Lese-Lock (mehrere gleichzeitig), False für exklusiv
+
+    Schreiber haben Vorrang: Sie halten zusätzlich ein exklusives Lock auf
+    "<lock_file>.gate", das Leser vor dem eigentlichen Lock kurz passieren
+    müssen. Ohne dieses Tor könnten sich ständig überlappende Leser einen
+    Schreiber beliebig lange aushungern, da OS-Locks keine Fairness kennen.
+
+    Innerhalb eines Threads reentrant, solange kein Upgrade von shared auf
+    exklusiv verlangt wird.
+
+    Raises:
+        TimeoutError: Lock nicht innerhalb von timeout erhalten
+        RuntimeError: Upgrade eines gehaltenen shared Locks auf exklusiv
+    """
+    held = _held_locks()
+    entry = held.get(lock_file)
+    if entry is not None:
+        if entry[1] and not shared:
+            raise RuntimeError(get_text("storage.error.lock_upgrade", path=lock_file))
+        entry[2] += 1
+        try:
+            yield
+        finally:
+            entry[2] -= 1
+        return
+
+    backend = get_lock_backend()
+    deadline = time.monotonic() + timeout
+    owner_path = _owner_path(backend, lock_file)
+
+    try:
+        if not backend.supports_shared:
+            handle = _acquire(backend, lock_file, False, deadline)
+            gate = None
+        else:
+            gate = _acquire(backend, lock_file + ".gate", shared, deadline)
+            try:
+                handle = _acquire(backend, lock_file, shared, deadline)
+            except BaseException:
+                _release(backend, gate)
+                raise
+            if shared:
+                # Leser passieren das Tor nur; Schreiber halten es bis zum Ende
+                _release(backend, gate)
+                gate = None
+    except TimeoutError:
+        _record_timeout(lock_file, owner_path)
+        raise
+
+    # Bei OS-Locks den Besitzer separat vermerken (beim O_EXCL-Fallback
+    # steht er bereits in der Lock-Datei)
+    record_owner = not shared and owner_path != lock_file
+    if record_owner:
+        _claim_owner_record(lock_file, owner_path)
+
+    held[lock_file] = [handle, shared, 1]
+    try:
+        yield
+    finally:
+        del held[lock_file]
+        try:
+            if record_owner:
+                _remove_file(owner_path)
+            _release(backend, handle)
+        finally:
+            if gate is not None:
+                _release(backend, gate)
+
+
+def _owner_path(backend: LockBackend, lock_file: str) -> str:
+    """Datei mit dem LockOwner: die Lock-Datei selbst (O_EXCL) oder <lock_file>.owner."""
+    return lock_file if isinstance(backend, ExclusiveFileBackend) else lock_file + ".owner"
+
+
+def _claim_owner_record(lock_file: str, owner_path: str) -> None:
+    """
+    Trägt den aktuellen Prozess als Besitzer ein.
+
+    Steht dort noch ein toter Besitzer, ist dieser während des Haltens
+    abgestürzt; das OS hat das Lock freigegeben, was als Übernahme zählt.
+    """
+    previous = read_owner(owner_path)
+    if previous is not None and not is_owner_alive(previous):
+        _record_recovery(lock_file, previous, get_text("storage.lock_reason.dead"))
+
+    try:
+        with open(owner_path, "w", encoding="utf-8") as f:
+            f.write(LockOwner.current().to_json())
+    except OSError:
+        # Nur Diagnose - das Lock selbst ist gehalten
+        pass
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _record_timeout(lock_file: str, owner_path: str) -> None:
+    with _stats_lock:
+        _stats.timeouts += 1
+
+    owner = read_owner(owner_path)
+    if owner is None:
+        logger.warning(get_text("storage.warn.lock_timeout_unknown", path=lock_file))
+    else:
+        logger.warning(get_text("storage.warn.lock_timeout", path=lock_file, pid=owner.pid, age=time.time() - owner.acquired_at))
@@ -0,0 +1,407 @@
+# Dateipfad: src/smartdesk/core/storage/sqlite_engine.py
+"""
+SQLite-Speicher-Engine für Desktops, Icon-Layouts und Auto-Switch-Regeln.
+
+Alternative zur JSON-Engine für große Desktop-Sammlungen und häufige
+Wechsel. Aktivierung über die Einstellung "storage_engine": "sqlite" oder
+die Umgebungsvariable SMARTDESK_STORAGE_ENGINE=sqlite; vorhandene JSON-Daten
+übernimmt import_from_json().
+
+Schema (PRAGMA user_version = SCHEMA_VERSION):
+    desktops      Metadaten, ein Datensatz pro Desktop, Reihenfolge über
+                  "position", Indizes auf Name und normalisiertem Pfad
+    icon_layouts  ein BLOB pro Desktop im Binärformat von icon_layout_store
+    rules         Prozessname -> Desktop-Name
+
+Schreiben:
+    write_desktops() vergleicht mit dem gespeicherten Stand und schreibt nur
+    geänderte Zeilen - beim Desktop-Wechsel also zwei is_active-Updates plus
+    das eine geänderte Icon-Layout, alles in einer Transaktion. Die ID eines
+    Datensatzes steht als "sqlite:<id>" in Desktop.icon_layout, dadurch
+    bleiben Layouts auch beim Umbenennen erhalten. Das Präfix hält sie von
+    Layout-Referenzen der JSON-Engine auseinander.
+
+Nebenläufigkeit:
+    WAL-Modus (Leser blockieren Schreiber nicht), eine Verbindung pro Thread.
+    Die Signatur ist PRAGMA data_version einer eigenen, nur lesenden
+    Verbindung und ändert sich bei jedem Commit einer anderen Verbindung -
+    auch aus anderen Prozessen.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..models.desktop import Desktop, IconPosition, path_key
+from . import icon_layout_store
+from ...shared.logging_config import get_logger
+from ...shared.localization import get_text
+
+logger = get_logger(__name__)
+
+DATABASE_FILE_NAME = "smartdesk.db"
+SCHEMA_VERSION = 1
+
+# Wartezeit auf gesperrte Datenbank (Sekunden), entspricht file_lock()
+BUSY_TIMEOUT = 10
+
+# Präfix der Datensatz-ID in Desktop.icon_layout
+LAYOUT_REF_PREFIX = "sqlite:"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS desktops (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    path_key TEXT NOT NULL,
+    is_active INTEGER NOT NULL DEFAULT 0,
+    wallpaper_path TEXT NOT NULL DEFAULT '',
+    protected INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_desktops_name ON desktops(name);
+CREATE INDEX IF NOT EXISTS idx_desktops_path_key ON desktops(path_key);
+CREATE TABLE IF NOT EXISTS icon_layouts (
+    desktop_id INTEGER PRIMARY KEY REFERENCES desktops(id) ON DELETE CASCADE,
+    layout BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rules (
+    process_name TEXT PRIMARY KEY,
+    desktop_name TEXT NOT NULL
+);
+"""
+
+_DESKTOP_COLUMNS = "id, position, name, path, is_active, wallpaper_path, protected, created_at"
+
+# Reihenfolge der vergleichbaren Spalten (ohne id/position)
+_Row = Tuple[str, str, str, int, str, int, str]
+
+
+def _layout_ref(desktop_id: int) -> str:
+    """Referenz in Desktop.icon_layout für den Datensatz desktop_id."""
+    return f"{LAYOUT_REF_PREFIX}{desktop_id}"
+
+
+def _row_values(desktop: Desktop) -> _Row:
+    return (
+        desktop.name,
+        desktop.path,
+        desktop.path_key,
+        int(desktop.is_active),
+        desktop.wallpaper_path,
+        int(desktop.protected),
+        desktop.created_at,
+    )
+
+
+class SqliteStorageEngine:
+    """
+    Implementiert StorageEngine und RuleStore auf Basis von SQLite.
+
+    Thread-sicher: Jeder Thread erhält eine eigene Verbindung.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._signature_conn: Optional[sqlite3.Connection] = None
+        self._signature_lock = threading.Lock()
+        self._schema_ready = False
+
+    # ------------------------------------------------------------------
+    # Verbindungen
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: Transaktionen explizit über BEGIN steuern
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Im WAL-Modus ist NORMAL crash-sicher (nur der letzte Commit kann
+        # bei Stromausfall verloren gehen) und spart ein fsync pro Commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        if not self._schema_ready:
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(get_text("storage.error.schema_version", path=self.db_path, version=version))
+        conn.executescript(_SCHEMA)
+        if version < SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._schema_ready = True
+
+    def close(self) -> None:
+        """Schließt alle Verbindungen (auch die anderer Threads)."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+        self._signature_conn = None
+
+    # ------------------------------------------------------------------
+    # StorageEngine
+    # ------------------------------------------------------------------
+
+    def location(self) -> str:
+        return self.db_path
+
+    def watch_paths(self) -> List[str]:
+        # Commits landen im WAL, die Datenbankdatei ändert sich erst beim Checkpoint
+        return [self.db_path, self.db_path + "-wal"]
+
+    def signature(self) -> Optional[int]:
+        self._conn()
+        with self._signature_lock:
+            if self._signature_conn is None:
+                self._signature_conn = self._connect()
+            return self._signature_conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def read_desktops(self) -> Tuple[List[Desktop], Optional[int]]:
+        conn = self._conn()
+        # Signatur vor dem Lesen: Ein gleichzeitiger Commit führt höchstens
+        # zu einem unnötigen, nie zu einem verpassten Neuladen
+        signature = self.signature()
+        rows = conn.execute(f"SELECT {_DESKTOP_COLUMNS} FROM desktops ORDER BY position").fetchall()
+        with_layout = {row[0] for row in conn.execute("SELECT desktop_id FROM icon_layouts")}
+        return [self._desktop_from_row(row, row[0] in with_layout) for row in rows], signature
+
+    def write_desktops(self, desktops: List[Desktop]) -> Optional[int]:
+        conn = self._conn()
+        refs = [desktop.icon_layout for desktop in desktops]
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            stored = {
+                row[0]: row[1:]
+                for row in conn.execute(
+                    "SELECT id, position, name, path, path_key, is_active, wallpaper_path, protected, created_at FROM desktops"
+                )
+            }
+
+            keep = set()
+            updates = []
+            inserts = []
+            for position, desktop in enumerate(desktops):
+                desktop_id = self._desktop_id(desktop)
+                values = _row_values(desktop)
+                if desktop_id in stored and desktop_id not in keep:
+                    keep.add(desktop_id)
+                    if stored[desktop_id] != (position,) + values:
+                        updates.append((position,) + values + (desktop_id,))
+                else:
+                    # Icons jetzt laden: Der Lazy-Loader kann auf eine Zeile
+                    # zeigen, die gleich gelöscht wird
+                    desktop.icon_positionen
+                    inserts.append((position, desktop, values))
+
+            removed = [(desktop_id,) for desktop_id in stored if desktop_id not in keep]
+            if removed:
+                conn.executemany("DELETE FROM desktops WHERE id = ?", removed)
+            if updates:
+                conn.executemany(
+                    "UPDATE desktops SET position = ?, name = ?, path = ?, path_key = ?, is_active = ?, "
+                    "wallpaper_path = ?, protected = ?, created_at = ? WHERE id = ?",
+                    updates,
+                )
+
+            layouts = []
+            for position, desktop, values in inserts:
+                cursor = conn.execute(
+                    "INSERT INTO desktops (position, name, path, path_key, is_active, wallpaper_path, protected, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (position,) + values,
+                )
+                desktop.icon_layout = _layout_ref(cursor.lastrowid)
+                layouts.append(desktop)
+            # Neue Zeilen immer, bestehende nur bei geänderten Icons
+            inserted = {id(d) for d in layouts}
+            layouts.extend(d for d in desktops if d.icons_dirty and id(d) not in inserted)
+            for desktop in layouts:
+                self._write_layout(conn, self._desktop_id(desktop), desktop.icon_positionen)
+
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            for desktop, ref in zip(desktops, refs):
+                desktop.icon_layout = ref
+            raise
+
+        for desktop in layouts:
+            desktop.mark_icons_saved(desktop.icon_layout)
+        return self.signature()
+
+    def get_desktop(self, name: str) -> Optional[Desktop]:
+        return self._query_one("d.name = ?", name)
+
+    def find_desktop_by_path(self, path: str) -> Optional[Desktop]:
+        return self._query_one("d.path_key = ?", path_key(path))
+
+    def update_icon_layout(self, name: str, icons: List[IconPosition]) -> bool:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT id FROM desktops WHERE name = ? ORDER BY position LIMIT 1", (name,)).fetchone()
+            if row is not None:
+                self._write_layout(conn, row[0], icons)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return row is not None
+
+    # ------------------------------------------------------------------
+    # RuleStore
+    # ------------------------------------------------------------------
+
+    def load_rules(self) -> Dict[str, str]:
+        rows = self._conn().execute("SELECT process_name, desktop_name FROM rules")
+        return {process_name: desktop_name for process_name, desktop_name in rows}
+
+    def save_rules(self, rules: Dict[str, str]) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM rules")
+            conn.executemany("INSERT INTO rules (process_name, desktop_name) VALUES (?, ?)", list(rules.items()))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    # ------------------------------------------------------------------
+    # Interna
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _desktop_id(desktop: Desktop) -> Optional[int]:
+        # icon_layout enthält bei dieser Engine "sqlite:<id>"; Desktops aus
+        # der JSON-Engine (SHA1-Referenz, auch wenn sie nur aus Ziffern
+        # besteht) gelten als neu
+        ref = desktop.icon_layout
+        if not ref.startswith(LAYOUT_REF_PREFIX):
+            return None
+        desktop_id = ref[len(LAYOUT_REF_PREFIX):]
+        return int(desktop_id) if desktop_id.isdigit() else None
+
+    def _desktop_from_row(self, row, has_layout: bool) -> Desktop:
+        desktop_id, _, name, path, is_active, wallpaper_path, protected, created_at = row
+        desktop = Desktop(
+            name,
+            path,
+            bool(is_active),
+            wallpaper_path,
+            protected=bool(protected),
+            created_at=created_at,
+            icon_layout=_layout_ref(desktop_id),
+        )
+        if has_layout:
+            desktop.attach_icon_loader(self._layout_loader(desktop_id))
+        return desktop
+
+    def _query_one(self, where: str, value: str) -> Optional[Desktop]:
+        row = (
+            self._conn()
+            .execute(
+                f"SELECT d.id, d.position, d.name, d.path, d.is_active, d.wallpaper_path, d.protected, d.created_at, "
+                f"l.desktop_id IS NOT NULL FROM desktops d LEFT JOIN icon_layouts l ON l.desktop_id = d.id "
+                f"WHERE {where} ORDER BY d.position LIMIT 1",
+                (value,),
+            )
+            .fetchone()
+        )
+        return self._desktop_from_row(row[:-1], bool(row[-1])) if row else None
+
+    def _layout_loader(self, desktop_id: int) -> Callable[[], List[IconPosition]]:
+        def load() -> List[IconPosition]:
+            try:
+                row = self._conn().execute("SELECT layout FROM icon_layouts WHERE desktop_id = ?", (desktop_id,)).fetchone()
+                return icon_layout_store.decode_layout(row[0]) if row else []
+            except (sqlite3.Error, ValueError) as e:
+                logger.error(get_text("storage.error.layout_read", path=f"{self.db_path}#{desktop_id}", e=e))
+                return []
+
+        return load
+
+    @staticmethod
+    def _write_layout(conn: sqlite3.Connection, desktop_id: int, icons: List[IconPosition]) -> None:
+        if icons:
+            conn.execute(
+                "INSERT INTO icon_layouts (desktop_id, layout) VALUES (?, ?) "
+                "ON CONFLICT(desktop_id) DO UPDATE SET layout = excluded.layout",
+                (desktop_id, icon_layout_store.encode_layout(icons)),
+            )
+        else:
+            conn.execute("DELETE FROM icon_layouts WHERE desktop_id = ?", (desktop_id,))
+
+
+def get_database_path(data_file: str) -> str:
+    """Pfad der Datenbank neben der desktops.json."""
+    return os.path.join(os.path.dirname(data_file), DATABASE_FILE_NAME)
+
+
+def import_from_json(engine: SqliteStorageEngine, data_file: str, rules_file: Optional[str] = None) -> Tuple[int, int]:
+    """
+    Übernimmt desktops.json (inkl. Layout-Dateien) und rules.json in die Datenbank.
+
+    Vorhandene Desktops und Regeln der Datenbank werden ersetzt. Die
+    JSON-Dateien bleiben unverändert, ein Zurückwechseln ist also jederzeit
+    möglich.
+
+    Args:
+        engine: Ziel-Engine
+        data_file: Pfad der desktops.json
+        rules_file: Pfad der rules.json (optional)
+
+    Returns:
+        (Anzahl Desktops, Anzahl Regeln)
+    """
+    from . import file_operations
+
+    desktops: List[Desktop] = []
+    if os.path.exists(data_file):
+        desktops, _ = file_operations.read_desktops_file(data_file)
+        for desktop in desktops:
+            # Icons jetzt laden (Lazy-Loader zeigt auf die Layout-Datei) und
+            # als neue Datensätze einfügen
+            icons = desktop.icon_positionen
+            desktop.icon_layout = ""
+            desktop.icon_positionen = icons
+
+    rules: Dict[str, str] = {}
+    if rules_file and os.path.exists(rules_file):
+        with open(rules_file, "r", encoding="utf-8") as f:
+            rules = json.load(f)
+
+    # Alle Desktops gelten als neu, vorhandene Zeilen werden dabei entfernt
+    engine.write_desktops(desktops)
+    if rules_file is not None:
+        engine.save_rules(rules)
+
+    logger.info(get_text("storage.info.sqlite_imported", desktops=len(desktops), rules=len(rules), path=engine.db_path))
+    return len(desktops), len(rules)
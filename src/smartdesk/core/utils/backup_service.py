@@ -2,22 +2,84 @@
 """
 Backup-Service für SmartDesk.
 Erstellt und verwaltet Registry-Backups für sichere Wiederherstellung.
+
+Backups sind inhaltsadressiert: Der Dateiname enthält den SHA-1 der
+.reg-Datei, die nur die beiden Desktop-Werte enthält. Zeitpunkt und Grund
+stehen im Index (backups/index.jsonl, eine Zeile pro Eintrag, älteste zuerst):
+    {"timestamp": "...", "reason": "...", "hash": "...", "file": "registry_<hash>.reg"}
+
+Ein neues Backup wird nur geschrieben, wenn sich die Werte gegenüber dem
+neuesten Eintrag geändert haben; wiederkehrende Werte (A -> B -> A) teilen
+sich eine Datei. Aufbewahrung und Auflistung arbeiten nur auf dem Index,
+ohne das Verzeichnis zu durchsuchen.
+
+Neue Einträge werden an den Index angehängt. Mit keep_count trägt der
+Eintrag zusätzlich "keep": keep_count; ältere Zeilen jenseits davon gelten
+ab dann als entfernt, ihre .reg-Dateien werden sofort gelöscht. Auf der
+Platte liegen so nie mehr als keep_count Backups. Nur die Index-Datei wird
+träge gekürzt, erst ab mehr als COMPACT_FACTOR * keep_count Zeilen;
+cleanup_old_backups() kürzt sofort.
+
+Vor einem Desktop-Wechsel werden nur die Werte gelesen; geschrieben wird im
+BackupWorker (begrenzte Warteschlange, flush_pending_backups() beim Beenden).
+
+Der Prozess merkt sich Hash und Datei-Signatur (Inode, mtime, Größe) des
+zuletzt gesehenen Index. Solange der Index unverändert ist und die Werte
+gleich bleiben, kommt ein Backup ohne Lock und ohne Lesen des Index aus.
 """
 
+import atexit
+import hashlib
+import json
 import os
-import winreg
+import queue
+import re
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Set, Tuple
 
 from ...shared.config import DATA_DIR, KEY_USER_SHELL, KEY_LEGACY_SHELL, VALUE_NAME
 from ...shared.logging_config import get_logger
 from ...shared.localization import get_text
+from ..registry import (
+    RegFileError,
+    RegistryBackend,
+    RegistryTransaction,
+    RegistryValue,
+    get_cached_value,
+    get_registry_cache,
+    parse_reg_file,
+)
+from ..storage.file_operations import write_atomic
+from ..storage.locking import file_lock
 
 logger = get_logger(__name__)
 
 # Backup-Ordner
 BACKUP_DIR = os.path.join(DATA_DIR, "backups")
 
+INDEX_FILE_NAME = "index.jsonl"
+INDEX_LOCK_NAME = "index.lock"
+
+# Anzahl der Index-Einträge, die vor einem Wechsel behalten werden
+DEFAULT_KEEP_COUNT = 10
+
+# Maximale Anzahl wartender Backups im BackupWorker
+DEFAULT_QUEUE_SIZE = 16
+
+# Wartezeit beim Beenden, bis ausstehende Backups geschrieben sind (Sekunden)
+DEFAULT_FLUSH_TIMEOUT = 5.0
+
+# Index-Datei wird beim Anhängen erst ab COMPACT_FACTOR * keep_count Zeilen neu geschrieben
+COMPACT_FACTOR = 2
+
+# Dateiname der Backups vor Einführung des Index: registry_<Grund>_<YYYYmmdd_HHMMSS>.reg
+_LEGACY_NAME = re.compile(r"^registry_(.+)_(\d{8}_\d{6})\.reg$")
+
+# (Backup-Ordner, Hash des neuesten Eintrags, Signatur des Index) nach dem letzten Zugriff
+_newest: Optional[Tuple[str, str, Tuple[int, int, int]]] = None
+
 
 def get_backup_dir() -> str:
     """Gibt den Backup-Ordner zurück und erstellt ihn falls nötig."""
@@ -25,53 +87,152 @@ def get_backup_dir() -> str:
     return BACKUP_DIR
 
 
-def create_registry_backup(reason: str = "manual") -> Optional[str]:
+def get_index_path() -> str:
+    """Pfad des Backup-Index."""
+    return os.path.join(get_backup_dir(), INDEX_FILE_NAME)
+
+
+def build_backup_content(user_shell_value: Optional[str], legacy_shell_value: Optional[str]) -> bytes:
+    """
+    Erzeugt den Inhalt der .reg-Datei (UTF-16LE mit BOM, CRLF wie regedit).
+
+    Der Inhalt hängt nur von den Werten ab, damit gleiche Werte dieselbe
+    Inhaltsadresse ergeben.
+    """
+    lines = ["Windows Registry Editor Version 5.00", ""]
+
+    # User Shell Folders
+    if user_shell_value:
+        lines.append(f"[HKEY_CURRENT_USER\\{KEY_USER_SHELL}]")
+        lines.append(f'"{VALUE_NAME}"=hex(2):{_string_to_reg_hex(user_shell_value)}')
+        lines.append("")
+
+    # Legacy Shell Folders
+    if legacy_shell_value:
+        lines.append(f"[HKEY_CURRENT_USER\\{KEY_LEGACY_SHELL}]")
+        # Backslashes und Anführungszeichen escapen für .reg Format
+        escaped_value = legacy_shell_value.replace("\\", "\\\\").replace('"', '\\"')
+        lines.append(f'"{VALUE_NAME}"="{escaped_value}"')
+        lines.append("")
+
+    # Metadata als Kommentar
+    lines.append(f"; User Shell: {user_shell_value}")
+    lines.append(f"; Legacy Shell: {legacy_shell_value}")
+    lines.append("")
+    return b"\xff\xfe" + "\r\n".join(lines).encode("utf-16-le")
+
+
+def backup_hash(content: bytes) -> str:
+    """Inhaltsadresse eines Backups."""
+    return hashlib.sha1(content).hexdigest()
+
+
+@dataclass(frozen=True)
+class BackupSnapshot:
+    """
+    Die zu sichernden Registry-Werte, gelesen zum Zeitpunkt des Backups.
+
+    Attributes:
+        user_shell_value: Desktop-Wert aus "User Shell Folders"
+        legacy_shell_value: Desktop-Wert aus "Shell Folders"
+        reason: Grund für das Backup
+        keep_count: Falls gesetzt, nur die neuesten keep_count Einträge behalten
+        timestamp: Zeitpunkt des Lesens (ISO-Format), landet im Index
+    """
+
+    user_shell_value: Optional[str]
+    legacy_shell_value: Optional[str]
+    reason: str = "manual"
+    keep_count: Optional[int] = None
+    timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+def snapshot_registry(reason: str = "manual", keep_count: Optional[int] = None) -> Optional[BackupSnapshot]:
+    """
+    Liest die aktuellen Desktop-Registry-Werte für ein Backup.
+
+    Returns:
+        BackupSnapshot oder None, wenn keiner der Werte gesetzt ist
+    """
+    user_shell_value = _read_registry_value(KEY_USER_SHELL, VALUE_NAME)
+    legacy_shell_value = _read_registry_value(KEY_LEGACY_SHELL, VALUE_NAME)
+
+    if not user_shell_value and not legacy_shell_value:
+        logger.warning(get_text("backup_manager.warn.no_values"))
+        return None
+    return BackupSnapshot(user_shell_value, legacy_shell_value, reason, keep_count)
+
+
+def create_registry_backup(reason: str = "manual", keep_count: Optional[int] = None) -> Optional[str]:
     """
     Erstellt ein Backup der aktuellen Desktop-Registry-Werte.
 
+    Haben sich die Werte seit dem neuesten Backup nicht geändert, wird
+    nichts geschrieben und dessen Pfad zurückgegeben.
+
     Args:
         reason: Grund für das Backup (z.B. "initial", "before_switch", "manual")
+        keep_count: Falls gesetzt, nur die neuesten keep_count Einträge behalten
 
     Returns:
         Pfad zur Backup-Datei oder None bei Fehler
     """
     try:
+        snapshot = snapshot_registry(reason, keep_count)
+    except Exception as e:
+        logger.error(get_text("backup_manager.error.create", e=e))
+        return None
+    return write_backup(snapshot) if snapshot else None
+
+
+def write_backup(snapshot: BackupSnapshot) -> Optional[str]:
+    """
+    Schreibt ein Backup der Werte aus snapshot (mit Deduplizierung und Aufbewahrung).
+
+    Returns:
+        Pfad zur Backup-Datei oder None bei Fehler
+    """
+    try:
+        content = build_backup_content(snapshot.user_shell_value, snapshot.legacy_shell_value)
+        digest = backup_hash(content)
         backup_dir = get_backup_dir()
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_file = os.path.join(backup_dir, f"registry_{reason}_{timestamp}.reg")
-
-        # Aktuelle Werte auslesen
-        user_shell_value = _read_registry_value(KEY_USER_SHELL, VALUE_NAME)
-        legacy_shell_value = _read_registry_value(KEY_LEGACY_SHELL, VALUE_NAME)
-
-        if not user_shell_value and not legacy_shell_value:
-            logger.warning(get_text("backup_manager.warn.no_values"))
-            return None
-
-        # .reg Datei erstellen
-        with open(backup_file, "w", encoding="utf-16") as f:
-            f.write("Windows Registry Editor Version 5.00\n\n")
-
-            # User Shell Folders
-            if user_shell_value:
-                key_path = f"HKEY_CURRENT_USER\\{KEY_USER_SHELL}"
-                f.write(f"[{key_path}]\n")
-                # Backslashes escapen für .reg Format
-                escaped_value = user_shell_value.replace("\\", "\\\\")
-                f.write(f'"{VALUE_NAME}"=hex(2):{_string_to_reg_hex(user_shell_value)}\n\n')
-
-            # Legacy Shell Folders
-            if legacy_shell_value:
-                key_path = f"HKEY_CURRENT_USER\\{KEY_LEGACY_SHELL}"
-                f.write(f"[{key_path}]\n")
-                escaped_value = legacy_shell_value.replace("\\", "\\\\")
-                f.write(f'"{VALUE_NAME}"="{escaped_value}"\n\n')
-
-            # Metadata als Kommentar
-            f.write(f"; Backup erstellt: {datetime.now().isoformat()}\n")
-            f.write(f"; Grund: {reason}\n")
-            f.write(f"; User Shell: {user_shell_value}\n")
-            f.write(f"; Legacy Shell: {legacy_shell_value}\n")
+        filename = f"registry_{digest}.reg"
+        backup_file = os.path.join(backup_dir, filename)
+        index_path = os.path.join(backup_dir, INDEX_FILE_NAME)
+
+        # Schneller Weg: Index seit dem letzten Zugriff unverändert, Werte auch
+        newest = _newest
+        if newest is not None and newest[:2] == (backup_dir, digest) and newest[2] == _index_signature(index_path):
+            logger.debug(get_text("backup_manager.info.unchanged", path=backup_file))
+            return backup_file
+
+        with file_lock(os.path.join(backup_dir, INDEX_LOCK_NAME)):
+            entries, intact, lines = _read_index(backup_dir)
+            if entries and entries[-1]["hash"] == digest and os.path.exists(backup_file):
+                _remember_newest(backup_dir, entries)
+                logger.debug(get_text("backup_manager.info.unchanged", path=backup_file))
+                return backup_file
+
+            if not os.path.exists(backup_file):
+                write_atomic(backup_file, content)
+            entry = {"timestamp": snapshot.timestamp, "reason": snapshot.reason, "hash": digest, "file": filename}
+            keep_count = snapshot.keep_count
+            removed: List[dict] = []
+            if keep_count is not None:
+                entry["keep"] = keep_count
+            entries.append(entry)
+            if keep_count is not None:
+                entries, removed = _split_retention(entries, keep_count)
+
+            if keep_count is not None and lines + 1 > COMPACT_FACTOR * keep_count:
+                _save_index(backup_dir, entries)
+            elif not intact:
+                # Nicht an eine abgebrochene Zeile anhängen
+                _save_index(backup_dir, entries)
+            else:
+                _append_index(backup_dir, entry, entries)
+            # Erst nach dem Index: ein Absturz dazwischen hinterlässt höchstens verwaiste Dateien
+            _remove_unreferenced(backup_dir, removed, entries)
 
         logger.info(get_text("backup_manager.info.created", path=backup_file))
         return backup_file
@@ -82,13 +243,9 @@ def create_registry_backup(reason: str = "manual") -> Optional[str]:
 
 
 def _read_registry_value(key_path: str, value_name: str) -> Optional[str]:
-    """Liest einen Registry-Wert."""
-    try:
-        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-            value, _ = winreg.QueryValueEx(key, value_name)
-            return os.path.expandvars(value)
-    except WindowsError:
-        return None
+    """Liest einen Registry-Wert (über den prozessweiten Registry-Cache)."""
+    value = get_cached_value(key_path, value_name)
+    return os.path.expandvars(value) if value else None
 
 
 def _string_to_reg_hex(s: str) -> str:
@@ -103,34 +260,145 @@ def _string_to_reg_hex(s: str) -> str:
     return hex_bytes
 
 
+# =============================================================================
+# Index
+# =============================================================================
+
+
+def _load_index(backup_dir: str) -> List[dict]:
+    """
+    Liest die gültigen Einträge des Index; fehlt er, wird er einmalig aus
+    vorhandenen .reg-Dateien aufgebaut.
+
+    Zeilen, die ein späterer Eintrag per "keep" abgeschnitten hat, fehlen.
+    """
+    return _read_index(backup_dir)[0]
+
+
+def _read_index(backup_dir: str) -> Tuple[List[dict], bool, int]:
+    """Wie _load_index(), zusätzlich ob alle Zeilen lesbar waren und wie viele Zeilen der Index hat."""
+    index_path = os.path.join(backup_dir, INDEX_FILE_NAME)
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        entries = _legacy_entries(backup_dir)
+        if entries:
+            _save_index(backup_dir, entries)
+        return entries, True, len(entries)
+
+    entries = []
+    intact = True
+    # Anzahl der vorderen Einträge, die per "keep" bereits entfernt sind
+    expired = 0
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            # Abgebrochenes Anhängen (z.B. Absturz): Zeile überspringen
+            intact = False
+            continue
+        entries.append(entry)
+        keep = entry.get("keep")
+        if keep is not None:
+            expired = max(expired, len(entries) - keep)
+    return entries[expired:], intact, len(lines)
+
+
+def _save_index(backup_dir: str, entries: List[dict]) -> None:
+    """Schreibt den Index vollständig neu (atomar)."""
+    payload = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries)
+    write_atomic(os.path.join(backup_dir, INDEX_FILE_NAME), payload.encode("utf-8"))
+    _remember_newest(backup_dir, entries)
+
+
+def _append_index(backup_dir: str, entry: dict, entries: List[dict]) -> None:
+    """Hängt einen Eintrag an den Index an; entries ist der Index danach."""
+    with open(os.path.join(backup_dir, INDEX_FILE_NAME), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    _remember_newest(backup_dir, entries)
+
+
+def _index_signature(index_path: str) -> Optional[Tuple[int, int, int]]:
+    """Inode, mtime und Größe des Index; os.replace() ändert zumindest den Inode."""
+    try:
+        stat = os.stat(index_path)
+    except OSError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _remember_newest(backup_dir: str, entries: List[dict]) -> None:
+    global _newest
+    signature = _index_signature(os.path.join(backup_dir, INDEX_FILE_NAME))
+    _newest = (backup_dir, entries[-1]["hash"], signature) if entries and signature else None
+
+
+def _legacy_entries(backup_dir: str) -> List[dict]:
+    """Index-Einträge für Backups aus der Zeit vor dem Index (registry_<Grund>_<Zeit>.reg)."""
+    entries = []
+    for filename in os.listdir(backup_dir):
+        match = _LEGACY_NAME.match(filename)
+        if not match:
+            continue
+        try:
+            with open(os.path.join(backup_dir, filename), "rb") as f:
+                digest = backup_hash(f.read())
+        except OSError:
+            continue
+        timestamp = datetime.strptime(match.group(2), "%Y%m%d_%H%M%S").isoformat()
+        entries.append({"timestamp": timestamp, "reason": match.group(1), "hash": digest, "file": filename})
+    entries.sort(key=lambda entry: entry["timestamp"])
+    return entries
+
+
+def _split_retention(entries: List[dict], keep_count: int) -> Tuple[List[dict], List[dict]]:
+    """Teilt den Index in (behalten, entfernen); behalten werden die neuesten keep_count."""
+    if len(entries) <= keep_count:
+        return entries, []
+    cut = len(entries) - keep_count
+    return entries[cut:], entries[:cut]
+
+
+def _remove_unreferenced(backup_dir: str, removed: List[dict], kept: List[dict]) -> int:
+    """Löscht Dateien entfernter Einträge, sofern kein behaltener Eintrag sie nutzt."""
+    referenced: Set[str] = {entry["file"] for entry in kept}
+    deleted = 0
+    for filename in {entry["file"] for entry in removed} - referenced:
+        try:
+            os.remove(os.path.join(backup_dir, filename))
+            deleted += 1
+            logger.debug(get_text("backup_manager.info.deleted_single", name=filename))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(get_text("backup_manager.warn.delete_failed", e=e))
+    if deleted > 0:
+        logger.info(get_text("backup_manager.info.deleted_count", count=deleted))
+    return deleted
+
+
 def list_backups() -> list[dict]:
     """
-    Listet alle vorhandenen Backups auf.
+    Listet alle Backups laut Index auf.
 
     Returns:
-        Liste von Dicts mit Backup-Informationen
+        Liste von Dicts (filename, path, created, reason, hash), neueste zuerst
     """
-    backup_dir = get_backup_dir()
     backups = []
 
     try:
-        for filename in os.listdir(backup_dir):
-            if filename.endswith(".reg"):
-                filepath = os.path.join(backup_dir, filename)
-                stat = os.stat(filepath)
-                backups.append(
-                    {
-                        "filename": filename,
-                        "path": filepath,
-                        "size": stat.st_size,
-                        "created": datetime.fromtimestamp(stat.st_ctime),
-                        "modified": datetime.fromtimestamp(stat.st_mtime),
-                    }
-                )
-
-        # Nach Datum sortieren (neueste zuerst)
-        backups.sort(key=lambda x: x["created"], reverse=True)
-
+        backup_dir = get_backup_dir()
+        for entry in reversed(_load_index(backup_dir)):
+            backups.append(
+                {
+                    "filename": entry["file"],
+                    "path": os.path.join(backup_dir, entry["file"]),
+                    "created": datetime.fromisoformat(entry["timestamp"]),
+                    "reason": entry["reason"],
+                    "hash": entry["hash"],
+                }
+            )
     except Exception as e:
         logger.error(get_text("backup_manager.error.list", e=e))
 
@@ -150,79 +418,304 @@ def get_latest_backup() -> Optional[str]:
     return None
 
 
-def restore_from_backup(backup_path: str) -> bool:
+@dataclass(frozen=True)
+class RestoreChange:
+    """
+    Ein Wert, den eine Wiederherstellung ändern würde.
+
+    Attributes:
+        key_path: Schlüsselpfad unterhalb von HKEY_CURRENT_USER
+        value_name: Name des Werts
+        current: Aktueller Wert (None, wenn er fehlt)
+        restored: Wert aus dem Backup
     """
-    Stellt die Registry aus einem Backup wieder her.
+
+    key_path: str
+    value_name: str
+    current: Optional[RegistryValue]
+    restored: RegistryValue
+
+    def describe(self) -> str:
+        current = self.current.data if self.current else None
+        return get_text(
+            "backup_manager.info.diff",
+            key_path=self.key_path,
+            value_name=self.value_name,
+            current=current,
+            restored=self.restored.data,
+        )
+
+
+def diff_backup(backup_path: str, backend: Optional[RegistryBackend] = None) -> List[RestoreChange]:
+    """
+    Vergleicht ein Backup mit den aktuellen Registry-Werten.
 
     Args:
         backup_path: Pfad zur .reg Backup-Datei
+        backend: Registry-Backend (Standard: das des prozessweiten Registry-Caches)
 
     Returns:
-        True bei Erfolg, False bei Fehler
+        Alle Werte, die sich durch die Wiederherstellung ändern würden
+
+    Raises:
+        OSError: Datei nicht lesbar
+        RegFileError: Datei ist keine gültige .reg-Datei
     """
-    import subprocess
+    backend = backend or get_registry_cache().backend
+    restored = {}
+    for entry in parse_reg_file(backup_path):
+        # Mehrfach gesetzte Werte: der letzte gewinnt (wie bei reg import)
+        restored[(entry.key_path.lower(), entry.value_name.lower())] = entry
+
+    changes = []
+    for entry in restored.values():
+        # Direkt vom Backend, nicht aus dem Cache: verglichen wird mit dem echten Stand
+        current = backend.read_value(entry.key_path, entry.value_name)
+        if current != entry.value:
+            changes.append(RestoreChange(entry.key_path, entry.value_name, current, entry.value))
+    return changes
+
+
+def restore_from_backup(backup_path: str, dry_run: bool = False, backend: Optional[RegistryBackend] = None) -> bool:
+    """
+    Stellt die Registry aus einem Backup wieder her.
+
+    Die Datei wird im Prozess geparst (kein "reg import"); nur geänderte
+    Werte werden als eine RegistryTransaction geschrieben.
+
+    Args:
+        backup_path: Pfad zur .reg Backup-Datei
+        dry_run: Nur die Unterschiede zu den aktuellen Werten loggen, nichts schreiben
+        backend: Registry-Backend (Standard: das des prozessweiten Registry-Caches)
 
+    Returns:
+        True bei Erfolg (bzw. bei dry_run: Backup lesbar), False bei Fehler
+    """
     if not os.path.exists(backup_path):
         logger.error(get_text("backup_manager.error.not_found", path=backup_path))
         return False
 
     try:
-        # reg import ausführen (erfordert keine Admin-Rechte für HKCU)
-        result = subprocess.run(["reg", "import", backup_path], capture_output=True, text=True)
-
-        if result.returncode == 0:
-            logger.info(get_text("backup_manager.info.restored", path=backup_path))
-            return True
-        else:
-            logger.error(get_text("backup_manager.error.restore_failed", error=result.stderr))
-            return False
-
+        changes = diff_backup(backup_path, backend)
+    except RegFileError as e:
+        logger.error(get_text("backup_manager.error.restore_failed", error=e))
+        return False
     except Exception as e:
         logger.error(get_text("backup_manager.error.restore_exception", e=e))
         return False
 
+    for change in changes:
+        if dry_run:
+            logger.info(change.describe())
+        else:
+            logger.debug(change.describe())
+    if dry_run:
+        return True
+    if not changes:
+        logger.info(get_text("backup_manager.info.restore_unchanged", path=backup_path))
+        return True
+
+    transaction = RegistryTransaction(backend)
+    for change in changes:
+        transaction.set_value(change.key_path, change.value_name, change.restored.data, change.restored.value_type)
+    result = transaction.commit()
+    if not result.success:
+        logger.error(get_text("backup_manager.error.restore_failed", error=result.message))
+        return False
 
-def cleanup_old_backups(keep_count: int = 10) -> int:
+    logger.info(get_text("backup_manager.info.restored", path=backup_path))
+    return True
+
+
+def cleanup_old_backups(keep_count: int = DEFAULT_KEEP_COUNT) -> int:
     """
-    Löscht alte Backups und behält nur die neuesten.
+    Löscht alte Backups und behält nur die neuesten Index-Einträge.
 
     Args:
         keep_count: Anzahl der Backups die behalten werden sollen
 
     Returns:
-        Anzahl der gelöschten Backups
+        Anzahl der gelöschten Backup-Dateien
     """
-    backups = list_backups()
-    deleted = 0
-
-    if len(backups) <= keep_count:
+    backup_dir = get_backup_dir()
+    try:
+        with file_lock(os.path.join(backup_dir, INDEX_LOCK_NAME)):
+            kept, removed = _split_retention(_load_index(backup_dir), keep_count)
+            if not removed:
+                return 0
+            _save_index(backup_dir, kept)
+            return _remove_unreferenced(backup_dir, removed, kept)
+    except Exception as e:
+        logger.warning(get_text("backup_manager.warn.delete_failed", e=e))
         return 0
 
-    # Lösche alle außer den neuesten keep_count
-    for backup in backups[keep_count:]:
-        try:
-            os.remove(backup["path"])
-            deleted += 1
-            logger.debug(get_text("backup_manager.info.deleted_single", name=backup['filename']))
-        except Exception as e:
-            logger.warning(get_text("backup_manager.warn.delete_failed", e=e))
 
-    if deleted > 0:
-        logger.info(get_text("backup_manager.info.deleted_count", count=deleted))
+# =============================================================================
+# Hintergrund-Worker
+# =============================================================================
 
-    return deleted
 
+class BackupWorker:
+    """
+    Schreibt Backups in einem Hintergrund-Thread.
+
+    Die Werte werden beim Einreihen gelesen (BackupSnapshot); Schreiben,
+    Deduplizierung und Aufbewahrung laufen danach ohne den Aufrufer. Die
+    Warteschlange ist begrenzt: Ist sie voll, wird das Backup verworfen statt
+    den Aufrufer (den Desktop-Wechsel) zu blockieren.
+    """
 
-def create_backup_before_switch() -> Optional[str]:
+    def __init__(self, max_pending: int = DEFAULT_QUEUE_SIZE):
+        self._queue: "queue.Queue[Optional[BackupSnapshot]]" = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.completed = 0
+        self.dropped = 0
+
+    @property
+    def pending(self) -> int:
+        """Anzahl eingereihter, noch nicht geschriebener Backups."""
+        with self._lock:
+            return self._pending
+
+    def submit(self, snapshot: BackupSnapshot) -> bool:
+        """
+        Reiht ein Backup ein, ohne zu warten.
+
+        Nach shutdown() wird synchron geschrieben.
+
+        Returns:
+            False, wenn die Warteschlange voll ist (Backup verworfen)
+        """
+        with self._lock:
+            if self._closed:
+                closed = True
+            else:
+                closed = False
+                try:
+                    self._queue.put_nowait(snapshot)
+                except queue.Full:
+                    self.dropped += 1
+                    logger.warning(get_text("backup_manager.warn.queue_full", size=self._queue.maxsize))
+                    return False
+                self._pending += 1
+                self._ensure_thread()
+        if closed:
+            return write_backup(snapshot) is not None
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wartet, bis alle eingereihten Backups geschrieben sind.
+
+        Returns:
+            False, wenn timeout vorher abgelaufen ist
+        """
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, timeout: Optional[float] = DEFAULT_FLUSH_TIMEOUT) -> bool:
+        """
+        Schreibt ausstehende Backups und beendet den Thread.
+
+        Returns:
+            False, wenn nicht alle Backups innerhalb von timeout geschrieben wurden
+        """
+        with self._lock:
+            if self._closed:
+                return self._pending == 0
+            self._closed = True
+            thread = self._thread
+        flushed = self.flush(timeout)
+        if not flushed:
+            logger.warning(get_text("backup_manager.warn.flush_timeout", count=self.pending))
+        if thread is not None:
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                # Nach einem Timeout: der Daemon-Thread endet mit dem Prozess
+                return flushed
+            thread.join(timeout)
+        return flushed
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="SmartDeskBackupWorker", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            snapshot = self._queue.get()
+            if snapshot is None:
+                return
+            try:
+                # write_backup() loggt Fehler selbst und wirft nicht
+                write_backup(snapshot)
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self.completed += 1
+                    self._idle.notify_all()
+
+
+_worker: Optional[BackupWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_backup_worker() -> BackupWorker:
+    """Gibt den prozessweiten Backup-Worker zurück (Singleton)."""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                _worker = BackupWorker()
+    return _worker
+
+
+def set_backup_worker(worker: Optional[BackupWorker]) -> None:
+    """Ersetzt den prozessweiten Worker (z.B. für Tests); der alte wird beendet."""
+    global _worker
+    with _worker_lock:
+        old, _worker = _worker, worker
+    if old is not None and old is not worker:
+        old.shutdown()
+
+
+def flush_pending_backups(timeout: Optional[float] = DEFAULT_FLUSH_TIMEOUT) -> bool:
     """
-    Erstellt ein Backup vor einem Desktop-Wechsel.
-    Räumt auch alte Backups auf.
+    Schreibt ausstehende Backups und beendet den Worker (beim Beenden der App).
 
-    Returns:
-        Pfad zum Backup oder None
+    Läuft auch automatisch per atexit; ein späteres Backup startet einen neuen Worker.
+    """
+    global _worker
+    with _worker_lock:
+        worker, _worker = _worker, None
+    if worker is None:
+        return True
+    return worker.shutdown(timeout)
+
+
+atexit.register(flush_pending_backups)
+
+
+def create_backup_before_switch() -> bool:
     """
-    # Alte Backups aufräumen
-    cleanup_old_backups(keep_count=10)
+    Reiht ein Backup vor einem Desktop-Wechsel ein.
 
-    # Neues Backup erstellen
-    return create_registry_backup(reason="before_switch")
+    Die Werte werden sofort gelesen (vor der Registry-Änderung); Schreiben
+    und Aufräumen laufen im BackupWorker.
+
+    Returns:
+        True, wenn ein Backup eingereiht wurde
+    """
+    try:
+        snapshot = snapshot_registry(reason="before_switch", keep_count=DEFAULT_KEEP_COUNT)
+    except Exception as e:
+        logger.error(get_text("backup_manager.error.create", e=e))
+        return False
+    if snapshot is None:
+        return False
+    return get_backup_worker().submit(snapshot)
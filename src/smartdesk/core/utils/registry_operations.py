@@ -7,6 +7,7 @@ import sys
 
 from ...shared.style import PREFIX_ERROR
 from ...shared.localization import get_text
+from ..registry.cache import invalidate_registry_cache
 
 
 def update_registry_key(key_path: str, value_name: str, value: str, value_type=winreg.REG_SZ) -> bool:
@@ -16,6 +17,8 @@ def update_registry_key(key_path: str, value_name: str, value: str, value_type=w
     try:
         with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE) as key:
             winreg.SetValueEx(key, value_name, 0, value_type, value)
+        # Die Änderungs-Benachrichtigung kommt asynchron; bis dahin nicht den alten Wert liefern
+        invalidate_registry_cache(key_path)
         return True
     except WindowsError as e:
         print(f"{PREFIX_ERROR} {get_text('registry.error.update', key_path=key_path, e=e)}")
@@ -73,9 +76,9 @@ def is_process_running(pid):
         if not process.is_running():
             return False
 
-        # Prüfe ob es ein Python-Prozess ist
+        # Prüfe ob es ein Python-Prozess ist (bzw. die eigene EXE bei PyInstaller-Builds)
         process_name = process.name().lower()
-        if "python" not in process_name:
+        if "python" not in process_name and process_name != os.path.basename(sys.executable).lower():
             return False
 
         try:
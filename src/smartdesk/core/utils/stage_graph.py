@@ -0,0 +1,155 @@
+# Dateipfad: src/smartdesk/core/utils/stage_graph.py
+"""
+Ausführung von Stufen nach Abhängigkeiten (z.B. beim Desktop-Wechsel).
+
+Jede Stufe nennt die Stufen, nach denen sie laufen muss (after). Stufen,
+deren Vorgänger fertig sind, laufen parallel in einem Thread-Pool; Stufen
+mit inline=True laufen im aufrufenden Thread (z.B. weil sie Dialoge zeigen,
+die Qt nur im GUI-Thread erlaubt).
+
+- Gibt eine Stufe False zurück, werden keine weiteren Stufen gestartet;
+  bereits laufende werden abgewartet. run_stages() gibt dann False zurück.
+- Wirft eine Stufe eine Exception, passiert dasselbe und die erste
+  Exception wird danach weitergereicht.
+
+Beispiel:
+    stages = [
+        Stage("icons", capture_icons),
+        Stage("animation", start_animation),
+        Stage("registry", write_registry, after=("icons",)),
+    ]
+    run_stages(stages, timer=trace)
+"""
+
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from .stage_timer import StageTimer
+
+DEFAULT_MAX_WORKERS = 4
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    Eine Stufe im Abhängigkeitsgraphen.
+
+    Attributes:
+        name: Eindeutiger Name (auch für die Zeitmessung)
+        run: Funktion ohne Argumente; False bricht den Ablauf ab
+        after: Namen der Stufen, die vorher fertig sein müssen
+        inline: Im aufrufenden Thread statt im Thread-Pool ausführen
+    """
+
+    name: str
+    run: Callable[[], Optional[bool]]
+    after: Tuple[str, ...] = ()
+    inline: bool = False
+
+
+def validate_stages(stages: Sequence[Stage]) -> None:
+    """
+    Prüft Namen und Abhängigkeiten.
+
+    Raises:
+        ValueError: Bei doppelten Namen, unbekannten Abhängigkeiten oder Zyklen
+    """
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Doppelte Stufennamen: {names}")
+    known = set(names)
+    for stage in stages:
+        unknown = set(stage.after) - known
+        if unknown:
+            raise ValueError(f"Stufe {stage.name}: unbekannte Abhängigkeiten {sorted(unknown)}")
+
+    # Zyklen: Kahn-Algorithmus muss alle Stufen erreichen
+    pending = {stage.name: set(stage.after) for stage in stages}
+    while pending:
+        ready = [name for name, deps in pending.items() if not deps]
+        if not ready:
+            raise ValueError(f"Zyklische Abhängigkeiten zwischen {sorted(pending)}")
+        for name in ready:
+            del pending[name]
+        for deps in pending.values():
+            deps.difference_update(ready)
+
+
+def run_stages(
+    stages: Sequence[Stage],
+    timer: Optional[StageTimer] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> bool:
+    """
+    Führt die Stufen nach ihren Abhängigkeiten aus.
+
+    Pool-Stufen laufen im Kontext (contextvars) des Aufrufers, damit z.B.
+    get_current_trace() auch dort den Trace des Ablaufs liefert.
+
+    Args:
+        stages: Stufen; die Reihenfolge bestimmt bei gleichzeitig bereiten
+            Stufen, welche zuerst gestartet wird
+        timer: Misst jede Stufe mit timer.stage(name), falls angegeben
+        max_workers: Größe des Thread-Pools
+
+    Returns:
+        True, wenn alle Stufen gelaufen sind; False nach einem Abbruch
+
+    Raises:
+        ValueError: Siehe validate_stages()
+        Exception: Die erste Exception einer Stufe
+    """
+    validate_stages(stages)
+
+    def execute(stage: Stage) -> bool:
+        with timer.stage(stage.name) if timer else nullcontext():
+            return stage.run() is not False
+
+    waiting: List[Stage] = list(stages)
+    done: Set[str] = set()
+    running: Dict[Future, Stage] = {}
+    aborted = False
+    error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="SmartDeskStage") as pool:
+        while waiting or running:
+            if not (aborted or error):
+                ready = [stage for stage in waiting if done.issuperset(stage.after)]
+                for stage in ready:
+                    if not stage.inline:
+                        waiting.remove(stage)
+                        context = contextvars.copy_context()
+                        running[pool.submit(context.run, execute, stage)] = stage
+                inline = next((stage for stage in ready if stage.inline), None)
+                if inline is not None:
+                    waiting.remove(inline)
+                    try:
+                        if execute(inline):
+                            done.add(inline.name)
+                        else:
+                            aborted = True
+                    except BaseException as e:
+                        error = e
+                    continue
+
+            if not running:
+                # Nur noch Stufen mit unerfüllbaren Abhängigkeiten (nach Abbruch)
+                break
+            finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    if future.result():
+                        done.add(stage.name)
+                    else:
+                        aborted = True
+                except BaseException as e:
+                    if error is None:
+                        error = e
+
+    if error is not None:
+        raise error
+    return not aborted
@@ -0,0 +1,79 @@
+# Dateipfad: src/smartdesk/core/utils/stage_timer.py
+"""
+Zeitmessung einzelner Abschnitte (Stufen) eines Ablaufs, z.B. des Desktop-Wechsels.
+
+Beispiel:
+    timer = StageTimer()
+    with timer.stage("registry"):
+        ...
+    logger.debug(timer.summary())
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Span:
+    """
+    Eine gemessene Stufe.
+
+    Attributes:
+        name: Name der Stufe
+        start_ms: Beginn relativ zum Start des Timers (Millisekunden)
+        duration_ms: Dauer (Millisekunden)
+        error: Name der Exception, falls die Stufe mit einer Exception endete
+    """
+
+    name: str
+    start_ms: float
+    duration_ms: float
+    error: Optional[str] = None
+
+
+class StageTimer:
+    """Misst die Dauer benannter Stufen mit time.perf_counter()."""
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._spans: List[Span] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        """Misst den Block als Stufe name (mehrfach genutzte Namen werden addiert)."""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            self._spans.append(Span(name, (start - self._start) * 1000, (end - start) * 1000, error))
+
+    @property
+    def spans(self) -> List[Span]:
+        """Alle gemessenen Stufen in Reihenfolge ihres Endes."""
+        return list(self._spans)
+
+    @property
+    def durations_ms(self) -> Dict[str, float]:
+        """Dauer je Stufe in Millisekunden, in Reihenfolge des ersten Endes."""
+        durations: Dict[str, float] = {}
+        for span in self._spans:
+            durations[span.name] = durations.get(span.name, 0.0) + span.duration_ms
+        return durations
+
+    @property
+    def total_ms(self) -> float:
+        """Zeit seit Erzeugung des Timers in Millisekunden."""
+        return (time.perf_counter() - self._start) * 1000
+
+    def summary(self) -> str:
+        """Kurzform für Logs: "sync=1.2ms backup=0.1ms ... total=3.4ms"."""
+        parts = [f"{name}={ms:.1f}ms" for name, ms in self.durations_ms.items()]
+        parts.append(f"total={self.total_ms:.1f}ms")
+        return " ".join(parts)
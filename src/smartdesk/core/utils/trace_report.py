@@ -0,0 +1,190 @@
+# Dateipfad: src/smartdesk/core/utils/trace_report.py
+"""
+Auswertung der Trace-Datei (smartdesk-trace).
+
+Fasst die Datensätze aus switch_trace.jsonl zusammen: Anzahl, p50, p95 und
+Maximum je Stufe sowie für den gesamten Ablauf ("total"), wahlweise getrennt
+nach Prozessrolle (listener, tray, gui).
+
+Mit --prefetch statt der Stufen: Treffer der Vorausberechnung
+(switch_prefetch.py) und die dadurch eingesparte Zeit.
+
+Aufruf:
+    smartdesk-trace [--file PFAD] [--by-process] [--last N] [--outcome ok] [--prefetch] [--json]
+"""
+
+import argparse
+import json
+import math
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional
+
+from .tracing import read_trace_records
+from ...shared.localization import get_text
+
+TOTAL = "total"
+
+
+@dataclass(frozen=True)
+class StageStats:
+    """
+    Kennzahlen einer Stufe über mehrere Datensätze (Millisekunden).
+
+    Attributes:
+        count: Anzahl der Messungen
+        p50: Median
+        p95: 95. Perzentil
+        max: Größter Wert
+    """
+
+    count: int
+    p50: float
+    p95: float
+    max: float
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Perzentil nach Nearest-Rank; values muss sortiert und nicht leer sein."""
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
+
+
+def summarize(
+    records: Iterable[dict],
+    kind: str = "switch",
+    by_process: bool = False,
+    outcome: Optional[str] = None,
+) -> Dict[str, Dict[str, StageStats]]:
+    """
+    Fasst Trace-Datensätze zusammen.
+
+    Args:
+        records: Datensätze (z.B. aus read_trace_records())
+        kind: Nur Datensätze dieser Art
+        by_process: Getrennt nach Prozessrolle statt alle zusammen ("all")
+        outcome: Nur Datensätze mit diesem Ergebnis (z.B. "ok")
+
+    Returns:
+        {Gruppe: {Stufe: StageStats}}, Stufen in Reihenfolge ihres ersten Auftretens,
+        "total" zuletzt
+    """
+    samples: Dict[str, Dict[str, List[float]]] = {}
+    for record in records:
+        if record.get("kind") != kind or (outcome and record.get("outcome") != outcome):
+            continue
+        group = samples.setdefault(record.get("process", "?") if by_process else "all", {})
+        # Mehrfach gemessene Stufen eines Datensatzes zählen als eine Messung
+        per_record: Dict[str, float] = {}
+        for stage in record.get("stages", []):
+            per_record[stage["name"]] = per_record.get(stage["name"], 0.0) + stage["duration_ms"]
+        for name, duration in per_record.items():
+            group.setdefault(name, []).append(duration)
+        if "duration_ms" in record:
+            group.setdefault(TOTAL, []).append(record["duration_ms"])
+
+    summary: Dict[str, Dict[str, StageStats]] = {}
+    for group_name, stages in samples.items():
+        ordered = [name for name in stages if name != TOTAL] + ([TOTAL] if TOTAL in stages else [])
+        summary[group_name] = {}
+        for name in ordered:
+            values = sorted(stages[name])
+            summary[group_name][name] = StageStats(len(values), percentile(values, 50), percentile(values, 95), values[-1])
+    return summary
+
+
+@dataclass(frozen=True)
+class PrefetchStats:
+    """
+    Ergebnisse der Vorausberechnung über mehrere Wechsel.
+
+    Attributes:
+        hits / misses / stale: Anzahl je Ergebnis (siehe SwitchPrefetcher.take())
+        hit_rate: Anteil der Treffer an allen Wechseln mit Vorausberechnung
+        saved_ms_total: Summe von prefetch_saved_ms
+        saved_ms_p50: Median von prefetch_saved_ms je Treffer
+    """
+
+    hits: int
+    misses: int
+    stale: int
+    hit_rate: float
+    saved_ms_total: float
+    saved_ms_p50: float
+
+
+def summarize_prefetch(records: Iterable[dict], kind: str = "switch", outcome: Optional[str] = None) -> Optional[PrefetchStats]:
+    """Fasst die prefetch-Attribute der Datensätze zusammen (None ohne solche Datensätze)."""
+    counts = {"hit": 0, "miss": 0, "stale": 0}
+    saved: List[float] = []
+    for record in records:
+        if record.get("kind") != kind or (outcome and record.get("outcome") != outcome):
+            continue
+        attrs = record.get("attrs", {})
+        status = attrs.get("prefetch")
+        if status not in counts:
+            continue
+        counts[status] += 1
+        if status == "hit":
+            saved.append(float(attrs.get("prefetch_saved_ms", 0.0)))
+    total = sum(counts.values())
+    if not total:
+        return None
+    saved.sort()
+    return PrefetchStats(
+        counts["hit"],
+        counts["miss"],
+        counts["stale"],
+        counts["hit"] / total,
+        sum(saved),
+        percentile(saved, 50) if saved else 0.0,
+    )
+
+
+def format_report(summary: Dict[str, Dict[str, StageStats]]) -> str:
+    """Formatiert summarize() als Tabelle."""
+    if not summary:
+        return get_text("tracing.report.no_records")
+    lines = []
+    for group_name, stages in summary.items():
+        lines.append(get_text("tracing.report.group", group=group_name))
+        lines.append(f"  {'Stufe':<18} {'Anzahl':>7} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}")
+        for name, stats in stages.items():
+            lines.append(f"  {name:<18} {stats.count:>7} {stats.p50:>10.1f} {stats.p95:>10.1f} {stats.max:>10.1f}")
+        lines.append("")
+    return "\n".join(lines).rstrip("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Einstiegspunkt für smartdesk-trace."""
+    parser = argparse.ArgumentParser(prog="smartdesk-trace", description=get_text("tracing.report.description"))
+    parser.add_argument("--file", help=get_text("tracing.report.arg_file"))
+    parser.add_argument("--by-process", action="store_true", help=get_text("tracing.report.arg_by_process"))
+    parser.add_argument("--last", type=int, default=0, help=get_text("tracing.report.arg_last"))
+    parser.add_argument("--outcome", help=get_text("tracing.report.arg_outcome"))
+    parser.add_argument("--kind", default="switch", help=get_text("tracing.report.arg_kind"))
+    parser.add_argument("--json", action="store_true", help=get_text("tracing.report.arg_json"))
+    parser.add_argument("--prefetch", action="store_true", help=get_text("tracing.report.arg_prefetch"))
+    args = parser.parse_args(argv)
+
+    records = list(read_trace_records(args.file))
+    if args.last > 0:
+        records = records[-args.last :]
+    if args.prefetch:
+        stats = summarize_prefetch(records, kind=args.kind, outcome=args.outcome)
+        if args.json:
+            print(json.dumps(asdict(stats) if stats else None, indent=2))
+        else:
+            print(get_text("tracing.report.prefetch", **asdict(stats)) if stats else get_text("tracing.report.no_prefetch"))
+        return 0
+    summary = summarize(records, kind=args.kind, by_process=args.by_process, outcome=args.outcome)
+
+    if args.json:
+        print(json.dumps({group: {name: asdict(stats) for name, stats in stages.items()} for group, stages in summary.items()}, indent=2))
+    else:
+        print(format_report(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
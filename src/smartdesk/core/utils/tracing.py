@@ -0,0 +1,191 @@
+# Dateipfad: src/smartdesk/core/utils/tracing.py
+"""
+Traces für Abläufe wie den Desktop-Wechsel.
+
+Ein Trace misst benannte Stufen (siehe StageTimer) und bekommt eine
+Trace-ID. Während des Ablaufs ist er über get_current_trace() erreichbar
+(contextvars, d.h. auch in Threads/Tasks, die den Kontext übernehmen);
+Kindprozesse (z.B. die Animation) erhalten die ID über die
+Umgebungsvariable SMARTDESK_TRACE_ID (Trace.env()).
+
+Am Ende wird ein Datensatz als eine JSON-Zeile an DATA_DIR/switch_trace.jsonl
+angehängt. Listener, Tray und GUI schreiben in dieselbe Datei; jede Zeile
+nennt Prozessrolle und PID. Ab MAX_TRACE_BYTES wird die Datei nach
+".1" verschoben. Auswertung: smartdesk-trace (trace_report.py).
+
+Datensatz:
+    {"trace_id": "...", "kind": "switch", "process": "listener", "pid": 123,
+     "started": "2025-01-01T12:00:00.000", "duration_ms": 3120.5, "outcome": "ok",
+     "attrs": {"desktop": "Arbeit"},
+     "stages": [{"name": "sync", "start_ms": 0.1, "duration_ms": 4.2}, ...]}
+"""
+
+import json
+import os
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .stage_timer import StageTimer
+from ...shared.config import DATA_DIR
+from ...shared.localization import get_text
+from ...shared.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+TRACE_FILE = os.path.join(DATA_DIR, "switch_trace.jsonl")
+
+# Ab dieser Größe wird die Trace-Datei nach "<TRACE_FILE>.1" verschoben
+MAX_TRACE_BYTES = 1024 * 1024
+
+# Umgebungsvariable, über die Kindprozesse die Trace-ID erhalten
+TRACE_ENV = "SMARTDESK_TRACE_ID"
+
+_current_trace: ContextVar[Optional["Trace"]] = ContextVar("smartdesk_trace", default=None)
+_process_role: Optional[str] = None
+
+
+def set_process_role(role: str) -> None:
+    """Setzt die Rolle dieses Prozesses für Trace-Datensätze (listener, tray, gui)."""
+    global _process_role
+    _process_role = role
+
+
+def get_process_role() -> str:
+    """Rolle dieses Prozesses; ohne set_process_role() der Name des Startskripts."""
+    if _process_role:
+        return _process_role
+    script = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+    return os.path.splitext(script)[0] or "python"
+
+
+class Trace(StageTimer):
+    """
+    Ein gemessener Ablauf mit Trace-ID.
+
+    Beispiel:
+        trace = Trace("switch", desktop=name)
+        with trace.activate():
+            with trace.stage("registry"):
+                ...
+        trace.finish("ok")
+    """
+
+    def __init__(self, kind: str, **attrs: Any):
+        super().__init__()
+        self.kind = kind
+        self.trace_id = uuid.uuid4().hex[:16]
+        # Von einem Elternprozess geerbte ID (z.B. Animation eines Wechsels)
+        self.parent_id = os.environ.get(TRACE_ENV)
+        self.attrs: Dict[str, Any] = dict(attrs)
+        self.started = datetime.now()
+        self.record: Optional[Dict[str, Any]] = None
+
+    def set(self, **attrs: Any) -> None:
+        """Ergänzt Attribute des Datensatzes."""
+        self.attrs.update(attrs)
+
+    @contextmanager
+    def activate(self):
+        """Macht den Trace für den Block über get_current_trace() verfügbar."""
+        token = _current_trace.set(self)
+        try:
+            yield self
+        finally:
+            _current_trace.reset(token)
+
+    def env(self) -> Dict[str, str]:
+        """Umgebung für Kindprozesse, die die Trace-ID erben sollen."""
+        env = dict(os.environ)
+        env[TRACE_ENV] = self.trace_id
+        return env
+
+    def to_record(self, outcome: str) -> Dict[str, Any]:
+        record: Dict[str, Any] = {
+            "trace_id": self.trace_id,
+            "kind": self.kind,
+            "process": get_process_role(),
+            "pid": os.getpid(),
+            "started": self.started.isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.total_ms, 3),
+            "outcome": outcome,
+            "attrs": self.attrs,
+            "stages": [],
+        }
+        if self.parent_id:
+            record["parent_id"] = self.parent_id
+        for span in self.spans:
+            stage: Dict[str, Any] = {"name": span.name, "start_ms": round(span.start_ms, 3), "duration_ms": round(span.duration_ms, 3)}
+            if span.error:
+                stage["error"] = span.error
+            record["stages"].append(stage)
+        return record
+
+    def finish(self, outcome: str) -> Dict[str, Any]:
+        """
+        Schließt den Trace ab und hängt den Datensatz an die Trace-Datei an.
+
+        Fehler beim Schreiben werden geloggt, nicht weitergereicht.
+        """
+        if self.record is None:
+            self.record = self.to_record(outcome)
+            write_trace_record(self.record)
+        return self.record
+
+
+def get_current_trace() -> Optional[Trace]:
+    """Der im aktuellen Kontext aktive Trace oder None."""
+    return _current_trace.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """ID des aktiven Traces, sonst eine von einem Elternprozess geerbte ID."""
+    trace = _current_trace.get()
+    return trace.trace_id if trace else os.environ.get(TRACE_ENV)
+
+
+def write_trace_record(record: Dict[str, Any], path: Optional[str] = None) -> bool:
+    """
+    Hängt einen Datensatz als JSON-Zeile an.
+
+    Die Zeile wird mit einem einzigen write() auf einen O_APPEND-Deskriptor
+    geschrieben, damit sich Zeilen mehrerer Prozesse nicht vermischen.
+    """
+    path = path or TRACE_FILE
+    line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+    try:
+        try:
+            if os.path.getsize(path) > MAX_TRACE_BYTES:
+                os.replace(path, path + ".1")
+        except FileNotFoundError:
+            pass
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+        return True
+    except OSError as e:
+        logger.warning(get_text("tracing.warn.write_failed", path=path, e=e))
+        return False
+
+
+def read_trace_records(path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Liest alle Datensätze (zuerst die verschobene ".1"-Datei); kaputte Zeilen werden übersprungen."""
+    path = path or TRACE_FILE
+    for candidate in (path + ".1", path):
+        try:
+            with open(candidate, "r", encoding="utf-8") as f:
+                lines: List[str] = f.readlines()
+        except FileNotFoundError:
+            continue
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
@@ -42,7 +42,7 @@ except ImportError as e:
 def _switch_to_desktop_by_index(desktop_index: int):
     """
     Holt alle Desktops, wählt einen anhand des Index (0=erster, 1=zweiter, ...)
-    und wechselt zu ihm, inklusive Explorer-Neustart.
+    und fordert den Wechsel zu ihm beim SwitchBroker an.
     """
     log_file = os.path.join(DATA_DIR, "actions.log")
 
@@ -69,9 +69,12 @@ def _switch_to_desktop_by_index(desktop_index: int):
                 target_desktop = desktops[desktop_index]
                 log.write(f"Target desktop: {target_desktop.name}\n")
 
-                # 3. Zum Desktop wechseln
-                if desktop_handler.switch_to_desktop(target_desktop.name):
-                    log.write("Switched to desktop successfully (including restart & sync).\n")
+                # 3. Wechsel anfordern (nicht blockierend: der Hotkey-Callback
+                #    kehrt sofort zurück, schnelle Folgen werden zusammengefasst)
+                #    Die Quelle "hotkey:<Nummer>" speist die Wechsel-Historie
+                outcome = desktop_handler.request_switch(target_desktop.name, wait=False, source=f"hotkey:{desktop_index + 1}")
+                if outcome:
+                    log.write(f"Switch queued (#{outcome.seq}).\n")
             else:
                 log.write(f"Invalid desktop index: {desktop_index}\n")
 
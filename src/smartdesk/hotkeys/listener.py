@@ -384,6 +384,10 @@ def start_listener():
         from ..shared.logging_config import get_logger
 
         logger = get_logger("hotkey_listener")
+        from ..core.utils.tracing import set_process_role
+
+        # Trace-Datensätze der Wechsel per Hotkey als "listener" kennzeichnen
+        set_process_role("listener")
     except ImportError:
         import logging
 
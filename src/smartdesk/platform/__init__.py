@@ -0,0 +1,25 @@
+# SmartDesk Platform
+from .current import create_default_platform, get_platform, set_platform, restart_explorer
+from .interfaces import DesktopListView, ExplorerProcess, Platform, WallpaperSetter, pack_position, unpack_position
+from .native import NativeExplorer, NativePlatform
+from .simulated import SimulatedExplorer, SimulatedListView, SimulatedPlatform, SimulatedWallpaper, visible_entries
+
+__all__ = [
+    "create_default_platform",
+    "get_platform",
+    "set_platform",
+    "restart_explorer",
+    "DesktopListView",
+    "ExplorerProcess",
+    "Platform",
+    "WallpaperSetter",
+    "pack_position",
+    "unpack_position",
+    "NativeExplorer",
+    "NativePlatform",
+    "SimulatedExplorer",
+    "SimulatedListView",
+    "SimulatedPlatform",
+    "SimulatedWallpaper",
+    "visible_entries",
+]
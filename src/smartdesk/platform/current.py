@@ -0,0 +1,63 @@
+# Dateipfad: src/smartdesk/platform/current.py
+"""
+Prozessweite Plattform, gegen die icon_service, wallpaper_service und der
+Desktop-Wechsel arbeiten.
+
+Standard ist unter Windows die native Plattform, sonst die Simulation.
+Tests, Benchmarks und der Lasttest setzen mit set_platform() bzw.
+SimulatedPlatform.installed() eine eigene.
+
+Bewusst ohne Importe aus dem Rest des Pakets auf Modulebene: Die Services
+importieren dieses Modul beim Laden von smartdesk.core.
+"""
+
+import sys
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from ..shared.localization import get_text
+from ..shared.logging_config import get_logger
+
+if TYPE_CHECKING:
+    from .interfaces import Platform
+
+logger = get_logger(__name__)
+
+
+def create_default_platform() -> "Platform":
+    """Wählt die Plattform für das aktuelle System (Windows, sonst Simulation)."""
+    if sys.platform == "win32":
+        from .native import NativePlatform
+
+        return NativePlatform()
+
+    from .simulated import SimulatedPlatform
+
+    logger.warning(get_text("platform.warn.simulated"))
+    return SimulatedPlatform()
+
+
+# Prozessweite Plattform (wird beim ersten Zugriff erzeugt)
+_platform: Optional["Platform"] = None
+_platform_lock = threading.Lock()
+
+
+def get_platform() -> "Platform":
+    """Gibt die prozessweite Plattform zurück."""
+    global _platform
+    with _platform_lock:
+        if _platform is None:
+            _platform = create_default_platform()
+        return _platform
+
+
+def set_platform(platform: Optional["Platform"]) -> None:
+    """Ersetzt die prozessweite Plattform; None wählt beim nächsten Zugriff neu."""
+    global _platform
+    with _platform_lock:
+        _platform = platform
+
+
+def restart_explorer() -> None:
+    """Startet den Explorer der aktuellen Plattform neu und wartet auf ihn."""
+    get_platform().explorer.restart_explorer()
@@ -0,0 +1,125 @@
+# Dateipfad: src/smartdesk/platform/interfaces.py
+"""
+Interfaces (Protocols) für die Windows-Teile, die ein Desktop-Wechsel berührt.
+
+Registry (core/registry) und Shell-Benachrichtigung (core/shell) haben
+bereits eigene Backends. Dazu kommen hier:
+
+- DesktopListView: Das SysListView32 des Desktops (Icons, Positionen, Stil)
+- WallpaperSetter: Hintergrundbild setzen (SystemParametersInfoW)
+- ExplorerProcess: Der Explorer-Prozess (PID, Neustart)
+- Platform: Bündel aus allen Backends, gegen das die Services arbeiten
+
+Die Logik (Warten auf das ListView, Namens-Matching, Stil-Handling) bleibt
+in den Services; ein Backend stellt nur die einzelnen Operationen bereit.
+So laufen dieselben Services unter Windows (native.py) und gegen die
+Simulation (simulated.py), z.B. im Lasttest unter Linux.
+"""
+
+from typing import List, Optional, Protocol, Tuple
+
+from ..core.models.desktop import IconPosition
+from ..core.registry.interfaces import RegistryBackend
+from ..core.shell.interfaces import ShellBackend
+
+
+def pack_position(x: int, y: int) -> int:
+    """Position als lParam für LVM_SETITEMPOSITION (MAKELPARAM(x, y))."""
+    return ((y & 0xFFFF) << 16) | (x & 0xFFFF)
+
+
+def unpack_position(lparam: int) -> Tuple[int, int]:
+    """Umkehrung von pack_position() (vorzeichenbehaftete 16-Bit-Koordinaten)."""
+    x, y = lparam & 0xFFFF, (lparam >> 16) & 0xFFFF
+    return x - 0x10000 if x & 0x8000 else x, y - 0x10000 if y & 0x8000 else y
+
+
+class DesktopListView(Protocol):
+    """
+    Operationen am Desktop-ListView.
+
+    Handles werden mit jedem Explorer-Start neu vergeben; Aufrufe mit einem
+    veralteten Handle schlagen fehl (0 Icons, leere Liste, False).
+    """
+
+    def find(self) -> Optional[int]:
+        """Handle des Desktop-ListViews oder None, wenn es (noch) keins gibt."""
+        ...
+
+    def item_count(self, handle: int) -> int:
+        """Anzahl der geladenen Icons (0, solange der Explorer noch lädt)."""
+        ...
+
+    def read_items(self, handle: int) -> List[IconPosition]:
+        """Namen und Positionen aller Icons; index ist der ListView-Index."""
+        ...
+
+    def set_item_position(self, handle: int, index: int, x: int, y: int) -> bool:
+        """Verschiebt das Icon mit dem ListView-Index index; True bei Erfolg."""
+        ...
+
+    def set_item_lparam(self, handle: int, index: int, lparam: int) -> bool:
+        """Wie set_item_position(), Position bereits gepackt (pack_position())."""
+        ...
+
+    def get_style(self, handle: int) -> int:
+        """Fensterstil (GWL_STYLE, u.a. LVS_AUTOARRANGE und LVS_SNAPTOGRID)."""
+        ...
+
+    def set_style(self, handle: int, style: int) -> None:
+        """Setzt den Fensterstil."""
+        ...
+
+    def redraw(self, handle: int) -> None:
+        """Zeichnet das ListView neu."""
+        ...
+
+
+class WallpaperSetter(Protocol):
+    """Setzt das Hintergrundbild des Desktops."""
+
+    def apply(self, path: str) -> bool:
+        """
+        Setzt path als Hintergrundbild (die Datei existiert bereits).
+
+        Returns:
+            True, wenn das System das Bild übernommen hat
+        """
+        ...
+
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        """Größe des primären Bildschirms in Pixeln (None: unbekannt)."""
+        ...
+
+
+class ExplorerProcess(Protocol):
+    """Der Explorer-Prozess, der Desktop und Taskleiste anzeigt."""
+
+    def pid(self) -> Optional[int]:
+        """PID des Explorers, der das Desktop-ListView besitzt (None ohne ListView)."""
+        ...
+
+    def restart_explorer(self) -> None:
+        """Beendet den Explorer und wartet, bis er wieder läuft."""
+        ...
+
+
+class Platform(Protocol):
+    """
+    Alle Backends einer Plattform.
+
+    Attributes:
+        name: "windows" oder "simulated"
+        registry: Registry (HKEY_CURRENT_USER)
+        shell: Shell-Operationen für den ShellRefresher
+        listview: Desktop-ListView
+        wallpaper: Hintergrundbild
+        explorer: Explorer-Prozess
+    """
+
+    name: str
+    registry: RegistryBackend
+    shell: ShellBackend
+    listview: DesktopListView
+    wallpaper: WallpaperSetter
+    explorer: ExplorerProcess
@@ -0,0 +1,380 @@
+# Dateipfad: src/smartdesk/platform/loadtest.py
+"""
+Lasttest des Desktop-Wechsels gegen die simulierte Plattform.
+
+Führt eine zufällige, über seed reproduzierbare Folge von Operationen über
+desktop_service aus:
+
+- switch: Wechsel zu einem zufälligen Desktop (auch zum bereits aktiven)
+- create: Neuer Desktop mit Ordner und einigen Dateien
+- delete: Desktop samt Ordner löschen (gelegentlich den aktiven, der
+  abgelehnt werden muss)
+- arrange: Icons des aktiven Desktops verschieben (wie der Benutzer)
+- wallpaper: Hintergrundbild zuweisen
+
+Nach jedem Schritt werden die Invarianten geprüft (siehe check_invariants()
+und die Prüfungen je Operation). Ergebnis ist ein LoadTestReport mit der
+Latenzverteilung je Operation, den Stufen des Wechsels und allen Verstößen.
+
+Der Lasttest schreibt desktops.json, Backups, Traces und Hintergrundbilder
+in das Datenverzeichnis. Nur mit eigenem, temporärem APPDATA und
+abgeschalteter Animation starten; benchmarks/bench_switch_loadtest.py
+richtet das ein.
+"""
+
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..core.models.desktop import Desktop, DesktopList, path_key
+from ..core.utils.trace_report import percentile
+from ..shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+from .simulated import SimulatedPlatform, visible_entries
+
+OPERATIONS = ("switch", "create", "delete", "arrange", "wallpaper")
+
+# Relative Häufigkeit der Operationen
+DEFAULT_WEIGHTS = {"switch": 70, "create": 8, "delete": 6, "arrange": 12, "wallpaper": 4}
+
+# Anteil der Wechsel zum bereits aktiven Desktop (muss ohne Wirkung bleiben)
+SAME_TARGET_RATE = 0.1
+
+# Anteil der Löschversuche, die den aktiven Desktop treffen (muss scheitern)
+DELETE_ACTIVE_RATE = 0.1
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    """
+    Latenzverteilung einer Operation oder Stufe (Millisekunden).
+
+    Attributes:
+        count: Anzahl der Messungen
+        p50 / p95 / p99: Perzentile (Nearest-Rank)
+        max: Größter Wert
+    """
+
+    count: int
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def of(cls, samples: List[float]) -> "LatencyStats":
+        values = sorted(samples)
+        return cls(len(values), percentile(values, 50), percentile(values, 95), percentile(values, 99), values[-1])
+
+
+@dataclass(frozen=True)
+class Violation:
+    """Verletzte Invariante: Schritt, Operation und Beschreibung."""
+
+    step: int
+    operation: str
+    message: str
+
+
+@dataclass
+class LoadTestReport:
+    """
+    Ergebnis eines Lasttests.
+
+    Attributes:
+        latencies: Messwerte je Operation in Millisekunden
+        stages: Messwerte je Stufe des Wechsels (get_last_switch_timings())
+        results: Anzahl der Ausgänge je Operation, z.B. {"switch": {"ok": 700, "same": 12}}
+        violations: Alle Verstöße in der Reihenfolge ihres Auftretens
+        explorer_restarts: Neustarts des simulierten Explorers
+        duration_s: Gesamtdauer
+    """
+
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+    stages: Dict[str, List[float]] = field(default_factory=dict)
+    results: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    violations: List[Violation] = field(default_factory=list)
+    explorer_restarts: int = 0
+    duration_s: float = 0.0
+
+    @property
+    def operations(self) -> int:
+        return sum(len(samples) for samples in self.latencies.values())
+
+    def latency(self, operation: str) -> Optional[LatencyStats]:
+        samples = self.latencies.get(operation)
+        return LatencyStats.of(samples) if samples else None
+
+    def stage_latency(self, stage: str) -> Optional[LatencyStats]:
+        samples = self.stages.get(stage)
+        return LatencyStats.of(samples) if samples else None
+
+
+def check_invariants(platform: SimulatedPlatform, desktops: List[Desktop]) -> List[str]:
+    """
+    Zustandsprüfungen, die nach jeder abgeschlossenen Operation gelten müssen.
+
+    - Beide Shell-Folder-Schlüssel zeigen auf denselben Pfad
+    - Genau ein Desktop ist aktiv, und zwar der aus der Registry
+    - Der Explorer zeigt diesen Ordner, das ListView genau dessen Einträge
+
+    Returns:
+        Beschreibungen der Verstöße (leer, wenn alles stimmt)
+    """
+    problems = []
+    user = platform.registry.read_value(KEY_USER_SHELL, VALUE_NAME)
+    legacy = platform.registry.read_value(KEY_LEGACY_SHELL, VALUE_NAME)
+    registry_path = user.data if user else None
+    if not legacy or path_key(legacy.data) != path_key(registry_path or ""):
+        problems.append(f"Registry uneinheitlich: {registry_path!r} / {legacy.data if legacy else None!r}")
+
+    active = [d for d in desktops if d.is_active]
+    if len(active) != 1:
+        problems.append(f"{len(active)} aktive Desktops: {[d.name for d in active]}")
+    elif path_key(active[0].path) != path_key(registry_path or ""):
+        problems.append(f"Aktiver Desktop {active[0].name!r} ({active[0].path}) != Registry {registry_path!r}")
+
+    shown = platform.explorer.shown_path
+    if shown is None or path_key(shown) != path_key(registry_path or ""):
+        problems.append(f"Explorer zeigt {shown!r} statt {registry_path!r}")
+    elif platform.listview.names() != visible_entries(shown):
+        problems.append(f"ListView passt nicht zum Ordner {shown!r}")
+    return problems
+
+
+def _wallpaper_variants(path: str) -> Tuple[str, Optional[str]]:
+    """Das Bild selbst und seine vorab skalierte Fassung (siehe switch_prefetch.py)."""
+    from ..core.services.wallpaper_service import scaled_wallpaper_path
+
+    return path, scaled_wallpaper_path(path)
+
+
+class SwitchLoadTest:
+    """
+    Zufällige Operationen über desktop_service mit Prüfung der Invarianten.
+
+    Beispiel:
+        platform = SimulatedPlatform(restart_latency=0.05)
+        report = SwitchLoadTest(platform, root_dir, seed=1).run(2000)
+
+    Args:
+        platform: Simulierte Plattform (wird für die Dauer von run() installiert)
+        root_dir: Verzeichnis für Desktop-Ordner und Quellbilder
+        seed: Startwert des Zufallsgenerators
+        weights: Relative Häufigkeit je Operation (Standard: DEFAULT_WEIGHTS)
+        max_desktops: Obergrenze für die Anzahl der Desktops
+        max_icons: Höchstzahl der Dateien in einem neuen Desktop-Ordner
+    """
+
+    def __init__(
+        self,
+        platform: SimulatedPlatform,
+        root_dir: str,
+        seed: int = 0,
+        weights: Optional[Dict[str, int]] = None,
+        max_desktops: int = 10,
+        max_icons: int = 20,
+    ):
+        self.platform = platform
+        self.root_dir = root_dir
+        self.rng = random.Random(seed)
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.max_desktops = max_desktops
+        self.max_icons = max_icons
+        self.report = LoadTestReport()
+        # Icon-Layout, das ein Desktop beim nächsten Wechsel zu ihm zeigen muss
+        self._layouts: Dict[str, Dict[str, Tuple[int, int]]] = {}
+        self._created = 0
+        self._step = 0
+
+    # --- Ablauf ---
+
+    def run(self, operations: int) -> LoadTestReport:
+        """Führt operations zufällige Operationen aus und gibt den Bericht zurück."""
+        from ..core.services import desktop_service
+
+        start = time.perf_counter()
+        with self.platform.installed():
+            self._setup(desktop_service)
+            restarts_before = self.platform.explorer.restart_calls
+            names = [name for name in OPERATIONS if self.weights.get(name)]
+            weights = [self.weights[name] for name in names]
+            for self._step in range(1, operations + 1):
+                operation = self._feasible(self.rng.choices(names, weights)[0], desktop_service)
+                began = time.perf_counter()
+                result = getattr(self, f"_op_{operation}")(desktop_service)
+                self.report.latencies.setdefault(operation, []).append((time.perf_counter() - began) * 1000)
+                counts = self.report.results.setdefault(operation, {})
+                counts[result] = counts.get(result, 0) + 1
+                for problem in check_invariants(self.platform, desktop_service.get_all_desktops()):
+                    self._violation(operation, problem)
+
+        self.report.explorer_restarts = self.platform.explorer.restart_calls - restarts_before
+        self.report.duration_s = time.perf_counter() - start
+        return self.report
+
+    def _setup(self, desktop_service) -> None:
+        """Drei Desktops anlegen; der erste wird in der Registry eingetragen und angezeigt."""
+        for _ in range(3):
+            self._create(desktop_service)
+        start_path = self._desktops(desktop_service)[0].path
+        self.platform.registry.write_value(KEY_USER_SHELL, VALUE_NAME, start_path)
+        self.platform.registry.write_value(KEY_LEGACY_SHELL, VALUE_NAME, start_path)
+        self.platform.explorer.restart_explorer()
+        desktop_service.synchronize_desktops_with_registry(desktop_service.get_all_desktops(), save_changes=True)
+
+    def _feasible(self, operation: str, desktop_service) -> str:
+        """Hält die Anzahl der Desktops zwischen 2 und max_desktops."""
+        count = len(desktop_service.get_all_desktops())
+        if operation == "create" and count >= self.max_desktops:
+            return "delete"
+        if operation == "delete" and count <= 2:
+            return "create"
+        return operation
+
+    def _violation(self, operation: str, message: str) -> None:
+        self.report.violations.append(Violation(self._step, operation, message))
+
+    def _desktops(self, desktop_service) -> DesktopList:
+        return DesktopList.of(desktop_service.get_all_desktops())
+
+    def _make_folder(self) -> str:
+        self._created += 1
+        path = os.path.join(self.root_dir, f"desktop_{self._created:04d}")
+        os.makedirs(path)
+        # Eigene Einträge, etwa jeder zweite Ordner zusätzlich einen gemeinsamen
+        # (manche Ordner bleiben leer)
+        count = self.rng.randint(0, self.max_icons)
+        names = [f"d{self._created:04d}_{i:02d}.txt" for i in range(count)]
+        if count and self.rng.random() < 0.5:
+            names.append("notizen.txt")
+        for name in names:
+            with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+                f.write(name)
+        return path
+
+    def _create(self, desktop_service) -> str:
+        path = self._make_folder()
+        name = f"LT{self._created:04d}"
+        if not desktop_service.create_desktop(name, path, create_if_missing=False):
+            self._violation("create", f"create_desktop({name!r}) schlug fehl")
+            return "failed"
+        if self._desktops(desktop_service).get_by_name(name) is None:
+            self._violation("create", f"{name!r} fehlt nach create_desktop()")
+        return "ok"
+
+    # --- Operationen ---
+
+    def _op_switch(self, desktop_service) -> str:
+        desktops = self._desktops(desktop_service)
+        active = desktops.get_active()
+        others = [d for d in desktops if d is not active]
+        target = active if active and (not others or self.rng.random() < SAME_TARGET_RATE) else self.rng.choice(others)
+        leaving = self.platform.listview.positions() if active else {}
+
+        success = desktop_service.switch_to_desktop(target.name)
+        self._collect_stages(desktop_service)
+
+        if target is active:
+            if success:
+                self._violation("switch", f"Wechsel zum aktiven Desktop {target.name!r} meldet Erfolg")
+            return "same"
+        if not success:
+            self._violation("switch", f"Wechsel zu {target.name!r} fehlgeschlagen")
+            return "failed"
+
+        if active:
+            self._layouts[active.name] = leaving
+        new_active = self._desktops(desktop_service).get_active()
+        if new_active is None or new_active.name != target.name:
+            self._violation("switch", f"Nach dem Wechsel zu {target.name!r} aktiv: {new_active.name if new_active else None!r}")
+            return "ok"
+
+        expected = self._layouts.get(target.name)
+        if expected:
+            shown = self.platform.listview.positions()
+            wrong = [name for name, position in expected.items() if shown.get(name, position) != position]
+            if wrong:
+                self._violation("switch", f"{len(wrong)} Icons von {target.name!r} nicht wiederhergestellt, z.B. {wrong[0]!r}")
+        if new_active.wallpaper_path and self.platform.wallpaper.current not in _wallpaper_variants(new_active.wallpaper_path):
+            self._violation("switch", f"Hintergrundbild von {target.name!r} nicht gesetzt")
+        return "ok"
+
+    def _collect_stages(self, desktop_service) -> None:
+        for stage, duration_ms in desktop_service.get_last_switch_timings().items():
+            self.report.stages.setdefault(stage, []).append(duration_ms)
+
+    def _op_create(self, desktop_service) -> str:
+        return self._create(desktop_service)
+
+    def _op_delete(self, desktop_service) -> str:
+        desktops = self._desktops(desktop_service)
+        active = desktops.get_active()
+        candidates = [d for d in desktops if d is not active and not d.protected]
+        if not candidates:
+            return "none"
+
+        if active and self.rng.random() < DELETE_ACTIVE_RATE:
+            if desktop_service.delete_desktop(active.name, delete_folder=True, skip_confirm=True):
+                self._violation("delete", f"Aktiver Desktop {active.name!r} wurde gelöscht")
+            return "refused"
+
+        target = self.rng.choice(candidates)
+        if not desktop_service.delete_desktop(target.name, delete_folder=True, skip_confirm=True):
+            self._violation("delete", f"delete_desktop({target.name!r}) schlug fehl")
+            return "failed"
+        if self._desktops(desktop_service).get_by_name(target.name) is not None:
+            self._violation("delete", f"{target.name!r} ist nach dem Löschen noch vorhanden")
+        if os.path.exists(target.path):
+            self._violation("delete", f"Ordner {target.path} ist nach dem Löschen noch vorhanden")
+        self._layouts.pop(target.name, None)
+        return "ok"
+
+    def _op_arrange(self, desktop_service) -> str:
+        names = self.platform.listview.names()
+        if not names:
+            return "empty"
+        for name in self.rng.sample(names, self.rng.randint(1, len(names))):
+            self.platform.listview.drag(name, self.rng.randrange(0, 1900, 5), self.rng.randrange(0, 1000, 5))
+        return "ok"
+
+    def _op_wallpaper(self, desktop_service) -> str:
+        target = self.rng.choice(self._desktops(desktop_service))
+        source = os.path.join(self.root_dir, f"bild_{self._step:05d}.png")
+        with open(source, "wb") as f:
+            f.write(os.urandom(64))
+
+        if not desktop_service.assign_wallpaper(target.name, source):
+            self._violation("wallpaper", f"assign_wallpaper({target.name!r}) schlug fehl")
+            return "failed"
+        assigned = self._desktops(desktop_service).get_by_name(target.name)
+        if assigned is None or not assigned.wallpaper_path or not os.path.exists(assigned.wallpaper_path):
+            self._violation("wallpaper", f"Hintergrundbild von {target.name!r} nicht gespeichert")
+        elif assigned.is_active and self.platform.wallpaper.current != assigned.wallpaper_path:
+            self._violation("wallpaper", f"Hintergrundbild des aktiven Desktops {target.name!r} nicht gesetzt")
+        return "ok"
+
+
+def format_report(report: LoadTestReport, max_violations: int = 10) -> str:
+    """Formatiert einen LoadTestReport als Tabelle."""
+    lines = [f"{report.operations} Operationen in {report.duration_s:.1f} s, {report.explorer_restarts} Explorer-Neustarts"]
+    header = f"  {'':<18} {'Anzahl':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+
+    for title, names, stats in (
+        ("Operationen", list(report.latencies), report.latency),
+        ("Stufen des Wechsels", list(report.stages), report.stage_latency),
+    ):
+        lines.extend(["", title, header])
+        for name in names:
+            s = stats(name)
+            lines.append(f"  {name:<18} {s.count:>7} {s.p50:>9.1f} {s.p95:>9.1f} {s.p99:>9.1f} {s.max:>9.1f}")
+
+    lines.extend(["", "Ergebnisse"])
+    for operation, counts in report.results.items():
+        lines.append(f"  {operation:<18} " + ", ".join(f"{result}: {count}" for result, count in sorted(counts.items())))
+
+    lines.extend(["", f"Verstöße: {len(report.violations)}"])
+    for violation in report.violations[:max_violations]:
+        lines.append(f"  #{violation.step} {violation.operation}: {violation.message}")
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+# Dateipfad: src/smartdesk/platform/native.py
+"""
+Native Windows-Plattform.
+
+Die Win32-Aufrufe selbst bleiben in den Services, zu denen sie gehören
+(Win32ListView in icon_service, Win32Wallpaper in wallpaper_service,
+restart_explorer in system_service); hier werden sie nur zur Platform
+zusammengesetzt.
+"""
+
+from typing import Optional
+
+from ..core.registry.implementations import create_default_backend as create_registry_backend
+from ..core.shell.implementations import WindowsShellBackend
+
+
+class NativeExplorer:
+    """
+    Der echte Explorer-Prozess.
+
+    Implementiert ExplorerProcess aus interfaces.py.
+    """
+
+    def pid(self) -> Optional[int]:
+        import win32process
+        from ..core.services.icon_service import _get_desktop_listview_handle
+
+        handle = _get_desktop_listview_handle()
+        if not handle:
+            return None
+        return win32process.GetWindowThreadProcessId(handle)[1]
+
+    def restart_explorer(self) -> None:
+        from ..core.services.system_service import restart_explorer
+
+        restart_explorer()
+
+
+class NativePlatform:
+    """
+    Windows mit winreg, Win32-Shell, SysListView32 und SystemParametersInfoW.
+
+    Implementiert Platform aus interfaces.py.
+    """
+
+    name = "windows"
+
+    def __init__(self):
+        from ..core.services.icon_service import Win32ListView
+        from ..core.services.wallpaper_service import Win32Wallpaper
+
+        self.registry = create_registry_backend()
+        self.shell = WindowsShellBackend()
+        self.listview = Win32ListView()
+        self.wallpaper = Win32Wallpaper()
+        self.explorer = NativeExplorer()
@@ -0,0 +1,389 @@
+# Dateipfad: src/smartdesk/platform/simulated.py
+"""
+Simulierte Plattform: Registry, Explorer, Desktop-ListView und
+Hintergrundbild im Speicher (Tests, Benchmarks, Lasttest unter Linux).
+
+Die Teile sind so gekoppelt wie unter Windows:
+- Der Explorer liest beim Start den Desktop-Pfad aus der Registry und füllt
+  das ListView mit den sichtbaren Einträgen dieses Ordners (echtes
+  Dateisystem), im Raster angeordnet.
+- Ein Neustart dauert restart_latency Sekunden. Währenddessen gibt es kein
+  ListView; danach ein neues Handle und eine neue PID.
+- Nach einer Benachrichtigung liest der Explorer die Registry nach
+  apply_delay Sekunden neu ein (im Hintergrund, wie die echte Shell).
+- Icon-Positionen gelten nur für das geladene ListView; nach dem Neuladen
+  stehen die Icons wieder im Raster.
+
+Alle Operationen sind threadsicher (der Wechsel setzt Icons und
+Hintergrundbild parallel).
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..core.models.desktop import IconPosition
+from ..core.registry.implementations import InMemoryRegistryBackend
+from ..core.registry.interfaces import REG_EXPAND_SZ, RegistryBackend
+from ..core.shell.implementations import _is_hidden
+from ..shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+from .current import set_platform
+from .interfaces import unpack_position
+
+# Rasterabstand der automatischen Anordnung (Standard bei 96 dpi)
+GRID_X = 75
+GRID_Y = 100
+GRID_ROWS = 8
+
+# Erste PID bzw. erstes Fenster-Handle der Simulation
+_FIRST_PID = 4000
+_FIRST_HANDLE = 0x10010
+
+
+def visible_entries(path: str) -> List[str]:
+    """Sichtbare Einträge eines Ordners in der Reihenfolge des Explorers (nach Name)."""
+    try:
+        with os.scandir(path) as it:
+            names = [entry.name for entry in it if not _is_hidden(entry)]
+    except OSError:
+        return []
+    return sorted(names, key=str.lower)
+
+
+class SimulatedListView:
+    """
+    Desktop-ListView mit benannten Icons.
+
+    Implementiert DesktopListView aus interfaces.py.
+
+    Args:
+        load_delay: Zeit nach dem Laden eines Ordners, bis die Icons
+            erscheinen (der Explorer füllt das ListView asynchron)
+        item_latency: Dauer je gelesenem Icon in read_items()
+            (prozessübergreifender Zugriff)
+
+    Attributes:
+        reads / moves / redraws: Anzahl der Aufrufe (für Tests)
+    """
+
+    def __init__(self, load_delay: float = 0.0, item_latency: float = 0.0):
+        self.load_delay = load_delay
+        self.item_latency = item_latency
+        self.style = 0
+        self.reads = 0
+        self.moves = 0
+        self.redraws = 0
+        self._handle: Optional[int] = None
+        self._next_handle = _FIRST_HANDLE
+        self._items: List[list] = []  # [name, x, y] in ListView-Reihenfolge
+        self._ready_at = 0.0
+        self._lock = threading.Lock()
+
+    # --- Seite des Explorers ---
+
+    def load(self, names: List[str], new_window: bool = True) -> None:
+        """Zeigt names im Raster an; new_window=False behält das Handle (Aktualisieren)."""
+        with self._lock:
+            if new_window or self._handle is None:
+                self._handle = self._next_handle
+                self._next_handle += 0x10
+            self._items = [[name, *self._grid_position(i)] for i, name in enumerate(names)]
+            self._ready_at = time.monotonic() + self.load_delay
+
+    def unload(self) -> None:
+        """Das ListView verschwindet (Explorer beendet)."""
+        with self._lock:
+            self._handle = None
+            self._items = []
+
+    @staticmethod
+    def _grid_position(index: int) -> Tuple[int, int]:
+        column, row = divmod(index, GRID_ROWS)
+        return column * GRID_X, row * GRID_Y
+
+    # --- Seite des Benutzers (Lasttest) ---
+
+    def names(self) -> List[str]:
+        with self._lock:
+            return [item[0] for item in self._items]
+
+    def positions(self) -> Dict[str, Tuple[int, int]]:
+        """Aktuelle Position je Icon-Name."""
+        with self._lock:
+            return {name: (x, y) for name, x, y in self._items}
+
+    def drag(self, name: str, x: int, y: int) -> bool:
+        """Verschiebt ein Icon wie der Benutzer mit der Maus."""
+        with self._lock:
+            for item in self._items:
+                if item[0] == name:
+                    item[1], item[2] = x, y
+                    return True
+        return False
+
+    # --- DesktopListView ---
+
+    def _loaded(self, handle: int) -> bool:
+        """Aufruf mit self._lock: Handle aktuell und Icons geladen."""
+        return handle is not None and handle == self._handle and time.monotonic() >= self._ready_at
+
+    def find(self) -> Optional[int]:
+        with self._lock:
+            return self._handle
+
+    def item_count(self, handle: int) -> int:
+        with self._lock:
+            return len(self._items) if self._loaded(handle) else 0
+
+    def read_items(self, handle: int) -> List[IconPosition]:
+        with self._lock:
+            self.reads += 1
+            if not self._loaded(handle):
+                return []
+            items = [IconPosition(index=i, name=name, x=x, y=y) for i, (name, x, y) in enumerate(self._items)]
+        if self.item_latency:
+            time.sleep(self.item_latency * len(items))
+        return items
+
+    def set_item_position(self, handle: int, index: int, x: int, y: int) -> bool:
+        with self._lock:
+            if not self._loaded(handle) or not 0 <= index < len(self._items):
+                return False
+            self._items[index][1:] = [x, y]
+            self.moves += 1
+            return True
+
+    def set_item_lparam(self, handle: int, index: int, lparam: int) -> bool:
+        return self.set_item_position(handle, index, *unpack_position(lparam))
+
+    def get_style(self, handle: int) -> int:
+        with self._lock:
+            return self.style
+
+    def set_style(self, handle: int, style: int) -> None:
+        with self._lock:
+            if handle == self._handle:
+                self.style = style
+
+    def redraw(self, handle: int) -> None:
+        with self._lock:
+            self.redraws += 1
+
+
+class SimulatedExplorer:
+    """
+    Explorer, der den Desktop-Ordner aus der Registry anzeigt.
+
+    Implementiert ExplorerProcess aus interfaces.py und ShellBackend aus
+    core/shell (Benachrichtigen, ListView-Namen, Ordnerinhalt, Neustart).
+
+    Args:
+        registry: Registry, aus der der Desktop-Pfad gelesen wird
+        listview: Das ListView, das der Explorer füllt
+        restart_latency: Dauer von restart_explorer() in Sekunden
+        notify_latency: Dauer von notify_shell_change() in Sekunden
+        apply_delay: Zeit nach der Benachrichtigung, bis der neue Ordner
+            angezeigt wird
+        soft_refresh_works: False simuliert einen Explorer, der die
+            Benachrichtigung ignoriert (dann hilft nur ein Neustart)
+
+    Attributes:
+        shown_path: Angezeigter Ordner (None während eines Neustarts)
+        restart_calls / notify_calls: Anzahl der Aufrufe (für Tests)
+    """
+
+    def __init__(
+        self,
+        registry: RegistryBackend,
+        listview: SimulatedListView,
+        restart_latency: float = 0.0,
+        notify_latency: float = 0.0,
+        apply_delay: float = 0.0,
+        soft_refresh_works: bool = True,
+    ):
+        self.registry = registry
+        self.listview = listview
+        self.restart_latency = restart_latency
+        self.notify_latency = notify_latency
+        self.apply_delay = apply_delay
+        self.soft_refresh_works = soft_refresh_works
+        self.shown_path: Optional[str] = None
+        self.restart_calls = 0
+        self.notify_calls = 0
+        self._pid: Optional[int] = None
+        self._next_pid = _FIRST_PID
+        self._generation = 0  # verwirft ausstehende Aktualisierungen nach einem Neustart
+        self._lock = threading.Lock()
+        with self._lock:
+            self._start()
+
+    def _desktop_path(self) -> Optional[str]:
+        value = self.registry.read_value(KEY_USER_SHELL, VALUE_NAME)
+        return os.path.expandvars(str(value.data)) if value and value.data else None
+
+    def _show(self, new_window: bool) -> None:
+        """Aufruf mit self._lock: Desktop-Ordner aus der Registry anzeigen."""
+        self.shown_path = self._desktop_path()
+        self.listview.load(visible_entries(self.shown_path) if self.shown_path else [], new_window=new_window)
+
+    def _start(self) -> None:
+        """Aufruf mit self._lock."""
+        self._pid = self._next_pid
+        self._next_pid += 4
+        self._show(new_window=True)
+
+    # --- ExplorerProcess ---
+
+    def pid(self) -> Optional[int]:
+        with self._lock:
+            return self._pid
+
+    def restart_explorer(self) -> None:
+        with self._lock:
+            self.restart_calls += 1
+            self._generation += 1
+            self._pid = None
+            self.shown_path = None
+            self.listview.unload()
+        if self.restart_latency:
+            time.sleep(self.restart_latency)
+        with self._lock:
+            self._start()
+
+    # --- ShellBackend ---
+
+    def notify_shell_change(self, new_path: str) -> None:
+        with self._lock:
+            self.notify_calls += 1
+            generation = self._generation
+        if self.notify_latency:
+            time.sleep(self.notify_latency)
+        if not self.soft_refresh_works:
+            return
+        if self.apply_delay:
+            timer = threading.Timer(self.apply_delay, self._apply_refresh, args=(generation,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._apply_refresh(generation)
+
+    def _apply_refresh(self, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation and self._pid is not None:
+                self._show(new_window=False)
+
+    def listview_items(self) -> Optional[List[str]]:
+        if self.listview.find() is None:
+            return None
+        return self.listview.names()
+
+    def folder_entries(self, path: str) -> List[str]:
+        return visible_entries(path)
+
+
+class SimulatedWallpaper:
+    """
+    Hintergrundbild im Speicher.
+
+    Implementiert WallpaperSetter aus interfaces.py.
+
+    Args:
+        latency: Dauer je Aufruf von apply()
+        size: Bildschirmgröße für screen_size()
+
+    Attributes:
+        current: Zuletzt gesetztes Bild (None: noch keins)
+        apply_calls: Anzahl der Aufrufe (für Tests)
+    """
+
+    def __init__(self, latency: float = 0.0, size: Optional[Tuple[int, int]] = (1920, 1080)):
+        self.latency = latency
+        self.size = size
+        self.current: Optional[str] = None
+        self.apply_calls = 0
+        self._lock = threading.Lock()
+
+    def apply(self, path: str) -> bool:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.current = path
+            self.apply_calls += 1
+        return True
+
+    def screen_size(self) -> Optional[Tuple[int, int]]:
+        return self.size
+
+
+class SimulatedPlatform:
+    """
+    Registry, Explorer, ListView und Hintergrundbild als zusammenhängende
+    Simulation.
+
+    Implementiert Platform aus interfaces.py.
+
+    Beispiel:
+        platform = SimulatedPlatform(desktop_path=start_dir, restart_latency=0.8)
+        with platform.installed():
+            desktop_service.switch_to_desktop("Arbeit")
+        assert platform.explorer.shown_path == arbeit_dir
+
+    Args:
+        desktop_path: Desktop-Pfad, mit dem beide Shell-Folder-Schlüssel
+            vorbelegt werden (None: Registry bleibt, wie sie ist)
+        registry: Vorhandene Registry (Standard: neue InMemoryRegistryBackend)
+        Weitere Argumente siehe SimulatedExplorer, SimulatedListView und
+        SimulatedWallpaper
+    """
+
+    name = "simulated"
+
+    def __init__(
+        self,
+        desktop_path: Optional[str] = None,
+        registry: Optional[RegistryBackend] = None,
+        restart_latency: float = 0.0,
+        notify_latency: float = 0.0,
+        apply_delay: float = 0.0,
+        soft_refresh_works: bool = True,
+        load_delay: float = 0.0,
+        item_latency: float = 0.0,
+        wallpaper_latency: float = 0.0,
+    ):
+        self.registry = registry if registry is not None else InMemoryRegistryBackend()
+        if desktop_path is not None:
+            self.registry.write_value(KEY_USER_SHELL, VALUE_NAME, desktop_path, REG_EXPAND_SZ)
+            self.registry.write_value(KEY_LEGACY_SHELL, VALUE_NAME, desktop_path)
+        self.listview = SimulatedListView(load_delay=load_delay, item_latency=item_latency)
+        self.wallpaper = SimulatedWallpaper(latency=wallpaper_latency)
+        self.explorer = SimulatedExplorer(
+            self.registry,
+            self.listview,
+            restart_latency=restart_latency,
+            notify_latency=notify_latency,
+            apply_delay=apply_delay,
+            soft_refresh_works=soft_refresh_works,
+        )
+        self.shell = self.explorer
+
+    @contextmanager
+    def installed(self, verify_timeout: float = 1.5) -> Iterator["SimulatedPlatform"]:
+        """
+        Setzt die Simulation prozessweit ein: als Plattform, als Backend des
+        Registry-Caches und als Shell des SoftRefreshers. Danach werden alle
+        drei wieder auf ihren Standard zurückgesetzt.
+        """
+        from ..core.registry.cache import RegistryValueCache, set_registry_cache
+        from ..core.shell.refresher import SoftRefresher, set_shell_refresher
+
+        set_platform(self)
+        set_registry_cache(RegistryValueCache(self.registry))
+        set_shell_refresher(SoftRefresher(self.shell, verify_timeout=verify_timeout))
+        try:
+            yield self
+        finally:
+            set_shell_refresher(None)
+            set_registry_cache(None)
+            set_platform(None)
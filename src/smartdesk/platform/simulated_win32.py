@@ -0,0 +1,236 @@
+# Dateipfad: src/smartdesk/platform/simulated_win32.py
+"""
+Simulierte Win32-API für Win32ListView (icon_service.py).
+
+Anders als SimulatedListView ersetzt SimulatedWin32Api nicht das ListView,
+sondern die Funktionen darunter: OpenProcess, VirtualAllocEx,
+Read-/WriteProcessMemory und SendMessage gegen einen Explorer mit eigenem
+Adressraum. Damit laufen ListViewSession und Win32ListView unverändert unter
+Linux, samt Zeigern in den Explorer-Speicher und Handle-Verwaltung.
+
+Jeder Aufruf kostet call_latency Sekunden, Reservieren und Freigeben von
+Speicher sowie Öffnen und Schließen des Prozesses zusätzlich alloc_latency
+(aktives Warten, damit auch Mikrosekunden eingehalten werden). Die Werte
+bilden den Kontextwechsel in den Explorer nach, nicht eine bestimmte
+Maschine.
+
+Braucht das echte ctypes (Puffer und Strukturen werden byteweise kopiert)
+und wird deshalb nicht aus smartdesk.platform re-exportiert.
+"""
+
+import ctypes
+import struct
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from ..core.services.icon_service import (
+    LVITEM,
+    LVM_GETITEMCOUNT,
+    LVM_GETITEMPOSITION,
+    LVM_GETITEMTEXTW,
+    LVM_GETITEMW,
+    LVM_SETITEMPOSITION,
+)
+from .interfaces import unpack_position
+from .simulated import _FIRST_HANDLE, _FIRST_PID
+
+# Erste Adresse bzw. erstes Prozess-Handle im simulierten Explorer
+_FIRST_ADDRESS = 0x7FF000000000
+_FIRST_PROCESS_HANDLE = 0x200
+
+_POINT = struct.Struct("<ii")
+_POINTER = struct.Struct("<Q" if ctypes.sizeof(ctypes.c_void_p) == 8 else "<I")
+
+
+def _spin(seconds: float) -> None:
+    """Aktives Warten (time.sleep ist für Mikrosekunden zu ungenau)."""
+    if seconds:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pass
+
+
+class SimulatedWin32Api:
+    """
+    Explorer-Prozess mit Desktop-ListView hinter der Win32-API.
+
+    Erfüllt die Schnittstelle von Win32Api aus icon_service.py.
+
+    Args:
+        items: (Name, x, y) je Icon in ListView-Reihenfolge
+        call_latency: Dauer je API-Aufruf in Sekunden
+        alloc_latency: Zusätzliche Dauer für Öffnen/Schließen des Prozesses
+            und Reservieren/Freigeben von Speicher
+
+    Attributes:
+        pid / handle: PID des Explorers und Handle des ListViews
+        calls: Anzahl der Aufrufe je Funktion (für Tests und Benchmarks)
+        fail_reads: True lässt ReadProcessMemory fehlschlagen
+    """
+
+    def __init__(self, items: List[Tuple[str, int, int]], call_latency: float = 0.0, alloc_latency: float = 0.0):
+        self.items = [list(item) for item in items]
+        self.call_latency = call_latency
+        self.alloc_latency = alloc_latency
+        self.pid = _FIRST_PID
+        self.handle = _FIRST_HANDLE
+        self.calls: Counter = Counter()
+        self.fail_reads = False
+        self._process_handles: set = set()
+        self._memory: Dict[int, bytearray] = {}
+        self._next_process_handle = _FIRST_PROCESS_HANDLE
+        self._next_address = _FIRST_ADDRESS
+        self._lock = threading.Lock()
+
+    def _call(self, name: str, alloc: bool = False) -> None:
+        self.calls[name] += 1
+        _spin(self.call_latency + (self.alloc_latency if alloc else 0.0))
+
+    def restart(self) -> None:
+        """Explorer-Neustart: neue PID, neues Handle; Prozess-Handles und Speicher verfallen."""
+        with self._lock:
+            self.pid += 4
+            self.handle += 0x10
+            self._process_handles.clear()
+            self._memory.clear()
+
+    @property
+    def allocations(self) -> int:
+        """Anzahl der reservierten Speicherblöcke im Explorer."""
+        with self._lock:
+            return len(self._memory)
+
+    @property
+    def open_handles(self) -> int:
+        with self._lock:
+            return len(self._process_handles)
+
+    # --- Speicher des Explorers ---
+
+    def _block(self, address: int, size: int) -> Optional[Tuple[bytearray, int]]:
+        """Aufruf mit self._lock: Speicherblock, der [address, address + size) enthält."""
+        for base, block in self._memory.items():
+            if base <= address and address + size <= base + len(block):
+                return block, address - base
+        return None
+
+    def _read(self, address: int, size: int) -> bytes:
+        found = self._block(address, size)
+        if found is None:
+            raise OSError(f"Zugriffsverletzung bei 0x{address:x}")
+        block, offset = found
+        return bytes(block[offset : offset + size])
+
+    def _write(self, address: int, data: bytes) -> None:
+        found = self._block(address, len(data))
+        if found is None:
+            raise OSError(f"Zugriffsverletzung bei 0x{address:x}")
+        block, offset = found
+        block[offset : offset + len(data)] = data
+
+    # --- Win32Api ---
+
+    def window_pid(self, hwnd: int) -> int:
+        self._call("GetWindowThreadProcessId")
+        with self._lock:
+            return self.pid if hwnd == self.handle else 0
+
+    def open_process(self, access: int, inherit: bool, pid: int) -> int:
+        self._call("OpenProcess", alloc=True)
+        with self._lock:
+            if pid != self.pid:
+                return 0
+            process = self._next_process_handle
+            self._next_process_handle += 4
+            self._process_handles.add(process)
+            return process
+
+    def close_handle(self, process: int) -> bool:
+        self._call("CloseHandle", alloc=True)
+        with self._lock:
+            if process not in self._process_handles:
+                return False
+            self._process_handles.discard(process)
+            return True
+
+    def virtual_alloc_ex(self, process: int, address: int, size: int, allocation_type: int, protect: int) -> int:
+        self._call("VirtualAllocEx", alloc=True)
+        with self._lock:
+            if process not in self._process_handles:
+                return 0
+            base = self._next_address
+            self._next_address += (size + 0xFFFF) & ~0xFFFF
+            self._memory[base] = bytearray(size)
+            return base
+
+    def virtual_free_ex(self, process: int, address: int, size: int, free_type: int) -> bool:
+        self._call("VirtualFreeEx", alloc=True)
+        with self._lock:
+            if process not in self._process_handles:
+                return False
+            return self._memory.pop(address, None) is not None
+
+    def read_process_memory(self, process: int, address: int, buffer, size: int, read) -> bool:
+        self._call("ReadProcessMemory")
+        with self._lock:
+            if self.fail_reads or process not in self._process_handles:
+                return False
+            try:
+                data = self._read(address, size)
+            except OSError:
+                return False
+        ctypes.memmove(buffer, data, size)
+        return True
+
+    def write_process_memory(self, process: int, address: int, buffer, size: int, written) -> bool:
+        self._call("WriteProcessMemory")
+        data = ctypes.string_at(buffer, size)
+        with self._lock:
+            if process not in self._process_handles:
+                return False
+            try:
+                self._write(address, data)
+            except OSError:
+                return False
+            return True
+
+    def send_message(self, hwnd: int, msg: int, wparam: int, lparam: int) -> int:
+        self._call("SendMessage")
+        with self._lock:
+            if hwnd != self.handle:
+                return 0
+            if msg == LVM_GETITEMCOUNT:
+                return len(self.items)
+            if not 0 <= wparam < len(self.items):
+                return 0
+            name, x, y = self.items[wparam]
+            try:
+                if msg == LVM_GETITEMPOSITION:
+                    self._write(lparam, _POINT.pack(x, y))
+                    return 1
+                if msg == LVM_SETITEMPOSITION:
+                    self.items[wparam][1:] = unpack_position(lparam)
+                    return 1
+                if msg == LVM_GETITEMTEXTW:
+                    return self._copy_text(lparam, name)
+                if msg == LVM_GETITEMW:
+                    # iItem aus dem LVITEM; dort steht der gefragte Index
+                    (index,) = struct.unpack("<i", self._read(lparam + LVITEM.iItem.offset, 4))
+                    if 0 <= index < len(self.items):
+                        self._copy_text(lparam, self.items[index][0])
+                    return 1
+            except OSError:
+                return 0
+        return 0
+
+    def _copy_text(self, lvitem: int, name: str) -> int:
+        """Aufruf mit self._lock: Name in den pszText-Puffer des LVITEM, Länge in Zeichen."""
+        (text,) = _POINTER.unpack(self._read(lvitem + LVITEM.pszText.offset, _POINTER.size))
+        (capacity,) = struct.unpack("<i", self._read(lvitem + LVITEM.cchTextMax.offset, 4))
+        if capacity <= 0:
+            return 0
+        encoded = name.encode("utf-16-le", "surrogatepass")[: 2 * (capacity - 1)]
+        self._write(text, encoded + b"\0\0")
+        return len(encoded) // 2
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""
+Dauerhaft laufender Animations-Host für SmartDesk
+
+Wird vom Tray gestartet (AnimationHostController) und hält das Überblend-
+und das Logo-Fenster fertig aufgebaut, aber verborgen. Ein Desktop-Wechsel
+schickt START über host_protocol.py; der Host verbindet sich mit dessen
+AnimationChannel und spielt die Animation wie screen_fade.py ab (READY/DONE,
+siehe handshake.py). So entfallen pro Wechsel zwei Interpreter-Starts,
+der tkinter-Import und der Fensteraufbau.
+
+Aufruf: python animation_host.py <info_file>
+
+Der Host beendet sich bei QUIT (Socket oder stdin) und wenn stdin
+geschlossen wird, also spätestens mit dem Tray-Prozess.
+"""
+import json
+import os
+import sys
+import threading
+
+try:
+    from .screen_fade import MultiMonitorFade
+    from .logo import LogoWindow
+    from .handshake import SwitchLink
+    from .host_protocol import BUSY, ERROR, OK, PING, QUIT, START, HostServer
+except ImportError:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    from screen_fade import MultiMonitorFade
+    from logo import LogoWindow
+    from handshake import SwitchLink
+    from host_protocol import BUSY, ERROR, OK, PING, QUIT, START, HostServer
+
+# Abstand (ms), in dem der Host im Leerlauf auf Befehle prüft
+COMMAND_POLL_MS = 20
+
+
+class AnimationHost:
+    def __init__(self, info_file, config=None):
+        """
+        Baut beide Fenster verborgen auf und veröffentlicht danach Port und
+        Token in info_file (erst dann nimmt der Host Befehle an).
+        """
+        self.info_file = info_file
+        self.quit_requested = False
+
+        self.fade = MultiMonitorFade(config=config)
+        self.fade.root.attributes("-alpha", 0.0)
+        self.fade.root.withdraw()
+        self.fade.idle_callback = self._poll_while_busy
+
+        if self.fade.config.SHOW_LOGO:
+            self.fade.logo_window = LogoWindow(master=self.fade.root)
+            self.fade.logo_window.root.withdraw()
+
+        self.server = HostServer()
+        self.server.write_info(info_file)
+
+    def run(self):
+        threading.Thread(target=self._watch_stdin, daemon=True).start()
+        self.fade.root.after(COMMAND_POLL_MS, self._poll)
+        self.fade.root.mainloop()
+
+    def _watch_stdin(self):
+        """Ende von stdin (Tray beendet) oder QUIT beendet den Host."""
+        try:
+            for line in sys.stdin:
+                if line.strip() == QUIT:
+                    break
+        except (OSError, ValueError):
+            pass
+        self.quit_requested = True
+
+    def _poll(self):
+        for command in self.server.poll():
+            if command.name == START:
+                command.reply(OK)
+                self._play(*command.args)
+            elif command.name == PING:
+                command.reply(OK)
+            elif command.name == QUIT:
+                command.reply(OK)
+                self.quit_requested = True
+            else:
+                command.reply(ERROR)
+
+        if self.quit_requested:
+            self.shutdown()
+            return
+        self.fade.root.after(COMMAND_POLL_MS, self._poll)
+
+    def _poll_while_busy(self):
+        """Befehle während einer laufenden Animation: START wird abgelehnt."""
+        for command in self.server.poll():
+            if command.name == QUIT:
+                self.quit_requested = True
+            command.reply(BUSY if command.name == START else OK)
+
+    def _play(self, port=None, token=None, signal_file=None):
+        try:
+            link = SwitchLink(int(port), str(token))
+        except (OSError, TypeError, ValueError) as e:
+            if self.fade.config.DEBUG:
+                print(f"Keine Verbindung zum Desktop-Wechsel: {e}")
+            return
+
+        self.fade.link = link
+        self.fade.signal_file = signal_file or None
+        try:
+            # Monitore können sich seit dem letzten Wechsel geändert haben
+            self.fade.root.deiconify()
+            self.fade.setup_fullscreen()
+            self.fade.root.attributes("-alpha", 0.0)
+            self.fade.root.update()
+            self.fade.play()
+        finally:
+            link.close()
+            self.fade.link = None
+            self.fade.signal_file = None
+            self.fade.root.attributes("-alpha", 0.0)
+            self.fade.root.withdraw()
+
+    def shutdown(self):
+        self.server.close()
+        # Info-Datei nur entfernen, wenn sie noch zu diesem Host gehört
+        try:
+            with open(self.info_file, "r", encoding="utf-8") as f:
+                owner = json.load(f).get("pid")
+            if owner == os.getpid():
+                os.remove(self.info_file)
+        except (OSError, ValueError, AttributeError):
+            pass
+        self.fade.cleanup_and_exit()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Aufruf: animation_host.py <info_file>")
+        sys.exit(2)
+
+    try:
+        AnimationHost(sys.argv[1]).run()
+    except Exception as e:
+        print(f"FEHLER: {e}")
+        import traceback
+
+        traceback.print_exc()
+        sys.exit(1)
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Handshake zwischen Desktop-Wechsel und Fade-Animation (screen_fade.py).
+
+Der Wechsel öffnet einen Socket auf 127.0.0.1 und gibt Port und ein
+zufälliges Token über die Umgebung an den Animationsprozess weiter
+(SMARTDESK_FADE_PORT, SMARTDESK_FADE_TOKEN). Protokoll (Textzeilen):
+
+    Animation -> Wechsel:  READY <token>   Bildschirm ist vollständig verdeckt
+    Wechsel -> Animation:  DONE            Wechsel fertig, sofort ausblenden
+
+Kommt READY nicht rechtzeitig, fährt der Wechsel wie bisher nach einer
+festen Wartezeit fort. Das Lock-File bleibt als zweites Endesignal
+bestehen, damit ältere Animationen und ein abgestürzter Socket die
+Animation trotzdem beenden.
+
+Nur Standardbibliothek: Das Modul wird auch von screen_fade.py importiert,
+das als eigenständiges Skript läuft.
+"""
+
+import os
+import secrets
+import select
+import socket
+import time
+from typing import Dict, Optional
+
+PORT_ENV = "SMARTDESK_FADE_PORT"
+TOKEN_ENV = "SMARTDESK_FADE_TOKEN"
+
+READY = "READY"
+DONE = "DONE"
+
+
+class AnimationChannel:
+    """
+    Seite des Desktop-Wechsels.
+
+    Beispiel:
+        channel = AnimationChannel()
+        subprocess.Popen(cmd, env={**os.environ, **channel.env()})
+        if not channel.wait_ready(0.5):
+            ...  # Fallback
+        ...
+        channel.send_done()
+        channel.close()
+    """
+
+    def __init__(self):
+        self.token = secrets.token_hex(8)
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self._server.bind(("127.0.0.1", 0))
+            self._server.listen(1)
+        except OSError:
+            self._server.close()
+            raise
+        self.port = self._server.getsockname()[1]
+        self._conn: Optional[socket.socket] = None
+        self.ready = False
+
+    def env(self) -> Dict[str, str]:
+        """Umgebungsvariablen für den Animationsprozess."""
+        return {PORT_ENV: str(self.port), TOKEN_ENV: self.token}
+
+    def wait_ready(self, timeout: float) -> bool:
+        """
+        Wartet, bis die Animation READY meldet.
+
+        Verbindungen mit falschem Token werden verworfen.
+
+        Returns:
+            True bei READY, False nach Ablauf von timeout
+        """
+        deadline = time.monotonic() + timeout
+        while not self.ready:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self._conn is None:
+                self._server.settimeout(remaining)
+                try:
+                    conn, _ = self._server.accept()
+                except (socket.timeout, OSError):
+                    return False
+                self._conn = conn
+            line = _read_line(self._conn, deadline)
+            if line is None:
+                # Verbindung bleiben lassen: die Animation läuft, nur READY ist spät dran
+                return False
+            if line == f"{READY} {self.token}":
+                self.ready = True
+            else:
+                self._drop_connection()
+        return True
+
+    def send_done(self) -> bool:
+        """Meldet der Animation das Ende des Wechsels (falls verbunden)."""
+        if self._conn is None:
+            return False
+        try:
+            self._conn.sendall(f"{DONE}\n".encode("ascii"))
+            return True
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        self._drop_connection()
+        self._server.close()
+
+    def _drop_connection(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
+
+
+class SwitchLink:
+    """
+    Seite der Animation.
+
+    Beispiel:
+        link = SwitchLink.from_env()
+        ...  # einblenden
+        if link:
+            link.send_ready()
+        while not (link and link.poll_done(0.02)):
+            ...
+    """
+
+    def __init__(self, port: int, token: str, connect_timeout: float = 1.0):
+        self.token = token
+        self._sock = socket.create_connection(("127.0.0.1", port), timeout=connect_timeout)
+        self._buffer = b""
+        self.closed = False
+
+    @classmethod
+    def from_env(cls) -> Optional["SwitchLink"]:
+        """Verbindet sich mit dem Wechsel, falls Port und Token gesetzt sind; sonst None."""
+        port, token = os.environ.get(PORT_ENV), os.environ.get(TOKEN_ENV)
+        if not port or not token:
+            return None
+        try:
+            return cls(int(port), token)
+        except (OSError, ValueError):
+            return None
+
+    def send_ready(self) -> bool:
+        try:
+            self._sock.sendall(f"{READY} {self.token}\n".encode("ascii"))
+            return True
+        except OSError:
+            self.closed = True
+            return False
+
+    def poll_done(self, timeout: float = 0.0) -> bool:
+        """
+        Prüft bis zu timeout Sekunden, ob DONE angekommen ist.
+
+        Eine geschlossene Verbindung gilt ebenfalls als Ende (der Wechsel
+        ist beendet oder abgestürzt).
+        """
+        if self.closed:
+            return True
+        try:
+            readable, _, _ = select.select([self._sock], [], [], timeout)
+            if not readable:
+                return False
+            data = self._sock.recv(64)
+        except OSError:
+            data = b""
+        if not data:
+            self.closed = True
+            return True
+        self._buffer += data
+        return f"{DONE}\n".encode("ascii") in self._buffer
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _read_line(conn: socket.socket, deadline: float, limit: int = 256) -> Optional[str]:
+    """
+    Liest eine Zeile (höchstens limit Bytes) bis zum Zeitpunkt deadline (time.monotonic()).
+
+    Returns:
+        Die Zeile, "" bei geschlossener Verbindung oder zu langer Zeile,
+        None nach Ablauf der Zeit
+    """
+    data = b""
+    while b"\n" not in data:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        conn.settimeout(remaining)
+        try:
+            chunk = conn.recv(256)
+        except socket.timeout:
+            return None
+        except OSError:
+            return ""
+        if not chunk:
+            return ""
+        data += chunk
+        if len(data) > limit:
+            return ""
+    return data.split(b"\n", 1)[0].decode("ascii", "replace").strip()
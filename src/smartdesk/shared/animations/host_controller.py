@@ -0,0 +1,199 @@
+# Dateipfad: src/smartdesk/shared/animations/host_controller.py
+"""
+Start und Überwachung des Animations-Hosts (animation_host.py).
+
+Wie der BannerController den Prozess von gui_overview.py am Leben hält,
+startet der Tray über den AnimationHostController einen dauerhaft
+laufenden Host mit vorbereiteten Animationsfenstern. Stürzt der Host ab,
+startet ihn die Überwachung neu; bei zu vielen Abstürzen kurz
+hintereinander bleibt er aus.
+
+Der Desktop-Wechsel (in welchem Prozess er auch läuft) ruft
+start_hosted_animation() auf. Ist kein Host erreichbar oder gerade
+beschäftigt, startet er wie bisher screen_fade.py als eigenen Prozess.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Deque, Optional
+
+from ..config import DATA_DIR, get_resource_path
+from ..localization import get_text
+from ..logging_config import get_logger
+from .host_protocol import OK, QUIT, START, send_host_command
+
+logger = get_logger(__name__)
+
+HOST_INFO_FILE = os.path.join(DATA_DIR, "animation_host.json")
+
+# Abstand, in dem die Überwachung nach dem Host-Prozess sieht
+CHECK_INTERVAL = 2.0
+
+# Mehr als MAX_RESTARTS Abstürze innerhalb von RESTART_WINDOW Sekunden:
+# Host bleibt aus, Wechsel starten die Animation wieder selbst
+MAX_RESTARTS = 3
+RESTART_WINDOW = 60.0
+
+# Längste Wartezeit auf die Antwort des Hosts auf START
+START_TIMEOUT = 0.3
+
+
+class AnimationHostController:
+    def __init__(
+        self,
+        info_file: Optional[str] = None,
+        script_path: Optional[str] = None,
+        check_interval: float = CHECK_INTERVAL,
+    ):
+        self.info_file = info_file or HOST_INFO_FILE
+        self.script_path = script_path or get_resource_path("smartdesk/shared/animations/animation_host.py")
+        self.check_interval = check_interval
+
+        self._process: Optional[subprocess.Popen] = None
+        self._crashes: Deque[float] = deque()
+        self.gave_up = False
+
+        # Threading
+        self._watch_thread: Optional[threading.Thread] = None
+        self._stop_watch = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    def is_running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    def start(self) -> None:
+        """Startet den Host und die Überwachung (Absturz -> Neustart)."""
+        with self._lock:
+            self._ensure_process_running()
+        if self._watch_thread is None:
+            self._stop_watch.clear()
+            self._watch_thread = threading.Thread(target=self._watch_loop, name="smartdesk-animation-host", daemon=True)
+            self._watch_thread.start()
+
+    def shutdown(self) -> None:
+        """Beendet Überwachung und Host-Prozess."""
+        self._stop_watch.set()
+        if self._watch_thread:
+            self._watch_thread.join(timeout=self.check_interval + 1)
+            self._watch_thread = None
+
+        with self._lock:
+            process, self._process = self._process, None
+        if process is None:
+            return
+        if process.poll() is None:
+            self._send_stdin(process, QUIT)
+            try:
+                process.wait(timeout=1.0)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if process.stdin:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+
+    def _watch_loop(self) -> None:
+        while not self._stop_watch.wait(self.check_interval):
+            with self._lock:
+                self._ensure_process_running()
+
+    def _ensure_process_running(self) -> None:
+        """Startet den Host-Prozess, falls er nicht läuft (Aufruf mit self._lock)."""
+        if self.gave_up:
+            return
+
+        if self._process is not None:
+            if self._process.poll() is None:
+                return  # Läuft noch
+            if not self._record_crash(self._process.returncode):
+                return
+
+        if not os.path.exists(self.script_path):
+            logger.warning(get_text("animation_host.warn.script_missing", path=self.script_path))
+            self.gave_up = True
+            return
+
+        try:
+            self._process = subprocess.Popen(
+                [sys.executable, self.script_path, self.info_file],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                creationflags=(subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0),
+                text=True,
+                bufsize=1,
+            )
+            logger.info(get_text("animation_host.info.started", pid=self._process.pid))
+        except OSError as e:
+            logger.warning(get_text("animation_host.warn.start_failed", e=e))
+            self._process = None
+
+    def _record_crash(self, returncode: Optional[int]) -> bool:
+        """Verbucht einen Absturz; False, wenn der Host nicht mehr neu gestartet wird."""
+        now = time.monotonic()
+        self._crashes.append(now)
+        while self._crashes and now - self._crashes[0] > RESTART_WINDOW:
+            self._crashes.popleft()
+
+        if len(self._crashes) > MAX_RESTARTS:
+            logger.warning(get_text("animation_host.warn.giving_up", count=len(self._crashes), window=RESTART_WINDOW))
+            self.gave_up = True
+            self._process = None
+            return False
+
+        logger.warning(get_text("animation_host.warn.restarting", code=returncode))
+        return True
+
+    @staticmethod
+    def _send_stdin(process: subprocess.Popen, command: str) -> None:
+        if process.stdin:
+            try:
+                process.stdin.write(f"{command}\n")
+                process.stdin.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def start_hosted_animation(port: int, token: str, lock_file: Optional[str], info_file: Optional[str] = None) -> bool:
+    """
+    Bittet den laufenden Host, die Animation für den Wechsel mit dem
+    AnimationChannel port/token abzuspielen.
+
+    Returns:
+        True, wenn der Host START angenommen hat; False ohne Host, bei
+        einem beschäftigten Host oder ohne Antwort (Aufrufer startet dann
+        screen_fade.py selbst)
+    """
+    answer = send_host_command(info_file or HOST_INFO_FILE, START, port, token, lock_file, timeout=START_TIMEOUT)
+    return answer == OK
+
+
+# Singleton
+_controller: Optional[AnimationHostController] = None
+_controller_lock = threading.Lock()
+
+
+def get_animation_host_controller() -> AnimationHostController:
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AnimationHostController()
+        return _controller
+
+
+def set_animation_host_controller(controller: Optional[AnimationHostController]) -> None:
+    global _controller
+    with _controller_lock:
+        if _controller:
+            _controller.shutdown()  # Cleanup old one
+        _controller = controller
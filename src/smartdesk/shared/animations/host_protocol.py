@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""
+Steuerkanal zum dauerhaft laufenden Animationsprozess (animation_host.py).
+
+Der Host lauscht auf einem Socket an 127.0.0.1 und legt Port, ein
+zufälliges Token und seine PID in einer Info-Datei ab. Wer eine Animation
+braucht (der Prozess, der gerade den Desktop wechselt), liest die Datei,
+verbindet sich und schickt eine JSON-Zeile:
+
+    {"token": "...", "command": "START", "args": [port, token, lock_file]}
+
+Antwort ist eine Textzeile: OK, BUSY oder ERROR. Nach START verbindet sich
+der Host mit dem AnimationChannel des Wechsels (port/token aus args) und
+es gilt der READY/DONE-Handshake aus handshake.py. Weitere Befehle:
+PING (lebt der Host?) und QUIT (beenden).
+
+Nur Standardbibliothek: Das Modul wird auch vom Host importiert, der als
+eigenständiges Skript läuft.
+"""
+
+import json
+import os
+import secrets
+import select
+import socket
+import tempfile
+import time
+from typing import Any, List, Optional
+
+try:
+    from .handshake import _read_line
+except ImportError:
+    from handshake import _read_line
+
+START = "START"
+PING = "PING"
+QUIT = "QUIT"
+
+OK = "OK"
+BUSY = "BUSY"
+ERROR = "ERROR"
+
+# Längste Zeit, die der Host auf die Befehlszeile einer neuen Verbindung wartet
+COMMAND_READ_TIMEOUT = 0.2
+
+# Größte Befehlszeile (Pfad des Lock-Files kann lang sein)
+MAX_COMMAND_BYTES = 4096
+
+
+class HostCommand:
+    """Ein empfangener Befehl; reply() beantwortet ihn und schließt die Verbindung."""
+
+    def __init__(self, name: str, args: List[Any], conn: socket.socket):
+        self.name = name
+        self.args = args
+        self._conn = conn
+
+    def reply(self, answer: str) -> None:
+        try:
+            self._conn.sendall(f"{answer}\n".encode("ascii"))
+        except OSError:
+            pass
+        finally:
+            self._conn.close()
+
+
+class HostServer:
+    """
+    Seite des Hosts.
+
+    Beispiel:
+        server = HostServer()
+        server.write_info(info_file)
+        for command in server.poll(0.02):
+            command.reply(OK)
+    """
+
+    def __init__(self):
+        self.token = secrets.token_hex(8)
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            self._server.bind(("127.0.0.1", 0))
+            self._server.listen(8)
+        except OSError:
+            self._server.close()
+            raise
+        self.port = self._server.getsockname()[1]
+
+    def write_info(self, info_file: str) -> None:
+        """Legt Port, Token und PID atomar in info_file ab."""
+        directory = os.path.dirname(info_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".animation_host-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"port": self.port, "token": self.token, "pid": os.getpid()}, f)
+            os.replace(tmp_path, info_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def poll(self, timeout: float = 0.0) -> List[HostCommand]:
+        """
+        Nimmt wartende Verbindungen an (bis zu timeout Sekunden auf die erste).
+
+        Verbindungen mit falschem Token oder unlesbarer Zeile werden verworfen.
+        """
+        commands = []
+        while True:
+            try:
+                readable, _, _ = select.select([self._server], [], [], timeout)
+            except OSError:
+                return commands
+            if not readable:
+                return commands
+            timeout = 0.0
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return commands
+            command = self._read_command(conn)
+            if command is None:
+                conn.close()
+            else:
+                commands.append(command)
+
+    def _read_command(self, conn: socket.socket) -> Optional[HostCommand]:
+        line = _read_line(conn, time.monotonic() + COMMAND_READ_TIMEOUT, MAX_COMMAND_BYTES)
+        if not line:
+            return None
+        try:
+            message = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(message, dict) or message.get("token") != self.token:
+            return None
+        return HostCommand(str(message.get("command")), list(message.get("args") or []), conn)
+
+    def close(self) -> None:
+        self._server.close()
+
+
+def read_host_info(info_file: str) -> Optional[dict]:
+    """Port, Token und PID des Hosts; None, wenn keine gültige Info-Datei existiert."""
+    try:
+        with open(info_file, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(info, dict) or not isinstance(info.get("port"), int) or not info.get("token"):
+        return None
+    return info
+
+
+def send_host_command(info_file: str, command: str, *args: Any, timeout: float = 0.3) -> Optional[str]:
+    """
+    Schickt einen Befehl an den Host.
+
+    Returns:
+        Die Antwort (OK, BUSY, ERROR) oder None, wenn kein Host erreichbar
+        ist oder er nicht innerhalb von timeout antwortet
+    """
+    info = read_host_info(info_file)
+    if info is None:
+        return None
+    deadline = time.monotonic() + timeout
+    try:
+        with socket.create_connection(("127.0.0.1", info["port"]), timeout=timeout) as conn:
+            message = {"token": info["token"], "command": command, "args": list(args)}
+            conn.sendall((json.dumps(message) + "\n").encode("utf-8"))
+            # Antwort zu lang, leer oder zu spät -> kein Host
+            return _read_line(conn, deadline) or None
+    except OSError:
+        return None
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 """
 Separates Logo-Fenster für SmartDesk Desktop-Switch
-Wird als eigener Prozess gestartet
+Wird als eigener Prozess gestartet oder vom Animations-Host als verborgenes
+Toplevel-Fenster vorbereitet (show()/hide())
 """
 import math
 import tkinter as tk
@@ -24,16 +25,18 @@ except ImportError:
 class LogoWindow:
     """Eigenständiges Logo-Fenster für Desktop-Switch"""
 
-    def __init__(self, duration=None):
+    def __init__(self, duration=None, master=None):
         """
         Args:
             duration: Anzeigedauer in Sekunden (Standard aus TIMING_CONFIG)
+            master: Tk-Hauptfenster; gesetzt wird das Logo ein Toplevel-Fenster
+                    in dessen Prozess (Animations-Host)
         """
         if duration is None:
             duration = cfg.TIMING_CONFIG["default_duration"]
         self.duration = duration * 1000  # Umrechnung in Millisekunden
 
-        self.root = tk.Tk()
+        self.root = tk.Toplevel(master) if master is not None else tk.Tk()
         self.root.title(cfg.WINDOW_CONFIG["title"])
 
         # Fenster-Eigenschaften
@@ -127,6 +130,7 @@ class LogoWindow:
         # Animation-Variablen
         self.animation_step = 0
         self.animation_running = False
+        self._animation_after = None
         self.animation_objects = []
         self.fade_in_complete = False
 
@@ -327,7 +331,7 @@ class LogoWindow:
 
         self.animation_step += 1
         frame_delay = cfg.ANIMATION_CONFIG["frame_delay"]
-        self.root.after(frame_delay, self.animate_loading)
+        self._animation_after = self.root.after(frame_delay, self.animate_loading)
 
     def animate_spinner(self):
         """Spinner-Animation updaten"""
@@ -422,12 +426,17 @@ class LogoWindow:
         self.fade_out()
         self.root.quit()
 
-    def run(self):
-        """Logo-Fenster anzeigen"""
-        # Fenster aktualisieren und in den Vordergrund bringen
-        self.root.update()
+    def show(self):
+        """Lade-Animation starten und einblenden (kehrt nach dem Fade-In zurück)"""
+        self.root.deiconify()
         self.root.lift()
-        self.root.focus_force()
+
+        # Schleife und Objekte einer vorherigen Anzeige entfernen
+        if self._animation_after:
+            self.root.after_cancel(self._animation_after)
+            self._animation_after = None
+        self.animation_canvas.delete("all")
+        self.animation_step = 0
 
         # Animation ZUERST initialisieren (vor Fade-In)
         if self.animation_type == "spinner":
@@ -446,6 +455,21 @@ class LogoWindow:
         # Einblenden (Animation läuft bereits)
         self.fade_in()
 
+    def hide(self):
+        """Ausblenden und Fenster verbergen (bleibt für die nächste Anzeige bestehen)"""
+        self.animation_running = False
+        self.fade_out()
+        self.root.withdraw()
+
+    def run(self):
+        """Logo-Fenster anzeigen"""
+        # Fenster aktualisieren und in den Vordergrund bringen
+        self.root.update()
+        self.root.lift()
+        self.root.focus_force()
+
+        self.show()
+
         # Nach duration automatisch schließen
         self.root.after(int(self.duration), self.start_close_sequence)
 
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 """
 Desktop-Switch Fade-Animation für SmartDesk
-Startet Logo-Fenster als separaten Prozess
-Wartet auf eine Signal-Datei (.lock), um sich zu beenden.
+Startet Logo-Fenster als separaten Prozess (im Animations-Host: vorbereitetes
+Logo-Fenster im selben Prozess, siehe animation_host.py)
+Meldet dem Desktop-Wechsel READY, sobald der Bildschirm verdeckt ist, und
+blendet nach DONE aus (siehe handshake.py). Das Löschen der Signal-Datei
+(.lock) beendet die Animation ebenfalls.
 """
 import tkinter as tk
 import time
@@ -36,6 +39,19 @@ except ImportError:
             ALLOW_ESC_EXIT = True
 
 
+# Handshake mit dem Desktop-Wechsel (auch bei Ausführung als Skript)
+try:
+    from .handshake import SwitchLink
+except ImportError:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    from handshake import SwitchLink
+
+# Wie oft (Sekunden) auf DONE geprüft wird; die Signal-Datei alle 0,1 s
+DONE_POLL_INTERVAL = 0.02
+SIGNAL_FILE_POLL_INTERVAL = 0.1
+
 # win32api wird benötigt, um die volle Größe über MEHRERE Monitore zu ermitteln
 try:
     import win32api
@@ -51,17 +67,25 @@ except ImportError:
 
 
 class MultiMonitorFade:
-    def __init__(self, config=None):
+    def __init__(self, config=None, signal_file=None, link=None, logo_window=None):
         """
         Initialisierung mit optionaler Konfiguration
 
         Args:
             config: FadeConfig-Instanz oder None für Standardwerte
+            signal_file: Signaldatei, deren Löschen die Animation beendet
+            link: SwitchLink zum Desktop-Wechsel (None ohne Handshake)
+            logo_window: Vorbereitetes LogoWindow im selben Prozess; None
+                         startet logo.py als eigenen Prozess
         """
         self.config = config or FadeConfig()
 
-        # --- Signaldatei aus Argumenten empfangen ---
-        self.signal_file = sys.argv[1] if len(sys.argv) > 1 else None
+        self.signal_file = signal_file
+        self.link = link
+        self.logo_window = logo_window
+
+        # Wird beim Warten auf das Ende regelmäßig aufgerufen (Animations-Host)
+        self.idle_callback = None
 
         self.root = tk.Tk()
         self.root.title("SmartDesk Desktop Switch")
@@ -145,10 +169,14 @@ class MultiMonitorFade:
         self.root.geometry(geometry)
 
     def start_logo(self):
-        """Logo-Fenster als separaten Prozess starten"""
+        """Logo-Fenster als separaten Prozess starten (bzw. vorbereitetes Fenster zeigen)"""
         if not self.config.SHOW_LOGO:
             return
 
+        if self.logo_window:
+            self.logo_window.show()
+            return
+
         try:
             # Pfad zur logo.py ermitteln
             script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -188,6 +216,10 @@ class MultiMonitorFade:
 
     def stop_logo(self):
         """Logo-Prozess beenden (falls noch aktiv)"""
+        if self.logo_window:
+            self.logo_window.hide()
+            return
+
         if self.logo_process and self.logo_process.poll() is None:
             try:
                 self.logo_process.terminate()
@@ -234,7 +266,14 @@ class MultiMonitorFade:
         self.root.mainloop()
 
     def execute_fade(self):
-        """Fade-Sequenz ausführen"""
+        """Fade-Sequenz ausführen und Fenster schließen"""
+        try:
+            self.play()
+        finally:
+            self.cleanup_and_exit()
+
+    def play(self):
+        """Einblenden -> auf das Ende des Wechsels warten -> Ausblenden (Fenster bleibt bestehen)"""
         try:
             if self.config.DEBUG:
                 print("Blende Bildschirm ein...")
@@ -242,10 +281,15 @@ class MultiMonitorFade:
             # Schnell einblenden
             self.fade_in()
 
+            # Bildschirm ist verdeckt: Wechsel darf fortfahren
+            if self.link:
+                self.link.send_ready()
+
             # Logo-Prozess starten (läuft parallel)
             if self.config.SHOW_LOGO:
                 self.start_logo()
-                time.sleep(0.3)  # Kurz warten, damit Logo-Fenster erscheint
+                if not self.logo_window:
+                    time.sleep(0.3)  # Kurz warten, damit Logo-Fenster erscheint
 
             # --- Warten auf Signal statt fester Zeit ---
             if self.config.DEBUG:
@@ -273,14 +317,15 @@ class MultiMonitorFade:
                 import traceback
 
                 traceback.print_exc()
-        finally:
-            self.cleanup_and_exit()
 
     def cleanup_and_exit(self):
         """Sauberes Beenden"""
         # Logo-Prozess beenden
         self.stop_logo()
 
+        if self.link:
+            self.link.close()
+
         try:
             self.root.quit()
             self.root.destroy()
@@ -288,40 +333,54 @@ class MultiMonitorFade:
             pass
 
     def wait_for_signal(self):
-        """Wartet darauf, dass die Signaldatei vom aufrufenden Prozess gelöscht wird."""
-        if not self.signal_file:
-            # Fallback auf feste Zeit, wenn keine Signaldatei übergeben wurde
+        """Wartet auf DONE vom Wechsel oder darauf, dass die Signaldatei gelöscht wird."""
+        if not self.signal_file and not self.link:
+            # Fallback auf feste Zeit, wenn weder Handshake noch Signaldatei vorhanden sind
             if self.config.DEBUG:
                 print(f"Keine Signaldatei. Nutze feste Dauer: {self.config.VISIBLE_DURATION}s")
             time.sleep(self.config.VISIBLE_DURATION)
             return
 
         if self.config.DEBUG:
-            print(f"Warte auf Löschung der Signaldatei: {self.signal_file}")
+            print(f"Warte auf DONE bzw. Löschung der Signaldatei: {self.signal_file}")
 
         start_time = time.time()
+        next_file_check = 0.0
         # Maximales Timeout, falls der Hauptprozess abstürzt
         max_wait_seconds = 30
 
         try:
-            # Warte solange die Datei existiert
-            while os.path.exists(self.signal_file):
-                time.sleep(0.1)
+            while True:
+                if self.link:
+                    if self.link.poll_done(DONE_POLL_INTERVAL):
+                        break
+                else:
+                    time.sleep(SIGNAL_FILE_POLL_INTERVAL)
+
+                now = time.time()
+                if self.signal_file and now >= next_file_check:
+                    if not os.path.exists(self.signal_file):
+                        break
+                    next_file_check = now + SIGNAL_FILE_POLL_INTERVAL
+
                 # Root-Update ist wichtig, damit das Fenster nicht einfriert
                 self.root.update_idletasks()
                 self.root.update()
 
-                if time.time() - start_time > max_wait_seconds:
+                if self.idle_callback:
+                    self.idle_callback()
+
+                if now - start_time > max_wait_seconds:
                     if self.config.DEBUG:
                         print(f"Timeout: Warte {max_wait_seconds}s. Breche ab.")
                     break
 
             if self.config.DEBUG:
-                print("Signaldatei wurde gelöscht (oder Timeout). Fahre fort.")
+                print("Wechsel beendet (DONE, Signaldatei gelöscht oder Timeout). Fahre fort.")
 
         except Exception as e:
             if self.config.DEBUG:
-                print(f"Fehler beim Warten auf Signaldatei: {e}")
+                print(f"Fehler beim Warten auf das Ende des Wechsels: {e}")
 
 
 if __name__ == "__main__":
@@ -336,7 +395,9 @@ if __name__ == "__main__":
         print("=" * 40)
 
     try:
-        fade = MultiMonitorFade()
+        # Signaldatei aus den Argumenten, Verbindung zum Wechsel aus der Umgebung
+        signal_file = sys.argv[1] if len(sys.argv) > 1 else None
+        fade = MultiMonitorFade(signal_file=signal_file, link=SwitchLink.from_env())
         fade.run()
     except Exception as e:
         print(f"FEHLER: {e}")
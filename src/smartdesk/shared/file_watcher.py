@@ -0,0 +1,583 @@
+# Dateipfad: src/smartdesk/shared/file_watcher.py
+"""
+Prozessweiter Datei-Watcher für die Dateien in DATA_DIR.
+
+Ersetzt das periodische Abfragen von mtime bzw. Existenz einzelner Dateien
+(desktops.json, rules.json, listener.pid) durch Änderungs-Benachrichtigungen
+des Betriebssystems. Ein einziger Hintergrund-Thread wartet blockierend auf
+Ereignisse; ohne Änderungen findet keinerlei periodische I/O statt.
+
+Backends (WatchBackend Protocol), automatisch gewählt:
+- InotifyBackend:  inotify (Linux)
+- Win32WatchBackend: ReadDirectoryChangesW via pywin32 (Windows)
+- PollingBackend:  stat() im festen Intervall als letzter Ausweg
+
+Beobachtet werden immer die Verzeichnisse der abonnierten Dateien. Dadurch
+werden auch atomare Ersetzungen (os.replace), Neuanlage und Löschen erkannt.
+
+Entprellung:
+    Mehrere Ereignisse zu einer Datei innerhalb von "debounce" Sekunden nach
+    dem ersten Ereignis ergeben genau einen Callback-Aufruf.
+
+Callbacks laufen im Watcher-Thread. Qt-Oberflächen müssen sie per Signal in
+den GUI-Thread weiterreichen.
+"""
+
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Protocol, Tuple
+
+from .logging_config import get_logger
+from .localization import get_text
+
+logger = get_logger(__name__)
+
+# Standard-Entprellzeit in Sekunden
+DEFAULT_DEBOUNCE = 0.05
+
+# Intervall des Polling-Fallbacks in Sekunden
+POLL_INTERVAL = 1.0
+
+FileCallback = Callable[[str], None]
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+class WatchBackend(Protocol):
+    """
+    Interface für ein Datei-Watcher-Backend.
+
+    wait() wird ausschließlich vom Watcher-Thread aufgerufen, add_path(),
+    remove_path() und wake() von beliebigen Threads.
+    """
+
+    name: str
+
+    def add_path(self, path: str) -> None:
+        """Beginnt die Überwachung einer Datei (bzw. ihres Verzeichnisses)."""
+        ...
+
+    def remove_path(self, path: str) -> None:
+        """Beendet die Überwachung einer Datei."""
+        ...
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        """
+        Wartet auf Änderungen.
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden, None = unbegrenzt
+
+        Returns:
+            Pfade der geänderten Dateien (kann auch nicht abonnierte
+            Dateien desselben Verzeichnisses enthalten)
+        """
+        ...
+
+    def wake(self) -> None:
+        """Weckt ein laufendes wait() vorzeitig auf."""
+        ...
+
+    def close(self) -> None:
+        """Gibt alle Ressourcen frei."""
+        ...
+
+
+# =============================================================================
+# Backends
+# =============================================================================
+
+
+class _DirectoryRefs:
+    """Zählt Abonnements je Verzeichnis (Basis der Verzeichnis-Backends)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dirs: Dict[str, int] = {}
+
+    def _acquire_dir(self, path: str) -> Optional[str]:
+        """Gibt das Verzeichnis zurück, wenn es neu überwacht werden muss."""
+        directory = os.path.dirname(os.path.abspath(path))
+        with self._lock:
+            count = self._dirs.get(directory, 0)
+            self._dirs[directory] = count + 1
+        if count:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def _release_dir(self, path: str) -> Optional[str]:
+        """Gibt das Verzeichnis zurück, wenn es nicht mehr überwacht wird."""
+        directory = os.path.dirname(os.path.abspath(path))
+        with self._lock:
+            count = self._dirs.get(directory, 0)
+            if count <= 1:
+                self._dirs.pop(directory, None)
+                return directory if count else None
+            self._dirs[directory] = count - 1
+        return None
+
+
+class InotifyBackend(_DirectoryRefs):
+    """inotify über die libc (Linux)."""
+
+    name = "inotify"
+
+    _IN_NONBLOCK = 0o4000
+    _IN_CLOEXEC = 0o2000000
+    _MASK = (
+        0x00000002  # IN_MODIFY
+        | 0x00000004  # IN_ATTRIB
+        | 0x00000008  # IN_CLOSE_WRITE
+        | 0x00000040  # IN_MOVED_FROM
+        | 0x00000080  # IN_MOVED_TO
+        | 0x00000100  # IN_CREATE
+        | 0x00000200  # IN_DELETE
+    )
+    _IN_Q_OVERFLOW = 0x00004000
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        super().__init__()
+        if not sys.platform.startswith("linux"):
+            raise ImportError("inotify ist nur unter Linux verfügbar")
+
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(self._IN_NONBLOCK | self._IN_CLOEXEC)
+        # Unter Test-Platzhaltern für ctypes kommt hier kein echter Deskriptor zurück
+        if not isinstance(fd, int) or fd < 0:
+            raise ImportError("inotify_init1 fehlgeschlagen")
+
+        self._ctypes = ctypes
+        self._libc = libc
+        self._fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self._watches: Dict[int, str] = {}
+        self._dir_watches: Dict[str, int] = {}
+
+    def add_path(self, path: str) -> None:
+        directory = self._acquire_dir(path)
+        if directory is None:
+            return
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self._MASK)
+        if wd < 0:
+            self._release_dir(path)
+            errno = self._ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._watches[wd] = directory
+        self._dir_watches[directory] = wd
+
+    def remove_path(self, path: str) -> None:
+        directory = self._release_dir(path)
+        wd = self._dir_watches.pop(directory, None) if directory else None
+        if wd is not None:
+            self._libc.inotify_rm_watch(self._fd, wd)
+            self._watches.pop(wd, None)
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+        if self._wake_r in readable:
+            os.read(self._wake_r, 4096)
+        if self._fd not in readable:
+            return []
+
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return []
+
+        changed = []
+        offset = 0
+        header = self._EVENT_HEADER
+        while offset + header.size <= len(data):
+            wd, mask, _, length = header.unpack_from(data, offset)
+            offset += header.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & self._IN_Q_OVERFLOW:
+                # Ereignisse verloren: alle Verzeichnisse als geändert melden
+                return [os.path.join(d, "") for d in self._watches.values()]
+            directory = self._watches.get(wd)
+            if directory and name:
+                changed.append(os.path.join(directory, os.fsdecode(name)))
+        return changed
+
+    def wake(self) -> None:
+        os.write(self._wake_w, b"\0")
+
+    def close(self) -> None:
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class Win32WatchBackend(_DirectoryRefs):
+    """ReadDirectoryChangesW mit Overlapped-I/O (Windows, benötigt pywin32)."""
+
+    name = "win32"
+
+    _BUFFER_SIZE = 64 * 1024
+
+    def __init__(self):
+        super().__init__()
+        import pywintypes
+        import win32con
+        import win32event
+        import win32file
+
+        self._pywintypes = pywintypes
+        self._win32con = win32con
+        self._win32event = win32event
+        self._win32file = win32file
+        self._filter = (
+            win32con.FILE_NOTIFY_CHANGE_FILE_NAME | win32con.FILE_NOTIFY_CHANGE_LAST_WRITE | win32con.FILE_NOTIFY_CHANGE_SIZE
+        )
+        # Auto-Reset-Event zum Aufwecken von WaitForMultipleObjects
+        self._wake_event = win32event.CreateEvent(None, False, False, None)
+        # directory -> [handle, overlapped, buffer]; Reads werden nur im
+        # Watcher-Thread gestartet (I/O gehört dem ausgebenden Thread)
+        self._handles: Dict[str, list] = {}
+        self._to_start: List[str] = []
+        self._to_close: List[str] = []
+
+    def add_path(self, path: str) -> None:
+        directory = self._acquire_dir(path)
+        if directory is None:
+            return
+        with self._lock:
+            if directory in self._to_close:
+                self._to_close.remove(directory)
+            else:
+                self._to_start.append(directory)
+        self.wake()
+
+    def remove_path(self, path: str) -> None:
+        directory = self._release_dir(path)
+        if directory is None:
+            return
+        with self._lock:
+            if directory in self._to_start:
+                self._to_start.remove(directory)
+            else:
+                self._to_close.append(directory)
+        self.wake()
+
+    def _start_read(self, directory: str, entry: list) -> None:
+        handle, overlapped, buffer = entry
+        self._win32file.ReadDirectoryChangesW(handle, buffer, False, self._filter, overlapped)
+
+    def _apply_changes(self) -> None:
+        win32file = self._win32file
+        with self._lock:
+            to_start, self._to_start = self._to_start, []
+            to_close, self._to_close = self._to_close, []
+
+        for directory in to_close:
+            entry = self._handles.pop(directory, None)
+            if entry:
+                win32file.CancelIo(entry[0])
+                entry[0].Close()
+
+        for directory in to_start:
+            handle = win32file.CreateFile(
+                directory,
+                0x0001,  # FILE_LIST_DIRECTORY
+                # Andere Prozesse dürfen Dateien im Verzeichnis weiter ersetzen/löschen
+                self._win32con.FILE_SHARE_READ | self._win32con.FILE_SHARE_WRITE | self._win32con.FILE_SHARE_DELETE,
+                None,
+                self._win32con.OPEN_EXISTING,
+                self._win32con.FILE_FLAG_BACKUP_SEMANTICS | self._win32con.FILE_FLAG_OVERLAPPED,
+                None,
+            )
+            overlapped = self._pywintypes.OVERLAPPED()
+            overlapped.hEvent = self._win32event.CreateEvent(None, True, False, None)
+            entry = [handle, overlapped, win32file.AllocateReadBuffer(self._BUFFER_SIZE)]
+            self._handles[directory] = entry
+            self._start_read(directory, entry)
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        self._apply_changes()
+
+        directories = list(self._handles)
+        events = [self._wake_event] + [self._handles[d][1].hEvent for d in directories]
+        milliseconds = self._win32event.INFINITE if timeout is None else max(0, int(timeout * 1000))
+        rc = self._win32event.WaitForMultipleObjects(events, False, milliseconds)
+
+        index = rc - self._win32event.WAIT_OBJECT_0
+        if rc == self._win32event.WAIT_TIMEOUT or index <= 0 or index > len(directories):
+            return []
+
+        directory = directories[index - 1]
+        entry = self._handles[directory]
+        handle, overlapped, buffer = entry
+        size = self._win32file.GetOverlappedResult(handle, overlapped, True)
+        self._win32event.ResetEvent(overlapped.hEvent)
+
+        if size == 0:
+            # Puffer übergelaufen: ganzes Verzeichnis als geändert melden
+            changed = [os.path.join(directory, "")]
+        else:
+            changed = [os.path.join(directory, name) for _, name in self._win32file.FILE_NOTIFY_INFORMATION(buffer, size)]
+        self._start_read(directory, entry)
+        return changed
+
+    def wake(self) -> None:
+        self._win32event.SetEvent(self._wake_event)
+
+    def close(self) -> None:
+        for handle, _, _ in self._handles.values():
+            try:
+                self._win32file.CancelIo(handle)
+                handle.Close()
+            except self._pywintypes.error:
+                pass
+        self._handles.clear()
+
+
+class PollingBackend:
+    """stat() aller abonnierten Dateien im festen Intervall (Fallback)."""
+
+    name = "polling"
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._paths: Dict[str, list] = {}  # path -> [Signatur, Anzahl]
+
+    @staticmethod
+    def _signature(path: str) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def add_path(self, path: str) -> None:
+        with self._lock:
+            if path in self._paths:
+                self._paths[path][1] += 1
+            else:
+                self._paths[path] = [self._signature(path), 1]
+
+    def remove_path(self, path: str) -> None:
+        with self._lock:
+            entry = self._paths.get(path)
+            if entry and entry[1] > 1:
+                entry[1] -= 1
+            else:
+                self._paths.pop(path, None)
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        wait_time = self.interval if timeout is None else min(timeout, self.interval)
+        if self._wake.wait(wait_time):
+            self._wake.clear()
+
+        changed = []
+        with self._lock:
+            for path, entry in self._paths.items():
+                signature = self._signature(path)
+                if signature != entry[0]:
+                    entry[0] = signature
+                    changed.append(path)
+        return changed
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def close(self) -> None:
+        pass
+
+
+def _detect_backend() -> WatchBackend:
+    """Wählt das beste verfügbare Backend für die aktuelle Plattform."""
+    candidates = (Win32WatchBackend,) if sys.platform == "win32" else (InotifyBackend,)
+    for backend_cls in candidates:
+        try:
+            return backend_cls()
+        except (ImportError, OSError, AttributeError):
+            continue
+
+    logger.warning(get_text("file_watcher.warn.fallback", interval=POLL_INTERVAL))
+    return PollingBackend()
+
+
+# =============================================================================
+# Watcher
+# =============================================================================
+
+
+class Subscription:
+    """Abonnement einer Datei; cancel() beendet es."""
+
+    __slots__ = ("path", "callback", "debounce", "_watcher")
+
+    def __init__(self, watcher: "FileWatcher", path: str, callback: FileCallback, debounce: float):
+        self._watcher = watcher
+        self.path = path
+        self.callback = callback
+        self.debounce = debounce
+
+    def cancel(self) -> None:
+        """Beendet das Abonnement (mehrfacher Aufruf ist unschädlich)."""
+        self._watcher.unsubscribe(self)
+
+
+class FileWatcher:
+    """
+    Verteilt Datei-Änderungen entprellt an Abonnenten.
+
+    Der Watcher-Thread startet mit dem ersten Abonnement.
+    """
+
+    def __init__(self, backend: Optional[WatchBackend] = None, debounce: float = DEFAULT_DEBOUNCE):
+        self._backend = backend
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._pending: Dict[Subscription, float] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def backend(self) -> WatchBackend:
+        with self._lock:
+            if self._backend is None:
+                self._backend = _detect_backend()
+            return self._backend
+
+    def subscribe(self, path: str, callback: FileCallback, debounce: Optional[float] = None) -> Subscription:
+        """
+        Ruft callback(path) auf, sobald sich die Datei ändert, angelegt oder gelöscht wird.
+
+        Args:
+            path: Zu beobachtende Datei (muss nicht existieren)
+            callback: Wird im Watcher-Thread aufgerufen
+            debounce: Entprellzeit in Sekunden (Standard: self.debounce)
+
+        Returns:
+            Subscription, deren cancel() das Abonnement beendet
+        """
+        subscription = Subscription(self, path, callback, self.debounce if debounce is None else debounce)
+        backend = self.backend
+        backend.add_path(path)
+        with self._lock:
+            self._subscriptions.setdefault(_path_key(path), []).append(subscription)
+            self._stopping = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="SmartDeskFileWatcher", daemon=True)
+                self._thread.start()
+        backend.wake()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Beendet ein Abonnement."""
+        key = _path_key(subscription.path)
+        with self._lock:
+            subscriptions = self._subscriptions.get(key, [])
+            if subscription not in subscriptions:
+                return
+            subscriptions.remove(subscription)
+            if not subscriptions:
+                del self._subscriptions[key]
+            self._pending.pop(subscription, None)
+        self.backend.remove_path(subscription.path)
+
+    def stop(self) -> None:
+        """Beendet den Watcher-Thread, alle Abonnements und gibt das Backend frei."""
+        with self._lock:
+            self._stopping = True
+            thread, self._thread = self._thread, None
+            backend, self._backend = self._backend, None
+            self._subscriptions.clear()
+            self._pending.clear()
+        if backend is not None:
+            backend.wake()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=2)
+        if backend is not None:
+            backend.close()
+
+    # ------------------------------------------------------------------
+    # Watcher-Thread
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        backend = self.backend
+        while True:
+            with self._lock:
+                if self._stopping:
+                    return
+                timeout = max(0.0, min(self._pending.values()) - time.monotonic()) if self._pending else None
+
+            try:
+                changed = backend.wait(timeout)
+            except Exception as e:
+                logger.error(get_text("file_watcher.error.backend", backend=backend.name, e=e))
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            for subscription in self._collect(changed):
+                try:
+                    subscription.callback(subscription.path)
+                except Exception as e:
+                    logger.error(get_text("file_watcher.error.callback", path=subscription.path, e=e))
+
+    def _collect(self, changed: List[str]) -> List[Subscription]:
+        """Merkt Ereignisse vor und liefert die fälligen Abonnements."""
+        now = time.monotonic()
+        with self._lock:
+            for path in changed:
+                if path.endswith(os.sep):
+                    # Ganzes Verzeichnis (z.B. nach Pufferüberlauf)
+                    prefix = _path_key(path) + os.sep
+                    matches = [s for key, subs in self._subscriptions.items() if key.startswith(prefix) for s in subs]
+                else:
+                    matches = self._subscriptions.get(_path_key(path), [])
+                for subscription in matches:
+                    self._pending.setdefault(subscription, now + subscription.debounce)
+
+            due = [s for s, at in self._pending.items() if at <= now]
+            for subscription in due:
+                del self._pending[subscription]
+        return due
+
+
+# Singleton
+_watcher: Optional[FileWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_file_watcher() -> FileWatcher:
+    """Gibt den prozessweiten FileWatcher zurück."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = FileWatcher()
+        return _watcher
+
+
+def set_file_watcher(watcher: Optional[FileWatcher]) -> None:
+    """Ersetzt den prozessweiten FileWatcher (z.B. für Tests); der alte wird gestoppt."""
+    global _watcher
+    with _watcher_lock:
+        old, _watcher = _watcher, watcher
+    if old is not None and old is not watcher:
+        old.stop()
+
+
+def watch_file(path: str, callback: FileCallback, debounce: Optional[float] = None) -> Subscription:
+    """Kurzform für get_file_watcher().subscribe()."""
+    return get_file_watcher().subscribe(path, callback, debounce)
@@ -270,6 +270,11 @@ def ensure_setup_complete() -> bool:
     if is_first_run():
         logger.info("Erster Start erkannt - führe Setup durch")
         return run_first_time_setup(silent=False)
+
+    # Alte desktops.json mit Inline-Icons in Layout-Dateien überführen
+    from ..core.storage.file_operations import migrate_icon_layouts
+
+    migrate_icon_layouts()
     return True
 
 
@@ -33,6 +33,7 @@ TEXT = {
             "watcher_error": "Watcher-Thread Fehler: {e}",
             "ready": "Overview GUI gestartet und bereit.",
             "load_error": "Fehler beim Laden der Desktops: {e}",
+            "watch_error": "desktops.json kann nicht überwacht werden, prüfe beim Anzeigen: {e}",
             "label_error": "Fehler beim Erstellen der Desktop-Labels: {e}",
             "style_warn": "Style nicht geladen: {e}",
         },
@@ -64,6 +65,7 @@ TEXT = {
             "desktop_label_template": "Desktop: {name}",
             "desktop_label_none": "Desktop: -",
             "desktop_label_error": "Desktop: ?",
+            "watch_error": "Status-Dateien können nicht überwacht werden, verwende Timer: {e}",
             "button_open": "📂 SmartDesk Öffnen",
             "button_create": "➕ Desktop Erstellen",
             "button_manage": "Desktops verwalten",
@@ -186,6 +188,7 @@ TEXT = {
                     "deactivating": "Deaktiviere SmartDesk...",
                     "activating": "Aktiviere SmartDesk...",
                     "start_error": "Fehler beim Starten der Tray-Anwendung: {e}",
+                    "watch_error": "listener.pid kann nicht überwacht werden, prüfe per Timer: {e}",
                 }
             },
             "settings": {
@@ -281,6 +284,7 @@ TEXT = {
             "wallpaper_assigned": "Hintergrundbild erfolgreich {name} zugewiesen.",
         },
         "info": {
+            "switch_cancelled": "Wechsel zu '{name}' abgebrochen, eine neuere Anfrage wartet.",
             "delete_aborted": "Löschvorgang abgebrochen.",
             "folder_not_found": "Ordner '{path}' nicht gefunden (wird ignoriert).",
             "folder_moved": "Ordner physisch verschoben von '{old_path}' nach '{new_path}'.",
@@ -293,6 +297,7 @@ TEXT = {
             "switching_registry": "Wechsle Registry zu '{name}' ({path})...",
             "registry_success": "Registry erfolgreich aktualisiert.",
             "sync_after_restart": "Synchronisiere Status nach Explorer-Neustart...",
+            "registry_changed": "Desktop-Pfad in der Registry wurde geändert, synchronisiere aktiven Desktop...",
             "sync_path_found": "Aktiver Pfad gefunden: {path}",
             "sync_desktop_active": "Aktiver Desktop: '{name}'",
             "setting_wallpaper": "Setze Hintergrundbild...",
@@ -301,7 +306,11 @@ TEXT = {
             "reading_icons": "Lese Icon-Positionen für '{name}'...",
             "old_wallpaper_removed": "Altes Hintergrundbild entfernt.",
             "setting_wallpaper_now": "Desktop ist aktiv. Setze Hintergrundbild sofort.",
-            "backup_created": "Registry-Backup erstellt",
+            "backup_scheduled": "Registry-Backup vor dem Wechsel eingereiht",
+        },
+        "debug": {
+            "switch_timings": "Desktop-Wechsel (Trace {trace_id}), Dauer je Stufe: {summary}",
+            "animation_ready_timeout": "Animation hat nach {timeout}s kein READY gemeldet, fahre fort",
         },
         "warn": {
             "sync_failed": "Warnung: Registry-Synchronisierung fehlgeschlagen: {e}",
@@ -314,6 +323,7 @@ TEXT = {
             "lock_file_create": "Konnte Lock-File nicht erstellen: {e}",
             "animation_script_missing": "Animationsskript nicht gefunden: {path}",
             "animation_start_failed": "Animation konnte nicht gestartet werden: {e}",
+            "animation_channel_failed": "Handshake mit der Animation nicht möglich, nutze feste Wartezeit: {e}",
             "icon_save_failed": "Icon-Speicherung fehlgeschlagen: {e}",
             "lock_file_remove_failed": "Konnte Lock-File nicht entfernen: {e}",
             "explorer_timeout": "Timeout beim Warten auf Explorer-Neustart. Versuche trotzdem fortzufahren...",
@@ -347,16 +357,22 @@ TEXT = {
         },
         "warn": {
             "rule_not_found": "Regel nicht gefunden für: {process}",
+            "watch_failed": "Regel-Datei kann nicht überwacht werden, prüfe periodisch: {e}",
         }
     },
     "backup_manager": {
         "warn": {
             "no_values": "Keine Registry-Werte zum Sichern gefunden",
             "delete_failed": "Konnte Backup nicht löschen: {e}",
+            "queue_full": "Backup-Warteschlange voll ({size}), Backup vor dem Wechsel wird übersprungen",
+            "flush_timeout": "{count} Backup(s) beim Beenden nicht rechtzeitig geschrieben",
         },
         "info": {
             "created": "Registry-Backup erstellt: {path}",
+            "unchanged": "Registry-Werte unverändert, verwende vorhandenes Backup: {path}",
             "restored": "Registry wiederhergestellt aus: {path}",
+            "restore_unchanged": "Registry entspricht bereits dem Backup: {path}",
+            "diff": "{key_path}\\{value_name}: '{current}' -> '{restored}'",
             "deleted_count": "{count} alte Backup(s) gelöscht",
             "deleted_single": "Altes Backup gelöscht: {name}",
         },
@@ -364,10 +380,29 @@ TEXT = {
             "create": "Fehler beim Erstellen des Registry-Backups: {e}",
             "list": "Fehler beim Auflisten der Backups: {e}",
             "not_found": "Backup-Datei nicht gefunden: {path}",
-            "restore_failed": "Registry-Import fehlgeschlagen: {error}",
+            "restore_failed": "Wiederherstellung fehlgeschlagen: {error}",
             "restore_exception": "Fehler bei der Wiederherstellung: {e}",
         },
     },
+    "tracing": {
+        "warn": {
+            "write_failed": "Trace-Datensatz konnte nicht nach {path} geschrieben werden: {e}",
+        },
+        "report": {
+            "description": "Dauer der Desktop-Wechsel je Stufe (p50/p95) aus der Trace-Datei",
+            "no_records": "Keine Trace-Datensätze gefunden.",
+            "group": "Prozess: {group}",
+            "arg_file": "Trace-Datei (Standard: switch_trace.jsonl im Datenverzeichnis)",
+            "arg_by_process": "Getrennt nach Prozess (listener, tray, gui) auswerten",
+            "arg_last": "Nur die letzten N Datensätze auswerten",
+            "arg_outcome": "Nur Datensätze mit diesem Ergebnis (ok, aborted, failed, error)",
+            "arg_kind": "Art der Datensätze (Standard: switch)",
+            "arg_json": "Ausgabe als JSON",
+            "arg_prefetch": "Treffer der Vorausberechnung (prefetch) statt der Stufen auswerten",
+            "prefetch": "Vorausberechnung: {hits} Treffer, {misses} Fehlgriffe, {stale} veraltet (Trefferquote {hit_rate:.0%}), eingespart {saved_ms_total:.0f} ms (p50 {saved_ms_p50:.1f} ms je Treffer)",
+            "no_prefetch": "Keine Wechsel mit Vorausberechnung gefunden.",
+        },
+    },
     "win_utils": {
         "debug": {
             "taskbar_top": "Taskleiste (HWND: {hwnd}) an die Spitze gezwungen.",
@@ -414,6 +449,7 @@ TEXT = {
         "warn": {
             "no_icons_on_desktop": "Aktueller Desktop hat 0 Icons.",
             "no_icons_found": "Konnte keine Icon-Namen auslesen (Explorer noch nicht bereit?).",
+            "session_failed": "Zugriff auf das Desktop-ListView im Explorer fehlgeschlagen: {error}",
         },
         "debug": {"item_count": "[IconManager DEBUG] Anzahl Items: {count}"},
     },
@@ -457,7 +493,42 @@ TEXT = {
             "create_dir": "Konnte Datenverzeichnis nicht erstellen: {e}",
             "save": "Konnte Desktops nicht speichern: {e}",
             "load": "Konnte Desktops nicht laden: {e}",
-        }
+            "save_listener": "Fehler im Save-Listener: {e}",
+            "layout_read": "Konnte Icon-Layout {path} nicht lesen: {e}",
+            "icon_layout_save": "Konnte Icon-Layout von '{name}' nicht speichern: {e}",
+            "lock_upgrade": "Lese-Lock auf {path} kann nicht zu einem Schreib-Lock erweitert werden.",
+            "schema_version": "Datenbank {path} hat Schema-Version {version}, die diese Version nicht kennt.",
+            "file_schema_version": "{path} hat Schema-Version {version}, diese Version unterstützt bis {supported}. Bitte SmartDesk aktualisieren.",
+            "journal_compact": "Kompaktierung des Änderungsjournals fehlgeschlagen: {e}",
+        },
+        "warn": {
+            "lock_fallback": "Kein Betriebssystem-Lock verfügbar, verwende Lock-Datei (O_EXCL).",
+            "lock_recovered": "Verwaistes Lock {path} von PID {pid} übernommen ({reason}).",
+            "lock_timeout": "Timeout beim Warten auf {path}: gehalten von PID {pid} seit {age:.1f}s.",
+            "lock_timeout_unknown": "Timeout beim Warten auf {path}: Besitzer unbekannt.",
+            "layout_cleanup": "Verwaistes Icon-Layout {path} konnte nicht gelöscht werden: {e}",
+            "unknown_engine": "Unbekannte Speicher-Engine '{name}', verwende '{default}'.",
+            "journal_corrupt": "Beschädigter Eintrag im Änderungsjournal {path} (ab Offset {offset}) übersprungen.",
+        },
+        "lock_reason": {
+            "dead": "Besitzer-Prozess beendet",
+            "expired": "Lease abgelaufen",
+            "legacy": "Lock-Datei ohne Besitzer veraltet",
+        },
+        "info": {
+            "layouts_migrated": "{count} Icon-Layout(s) aus desktops.json in Layout-Dateien migriert.",
+            "sqlite_imported": "{desktops} Desktop(s) und {rules} Regel(n) nach {path} importiert.",
+            "journal_compacted": "Änderungsjournal {path} in Snapshot übernommen ({size} Bytes).",
+        },
+    },
+    "file_watcher": {
+        "error": {
+            "backend": "Fehler im Datei-Watcher ({backend}): {e}",
+            "callback": "Fehler im Datei-Watcher-Callback für {path}: {e}",
+        },
+        "warn": {
+            "fallback": "Keine Dateisystem-Benachrichtigungen verfügbar, verwende Polling ({interval}s).",
+        },
     },
     "path_validator": {"error": {"create_dir": "Fehler beim Erstellen des Verzeichnisses {path}: {e}"}},
     "hotkey_manager": {
@@ -527,7 +598,77 @@ TEXT = {
             "hold_duration_error": "Error setting hold duration: {e}",
         },
     },
-    "registry": {"error": {"update": "Registry Fehler bei {key_path}: {e}"}},
+    "registry": {
+        "error": {
+            "update": "Registry Fehler bei {key_path}: {e}",
+            "callback": "Fehler im Registry-Listener für {key_path}: {e}",
+            "verify": "Registry-Wert in {key_path} ist nach dem Schreiben '{actual}' statt '{expected}'",
+            "transaction": "Registry-Transaktion fehlgeschlagen: {e}",
+            "rollback": "Rollback von {key_path} fehlgeschlagen, Registry ist inkonsistent: {e}",
+        },
+        "warn": {
+            "watch_failed": "Registry-Schlüssel {key_path} kann nicht beobachtet werden: {e}",
+            "no_winreg": "winreg nicht verfügbar, verwende In-Memory-Registry.",
+        },
+        "info": {
+            "cache_disabled": "Kein Registry-Cache für {key_path} (keine Änderungs-Benachrichtigung): {e}",
+            "watch_lost": "Beobachtung durch das Backend beendet",
+            "key_changed": "Registry-Schlüssel geändert: {key_path}",
+            "transaction_committed": "{count} Registry-Werte geschrieben und geprüft.",
+            "rolled_back": "{count} Registry-Werte auf den alten Stand zurückgesetzt.",
+        },
+    },
+    "animation_host": {
+        "info": {
+            "started": "Animations-Host gestartet (PID: {pid}).",
+        },
+        "warn": {
+            "script_missing": "Animations-Host nicht gefunden: {path}",
+            "start_failed": "Animations-Host konnte nicht gestartet werden: {e}",
+            "restarting": "Animations-Host beendet (Code {code}), wird neu gestartet.",
+            "giving_up": "Animations-Host {count}x in {window:.0f} s abgestürzt, Wechsel starten die Animation wieder selbst.",
+        },
+    },
+    "switch_broker": {
+        "info": {
+            "executing": "Wechsel zu '{desktop}' (Quelle: {source}, {depth} Anfrage(n), {wait_ms:.0f} ms gewartet).",
+            "superseded": "Anfrage für '{desktop}' durch neuere Anfrage für '{by}' ersetzt.",
+            "cancelled": "Wechsel zu '{desktop}' zugunsten einer neueren Anfrage abgebrochen.",
+        },
+        "warn": {
+            "interrupted": "Wechsel zu '{desktop}' (PID {pid}) wurde nicht abgeschlossen, wird als fehlgeschlagen verbucht.",
+            "timeout": "Kein Ergebnis für den Wechsel zu '{desktop}' nach {timeout:.0f} s.",
+        },
+        "error": {
+            "execute": "Fehler beim Wechsel zu '{desktop}': {e}",
+        },
+    },
+    "switch_prefetch": {
+        "debug": {
+            "prefetched": "Wiederherstellung vorausberechnet für: {names}",
+        },
+        "warn": {
+            "history_load_failed": "Wechsel-Historie {path} konnte nicht gelesen werden: {e}",
+            "history_save_failed": "Wechsel-Historie {path} konnte nicht gespeichert werden: {e}",
+            "build_failed": "Vorausberechnung für '{name}' fehlgeschlagen: {e}",
+            "prefetch_failed": "Vorausberechnung fehlgeschlagen: {e}",
+        },
+    },
+    "shell": {
+        "warn": {
+            "simulated_backend": "Keine Windows-Shell verfügbar, verwende simulierte Shell.",
+            "escalating": "Desktop-ListView zeigt nach {timeout:.1f} s nicht den neuen Ordner, Explorer wird neu gestartet.",
+        },
+        "info": {
+            "not_verifiable": "Desktop-Ordner {path} unterscheidet sich nicht vom bisherigen, Explorer wird neu gestartet.",
+            "soft_refreshed": "Explorer zeigt den neuen Desktop nach {duration_ms:.0f} ms (ohne Neustart).",
+        },
+    },
+    "platform": {
+        "warn": {
+            "simulated": "Kein Windows verfügbar, verwende simulierte Plattform (Registry, Explorer, ListView, Hintergrundbild).",
+        },
+    },
     "scripts": {
         "restart_listener": {
             "starting": "Restarting the hotkey listener...",
@@ -542,6 +683,9 @@ TEXT = {
             "api_exception": "Fehler beim Setzen des Hintergrundbilds: {e}",
             "copy": "Fehler beim Kopieren der Datei: {e}",
         },
+        "warn": {
+            "prepare_failed": "Hintergrundbild {path} konnte nicht vorab skaliert werden: {e}",
+        },
         "success": {
             "set": "Hintergrundbild erfolgreich gesetzt.",
             "copy": "Hintergrundbild kopiert nach: {path}",
@@ -4,7 +4,7 @@ import subprocess
 import sys
 from PySide6.QtWidgets import QApplication, QWidget, QPushButton, QLabel, QVBoxLayout
 from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile, QIODevice, QTimer, QPropertyAnimation, QEasingCurve, QRect, Qt
+from PySide6.QtCore import QFile, QIODevice, QTimer, QPropertyAnimation, QEasingCurve, QRect, Qt, Signal
 
 # --- Imports & Mocking (wie im Original) ---
 try:
@@ -61,6 +61,13 @@ except ImportError:
 
     desktop_service = FakeDesktopService()
 
+try:
+    from smartdesk.shared.file_watcher import watch_file
+    from smartdesk.core.storage import get_storage_engine
+except ImportError:
+    # Ohne Backend: Status per Timer abfragen
+    watch_file = None
+
 # --- PID Paths ---
 PID_FILE_DIR = os.path.join(os.environ.get("APPDATA", "."), "SmartDesk")
 CONTROL_PANEL_PID_PATH = os.path.join(PID_FILE_DIR, "control_panel.pid")
@@ -76,6 +83,10 @@ def cleanup_control_panel_pid():
 
 
 class SmartDeskControlPanel(QWidget):
+    # Vom Datei-Watcher-Thread ausgelöst, laufen im GUI-Thread
+    pid_file_changed = Signal()
+    desktops_changed = Signal()
+
     def __init__(self):
         super().__init__()
         self.is_active = False
@@ -110,11 +121,15 @@ class SmartDeskControlPanel(QWidget):
 
         self.setup_positioning()
 
-        # Timer
+        # Status-Updates über den Datei-Watcher; der Timer ist nur Fallback
         self.status_timer = QTimer(self)
         self.status_timer.timeout.connect(self.update_status)
         self.status_timer.timeout.connect(self.update_active_desktop_label)
-        self.status_timer.start(500)
+        self.pid_file_changed.connect(self.update_status)
+        self.desktops_changed.connect(self.update_active_desktop_label)
+        self._subscriptions = []
+        if not self.watch_status_files():
+            self.status_timer.start(500)
 
         # Initialer Check
         self.update_status()
@@ -205,11 +220,31 @@ class SmartDeskControlPanel(QWidget):
 
     def closeEvent(self, event):
         self.status_timer.stop()
+        self.unwatch_status_files()
         cleanup_control_panel_pid()
         super().closeEvent(event)
 
     # --- Logik ---
 
+    def watch_status_files(self) -> bool:
+        """Abonniert listener.pid und die Desktop-Daten. False, wenn kein Watcher verfügbar ist."""
+        if watch_file is None:
+            return False
+        try:
+            self._subscriptions.append(watch_file(PID_FILE_PATH, lambda _path: self.pid_file_changed.emit()))
+            for path in get_storage_engine().watch_paths():
+                self._subscriptions.append(watch_file(path, lambda _path: self.desktops_changed.emit()))
+            return True
+        except Exception as e:
+            logger.warning(get_text("gui.control_panel.watch_error", e=e))
+            self.unwatch_status_files()
+            return False
+
+    def unwatch_status_files(self):
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions = []
+
     def update_status(self):
         """Prüft Status und setzt Styles via Property."""
         if not self.toggle_btn:
@@ -298,6 +333,9 @@ class SmartDeskControlPanel(QWidget):
 
 
 def show_control_panel():
+    from smartdesk.core.utils.tracing import set_process_role
+
+    set_process_role("gui")
     app = QApplication.instance() or QApplication(sys.argv)
     panel = SmartDeskControlPanel()
     panel.show_animated()
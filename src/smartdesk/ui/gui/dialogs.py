@@ -1,7 +1,16 @@
 import subprocess
 import sys
 from PySide6.QtWidgets import QMessageBox, QApplication
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread
+
+
+def _use_subprocess():
+    """
+    True if widgets cannot be shown here: no QApplication, or not on its
+    thread (e.g. a desktop switch running in a worker thread of the GUI).
+    """
+    app = QApplication.instance()
+    return app is None or QThread.currentThread() is not app.thread()
 
 
 def show_confirmation_dialog(parent, title, message):
@@ -9,8 +18,7 @@ def show_confirmation_dialog(parent, title, message):
     Displays a confirmation dialog with a title and message.
     Returns True if the user clicks "Yes", and False otherwise.
     """
-    app = QApplication.instance()
-    if app is None:
+    if _use_subprocess():
         # Background thread/process mode: spawn a subprocess to avoid Qt thread crashes
         script = f"""
 import sys
@@ -51,8 +59,7 @@ def show_choice_dialog(parent, title, message, choices):
     Displays a dialog with multiple choices.
     Returns the text of the chosen button, or None if no choice is made.
     """
-    app = QApplication.instance()
-    if app is None:
+    if _use_subprocess():
         # Background thread/process mode: spawn a subprocess to avoid Qt thread crashes
         script = f"""
 import sys
@@ -240,6 +240,10 @@ class SmartDeskMainWindow(QMainWindow):
 
 
 def launch_gui():
+    from smartdesk.core.utils.tracing import set_process_role
+
+    set_process_role("gui")
+
     # Single Instance Check
     lock = AppLock("manager")
     if not lock.try_acquire():
@@ -24,6 +24,25 @@ except ImportError:
         pass
 
 
+try:
+    from smartdesk.shared.file_watcher import watch_file
+except ImportError:
+    watch_file = None
+
+try:
+    from smartdesk.core.storage import get_storage_engine
+    from smartdesk.core.storage.desktop_repository import get_desktop_repository
+except ImportError:
+    # Ohne Paket: nur desktops.json direkt lesen (JSON-Engine)
+    get_storage_engine = None
+    get_desktop_repository = None
+
+    def decode_records(payload: bytes) -> List[Dict]:
+        data = json.loads(payload)
+        # Ab Schema-Version 2 stehen die Desktops in einem Umschlag
+        return data["desktops"] if isinstance(data, dict) else data
+
+
 # --- Logger Setup ---
 try:
     from smartdesk.shared.logging_config import get_logger
@@ -74,6 +93,9 @@ class CommandWatcher(QObject):
 
 
 class OverviewWindow(QWidget):
+    # Vom Datei-Watcher-Thread ausgelöst, läuft im GUI-Thread
+    desktops_file_changed = Signal()
+
     def __init__(self):
         super().__init__()
         self.is_animating = False
@@ -81,7 +103,8 @@ class OverviewWindow(QWidget):
         self.animation = None
         self.desktops_data: List[Dict] = []
         self.desktop_labels: List[QLabel] = []
-        self._last_mtime = 0
+        self._desktops_subscriptions = []
+        self._desktops_dirty = True
 
         # Hauptcontainer aus UI laden
         self.load_ui()
@@ -93,6 +116,7 @@ class OverviewWindow(QWidget):
         self.setAttribute(Qt.WA_TranslucentBackground)
 
         # Desktop-Liste laden und anzeigen
+        self.watch_desktops_file()
         self.load_desktops()
         self.populate_desktop_list()
 
@@ -115,38 +139,74 @@ class OverviewWindow(QWidget):
         elif cmd == "HIDE":
             self.animate_out()
         elif cmd == "QUIT":
+            for subscription in self._desktops_subscriptions:
+                subscription.cancel()
             self.close()
             QApplication.quit()
 
+    def watch_desktops_file(self):
+        """
+        Abonniert Änderungen an den Dateien der aktiven Speicher-Engine
+        (desktops.json, Änderungsjournal bzw. SQLite-Datenbank samt WAL). Die
+        Liste wird dann sofort im Hintergrund (auch im versteckten Zustand)
+        neu aufgebaut, sodass SHOW keine Datei mehr anfassen muss.
+        """
+        if watch_file is None:
+            return
+        try:
+            if get_storage_engine is not None:
+                paths = get_storage_engine().watch_paths()
+            else:
+                json_path = self.get_desktops_file_path()
+                paths = [str(json_path)] if json_path.name else []
+            self.desktops_file_changed.connect(self._on_desktops_file_changed)
+            for path in paths:
+                self._desktops_subscriptions.append(watch_file(path, lambda _path: self.desktops_file_changed.emit()))
+        except Exception as e:
+            logger.warning(get_text("gui.overview.watch_error", e=e))
+            for subscription in self._desktops_subscriptions:
+                subscription.cancel()
+            self._desktops_subscriptions = []
+
+    @Slot()
+    def _on_desktops_file_changed(self):
+        self._desktops_dirty = True
+        self.refresh_desktop_list()
+
     def get_desktops_file_path(self) -> Path:
         appdata = os.getenv("APPDATA")
         if not appdata:
             return Path()
         return Path(appdata) / "SmartDesk" / "desktops.json"
 
-    def load_desktops(self) -> bool:
+    def _read_desktops(self) -> List[Dict]:
+        """Name und Aktiv-Status aller Desktops in gespeicherter Reihenfolge."""
+        if get_desktop_repository is not None:
+            # Über das Repository: jede Engine, Cache nach Datei-Signatur
+            return [{"name": d.name, "is_active": d.is_active} for d in get_desktop_repository().load()]
         json_path = self.get_desktops_file_path()
-        try:
-            if not json_path.exists():
-                self.desktops_data = []
-                self._last_mtime = 0
-                return False
+        if not json_path.name or not json_path.exists():
+            return []
+        return decode_records(json_path.read_bytes())
 
-            # Check modification time
-            current_mtime = json_path.stat().st_mtime
-            if current_mtime == self._last_mtime:
+    def load_desktops(self) -> bool:
+        """Liest die Desktops neu; True, wenn sich die angezeigte Liste geändert hat."""
+        # Mit Datei-Watcher: nur nach gemeldeter Änderung lesen
+        if self._desktops_subscriptions:
+            if not self._desktops_dirty:
                 return False
+            self._desktops_dirty = False
 
-            with open(json_path, "r", encoding="utf-8") as f:
-                self.desktops_data = json.load(f)
-
-            self._last_mtime = current_mtime
-            return True
+        try:
+            desktops = self._read_desktops()
         except Exception as e:
             logger.error(get_text("gui.overview.load_error", e=e))
-            self.desktops_data = []
-            self._last_mtime = 0
+            desktops = []
+
+        if desktops == self.desktops_data:
             return False
+        self.desktops_data = desktops
+        return True
 
     def populate_desktop_list(self):
         try:
@@ -1,5 +1,6 @@
 import os
 import logging
+import threading
 from PySide6.QtWidgets import (
     QWidget,
     QFileDialog,
@@ -17,7 +18,7 @@ from PySide6.QtWidgets import (
     QVBoxLayout,
 )
 from PySide6.QtUiTools import QUiLoader
-from PySide6.QtCore import QFile, QIODevice, Qt, QSize
+from PySide6.QtCore import QFile, QIODevice, Qt, QSize, Signal
 from PySide6.QtGui import QPixmap, QIcon
 
 from smartdesk.core.services import desktop_service
@@ -35,8 +36,12 @@ except ImportError:
 
 
 class DesktopPage(QWidget):
+    # Ergebnis eines Wechsels aus dem Hintergrund-Thread (SwitchOutcome oder None)
+    switch_finished = Signal(object)
+
     def __init__(self):
         super().__init__()
+        self.switch_finished.connect(self._on_switch_finished)
         self.load_ui()
         self.setup_connections()
         self.refresh_list()
@@ -421,14 +426,31 @@ class DesktopPage(QWidget):
         reply = QMessageBox.question(self, "Bestätigung", f"Möchten Sie wirklich zu '{self.current_desktop.name}' wechseln?\nDer Explorer wird neu gestartet.", QMessageBox.Yes | QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            success = desktop_service.switch_to_desktop(self.current_desktop.name, parent=self)
+            self.btn_activate.setEnabled(False)
+            self.btn_activate.setText("Wechsle...")
+            # Der Wechsel (inkl. Warten auf den Broker) dauert bis zu Minuten und
+            # läuft daher nicht im UI-Thread; Rückfragen zeigt dialogs.py dann
+            # in einem eigenen Prozess, deshalb ohne parent
+            threading.Thread(target=self._run_switch, args=(self.current_desktop.name,), name="smartdesk-gui-switch", daemon=True).start()
+
+    def _run_switch(self, name):
+        outcome = None
+        try:
+            outcome = desktop_service.request_switch(name)
+        except Exception as e:
+            logger.error(f"Exception beim Wechsel zu '{name}': {e}", exc_info=True)
+        self.switch_finished.emit(outcome)
 
-            if success:
-                self.refresh_list()
-                self.load_details(self.current_desktop.name)
-                QMessageBox.information(self, "Erfolg", "Desktop gewechselt.")
-            else:
-                QMessageBox.warning(self, "Hinweis", "Wechsel nicht durchgeführt (siehe Logs).")
+    def _on_switch_finished(self, outcome):
+        self.refresh_list()
+        if hasattr(self, "current_desktop"):
+            # Setzt auch den Wechsel-Button zurück
+            self.load_details(self.current_desktop.name)
+
+        if outcome is not None and outcome.success:
+            QMessageBox.information(self, "Erfolg", "Desktop gewechselt.")
+        else:
+            QMessageBox.warning(self, "Hinweis", "Wechsel nicht durchgeführt (siehe Logs).")
 
     def action_delete_desktop(self):
         if not hasattr(self, "current_desktop"):
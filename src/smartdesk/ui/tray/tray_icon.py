@@ -1,7 +1,7 @@
 import sys
 import os
 import logging
-import threading
+from PySide6.QtCore import QTimer, Signal
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QIcon, QAction
 from PySide6.QtWidgets import QSystemTrayIcon, QMenu
@@ -28,9 +28,14 @@ except Exception as e:
 # --- Projekt-Imports ---
 from smartdesk.hotkeys import hotkey_manager
 from smartdesk.core.services.auto_switch_service import AutoSwitchService
+from smartdesk.core.services.desktop_service import watch_active_desktop
+from smartdesk.core.utils.backup_service import flush_pending_backups
+from smartdesk.core.utils.tracing import set_process_role
 from smartdesk.ui.gui.control_panel import SmartDeskControlPanel
 from smartdesk.shared.localization import get_text, init_localization
 from smartdesk.shared.config import get_resource_path
+from smartdesk.shared.animations.host_controller import get_animation_host_controller
+from smartdesk.shared.file_watcher import watch_file
 
 # --- PID-Management ---
 PID_FILE_DIR = os.path.join(os.environ.get("APPDATA", ""), "SmartDesk")
@@ -38,9 +43,13 @@ LISTENER_PID_FILE = os.path.join(PID_FILE_DIR, "listener.pid")
 
 
 class SmartDeskTrayApp(QApplication):
+    # Vom Datei-Watcher-Thread ausgelöst, läuft im GUI-Thread
+    listener_pid_changed = Signal()
+
     def __init__(self, argv):
         super().__init__(argv)
         self.setQuitOnLastWindowClosed(False)
+        set_process_role("tray")
 
         # Lade explizit die Lokalisierung, bevor UI-Elemente erstellt werden
         init_localization()
@@ -51,6 +60,10 @@ class SmartDeskTrayApp(QApplication):
         self.auto_switch_service = AutoSwitchService()
         self.auto_switch_service.start()
 
+        # --- Animations-Host (vorbereitete Fade-/Logo-Fenster für Wechsel) ---
+        self.animation_host = get_animation_host_controller()
+        self.animation_host.start()
+
         # --- Icons Laden ---
         self.idle_icon = QIcon(get_resource_path("smartdesk/icons/idle_icon.png"))
         self.active_icon = QIcon(get_resource_path("smartdesk/icons/activ_icon.png"))
@@ -93,13 +106,35 @@ class SmartDeskTrayApp(QApplication):
         self.tray_icon.show()
 
         # --- Status-Überwachung ---
-        self.status_thread = threading.Thread(target=self.monitor_status, daemon=True)
-        self.status_thread.start()
+        # listener.pid wird beim Start/Stopp des Listeners angelegt/gelöscht;
+        # der Datei-Watcher meldet das, statt jede Sekunde nachzusehen
+        self.listener_pid_changed.connect(self.update_status)
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.update_status)
+        self.status_subscription = None
+        try:
+            self.status_subscription = watch_file(LISTENER_PID_FILE, lambda _path: self.listener_pid_changed.emit())
+        except Exception as e:
+            # Ohne Watcher-Backend wie früher jede Sekunde nachsehen
+            logger.warning(get_text("gui.main.tray.log.watch_error", e=e))
+            self.status_timer.start(1000)
+        self.update_status()
+
+        # Desktop-Pfad von außen geändert (Explorer): aktiven Desktop sofort
+        # übernehmen; Control Panel und Overview folgen über desktops.json
+        self.registry_listener = watch_active_desktop()
 
     def quit(self):
         """Beendet die Anwendung sauber."""
         if self.auto_switch_service:
             self.auto_switch_service.stop()
+        self.status_timer.stop()
+        if self.status_subscription is not None:
+            self.status_subscription.cancel()
+        self.registry_listener.cancel()
+        self.animation_host.shutdown()
+        # Backups aus Wechseln, die im Tray-Prozess ausgelöst wurden, noch schreiben
+        flush_pending_backups()
         super().quit()
 
     def on_tray_activated(self, reason):
@@ -128,19 +163,17 @@ class SmartDeskTrayApp(QApplication):
     def deactivate_hotkeys(self):
         hotkey_manager.stop_listener()
 
-    def monitor_status(self):
-        while True:
-            if os.path.exists(LISTENER_PID_FILE):
-                self.tray_icon.setIcon(self.active_icon)
-                self.tray_icon.setToolTip(get_text("gui.tray.tooltip_active"))
-                self.activate_action.setEnabled(False)
-                self.deactivate_action.setEnabled(True)
-            else:
-                self.tray_icon.setIcon(self.idle_icon)
-                self.tray_icon.setToolTip(get_text("gui.tray.tooltip_inactive"))
-                self.activate_action.setEnabled(True)
-                self.deactivate_action.setEnabled(False)
-            threading.Event().wait(1)
+    def update_status(self):
+        if os.path.exists(LISTENER_PID_FILE):
+            self.tray_icon.setIcon(self.active_icon)
+            self.tray_icon.setToolTip(get_text("gui.tray.tooltip_active"))
+            self.activate_action.setEnabled(False)
+            self.deactivate_action.setEnabled(True)
+        else:
+            self.tray_icon.setIcon(self.idle_icon)
+            self.tray_icon.setToolTip(get_text("gui.tray.tooltip_inactive"))
+            self.activate_action.setEnabled(True)
+            self.deactivate_action.setEnabled(False)
 
 
 if __name__ == "__main__":
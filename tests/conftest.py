@@ -7,6 +7,7 @@ Dieses Modul enthält wiederverwendbare Fixtures für:
 - Filesystem Mocking (os.path, os.makedirs, shutil)
 - Temporäre Testverzeichnisse
 - Sample Desktop-Objekte
+- Desktop-Wechsel im Prozess (switch_harness) und gegen die simulierte Plattform (simulated_environment)
 """
 
 import os
@@ -207,6 +208,131 @@ def mock_winreg_failure():
         yield mock
 
 
+@pytest.fixture
+def memory_registry():
+    """
+    In-Memory-Registry als Backend des prozessweiten Registry-Caches.
+
+    Beide Shell-Folder-Schlüssel zeigen auf C:\\Current. Schreibfehler lassen
+    sich mit fail_writes() injizieren.
+    """
+    from smartdesk.core.registry import REG_EXPAND_SZ, InMemoryRegistryBackend, RegistryValueCache, set_registry_cache
+    from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+    backend = InMemoryRegistryBackend()
+    backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Current", REG_EXPAND_SZ)
+    backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Current")
+    set_registry_cache(RegistryValueCache(backend))
+    yield backend
+    set_registry_cache(None)
+
+
+@pytest.fixture(autouse=True)
+def trace_file(tmp_path):
+    """
+    Trace-Datei im temporären Verzeichnis, damit Tests keine Datensätze
+    in das echte Datenverzeichnis schreiben.
+    """
+    path = str(tmp_path / "switch_trace.jsonl")
+    with patch("smartdesk.core.utils.tracing.TRACE_FILE", path):
+        yield path
+
+
+@pytest.fixture(autouse=True)
+def switch_prefetcher():
+    """
+    Eigener SwitchPrefetcher je Test mit Historie nur im Speicher und ohne
+    Leerlauf-Thread (vorausberechnet wird nur über prefetch_now()).
+    """
+    from smartdesk.core.services.switch_prefetch import SwitchHistory, SwitchPrefetcher, set_switch_prefetcher
+
+    prefetcher = SwitchPrefetcher(history=SwitchHistory(path=None), idle_delay=None)
+    set_switch_prefetcher(prefetcher)
+    yield prefetcher
+    set_switch_prefetcher(None)
+
+
+# =============================================================================
+# Desktop-Wechsel
+# =============================================================================
+
+
+@pytest.fixture
+def switch_harness(tmp_path, memory_registry):
+    """
+    Führt desktop_service.switch_to_desktop() im Prozess aus, ohne Windows.
+
+    Desktops "Current" (aktiv) und "Target" (Ordner tmp_path), Registry im
+    Speicher, Explorer über RestartRefresher(SimulatedShellBackend()), kein
+    Backup, kein warmer Animations-Host, Lock-Datei der Animation in tmp_path:
+
+        with switch_harness(animation=True) as desktop_service:
+            desktop_service.switch_to_desktop("Target")
+
+    Abweichende Patches einzelner Tests werden innerhalb des with gesetzt.
+    """
+    import subprocess
+    from contextlib import ExitStack, contextmanager
+
+    from smartdesk.core.registry import write_desktop_path
+    from smartdesk.core.services import desktop_service
+    from smartdesk.core.shell import RestartRefresher, SimulatedShellBackend
+
+    module = "smartdesk.core.services.desktop_service"
+
+    @contextmanager
+    def harness(animation: bool = False):
+        desktops = [Desktop(name="Current", path="C:\\Current", is_active=True), Desktop(name="Target", path=str(tmp_path), is_active=False)]
+        patches = [
+            patch(f"{module}.get_all_desktops", return_value=desktops),
+            patch(f"{module}.save_desktops"),
+            patch(f"{module}.get_current_icon_positions", return_value=[]),
+            patch(f"{module}.write_desktop_path", side_effect=write_desktop_path),
+            patch(f"{module}.restart_explorer"),
+            patch(f"{module}.get_shell_refresher", return_value=RestartRefresher(SimulatedShellBackend())),
+            patch(f"{module}.sync_desktop_state_and_apply_icons"),
+            patch(f"{module}.tempfile.gettempdir", return_value=str(tmp_path)),
+            patch("smartdesk.shared.animations.host_controller.HOST_INFO_FILE", str(tmp_path / "kein_host.json")),
+            patch("smartdesk.core.utils.backup_service.create_backup_before_switch", return_value=False),
+            patch.object(subprocess, "CREATE_NO_WINDOW", 0, create=True),
+            patch.object(
+                desktop_service.settings_service,
+                "get_setting",
+                side_effect=lambda key, default=None: animation if key == "show_switch_animation" else default,
+            ),
+        ]
+        with ExitStack() as stack:
+            for active in patches:
+                stack.enter_context(active)
+            yield desktop_service
+
+    return harness
+
+
+@pytest.fixture
+def simulated_environment(tmp_path):
+    """
+    Eigene desktops.json und Hintergrundbilder in tmp_path, ohne Animation
+    und Backup, für Wechsel gegen die simulierte Plattform.
+
+    Gibt das Einstellungs-Dict zurück, aus dem get_setting() liest; Tests
+    können es ändern (z.B. explorer_refresh_mode).
+    """
+    from smartdesk.core.services import desktop_service
+    from smartdesk.core.storage.desktop_repository import DesktopRepository, set_desktop_repository
+
+    settings = {"show_switch_animation": False}
+    (tmp_path / "wallpapers").mkdir()
+    set_desktop_repository(DesktopRepository())
+    with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(tmp_path / "desktops.json")), patch(
+        "smartdesk.core.services.wallpaper_service.WALLPAPERS_DIR", str(tmp_path / "wallpapers")
+    ), patch("smartdesk.core.utils.backup_service.create_backup_before_switch", return_value=False), patch.object(
+        desktop_service.settings_service, "get_setting", side_effect=lambda key, default=None: settings.get(key, default)
+    ):
+        yield settings
+    set_desktop_repository(None)
+
+
 # =============================================================================
 # Filesystem Mock Fixtures
 # =============================================================================
@@ -0,0 +1,175 @@
+# Dateipfad: tests/test_animation_handshake.py
+"""
+Unit-Tests für smartdesk.shared.animations.handshake
+
+Testet mit einem Fake-Animationsprozess (ohne Tk):
+- READY/DONE über den Socket
+- Zeitüberschreitung, falsches Token, Abbruch der Verbindung
+- Desktop-Wechsel: Animationsstufe endet mit READY statt fester Pause
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+import time
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.shared.animations.handshake import PORT_ENV, TOKEN_ENV, AnimationChannel, SwitchLink
+
+# Wie screen_fade.py als Skript: handshake.py direkt aus dem Verzeichnis importieren
+ANIMATIONS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src", "smartdesk", "shared", "animations"))
+
+# Fake-Animation: verbindet sich, meldet nach ready_delay READY, wartet auf
+# DONE und schreibt ihren Ablauf nach "<letztes Argument>.log" (beim Wechsel
+# ist das letzte Argument das Lock-File).
+FAKE_ANIMATION = textwrap.dedent(
+    """
+    import sys, time
+    sys.path.insert(0, {animations_dir!r})
+    from handshake import SwitchLink
+
+    log = open(sys.argv[-1] + ".log", "w")
+    link = SwitchLink.from_env()
+    time.sleep({ready_delay})
+    if {send_ready}:
+        link.send_ready()
+        log.write("ready\\n")
+        log.flush()
+    deadline = time.monotonic() + 5
+    while not link.poll_done(0.02):
+        if time.monotonic() > deadline:
+            log.write("timeout\\n")
+            sys.exit(1)
+    log.write("done\\n" if not link.closed else "closed\\n")
+    """
+)
+
+
+def _write_fake(tmp_path, ready_delay=0.05, send_ready=True):
+    script = tmp_path / "fake_animation.py"
+    script.write_text(FAKE_ANIMATION.format(animations_dir=ANIMATIONS_DIR, ready_delay=ready_delay, send_ready=send_ready))
+    return str(script)
+
+
+def _spawn(script, channel, log_path):
+    env = dict(os.environ)
+    env.update(channel.env())
+    return subprocess.Popen([sys.executable, script, log_path], env=env)
+
+
+class TestHandshake:
+    """READY/DONE zwischen Wechsel und Animation."""
+
+    def test_ready_and_done(self, tmp_path):
+        """Test: READY kommt, sobald die Animation es meldet; DONE beendet sie sofort."""
+        log_path = str(tmp_path / "log.txt")
+        channel = AnimationChannel()
+        process = _spawn(_write_fake(tmp_path), channel, log_path)
+        try:
+            assert channel.wait_ready(10) is True
+            assert channel.send_done() is True
+            start = time.monotonic()
+            assert process.wait(5) == 0
+            assert time.monotonic() - start < 1.0
+        finally:
+            channel.close()
+
+        with open(log_path + ".log") as f:
+            assert f.read().split() == ["ready", "done"]
+
+    def test_ready_timeout_keeps_connection(self, tmp_path):
+        """Test: Ohne READY endet wait_ready() nach dem Timeout; DONE erreicht die Animation trotzdem."""
+        log_path = str(tmp_path / "log.txt")
+        channel = AnimationChannel()
+        process = _spawn(_write_fake(tmp_path, send_ready=False), channel, log_path)
+        try:
+            start = time.monotonic()
+            assert channel.wait_ready(0.3) is False
+            assert 0.25 <= time.monotonic() - start < 2.0
+            # Verbindung darf nicht als Endesignal wirken
+            time.sleep(0.1)
+            assert process.poll() is None
+            channel.send_done()
+            assert process.wait(5) == 0
+        finally:
+            channel.close()
+
+        with open(log_path + ".log") as f:
+            assert f.read().split() == ["done"]
+
+    def test_wrong_token_is_rejected(self):
+        """Test: Eine Verbindung mit falschem Token zählt nicht als READY."""
+        channel = AnimationChannel()
+        try:
+            link = SwitchLink(channel.port, "falsch")
+            link.send_ready()
+            assert channel.wait_ready(0.3) is False
+            link.close()
+        finally:
+            channel.close()
+
+    def test_closed_channel_ends_animation(self):
+        """Test: Schließt der Wechsel die Verbindung (z.B. Absturz), gilt das als Ende."""
+        channel = AnimationChannel()
+        link = SwitchLink(channel.port, channel.token)
+        link.send_ready()
+        assert channel.wait_ready(2)
+        assert link.poll_done(0.01) is False
+
+        channel.close()
+
+        assert link.poll_done(1.0) is True
+        assert link.closed
+
+    def test_from_env_without_handshake(self):
+        """Test: Ohne Umgebungsvariablen gibt es keinen Link (Start durch ältere Versionen)."""
+        with patch.dict(os.environ, {}, clear=False):
+            os.environ.pop(PORT_ENV, None)
+            os.environ.pop(TOKEN_ENV, None)
+            assert SwitchLink.from_env() is None
+
+
+class TestSwitchAnimationStage:
+    """Animationsstufe des Desktop-Wechsels mit Fake-Animation."""
+
+    @pytest.fixture
+    def switch(self, switch_harness):
+        def run(script):
+            with switch_harness(animation=True) as desktop_service, patch.object(desktop_service, "get_resource_path", return_value=script):
+                assert desktop_service.switch_to_desktop("Target") is True
+            return desktop_service.get_last_switch_timings()
+
+        return run
+
+    def test_stage_ends_on_ready(self, switch, tmp_path, trace_file):
+        """Test: Meldet die Animation READY, endet die Stufe ohne die feste Pause; danach kommt DONE."""
+        from smartdesk.core.services import desktop_service
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        # Großzügiges Timeout, damit ein langsamer Prozessstart nicht als Fallback zählt
+        with patch.object(desktop_service, "ANIMATION_READY_TIMEOUT", 10):
+            timings = switch(_write_fake(tmp_path, ready_delay=0.0))
+
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["animation"] == "ready"
+        assert timings["animation"] < 10000
+        assert not (tmp_path / "smartdesk_switch.lock").exists()
+        log_path = tmp_path / "smartdesk_switch.lock.log"
+        deadline = time.monotonic() + 5
+        while log_path.read_text().split() != ["ready", "done"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert log_path.read_text().split() == ["ready", "done"]
+
+    def test_stage_falls_back_after_timeout(self, switch, tmp_path, trace_file):
+        """Test: Ohne READY wartet die Stufe höchstens ANIMATION_READY_TIMEOUT."""
+        from smartdesk.core.services.desktop_service import ANIMATION_READY_TIMEOUT
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        timings = switch(_write_fake(tmp_path, send_ready=False))
+
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["animation"] == "timeout"
+        assert timings["animation"] >= ANIMATION_READY_TIMEOUT * 1000 * 0.9
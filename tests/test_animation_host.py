@@ -0,0 +1,270 @@
+# Dateipfad: tests/test_animation_host.py
+"""
+Unit-Tests für den Animations-Host (host_protocol.py, host_controller.py)
+
+Testet ohne Tk (Fake-Host im Thread bzw. Fake-Skript als Prozess):
+- Befehle über den Steuerkanal, Token-Prüfung, fehlender/alter Host
+- Desktop-Wechsel: Animation über den warmen Host statt eigenem Prozess
+- Überwachung: Neustart nach Absturz, Aufgeben bei Absturzschleife, Beenden
+"""
+
+import json
+import subprocess
+import textwrap
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.shared.animations import host_controller
+from smartdesk.shared.animations.handshake import SwitchLink
+from smartdesk.shared.animations.host_controller import AnimationHostController, start_hosted_animation
+from smartdesk.shared.animations.host_protocol import BUSY, OK, PING, START, HostServer, read_host_info, send_host_command
+
+
+class FakeHost:
+    """Host ohne Fenster: beantwortet Befehle im Thread und spielt START als READY/DONE-Handshake ab."""
+
+    def __init__(self, info_file, answer=OK):
+        self.server = HostServer()
+        self.server.write_info(str(info_file))
+        self.answer = answer
+        self.commands = []
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            for command in self.server.poll(0.02):
+                self.commands.append((command.name, command.args))
+                command.reply(self.answer if command.name == START else OK)
+                if command.name == START and self.answer == OK:
+                    self._play(*command.args)
+
+    def _play(self, port, token, lock_file):
+        link = SwitchLink(port, token)
+        link.send_ready()
+        deadline = time.monotonic() + 5
+        while not link.poll_done(0.02) and time.monotonic() < deadline:
+            pass
+        link.close()
+        self.finished.set()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(2)
+        self.server.close()
+
+
+@pytest.fixture
+def info_file(tmp_path):
+    return tmp_path / "animation_host.json"
+
+
+@pytest.fixture
+def fake_host(info_file):
+    hosts = []
+
+    def create(**kwargs):
+        host = FakeHost(info_file, **kwargs)
+        hosts.append(host)
+        return host
+
+    yield create
+    for host in hosts:
+        host.stop()
+
+
+class TestHostProtocol:
+    """Steuerkanal zwischen Wechsel und Host."""
+
+    def test_ping(self, info_file, fake_host):
+        """Test: Ein laufender Host antwortet auf PING mit OK."""
+        host = fake_host()
+
+        assert send_host_command(str(info_file), PING) == OK
+        assert host.commands == [(PING, [])]
+
+    def test_info_file(self, info_file, fake_host):
+        """Test: Die Info-Datei enthält Port, Token und PID des Hosts."""
+        host = fake_host()
+
+        info = read_host_info(str(info_file))
+        assert info["port"] == host.server.port
+        assert info["token"] == host.server.token
+
+    def test_wrong_token_is_ignored(self, info_file, fake_host):
+        """Test: Befehle mit falschem Token verwirft der Host ohne Antwort."""
+        host = fake_host()
+        info = json.loads(info_file.read_text())
+        info_file.write_text(json.dumps({**info, "token": "falsch"}))
+
+        assert send_host_command(str(info_file), PING, timeout=0.3) is None
+        assert host.commands == []
+
+    def test_no_host(self, info_file):
+        """Test: Ohne Info-Datei oder mit kaputter Datei gibt es sofort keine Antwort."""
+        assert send_host_command(str(info_file), PING) is None
+        info_file.write_text("{kaputt")
+        assert send_host_command(str(info_file), PING) is None
+
+    def test_stale_info_file(self, info_file):
+        """Test: Info-Datei eines beendeten Hosts (Port geschlossen) -> keine Antwort, kein Warten."""
+        server = HostServer()
+        server.write_info(str(info_file))
+        server.close()
+
+        start = time.monotonic()
+        assert send_host_command(str(info_file), PING, timeout=1.0) is None
+        assert time.monotonic() - start < 0.5
+
+    def test_long_lock_path(self, info_file, fake_host, tmp_path):
+        """Test: Auch lange Pfade mit Umlauten kommen unverändert an."""
+        host = fake_host(answer=BUSY)
+        lock_file = str(tmp_path / ("Überlänge_" * 40) / "smartdesk_switch.lock")
+
+        assert start_hosted_animation(1234, "abc", lock_file, info_file=str(info_file)) is False
+        assert host.commands == [(START, [1234, "abc", lock_file])]
+
+
+class TestSwitchWithHost:
+    """Animationsstufe des Desktop-Wechsels mit warmem Host."""
+
+    @pytest.fixture
+    def switch(self, switch_harness, info_file):
+        with switch_harness(animation=True) as desktop_service, patch.object(host_controller, "HOST_INFO_FILE", str(info_file)), patch(
+            "smartdesk.core.services.desktop_service.subprocess.Popen"
+        ) as popen:
+            yield desktop_service, popen
+
+    def test_warm_host_plays_animation(self, switch, fake_host, tmp_path, trace_file):
+        """Test: Mit laufendem Host startet der Wechsel keinen Prozess; READY und DONE laufen über den Host."""
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        desktop_service, popen = switch
+        host = fake_host()
+
+        assert desktop_service.switch_to_desktop("Target") is True
+
+        popen.assert_not_called()
+        assert host.finished.wait(5)
+        (name, args), = host.commands
+        assert name == START
+        assert args[2] == str(tmp_path / "smartdesk_switch.lock")
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["animation_host"] == "warm"
+        assert record["attrs"]["animation"] == "ready"
+
+    def test_busy_host_falls_back_to_spawn(self, switch, fake_host, trace_file):
+        """Test: Ein beschäftigter Host lehnt ab; der Wechsel startet screen_fade.py wie bisher."""
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        desktop_service, popen = switch
+        fake_host(answer=BUSY)
+
+        with patch.object(desktop_service, "ANIMATION_READY_TIMEOUT", 0.05):
+            assert desktop_service.switch_to_desktop("Target") is True
+
+        popen.assert_called_once()
+        assert popen.call_args[0][0][1].endswith("screen_fade.py")
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["animation_host"] == "spawn"
+
+    def test_without_host_spawns(self, switch, trace_file):
+        """Test: Ohne Host (keine Info-Datei) bleibt alles beim Alten."""
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        desktop_service, popen = switch
+
+        with patch.object(desktop_service, "ANIMATION_READY_TIMEOUT", 0.05):
+            assert desktop_service.switch_to_desktop("Target") is True
+
+        popen.assert_called_once()
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["animation_host"] == "spawn"
+
+
+# Fake-Host-Prozess: läuft, bis stdin QUIT liefert oder geschlossen wird
+# (wie animation_host.py), oder endet sofort mit Code 3 ("abstürzen").
+FAKE_HOST_SCRIPT = textwrap.dedent(
+    """
+    import sys
+    if {crash}:
+        sys.exit(3)
+    for line in sys.stdin:
+        if line.strip() == "QUIT":
+            break
+    """
+)
+
+
+class TestHostController:
+    """Start, Überwachung und Beenden des Host-Prozesses."""
+
+    @pytest.fixture
+    def controller(self, tmp_path, info_file, monkeypatch):
+        monkeypatch.setattr(subprocess, "CREATE_NO_WINDOW", 0, raising=False)
+        controllers = []
+
+        def create(crash=False):
+            script = tmp_path / ("crash.py" if crash else "host.py")
+            script.write_text(FAKE_HOST_SCRIPT.format(crash=crash))
+            controller = AnimationHostController(info_file=str(info_file), script_path=str(script), check_interval=0.05)
+            controllers.append(controller)
+            return controller
+
+        yield create
+        for controller in controllers:
+            controller.shutdown()
+
+    def _wait(self, condition, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not condition():
+            assert time.monotonic() < deadline
+            time.sleep(0.02)
+
+    def test_start_and_shutdown(self, controller):
+        """Test: start() startet den Host, shutdown() beendet ihn über QUIT."""
+        ctrl = controller()
+        ctrl.start()
+        assert ctrl.is_running()
+        process = ctrl._process
+
+        ctrl.shutdown()
+
+        assert process.poll() == 0
+        assert not ctrl.is_running()
+
+    def test_restart_after_crash(self, controller):
+        """Test: Wird der Host beendet, startet die Überwachung einen neuen."""
+        ctrl = controller()
+        ctrl.start()
+        first_pid = ctrl.pid
+
+        ctrl._process.kill()
+
+        self._wait(lambda: ctrl.is_running() and ctrl.pid != first_pid)
+        assert not ctrl.gave_up
+
+    def test_gives_up_on_crash_loop(self, controller):
+        """Test: Stürzt der Host immer wieder sofort ab, bleibt er nach MAX_RESTARTS aus."""
+        ctrl = controller(crash=True)
+        ctrl.start()
+
+        self._wait(lambda: ctrl.gave_up)
+        assert len(ctrl._crashes) == host_controller.MAX_RESTARTS + 1
+        assert not ctrl.is_running()
+
+    def test_missing_script(self, controller, tmp_path):
+        """Test: Fehlt animation_host.py, wird nichts gestartet."""
+        ctrl = controller()
+        ctrl.script_path = str(tmp_path / "fehlt.py")
+
+        with patch("subprocess.Popen") as popen:
+            ctrl.start()
+
+        popen.assert_not_called()
+        assert ctrl.gave_up
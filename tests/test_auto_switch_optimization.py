@@ -33,7 +33,7 @@ def test_optimization_stops_early(mock_dependencies):
     d2 = Desktop("LowPrio", "path/2", is_active=False)
     d3 = Desktop("Idle", "path/3", is_active=True)
     mock_desktop.get_all_desktops.return_value = [d1, d2, d3]
-    mock_desktop.switch_to_desktop.return_value = True
+    mock_desktop.request_switch.return_value.success = True
 
     # Setup Process Generator
     def process_generator():
@@ -56,7 +56,7 @@ def test_optimization_stops_early(mock_dependencies):
     service._check_and_switch()
 
     # Verify switch happened
-    mock_desktop.switch_to_desktop.assert_called_with("HighPrio")
+    mock_desktop.request_switch.assert_called_with("HighPrio")
 
 
 def test_priority_logic_mixed_order(mock_dependencies):
@@ -76,7 +76,7 @@ def test_priority_logic_mixed_order(mock_dependencies):
     d2 = Desktop("LowPrio", "path/2", is_active=False)
     d3 = Desktop("Idle", "path/3", is_active=True)
     mock_desktop.get_all_desktops.return_value = [d1, d2, d3]
-    mock_desktop.switch_to_desktop.return_value = True
+    mock_desktop.request_switch.return_value.success = True
 
     # Process list where Low Prio appears BEFORE High Prio
     def process_generator():
@@ -100,7 +100,7 @@ def test_priority_logic_mixed_order(mock_dependencies):
     service._check_and_switch()
 
     # Should switch to HighPrio because it is first in rules, even if found later in process list
-    mock_desktop.switch_to_desktop.assert_called_with("HighPrio")
+    mock_desktop.request_switch.assert_called_with("HighPrio")
 
 
 def test_no_match_iterates_all(mock_dependencies):
@@ -122,4 +122,4 @@ def test_no_match_iterates_all(mock_dependencies):
 
     service._check_and_switch()
 
-    mock_desktop.switch_to_desktop.assert_not_called()
+    mock_desktop.request_switch.assert_not_called()
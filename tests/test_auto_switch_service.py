@@ -105,7 +105,7 @@ def test_check_and_switch_no_match(auto_switch_service, mock_psutil_service, moc
 
     auto_switch_service._check_and_switch()
 
-    mock_desktop_service.switch_to_desktop.assert_not_called()
+    mock_desktop_service.request_switch.assert_not_called()
 
 
 def test_check_and_switch_match(auto_switch_service, mock_psutil_service, mock_desktop_service):
@@ -128,7 +128,7 @@ def test_check_and_switch_match(auto_switch_service, mock_psutil_service, mock_d
     # Execute
     auto_switch_service._check_and_switch()
 
-    mock_desktop_service.switch_to_desktop.assert_called_with("Gaming")
+    mock_desktop_service.request_switch.assert_called_with("Gaming")
 
 
 def test_check_and_switch_already_active(auto_switch_service, mock_psutil_service, mock_desktop_service):
@@ -149,7 +149,7 @@ def test_check_and_switch_already_active(auto_switch_service, mock_psutil_servic
     # Execute
     auto_switch_service._check_and_switch()
 
-    mock_desktop_service.switch_to_desktop.assert_not_called()
+    mock_desktop_service.request_switch.assert_not_called()
 
 
 def test_cooldown(auto_switch_service, mock_psutil_service, mock_desktop_service):
@@ -158,7 +158,7 @@ def test_cooldown(auto_switch_service, mock_psutil_service, mock_desktop_service
     active_desktop = Desktop("Work", "path/to/work", is_active=True)
     gaming_desktop = Desktop("Gaming", "path/to/gaming", is_active=False)
     mock_desktop_service.get_all_desktops.return_value = [active_desktop, gaming_desktop]
-    mock_desktop_service.switch_to_desktop.return_value = True
+    mock_desktop_service.request_switch.return_value.success = True
 
     # Setup processes
     mock_proc = MagicMock()
@@ -169,11 +169,11 @@ def test_cooldown(auto_switch_service, mock_psutil_service, mock_desktop_service
 
     # First switch
     auto_switch_service._check_and_switch()
-    assert mock_desktop_service.switch_to_desktop.call_count == 1
+    assert mock_desktop_service.request_switch.call_count == 1
 
     # Second switch (immediate) - should be blocked by cooldown
     # Even if we pretend we switched back to Work manually (so we are on Work again)
     active_desktop.is_active = True  # We are back on Work
 
     auto_switch_service._check_and_switch()
-    assert mock_desktop_service.switch_to_desktop.call_count == 1  # Count should stay 1
+    assert mock_desktop_service.request_switch.call_count == 1  # Count should stay 1
@@ -0,0 +1,414 @@
+# Dateipfad: tests/test_backup_service.py
+"""
+Unit-Tests für smartdesk.core.utils.backup_service
+
+Testet:
+- Inhaltsadressierte Backups mit Index
+- Kein Schreiben bei unveränderten Werten
+- Aufbewahrung anhand des Index ohne Verzeichnis-Scan, Dateien sofort, Index träge gekürzt
+- Übernahme von Backups aus der Zeit vor dem Index
+- Wiederherstellung im Prozess mit Probelauf (dry_run)
+- Hintergrund-Worker mit begrenzter Warteschlange
+"""
+
+import json
+import threading
+import os
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.registry import REG_EXPAND_SZ, REG_SZ, RegistryValue
+from smartdesk.core.utils import backup_service
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+
+@pytest.fixture
+def backup_dir(tmp_path, monkeypatch, memory_registry):
+    directory = tmp_path / "backups"
+    monkeypatch.setattr(backup_service, "BACKUP_DIR", str(directory))
+    return directory
+
+
+def _set_desktop(backend, path):
+    backend.write_value(KEY_USER_SHELL, VALUE_NAME, path, REG_EXPAND_SZ)
+    backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, path)
+
+
+def _reg_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".reg"))
+
+
+def _index_lines(directory):
+    return (directory / "index.jsonl").read_text(encoding="utf-8").splitlines()
+
+
+class TestContentAddressedBackups:
+    """Tests für create_registry_backup()."""
+
+    def test_backup_named_by_content_hash(self, backup_dir):
+        """Test: Dateiname ist die Inhaltsadresse, der Index enthält Zeit und Grund."""
+        path = backup_service.create_registry_backup(reason="manual")
+
+        with open(path, "rb") as f:
+            content = f.read()
+        assert os.path.basename(path) == f"registry_{backup_service.backup_hash(content)}.reg"
+
+        lines = _index_lines(backup_dir)
+        index = [json.loads(line) for line in lines]
+        assert [entry["reason"] for entry in index] == ["manual"]
+        assert index[0]["file"] == os.path.basename(path)
+
+    def test_content_is_utf16_reg_file(self, backup_dir):
+        """Test: Die Datei ist eine gültige UTF-16-.reg-Datei mit beiden Werten."""
+        path = backup_service.create_registry_backup()
+
+        with open(path, "r", encoding="utf-16") as f:
+            text = f.read()
+        assert text.startswith("Windows Registry Editor Version 5.00")
+        assert f"[HKEY_CURRENT_USER\\{KEY_USER_SHELL}]" in text
+        assert f'"{VALUE_NAME}"="C:\\\\Current"' in text
+
+    def test_unchanged_values_write_nothing(self, backup_dir):
+        """Test: Gleiche Werte wie im neuesten Backup erzeugen keinen Schreibvorgang."""
+        first = backup_service.create_registry_backup(reason="before_switch")
+        index_mtime = os.stat(backup_dir / "index.jsonl").st_mtime_ns
+
+        with patch.object(backup_service, "write_atomic") as write:
+            second = backup_service.create_registry_backup(reason="before_switch")
+
+        assert second == first
+        write.assert_not_called()
+        assert os.stat(backup_dir / "index.jsonl").st_mtime_ns == index_mtime
+
+    def test_unchanged_values_skip_lock(self, backup_dir):
+        """Test: Bei unverändertem Index kommt das Backup ohne Lock aus."""
+        first = backup_service.create_registry_backup()
+
+        with patch.object(backup_service, "file_lock") as lock:
+            assert backup_service.create_registry_backup() == first
+
+        lock.assert_not_called()
+
+    def test_index_changed_elsewhere_is_reread(self, backup_dir, memory_registry):
+        """Test: Ändert ein anderer Prozess den Index, gilt der gemerkte Stand nicht mehr."""
+        backup_service.create_registry_backup()
+        (backup_dir / "index.jsonl").write_text("", encoding="utf-8")
+
+        backup_service.create_registry_backup()
+
+        assert len(backup_service.list_backups()) == 1
+
+    def test_changed_values_add_entry(self, backup_dir, memory_registry):
+        """Test: Neue Werte ergeben eine neue Datei und einen neuen Eintrag."""
+        first = backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Target")
+
+        second = backup_service.create_registry_backup()
+
+        assert second != first
+        assert len(_reg_files(backup_dir)) == 2
+        assert [b["path"] for b in backup_service.list_backups()] == [second, first]
+
+    def test_recurring_values_share_file(self, backup_dir, memory_registry):
+        """Test: A -> B -> A legt drei Einträge, aber nur zwei Dateien an."""
+        first = backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Target")
+        backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Current")
+
+        third = backup_service.create_registry_backup()
+
+        assert third == first
+        assert len(backup_service.list_backups()) == 3
+        assert len(_reg_files(backup_dir)) == 2
+
+    def test_no_values_no_backup(self, backup_dir, memory_registry):
+        """Test: Ohne Registry-Werte wird kein Backup angelegt."""
+        memory_registry.delete_value(KEY_USER_SHELL, VALUE_NAME)
+        memory_registry.delete_value(KEY_LEGACY_SHELL, VALUE_NAME)
+
+        assert backup_service.create_registry_backup() is None
+
+
+class TestRetention:
+    """Tests für die Aufbewahrung."""
+
+    def test_retention_prunes_files_on_every_append(self, backup_dir, memory_registry):
+        """Test: Nie mehr als keep_count Backups; nur die Index-Datei wird erst ab COMPACT_FACTOR * keep_count Zeilen gekürzt."""
+        keep_count = 3
+        limit = backup_service.COMPACT_FACTOR * keep_count
+        for i in range(limit):
+            _set_desktop(memory_registry, f"C:\\Desktop{i}")
+            backup_service.create_registry_backup(reason="before_switch", keep_count=keep_count)
+
+            backups = backup_service.list_backups()
+            assert len(backups) == min(i + 1, keep_count)
+            assert _reg_files(backup_dir) == sorted(b["filename"] for b in backups)
+        assert len(_index_lines(backup_dir)) == limit
+
+        _set_desktop(memory_registry, "C:\\Desktop_last")
+        with patch.object(backup_service, "write_atomic", wraps=backup_service.write_atomic) as write:
+            backup_service.create_registry_backup(reason="before_switch", keep_count=keep_count)
+
+        assert len(_index_lines(backup_dir)) == keep_count
+        assert len(backup_service.list_backups()) == keep_count
+        # Neue .reg-Datei + einmal den gekürzten Index
+        assert write.call_count == 2
+
+    def test_manual_backup_does_not_revive_expired_entries(self, backup_dir, memory_registry):
+        """Test: Ein Backup ohne keep_count macht abgeschnittene Einträge (deren Dateien fehlen) nicht wieder sichtbar."""
+        for i in range(3):
+            _set_desktop(memory_registry, f"C:\\Desktop{i}")
+            backup_service.create_registry_backup(reason="before_switch", keep_count=1)
+
+        _set_desktop(memory_registry, "C:\\Manuell")
+        backup_service.create_registry_backup(reason="manual")
+
+        backups = backup_service.list_backups()
+        assert [b["reason"] for b in backups] == ["manual", "before_switch"]
+        assert all(os.path.exists(b["path"]) for b in backups)
+
+    def test_append_does_not_rewrite_index(self, backup_dir, memory_registry):
+        """Test: Unterhalb der Grenze wird der Index nicht neu geschrieben."""
+        backup_service.create_registry_backup(keep_count=10)
+        _set_desktop(memory_registry, "C:\\Target")
+
+        with patch.object(backup_service, "_save_index") as save:
+            backup_service.create_registry_backup(keep_count=10)
+
+        save.assert_not_called()
+        assert len(backup_service.list_backups()) == 2
+
+    def test_cleanup_trims_immediately(self, backup_dir, memory_registry):
+        """Test: cleanup_old_backups() kürzt ohne Spielraum auf keep_count."""
+        for i in range(4):
+            _set_desktop(memory_registry, f"C:\\Desktop{i}")
+            backup_service.create_registry_backup()
+
+        assert backup_service.cleanup_old_backups(keep_count=2) == 2
+        assert len(backup_service.list_backups()) == 2
+        assert len(_reg_files(backup_dir)) == 2
+
+    def test_torn_index_line_is_skipped(self, backup_dir, memory_registry):
+        """Test: Eine abgebrochene letzte Index-Zeile wird beim Lesen übersprungen."""
+        backup_service.create_registry_backup()
+        with open(backup_dir / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2025-')
+
+        assert len(backup_service.list_backups()) == 1
+
+    def test_torn_index_line_is_repaired(self, backup_dir, memory_registry):
+        """Test: Nach einer abgebrochenen Zeile wird nicht angehängt, sondern neu geschrieben."""
+        backup_service.create_registry_backup()
+        with open(backup_dir / "index.jsonl", "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2025-')
+        _set_desktop(memory_registry, "C:\\Target")
+
+        backup_service.create_registry_backup()
+
+        lines = _index_lines(backup_dir)
+        assert [json.loads(line)["reason"] for line in lines] == ["manual", "manual"]
+
+    def test_retention_keeps_file_still_referenced(self, backup_dir, memory_registry):
+        """Test: Eine Datei bleibt, solange ein behaltener Eintrag sie nutzt."""
+        first = backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Target")
+        backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Current")
+        backup_service.create_registry_backup()
+
+        # Ältester Eintrag fällt heraus, seine Datei wird vom neuesten weiter genutzt
+        assert backup_service.cleanup_old_backups(keep_count=2) == 0
+        assert os.path.exists(first)
+
+    def test_retention_does_not_scan_directory(self, backup_dir, memory_registry):
+        """Test: Backup vor dem Wechsel kommt ohne os.listdir aus."""
+        worker = backup_service.get_backup_worker()
+        backup_service.create_backup_before_switch()
+        assert worker.flush(5)
+        _set_desktop(memory_registry, "C:\\Target")
+
+        with patch.object(backup_service.os, "listdir") as listdir:
+            backup_service.create_backup_before_switch()
+            # Im Hintergrund geschrieben: erst warten, dann prüfen
+            assert worker.flush(5)
+
+        listdir.assert_not_called()
+        assert len(backup_service.list_backups()) == 2
+
+
+class TestLegacyBackups:
+    """Tests für Backups aus der Zeit vor dem Index."""
+
+    def test_legacy_files_are_indexed(self, backup_dir):
+        """Test: Vorhandene registry_<Grund>_<Zeit>.reg werden einmalig in den Index übernommen."""
+        backup_dir.mkdir()
+        (backup_dir / "registry_before_switch_20250102_120000.reg").write_bytes(b"alt2")
+        (backup_dir / "registry_initial_20250101_120000.reg").write_bytes(b"alt1")
+        (backup_dir / "notiz.txt").write_text("kein Backup")
+
+        backups = backup_service.list_backups()
+
+        assert [b["reason"] for b in backups] == ["before_switch", "initial"]
+        assert backups[1]["created"].isoformat() == "2025-01-01T12:00:00"
+        assert (backup_dir / "index.jsonl").exists()
+
+    def test_legacy_files_subject_to_retention(self, backup_dir):
+        """Test: Alte Dateien fallen wie neue aus der Aufbewahrung heraus."""
+        backup_dir.mkdir()
+        legacy = backup_dir / "registry_manual_20250101_120000.reg"
+        legacy.write_bytes(b"alt")
+
+        backup_service.create_registry_backup()
+        backup_service.cleanup_old_backups(keep_count=1)
+
+        assert not legacy.exists()
+        assert len(backup_service.list_backups()) == 1
+
+
+class TestRestore:
+    """Tests für restore_from_backup() und diff_backup()."""
+
+    def test_restore_writes_values_in_process(self, backup_dir, memory_registry):
+        """Test: Wiederherstellung setzt beide Werte mit ihren Typen, ohne reg import."""
+        path = backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Target")
+
+        with patch("subprocess.run") as run:
+            assert backup_service.restore_from_backup(path)
+
+        run.assert_not_called()
+        assert memory_registry.read_value(KEY_USER_SHELL, VALUE_NAME) == RegistryValue("C:\\Current", REG_EXPAND_SZ)
+        assert memory_registry.read_value(KEY_LEGACY_SHELL, VALUE_NAME) == RegistryValue("C:\\Current", REG_SZ)
+
+    def test_dry_run_reports_diff_without_writing(self, backup_dir, memory_registry):
+        """Test: dry_run schreibt nichts, diff_backup() liefert nur abweichende Werte."""
+        path = backup_service.create_registry_backup()
+        memory_registry.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Target")
+        writes = memory_registry.writes
+
+        assert backup_service.restore_from_backup(path, dry_run=True)
+
+        assert memory_registry.writes == writes
+        (change,) = backup_service.diff_backup(path)
+        assert (change.key_path, change.current.data, change.restored.data) == (KEY_LEGACY_SHELL, "C:\\Target", "C:\\Current")
+
+    def test_unchanged_values_not_written(self, backup_dir, memory_registry):
+        """Test: Entspricht die Registry dem Backup, wird nichts geschrieben."""
+        path = backup_service.create_registry_backup()
+        writes = memory_registry.writes
+
+        assert backup_service.restore_from_backup(path)
+        assert memory_registry.writes == writes
+
+    def test_partial_failure_rolls_back(self, backup_dir, memory_registry):
+        """Test: Scheitert ein Wert, bleiben beide auf dem Stand vor der Wiederherstellung."""
+        path = backup_service.create_registry_backup()
+        _set_desktop(memory_registry, "C:\\Target")
+        memory_registry.fail_writes(KEY_LEGACY_SHELL)
+
+        assert not backup_service.restore_from_backup(path)
+        assert memory_registry.read_value(KEY_USER_SHELL, VALUE_NAME).data == "C:\\Target"
+
+    def test_invalid_file_rejected(self, backup_dir, memory_registry, tmp_path):
+        """Test: Eine ungültige Datei wird abgelehnt, ohne etwas zu schreiben."""
+        path = tmp_path / "kaputt.reg"
+        path.write_bytes(b"\xff\xfe" + "kein Registry-Export".encode("utf-16-le"))
+        writes = memory_registry.writes
+
+        assert not backup_service.restore_from_backup(str(path))
+        assert memory_registry.writes == writes
+
+    def test_missing_file(self, backup_dir):
+        """Test: Fehlende Datei ergibt False."""
+        assert not backup_service.restore_from_backup(str(backup_dir / "fehlt.reg"))
+
+
+class TestBackupWorker:
+    """Tests für BackupWorker und create_backup_before_switch()."""
+
+    @pytest.fixture
+    def worker(self, backup_dir):
+        worker = backup_service.BackupWorker(max_pending=2)
+        backup_service.set_backup_worker(worker)
+        yield worker
+        backup_service.set_backup_worker(None)
+
+    def test_backup_written_in_background(self, worker, backup_dir):
+        """Test: create_backup_before_switch() reiht ein, der Worker schreibt."""
+        assert backup_service.create_backup_before_switch()
+        assert worker.flush(5)
+
+        (backup,) = backup_service.list_backups()
+        assert backup["reason"] == "before_switch"
+        assert worker.completed == 1
+
+    def test_values_read_when_queued(self, worker, memory_registry):
+        """Test: Gesichert werden die Werte beim Einreihen, nicht beim Schreiben."""
+        release = threading.Event()
+        original = backup_service.write_backup
+
+        def slow_write(snapshot):
+            release.wait(5)
+            return original(snapshot)
+
+        with patch.object(backup_service, "write_backup", side_effect=slow_write):
+            backup_service.create_backup_before_switch()
+            _set_desktop(memory_registry, "C:\\Target")
+            release.set()
+            assert worker.flush(5)
+
+        with open(backup_service.get_latest_backup(), "r", encoding="utf-16") as f:
+            assert "C:\\\\Current" in f.read()
+
+    def test_full_queue_drops_backup(self, worker):
+        """Test: Ist die Warteschlange voll, wird verworfen statt zu warten."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocked_write(snapshot):
+            started.set()
+            release.wait(5)
+
+        with patch.object(backup_service, "write_backup", side_effect=blocked_write):
+            assert backup_service.create_backup_before_switch()
+            assert started.wait(5)
+            # Worker hängt im ersten Backup, zwei Plätze in der Warteschlange
+            assert backup_service.create_backup_before_switch()
+            assert backup_service.create_backup_before_switch()
+            assert not backup_service.create_backup_before_switch()
+            release.set()
+            assert worker.flush(5)
+
+        assert worker.dropped == 1
+        assert worker.completed == 3
+
+    def test_flush_times_out(self, worker):
+        """Test: flush() mit Timeout kehrt zurück, solange ein Backup hängt."""
+        release = threading.Event()
+
+        with patch.object(backup_service, "write_backup", side_effect=lambda snapshot: release.wait(5)):
+            backup_service.create_backup_before_switch()
+            assert not worker.flush(0.05)
+            release.set()
+            assert worker.flush(5)
+
+    def test_flush_pending_backups_on_shutdown(self, backup_dir):
+        """Test: flush_pending_backups() schreibt ausstehende Backups und beendet den Worker."""
+        backup_service.create_backup_before_switch()
+        worker = backup_service.get_backup_worker()
+
+        assert backup_service.flush_pending_backups()
+
+        assert worker.pending == 0
+        assert len(backup_service.list_backups()) == 1
+        assert backup_service.get_backup_worker() is not worker
+        backup_service.set_backup_worker(None)
+
+    def test_submit_after_shutdown_writes_synchronously(self, worker):
+        """Test: Nach shutdown() wird direkt geschrieben statt eingereiht."""
+        worker.shutdown()
+
+        assert worker.submit(backup_service.snapshot_registry("before_switch"))
+        assert len(backup_service.list_backups()) == 1
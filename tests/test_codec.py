@@ -0,0 +1,170 @@
+# Dateipfad: tests/test_codec.py
+"""
+Unit-Tests für smartdesk.core.storage.codec
+
+Testet:
+- Migrationskette vom alten Listenformat auf die aktuelle Schema-Version
+- Ablehnung von Dateien einer neueren Version
+- Eigenschaftstests: Alter Codec (json + from_dict pro Icon) und neuer
+  Codec liefern auf generierten Daten identische Desktops, mit und ohne orjson
+- IconPosition.from_dicts (Bulk-Dekodierung) inkl. Fallback
+"""
+
+import json
+import random
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop, IconPosition
+from smartdesk.core.storage import codec, file_operations
+
+SEEDS = range(25)
+
+# Zeichen, die in Desktop-/Dateinamen vorkommen können (inkl. Escapes)
+_ALPHABET = "abcXYZ 019_-.äöüß€\\/\"'\t"
+
+
+def _random_text(rng, max_len=20):
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, max_len)))
+
+
+def _random_records(rng):
+    """Desktop-Dicts im alten Format (inkl. Inline-Icons und fehlender Felder)."""
+    records = []
+    for i in range(rng.randint(0, 8)):
+        record = {"name": f"{_random_text(rng)}#{i}", "path": "C:\\" + _random_text(rng)}
+        if rng.random() < 0.8:
+            record["is_active"] = rng.random() < 0.3
+        if rng.random() < 0.8:
+            record["wallpaper_path"] = _random_text(rng)
+        if rng.random() < 0.5:
+            record["protected"] = rng.random() < 0.5
+        if rng.random() < 0.5:
+            record["created_at"] = "2025-01-0%dT12:00:00" % rng.randint(1, 9)
+        if rng.random() < 0.7:
+            record["icon_positionen"] = [
+                {"index": j, "name": _random_text(rng), "x": rng.randint(-5000, 5000), "y": rng.randint(-5000, 5000)}
+                for j in range(rng.randint(0, 50))
+            ]
+        records.append(record)
+    return records
+
+
+def _old_decode(payload):
+    """Bisheriger Codec: json.loads + Desktop/IconPosition.from_dict pro Eintrag."""
+    desktops = []
+    for data in json.loads(payload):
+        desktop = Desktop(
+            name=data["name"],
+            path=data["path"],
+            is_active=data.get("is_active", False),
+            wallpaper_path=data.get("wallpaper_path", ""),
+            protected=data.get("protected", False),
+            created_at=data.get("created_at", ""),
+            icon_layout=data.get("icon_layout", ""),
+        )
+        if "icon_positionen" in data:
+            desktop.icon_positionen = [IconPosition.from_dict(icon) for icon in data["icon_positionen"]]
+        desktops.append(desktop)
+    return desktops
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_backend(request, monkeypatch):
+    """Codec mit orjson (falls installiert) bzw. mit dem json-Modul."""
+    if request.param == "orjson":
+        if codec.orjson is None:
+            pytest.skip("orjson nicht installiert")
+    else:
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+class TestMigration:
+    """Tests für Schema-Versionen und Migrationskette."""
+
+    def test_legacy_list_is_migrated(self):
+        """Test: Eine reine Liste (Version 1) wird auf die aktuelle Version gehoben."""
+        data = codec.migrate([{"name": "A", "path": "C:\\A"}])
+
+        assert data["schema_version"] == codec.SCHEMA_VERSION
+        assert data["desktops"] == [{"name": "A", "path": "C:\\A"}]
+
+    def test_every_old_version_has_migration(self):
+        """Test: Die Kette ist lückenlos bis zur aktuellen Version."""
+        for version in range(codec.LEGACY_SCHEMA_VERSION, codec.SCHEMA_VERSION):
+            assert version in codec.MIGRATIONS
+
+    def test_newer_version_rejected(self):
+        """Test: Dateien einer neueren Version werden nicht still gelesen."""
+        payload = json.dumps({"schema_version": codec.SCHEMA_VERSION + 1, "desktops": []}).encode()
+
+        with pytest.raises(codec.SchemaVersionError):
+            codec.decode_records(payload)
+
+    def test_unknown_format_rejected(self):
+        """Test: Ein Objekt ohne schema_version ist kein gültiges Format."""
+        with pytest.raises(ValueError):
+            codec.decode_records(b'{"foo": 1}')
+
+    def test_read_desktops_file_migrates_and_save_upgrades(self, tmp_path, monkeypatch):
+        """Test: Altes Format wird gelesen und beim Speichern im neuen Format geschrieben."""
+        data_file = tmp_path / "desktops.json"
+        data_file.write_text(json.dumps([{"name": "A", "path": "C:\\A"}]), encoding="utf-8")
+        monkeypatch.setattr(file_operations, "get_data_file_path", lambda: str(data_file))
+
+        desktops, _ = file_operations.read_desktops_file(str(data_file))
+        assert file_operations.save_desktops(desktops)
+
+        data = json.loads(data_file.read_text(encoding="utf-8"))
+        assert data["schema_version"] == codec.SCHEMA_VERSION
+        assert [d["name"] for d in data["desktops"]] == ["A"]
+
+
+class TestCodecProperties:
+    """Eigenschaftstests auf generierten Daten."""
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_new_codec_matches_old(self, seed, json_backend):
+        """Test: Neuer Codec dekodiert das alte Format identisch zum alten Codec."""
+        payload = json.dumps(_random_records(random.Random(seed)), ensure_ascii=False).encode("utf-8")
+
+        assert codec.decode_desktops(payload) == _old_decode(payload)
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_roundtrip(self, seed, json_backend):
+        """Test: encode_records/decode_records sind verlustfrei."""
+        records = [Desktop.from_dict(r).to_dict(include_icons=False) for r in _random_records(random.Random(seed))]
+
+        payload = codec.encode_records(records)
+
+        assert codec.decode_records(payload) == records
+        assert json.loads(payload)["desktops"] == records
+        assert payload.count(b"\n") == len(records) + (2 if records else 1)
+
+    def test_backends_produce_same_bytes(self, monkeypatch):
+        """Test: orjson und json erzeugen identische Dateien (Hash-Vergleich beim Speichern)."""
+        if codec.orjson is None:
+            pytest.skip("orjson nicht installiert")
+        records = [Desktop.from_dict(r).to_dict(include_icons=False) for r in _random_records(random.Random(1))]
+
+        fast = codec.encode_records(records)
+        monkeypatch.setattr(codec, "orjson", None)
+
+        assert codec.encode_records(records) == fast
+
+
+class TestBulkIconDecode:
+    """Tests für IconPosition.from_dicts."""
+
+    def test_matches_from_dict(self):
+        """Test: Bulk-Dekodierung liefert dieselben Icons wie from_dict."""
+        items = [{"index": i, "name": f"Icon {i}", "x": i * 3, "y": -i} for i in range(100)]
+
+        assert IconPosition.from_dicts(items) == [IconPosition.from_dict(item) for item in items]
+
+    def test_missing_index_falls_back(self):
+        """Test: Einträge ohne index (sehr alte Dateien) erhalten index 0."""
+        items = [{"index": 5, "name": "A", "x": 1, "y": 2}, {"name": "B", "x": 3, "y": 4}]
+
+        assert IconPosition.from_dicts(items) == [IconPosition(5, "A", 1, 2), IconPosition(0, "B", 3, 4)]
@@ -159,6 +159,26 @@ class TestGetAllDesktopsLogic:
 
         assert norm1 == norm2
 
+    def test_sync_with_registry_uses_path_index(self):
+        """Test: Registry-Sync setzt den passenden Desktop aktiv, ohne Pfade erneut zu normalisieren."""
+        from smartdesk.core.models import desktop as desktop_module
+        from smartdesk.core.services import desktop_service
+
+        desktops = [
+            Desktop(name="D1", path="C:\\D1", is_active=True),
+            Desktop(name="D2", path="C:\\D2"),
+        ]
+        for d in desktops:
+            d.path_key
+
+        with patch.object(desktop_service, "get_cached_value", return_value="c:\\d2"), patch.object(desktop_service, "save_desktops") as save:
+            with patch.object(desktop_module, "path_key", wraps=desktop_module.path_key) as spy:
+                assert desktop_service.synchronize_desktops_with_registry(desktops) is True
+                assert spy.call_count == 1  # nur der Registry-Wert
+
+        assert [d.is_active for d in desktops] == [False, True]
+        save.assert_called_once_with(desktops)
+
     def test_only_one_active_desktop(self, tmp_path):
         """Test: Nur ein Desktop sollte aktiv sein."""
         from smartdesk.core.storage.file_operations import load_desktops, save_desktops
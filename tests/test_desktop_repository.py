@@ -0,0 +1,190 @@
+# Dateipfad: tests/test_desktop_repository.py
+"""
+Unit-Tests für smartdesk.core.storage.desktop_repository
+
+Testet:
+- Cache-Treffer ohne erneutes Parsen
+- Revalidierung bei externer Änderung (mtime/size/inode)
+- Übernahme eigener Speichervorgänge ohne Reparse
+- Sortierung, Name-/Pfad-Index und aktiven Desktop
+- Kopien statt Cache-Referenzen
+"""
+
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop
+from smartdesk.core.storage import file_operations
+from smartdesk.core.storage.desktop_repository import DesktopRepository, set_desktop_repository, get_desktop_repository
+
+
+@pytest.fixture
+def repo_file(tmp_path, sample_desktops_data):
+    """desktops.json mit Beispieldaten + gepatchter Datenpfad."""
+    json_file = tmp_path / "desktops.json"
+    with open(json_file, "w", encoding="utf-8") as f:
+        json.dump(sample_desktops_data, f)
+
+    with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+        yield json_file
+
+
+@pytest.fixture
+def repository():
+    """Frisches Repository, das als prozessweites Singleton registriert ist."""
+    repo = DesktopRepository()
+    set_desktop_repository(repo)
+    yield repo
+    set_desktop_repository(None)
+
+
+def _write_external(json_file, data):
+    """Simuliert einen Schreibvorgang durch einen anderen Prozess."""
+    with open(json_file, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    # mtime sicher verändern (grobe Zeitauflösung mancher Dateisysteme)
+    st = os.stat(json_file)
+    os.utime(json_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+class TestCaching:
+    """Tests für Cache-Treffer und Revalidierung."""
+
+    def test_second_call_is_cache_hit(self, repo_file, repository):
+        """Test: Zweiter Aufruf parst die Datei nicht erneut."""
+        repository.get_all()
+        repository.get_all()
+
+        assert repository.reloads == 1
+        assert repository.hits == 1
+
+    def test_no_reparse_without_change(self, repo_file, repository):
+        """Test: read_desktops_file wird nur einmal aufgerufen."""
+        with patch.object(file_operations, "read_desktops_file", wraps=file_operations.read_desktops_file) as spy:
+            for _ in range(10):
+                repository.get_all()
+
+        assert spy.call_count == 1
+
+    def test_external_change_triggers_reload(self, repo_file, repository, sample_desktops_data):
+        """Test: Änderung durch anderen Prozess wird erkannt."""
+        assert len(repository.get_all()) == 3
+
+        _write_external(repo_file, sample_desktops_data[:1])
+
+        assert len(repository.get_all()) == 1
+        assert repository.reloads == 2
+
+    def test_own_save_primes_cache(self, repo_file, repository):
+        """Test: Eigenes Speichern aktualisiert den Cache ohne Reparse."""
+        desktops = repository.load()
+        desktops.append(Desktop(name="Neu", path="C:\\Neu"))
+        file_operations.save_desktops(desktops)
+
+        result = repository.get_all()
+
+        assert any(d.name == "Neu" for d in result)
+        assert repository.reloads == 1
+
+    def test_missing_file_returns_empty(self, tmp_path, repository):
+        """Test: Nicht existierende Datei ergibt leere Liste."""
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(tmp_path / "fehlt.json")):
+            assert repository.get_all() == []
+            assert repository.get_active() is None
+
+    def test_corrupted_file_is_not_cached(self, tmp_path, repository, sample_desktops_data):
+        """Test: Korrupte Datei liefert [] und wird beim nächsten Aufruf erneut gelesen."""
+        json_file = tmp_path / "desktops.json"
+        json_file.write_text("{kaputt", encoding="utf-8")
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            assert repository.get_all() == []
+
+            _write_external(json_file, sample_desktops_data)
+            assert len(repository.get_all()) == 3
+
+
+class TestQueries:
+    """Tests für Sortierung und Indizes."""
+
+    def test_get_all_sorted(self, repo_file, repository):
+        """Test: Alphabetische Sortierung."""
+        names = [d.name for d in repository.get_all()]
+        assert names == ["Arbeit", "Gaming", "Standard"]
+
+    def test_load_keeps_file_order(self, repo_file, repository):
+        """Test: load() behält die Reihenfolge der Datei."""
+        names = [d.name for d in repository.load()]
+        assert names == ["Standard", "Arbeit", "Gaming"]
+
+    def test_protected_first(self, tmp_path, repository):
+        """Test: Geschützte Desktops stehen vorne."""
+        json_file = tmp_path / "desktops.json"
+        data = [
+            {"name": "A", "path": "C:\\A"},
+            {"name": "Z", "path": "C:\\Z", "protected": True},
+        ]
+        json_file.write_text(json.dumps(data), encoding="utf-8")
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            assert [d.name for d in repository.get_all()] == ["Z", "A"]
+
+    def test_get_by_name(self, repo_file, repository):
+        """Test: Lookup über den Namen."""
+        assert repository.get_by_name("Arbeit").path == "C:\\Users\\Test\\Desktop_Arbeit"
+        assert repository.get_by_name("Gibt es nicht") is None
+
+    def test_get_by_path_normalized(self, repo_file, repository):
+        """Test: Lookup über den Pfad ist unabhängig von Groß-/Kleinschreibung."""
+        desktop = repository.get_by_path("C:\\USERS\\TEST\\DESKTOP_ARBEIT")
+        assert desktop is not None
+        assert desktop.name == "Arbeit"
+
+    def test_get_active(self, repo_file, repository):
+        """Test: Aktiver Desktop wird gefunden."""
+        assert repository.get_active().name == "Standard"
+
+
+class TestIsolation:
+    """Tests dafür, dass Aufrufer den Cache nicht verändern können."""
+
+    def test_mutation_does_not_leak(self, repo_file, repository):
+        """Test: Änderungen an zurückgegebenen Objekten bleiben lokal."""
+        first = repository.get_all()
+        first[0].is_active = True
+        first[0].name = "Verändert"
+
+        second = repository.get_all()
+        assert second[0].name == "Arbeit"
+        assert second[0].is_active is False
+
+    def test_mutation_after_save_does_not_leak(self, repo_file, repository):
+        """Test: Nach dem Speichern weiterverwendete Objekte verändern den Cache nicht."""
+        desktops = repository.load()
+        file_operations.save_desktops(desktops)
+        desktops[0].is_active = False
+
+        assert repository.get_active().name == "Standard"
+
+
+    def test_icon_mutation_does_not_leak(self, repo_file, repository):
+        """Test: In-place-Änderungen an den Icons eines zurückgegebenen Desktops erreichen den Cache nicht."""
+        first = repository.get_by_name("Standard")
+        first.icon_positionen[0].x = 9999
+        first.icon_positionen.clear()
+
+        second = repository.get_by_name("Standard")
+        assert second.icon_positionen
+        assert second.icon_positionen[0].x != 9999
+
+
+def test_singleton_is_shared():
+    """Test: get_desktop_repository() liefert immer dieselbe Instanz."""
+    set_desktop_repository(None)
+    try:
+        assert get_desktop_repository() is get_desktop_repository()
+    finally:
+        set_desktop_repository(None)
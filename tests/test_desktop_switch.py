@@ -9,6 +9,8 @@ import os
 import sys
 
 from smartdesk.core.models.desktop import Desktop, IconPosition
+from smartdesk.core.shell import RefreshResult
+from smartdesk.core.utils.backup_service import create_backup_before_switch as _create_backup_before_switch
 
 
 # Dummy Desktop Daten
@@ -32,8 +34,10 @@ def mock_dependencies():
     mocks["get_icons"] = patch("smartdesk.core.services.desktop_service.get_current_icon_positions").start()
 
     # System / OS
-    mocks["reg_update"] = patch("smartdesk.core.services.desktop_service.update_registry_key").start()
+    mocks["reg_update"] = patch("smartdesk.core.services.desktop_service.write_desktop_path").start()
     mocks["restart_explorer"] = patch("smartdesk.core.services.desktop_service.restart_explorer").start()
+    mocks["refresher"] = patch("smartdesk.core.services.desktop_service.get_shell_refresher").start()
+    mocks["refresh"] = mocks["refresher"].return_value.refresh
     mocks["sync"] = patch("smartdesk.core.services.desktop_service.sync_desktop_state_and_apply_icons").start()
     mocks["popen"] = patch("smartdesk.core.services.desktop_service.subprocess.Popen").start()
     mocks["tempdir"] = patch("smartdesk.core.services.desktop_service.tempfile.gettempdir").start()
@@ -43,8 +47,9 @@ def mock_dependencies():
 
     # Defaults
     mocks["get_icons"].return_value = []
-    mocks["reg_update"].return_value = True
+    mocks["reg_update"].return_value.success = True
     mocks["tempdir"].return_value = "C:\\Temp"
+    mocks["refresh"].return_value = RefreshResult("soft", True, 0.0)
     mocks["path_exists"].return_value = True  # Standardmäßig existiert alles (Skript, Zielpfad)
 
     yield mocks
@@ -52,6 +57,25 @@ def mock_dependencies():
     patch.stopall()
 
 
+@pytest.fixture
+def memory_switch(mock_desktops, mock_dependencies, memory_registry):
+    """
+    Wechsel mit den Mocks aus mock_dependencies, aber mit echter
+    Registry-Transaktion auf der In-Memory-Registry und ohne Animation
+    (Windows-spezifischer Prozessstart).
+
+    Gibt das Einstellungs-Dict zurück, aus dem get_setting() liest.
+    """
+    from smartdesk.core.registry import write_desktop_path
+    from smartdesk.core.services import desktop_service
+
+    mock_dependencies["get_all"].return_value = mock_desktops
+    mock_dependencies["reg_update"].side_effect = write_desktop_path
+    settings = {"show_switch_animation": False}
+    with patch.object(desktop_service.settings_service, "get_setting", side_effect=lambda key, default=None: settings.get(key, default)):
+        yield settings
+
+
 class TestSwitchToDesktop:
 
     def test_switch_success_flow(self, mock_desktops, mock_dependencies):
@@ -60,7 +84,7 @@ class TestSwitchToDesktop:
         1. Lockfile erstellt
         2. Animation gestartet
         3. Registry Update
-        4. Explorer Restart
+        4. Explorer aktualisiert
         5. Sync
         6. Lockfile gelöscht
         """
@@ -77,7 +101,7 @@ class TestSwitchToDesktop:
 
         # 1. Lock-File erstellt?
         expected_lock_file = os.path.join("C:\\Temp", "smartdesk_switch.lock")
-        m_open.assert_called_with(expected_lock_file, "w")
+        m_open.assert_any_call(expected_lock_file, "w")
 
         # 2. Animation gestartet mit Lock-File Argument?
         assert mock_dependencies["popen"].called
@@ -86,11 +110,12 @@ class TestSwitchToDesktop:
         assert "screen_fade.py" in cmd_args[1]
         assert cmd_args[2] == expected_lock_file
 
-        # 3. Registry Updates? (Shell und Legacy Shell)
-        assert mock_dependencies["reg_update"].call_count == 2
+        # 3. Registry Update? (Shell und Legacy Shell als eine Transaktion)
+        mock_dependencies["reg_update"].assert_called_once_with(os.path.normpath("C:\\Target"))
 
-        # 4. Explorer Restart?
-        mock_dependencies["restart_explorer"].assert_called_once()
+        # 4. Explorer aktualisiert (Standard: ohne Neustart)?
+        mock_dependencies["refresh"].assert_called_once_with(os.path.normpath("C:\\Target"), os.path.normpath("C:\\Current"))
+        mock_dependencies["restart_explorer"].assert_not_called()
 
         # 5. Sync?
         mock_dependencies["sync"].assert_called_once()
@@ -111,7 +136,7 @@ class TestSwitchToDesktop:
 
         assert result is False
         mock_dependencies["reg_update"].assert_not_called()
-        mock_dependencies["restart_explorer"].assert_not_called()
+        mock_dependencies["refresh"].assert_not_called()
 
     def test_switch_already_active(self, mock_desktops, mock_dependencies):
         """Wenn Ziel-Desktop schon aktiv ist, Abbruch."""
@@ -131,7 +156,7 @@ class TestSwitchToDesktop:
         mock_dependencies["get_all"].return_value = mock_desktops
 
         # Simuliere Fehler beim Registry Update
-        mock_dependencies["reg_update"].return_value = False
+        mock_dependencies["reg_update"].return_value.success = False
 
         # Mock file open für Lock-File
         with patch("builtins.open", mock_open()):
@@ -140,7 +165,7 @@ class TestSwitchToDesktop:
         assert result is False
 
         # Kein Explorer Restart!
-        mock_dependencies["restart_explorer"].assert_not_called()
+        mock_dependencies["refresh"].assert_not_called()
 
         # Lockfile sollte trotzdem aufgeräumt werden
         expected_lock_file = os.path.join("C:\\Temp", "smartdesk_switch.lock")
@@ -174,7 +199,7 @@ class TestSwitchToDesktop:
         mock_dependencies["popen"].assert_not_called()
 
         # Aber der Rest muss laufen
-        mock_dependencies["restart_explorer"].assert_called_once()
+        mock_dependencies["refresh"].assert_called_once()
 
     def test_target_path_not_found_dialog(self, mock_desktops, mock_dependencies):
         """Wenn Ziel-Ordner fehlt, Dialog anzeigen (hier: Abbruch simulieren)."""
@@ -193,7 +218,7 @@ class TestSwitchToDesktop:
 
             assert result is False
             mock_dialog.assert_called_once()
-            mock_dependencies["restart_explorer"].assert_not_called()
+            mock_dependencies["refresh"].assert_not_called()
 
     def test_target_path_recreate(self, mock_desktops, mock_dependencies):
         """Wenn Ziel-Ordner fehlt und User 'Neu erstellen' wählt."""
@@ -226,4 +251,144 @@ class TestSwitchToDesktop:
 
                 assert result is True
                 mock_ensure.assert_called()
-                mock_dependencies["restart_explorer"].assert_called()
+                mock_dependencies["refresh"].assert_called()
+
+
+class TestSwitchRegistryTransaction:
+    """Desktop-Wechsel gegen die In-Memory-Registry mit Fehlerinjektion."""
+
+    def test_switch_writes_both_keys(self, memory_switch, memory_registry):
+        """Test: Beide Schlüssel zeigen nach dem Wechsel auf den Ziel-Desktop."""
+        from smartdesk.core.services.desktop_service import switch_to_desktop
+        from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+        assert switch_to_desktop("Target") is True
+
+        assert memory_registry.read_value(KEY_USER_SHELL, VALUE_NAME).data == "C:\\Target"
+        assert memory_registry.read_value(KEY_LEGACY_SHELL, VALUE_NAME).data == "C:\\Target"
+
+    def test_partial_failure_rolls_back_both_keys(self, memory_switch, memory_registry, mock_desktops, mock_dependencies):
+        """Test: Schlägt Shell Folders fehl, wird auch User Shell Folders zurückgesetzt."""
+        from smartdesk.core.services.desktop_service import switch_to_desktop
+        from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+        memory_registry.fail_writes(KEY_LEGACY_SHELL)
+
+        assert switch_to_desktop("Target") is False
+
+        assert memory_registry.read_value(KEY_USER_SHELL, VALUE_NAME).data == "C:\\Current"
+        assert memory_registry.read_value(KEY_LEGACY_SHELL, VALUE_NAME).data == "C:\\Current"
+        assert mock_desktops[0].is_active
+        mock_dependencies["refresh"].assert_not_called()
+
+
+class TestSwitchBackgroundBackup:
+    """Backup vor dem Wechsel im Hintergrund."""
+
+    @pytest.fixture
+    def switch(self, memory_switch, mock_dependencies, tmp_path):
+        from smartdesk.core.utils import backup_service
+
+        # Echtes Einreihen statt Mock
+        mock_dependencies["backup"].side_effect = _create_backup_before_switch
+        worker = backup_service.BackupWorker()
+        backup_service.set_backup_worker(worker)
+        with patch.object(backup_service, "BACKUP_DIR", str(tmp_path / "backups")):
+            yield worker
+        backup_service.set_backup_worker(None)
+
+    def test_switch_does_not_wait_for_backup(self, switch, memory_registry):
+        """Test: Der Wechsel endet, während das Backup noch schreibt; gesichert wird der alte Pfad."""
+        import threading
+
+        from smartdesk.core.services import desktop_service
+        from smartdesk.core.utils import backup_service
+
+        release = threading.Event()
+        written = []
+
+        def slow_write(snapshot):
+            release.wait(5)
+            written.append(snapshot)
+
+        with patch.object(backup_service, "write_backup", side_effect=slow_write):
+            assert desktop_service.switch_to_desktop("Target") is True
+            assert switch.pending == 1
+            release.set()
+            assert switch.flush(5)
+
+        assert written[0].user_shell_value == "C:\\Current"
+        assert "backup" in desktop_service.get_last_switch_timings()
+
+    def test_switch_timings_cover_all_stages(self, switch):
+        """Test: Die Zeitmessung enthält alle Stufen eines erfolgreichen Wechsels."""
+        from smartdesk.core.services import desktop_service
+
+        assert desktop_service.switch_to_desktop("Target") is True
+
+        # Unabhängige Stufen laufen parallel, die Reihenfolge ihres Endes ist offen
+        assert set(desktop_service.get_last_switch_timings()) == {
+            "sync",
+            "backup",
+            "path_check",
+            "animation",
+            "icons",
+            "registry",
+            "explorer_restart",
+            "apply",
+        }
+
+
+class TestSwitchShellRefresh:
+    """Explorer-Stufe: Aktualisierung ohne Neustart oder Neustart per Einstellung."""
+
+    def test_restart_mode_always_restarts(self, memory_switch, mock_dependencies, trace_file):
+        """Test: explorer_refresh_mode = "restart" startet den Explorer ohne Benachrichtigung neu."""
+        from smartdesk.core.services.desktop_service import switch_to_desktop
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        memory_switch["explorer_refresh_mode"] = "restart"
+
+        assert switch_to_desktop("Target") is True
+
+        mock_dependencies["restart_explorer"].assert_called_once()
+        mock_dependencies["refresh"].assert_not_called()
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["shell_refresh"] == "restart"
+
+    def test_soft_refresh_result_is_traced(self, memory_switch, mock_dependencies, trace_file):
+        """Test: Die Art der Aktualisierung (hier: eskaliert) landet im Trace-Datensatz."""
+        from smartdesk.core.services.desktop_service import switch_to_desktop
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        mock_dependencies["refresh"].return_value = RefreshResult("escalated", False, 1500.0)
+
+        assert switch_to_desktop("Target") is True
+
+        mock_dependencies["restart_explorer"].assert_not_called()
+        (record,) = read_trace_records(trace_file)
+        assert record["attrs"]["shell_refresh"] == "escalated"
+
+
+class TestSwitchCancellation:
+    """Abbruch eines Wechsels zugunsten einer neueren Anfrage (SwitchBroker)."""
+
+    def test_cancelled_before_registry(self, memory_switch, mock_dependencies, trace_file):
+        """Test: Meldet cancelled() True, bleiben Registry und Explorer unberührt."""
+        from smartdesk.core.services.desktop_service import switch_to_desktop
+        from smartdesk.core.utils.tracing import read_trace_records
+
+        assert switch_to_desktop("Target", cancelled=lambda: True, trace_attrs={"queue_seq": 3}) is False
+
+        mock_dependencies["reg_update"].assert_not_called()
+        mock_dependencies["refresh"].assert_not_called()
+        (record,) = read_trace_records(trace_file)
+        assert record["outcome"] == "cancelled"
+        assert record["attrs"]["queue_seq"] == 3
+
+    def test_not_cancelled_runs_through(self, memory_switch, mock_dependencies):
+        """Test: Meldet cancelled() False, läuft der Wechsel normal."""
+        from smartdesk.core.services.desktop_service import switch_to_desktop
+
+        assert switch_to_desktop("Target", cancelled=lambda: False) is True
+        mock_dependencies["reg_update"].assert_called_once()
@@ -6,13 +6,16 @@ Testet:
 - load_desktops(): Laden von JSON-Daten
 - save_desktops(): Speichern von Desktop-Listen
 - get_data_file_path(): Pfad-Ermittlung
+- Atomares Schreiben, Hash-Vergleich und save_batch()
 """
 
 import json
+import os
 from unittest.mock import patch
 
-from smartdesk.core.storage.file_operations import load_desktops, save_desktops, get_data_file_path
-from smartdesk.core.models.desktop import Desktop
+from smartdesk.core.storage import file_operations
+from smartdesk.core.storage.file_operations import load_desktops, save_desktops, save_batch, get_data_file_path
+from smartdesk.core.models.desktop import Desktop, IconPosition
 
 
 class TestGetDataFilePath:
@@ -147,7 +150,7 @@ class TestSaveDesktops:
             save_desktops(sample_desktops)
 
             with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = json.load(f)["desktops"]
 
             assert len(data) == 3
             assert data[0]["name"] == "Standard"
@@ -173,7 +176,7 @@ class TestSaveDesktops:
 
             assert result is True
             with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = json.load(f)["desktops"]
             assert data == []
 
     def test_save_preserves_unicode(self, tmp_path):
@@ -202,7 +205,7 @@ class TestSaveDesktops:
             save_desktops(sample_desktops)
 
             with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                data = json.load(f)["desktops"]
 
             assert len(data) == 3
             assert data[0]["name"] == "Standard"
@@ -264,3 +267,149 @@ class TestRoundtrip:
             assert len(loaded2) == 2
             assert loaded2[0].name == "V2"
             assert loaded2[1].name == "Neu"
+
+
+class TestAtomicSave:
+    """Tests für atomares Schreiben und das Überspringen identischer Inhalte."""
+
+    def test_no_temp_files_left(self, tmp_path, sample_desktops):
+        """Test: Nach dem Speichern bleibt keine temporäre Datei zurück."""
+        json_file = tmp_path / "atomic.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            save_desktops(sample_desktops)
+
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_failed_replace_keeps_old_file(self, tmp_path, sample_desktops):
+        """Test: Schlägt das Ersetzen fehl, bleibt die alte Datei unverändert."""
+        json_file = tmp_path / "atomic.json"
+        json_file.write_text('[{"name": "Alt", "path": "C:\\\\Alt"}]', encoding="utf-8")
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with patch("smartdesk.core.storage.file_operations.os.replace", side_effect=OSError("kaputt")):
+                assert save_desktops(sample_desktops) is False
+
+        data = json.loads(json_file.read_text(encoding="utf-8"))
+        assert data[0]["name"] == "Alt"
+        assert not list(tmp_path.rglob("*.tmp"))
+
+    def test_unchanged_content_is_not_rewritten(self, tmp_path, sample_desktops):
+        """Test: Identischer Inhalt wird nicht erneut geschrieben."""
+        json_file = tmp_path / "same.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            save_desktops(sample_desktops)
+            with patch.object(file_operations, "write_atomic", wraps=file_operations.write_atomic) as spy:
+                assert save_desktops(sample_desktops) is True
+
+        assert spy.call_count == 0
+
+    def test_external_change_forces_rewrite(self, tmp_path, sample_desktops):
+        """Test: Wurde die Datei von außen geändert, wird trotz gleichem Inhalt geschrieben."""
+        json_file = tmp_path / "external.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            save_desktops(sample_desktops)
+
+            json_file.write_text("[]", encoding="utf-8")
+            st = os.stat(json_file)
+            os.utime(json_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+            save_desktops(sample_desktops)
+            assert len(load_desktops()) == 3
+
+
+class TestSaveBatch:
+    """Tests für save_batch()."""
+
+    def test_batch_writes_once(self, tmp_path, sample_desktops):
+        """Test: Mehrere Speichervorgänge im Batch ergeben einen Schreibvorgang."""
+        json_file = tmp_path / "batch.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with patch.object(file_operations, "write_atomic", wraps=file_operations.write_atomic) as spy:
+                with save_batch():
+                    save_desktops(sample_desktops[:1])
+                    save_desktops(sample_desktops[:2])
+                    save_desktops(sample_desktops)
+                    assert not json_file.exists()
+
+            json_writes = [c for c in spy.call_args_list if c.args[0] == str(json_file)]
+            assert len(json_writes) == 1
+            assert len(load_desktops()) == 3
+
+    def test_batch_keeps_snapshot(self, tmp_path, sample_desktops):
+        """Test: Spätere Änderungen des Aufrufers verändern den vorgemerkten Stand nicht."""
+        json_file = tmp_path / "snapshot.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with save_batch():
+                save_desktops(sample_desktops)
+                sample_desktops[0].name = "Nachträglich"
+
+            assert load_desktops()[0].name == "Standard"
+
+    def test_read_inside_batch_sees_pending(self, tmp_path):
+        """Test: Lesen innerhalb eines Batches liefert den zuletzt gespeicherten Stand."""
+        json_file = tmp_path / "read.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with save_batch():
+                save_desktops([Desktop(name="Neu", path="C:\\Neu")])
+                assert [d.name for d in load_desktops()] == ["Neu"]
+
+    def test_nested_batches_flush_at_outermost(self, tmp_path, sample_desktops):
+        """Test: Verschachtelte Batches schreiben erst beim Verlassen des äußersten."""
+        json_file = tmp_path / "nested.json"
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with save_batch():
+                with save_batch():
+                    save_desktops(sample_desktops)
+                assert not json_file.exists()
+            assert json_file.exists()
+
+    def test_batch_marks_callers_icons_saved(self, tmp_path):
+        """Test: Nach dem Schreiben des Batches sind die Icons der übergebenen Desktops nicht mehr geändert."""
+        json_file = tmp_path / "dirty.json"
+        desktop = Desktop(name="Icons", path="C:\\Icons", icon_positionen=[IconPosition(index=0, name="a.txt", x=1, y=2)])
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with save_batch():
+                save_desktops([desktop])
+                assert desktop.icons_dirty
+
+            assert not desktop.icons_dirty
+            assert desktop.icon_layout
+            assert load_desktops()[0].icon_layout == desktop.icon_layout
+
+    def test_batch_keeps_later_icon_changes_dirty(self, tmp_path):
+        """Test: Nach dem Vormerken neu zugewiesene Icons bleiben als geändert markiert."""
+        json_file = tmp_path / "later.json"
+        desktop = Desktop(name="Icons", path="C:\\Icons", icon_positionen=[IconPosition(index=0, name="a.txt", x=1, y=2)])
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with save_batch():
+                save_desktops([desktop])
+                desktop.icon_positionen = [IconPosition(index=0, name="a.txt", x=50, y=60)]
+
+            assert desktop.icons_dirty
+            save_desktops([desktop])
+            assert load_desktops()[0].icon_positionen[0].x == 50
+
+    def test_batch_does_not_defer_other_threads(self, tmp_path, sample_desktops):
+        """Test: Während ein Thread einen Batch hält, schreiben andere Threads sofort."""
+        import threading
+
+        json_file = tmp_path / "threads.json"
+        results = []
+
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            with save_batch():
+                thread = threading.Thread(target=lambda: results.append(save_desktops(sample_desktops)))
+                thread.start()
+                thread.join()
+
+                assert results == [True]
+                assert json_file.exists()
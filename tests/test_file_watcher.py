@@ -0,0 +1,207 @@
+# Dateipfad: tests/test_file_watcher.py
+"""
+Unit-Tests für smartdesk.shared.file_watcher
+
+Testet:
+- Benachrichtigung bei Ändern, Anlegen, Löschen und atomarem Ersetzen
+- Entprellung mehrerer Ereignisse zu einem Callback
+- Abmelden, Fehler in Callbacks, nicht abonnierte Dateien
+- inotify-Backend (Linux) und Fallback bei fehlendem Backend
+- AutoSwitchService prüft rules.json nur nach gemeldeter Änderung
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.shared import file_watcher
+from smartdesk.shared.file_watcher import FileWatcher, InotifyBackend, PollingBackend
+
+
+def _wait_for(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class _Recorder:
+    """Sammelt Callback-Aufrufe thread-sicher."""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, path):
+        with self._lock:
+            self.calls.append(path)
+
+
+@pytest.fixture
+def real_ctypes(monkeypatch):
+    """Echtes ctypes statt des Platzhalters aus conftest.py."""
+    for name in ("ctypes", "ctypes.util", "ctypes.wintypes"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+
+
+@pytest.fixture(params=["polling", "inotify"])
+def watcher(request):
+    """FileWatcher mit Polling- bzw. inotify-Backend."""
+    if request.param == "inotify":
+        if not sys.platform.startswith("linux"):
+            pytest.skip("inotify nur unter Linux")
+        request.getfixturevalue("real_ctypes")
+        backend = InotifyBackend()
+    else:
+        backend = PollingBackend(interval=0.01)
+    w = FileWatcher(backend, debounce=0.02)
+    yield w
+    w.stop()
+
+
+class TestNotifications:
+    """Tests für die Zustellung von Änderungen."""
+
+    def test_modify(self, watcher, tmp_path):
+        """Test: Schreiben in eine Datei löst den Callback aus."""
+        target = tmp_path / "desktops.json"
+        target.write_text("[]")
+        recorder = _Recorder()
+        watcher.subscribe(str(target), recorder)
+
+        target.write_text("[1, 2]")
+
+        assert _wait_for(lambda: recorder.calls == [str(target)])
+
+    def test_create_and_delete(self, watcher, tmp_path):
+        """Test: Anlegen und Löschen werden gemeldet (z.B. listener.pid)."""
+        target = tmp_path / "listener.pid"
+        recorder = _Recorder()
+        watcher.subscribe(str(target), recorder)
+
+        target.write_text("1234")
+        assert _wait_for(lambda: len(recorder.calls) == 1)
+
+        target.unlink()
+        assert _wait_for(lambda: len(recorder.calls) == 2)
+
+    def test_atomic_replace(self, watcher, tmp_path):
+        """Test: os.replace auf die Datei wird erkannt."""
+        target = tmp_path / "desktops.json"
+        target.write_text("[]")
+        recorder = _Recorder()
+        watcher.subscribe(str(target), recorder)
+
+        tmp = tmp_path / ".desktops.json-x.tmp"
+        tmp.write_text("[1, 2, 3]")
+        os.replace(tmp, target)
+
+        assert _wait_for(lambda: len(recorder.calls) == 1)
+
+    def test_other_files_ignored(self, watcher, tmp_path):
+        """Test: Änderungen anderer Dateien im Verzeichnis lösen nichts aus."""
+        recorder = _Recorder()
+        watcher.subscribe(str(tmp_path / "rules.json"), recorder)
+
+        (tmp_path / "andere.json").write_text("{}")
+        time.sleep(0.2)
+
+        assert recorder.calls == []
+
+    def test_debounce_coalesces_events(self, watcher, tmp_path):
+        """Test: Mehrere schnelle Änderungen ergeben einen Callback."""
+        target = tmp_path / "rules.json"
+        recorder = _Recorder()
+        watcher.subscribe(str(target), recorder, debounce=0.3)
+
+        for i in range(5):
+            target.write_text(json.dumps({"n": i}))
+            time.sleep(0.02)
+
+        assert _wait_for(lambda: len(recorder.calls) == 1)
+        time.sleep(0.4)
+        assert len(recorder.calls) == 1
+
+    def test_cancel_stops_notifications(self, watcher, tmp_path):
+        """Test: Nach cancel() kommen keine Callbacks mehr."""
+        target = tmp_path / "desktops.json"
+        recorder = _Recorder()
+        subscription = watcher.subscribe(str(target), recorder)
+        subscription.cancel()
+        subscription.cancel()
+
+        target.write_text("[]")
+        time.sleep(0.2)
+
+        assert recorder.calls == []
+
+    def test_callback_error_does_not_stop_watcher(self, watcher, tmp_path):
+        """Test: Eine Exception im Callback beendet den Watcher nicht."""
+        target = tmp_path / "desktops.json"
+        recorder = _Recorder()
+        watcher.subscribe(str(target), lambda path: 1 / 0)
+        watcher.subscribe(str(target), recorder)
+
+        target.write_text("[]")
+        assert _wait_for(lambda: len(recorder.calls) == 1)
+        target.write_text("[1]")
+        assert _wait_for(lambda: len(recorder.calls) == 2)
+
+
+class TestBackendSelection:
+    """Tests für die Auswahl des Backends."""
+
+    def test_inotify_rejects_placeholder_ctypes(self):
+        """Test: Mit dem ctypes-Platzhalter scheitert inotify sauber mit ImportError."""
+        with pytest.raises(ImportError):
+            InotifyBackend()
+
+    def test_fallback_to_polling(self):
+        """Test: Ohne Betriebssystem-Backend wird Polling verwendet."""
+        with patch.object(file_watcher.InotifyBackend, "__init__", side_effect=ImportError):
+            with patch.object(file_watcher.sys, "platform", "linux"):
+                assert file_watcher._detect_backend().name == "polling"
+
+    def test_idle_polling_backend_waits(self, tmp_path):
+        """Test: Ohne Änderungen liefert wait() nichts."""
+        backend = PollingBackend(interval=0.01)
+        backend.add_path(str(tmp_path / "x"))
+        assert backend.wait(0.01) == []
+
+
+class TestAutoSwitchRules:
+    """Tests für die Einbindung in AutoSwitchService."""
+
+    def test_rules_reloaded_only_after_event(self, tmp_path):
+        """Test: Ohne Ereignis kein stat() auf rules.json, nach Änderung neu geladen."""
+        from smartdesk.core.services import auto_switch_service
+
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps({"a.exe": "A"}))
+        file_watcher.set_file_watcher(FileWatcher(PollingBackend(interval=0.01), debounce=0.0))
+        try:
+            with patch.object(auto_switch_service, "RULES_FILE", str(rules_file)):
+                service = auto_switch_service.AutoSwitchService()
+                service._watch_rules()
+
+                with patch.object(auto_switch_service.os.path, "getmtime", wraps=os.path.getmtime) as getmtime:
+                    service._check_rules_file()
+                    assert getmtime.call_count == 0
+
+                rules_file.write_text(json.dumps({"b.exe": "B"}))
+                st = os.stat(rules_file)
+                os.utime(rules_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+                assert _wait_for(lambda: service._rules_changed)
+
+                service._check_rules_file()
+                assert service.get_rules() == {"b.exe": "B"}
+                service._unwatch_rules()
+        finally:
+            file_watcher.set_file_watcher(None)
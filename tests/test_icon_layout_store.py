@@ -0,0 +1,166 @@
+# Dateipfad: tests/test_icon_layout_store.py
+"""
+Unit-Tests für smartdesk.core.storage.icon_layout_store
+
+Testet:
+- Binärformat: Roundtrip, Unicode, negative Koordinaten, Fehlerfälle
+- Lesen per Memory-Mapping
+- Integration mit file_operations: schlanke desktops.json, Lazy Loading,
+  Migration des alten Inline-Formats, Bereinigung verwaister Layouts
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop, IconPosition
+from smartdesk.core.storage import file_operations, icon_layout_store
+from smartdesk.core.storage.file_operations import load_desktops, save_desktops, migrate_icon_layouts
+from smartdesk.core.storage.icon_layout_store import LayoutFormatError, decode_layout, encode_layout, read_layout
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """Gepatchter Pfad zur desktops.json in tmp_path."""
+    json_file = tmp_path / "desktops.json"
+    with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+        yield json_file
+
+
+def _layout_files(json_file):
+    layout_dir = json_file.parent / icon_layout_store.LAYOUT_DIR_NAME
+    return sorted(p.name for p in layout_dir.glob("*" + icon_layout_store.LAYOUT_SUFFIX)) if layout_dir.exists() else []
+
+
+class TestBinaryFormat:
+    """Tests für encode_layout()/decode_layout()."""
+
+    def test_roundtrip(self, sample_icons):
+        """Test: Kodieren und Dekodieren ergibt dieselben Icons."""
+        assert decode_layout(encode_layout(sample_icons)) == sample_icons
+
+    def test_empty_layout(self):
+        """Test: Leeres Layout ist gültig."""
+        assert decode_layout(encode_layout([])) == []
+
+    def test_unicode_and_negative_coordinates(self):
+        """Test: Unicode-Namen und negative Koordinaten (Mehrmonitor) bleiben erhalten."""
+        icons = [IconPosition(0, "Büro – Übersicht 📁", -1920, -40), IconPosition(7, "", 2**31 - 1, -(2**31))]
+        assert decode_layout(encode_layout(icons)) == icons
+
+    def test_wrong_magic_raises(self, sample_icons):
+        """Test: Fremde Dateien werden abgelehnt."""
+        payload = b"XXXX" + encode_layout(sample_icons)[4:]
+        with pytest.raises(LayoutFormatError):
+            decode_layout(payload)
+
+    def test_truncated_raises(self, sample_icons):
+        """Test: Abgeschnittene Dateien werden erkannt."""
+        with pytest.raises(LayoutFormatError):
+            decode_layout(encode_layout(sample_icons)[:-3])
+
+    def test_read_layout_via_mmap(self, tmp_path, sample_icons):
+        """Test: read_layout() liest eine geschriebene Datei."""
+        path = tmp_path / "test.sdl"
+        path.write_bytes(encode_layout(sample_icons))
+        assert read_layout(str(path)) == sample_icons
+
+    def test_read_empty_file_raises(self, tmp_path):
+        """Test: Leere Datei ergibt LayoutFormatError statt mmap-Fehler."""
+        path = tmp_path / "leer.sdl"
+        path.write_bytes(b"")
+        with pytest.raises(LayoutFormatError):
+            read_layout(str(path))
+
+
+class TestStorageIntegration:
+    """Tests für das Zusammenspiel mit save_desktops()/load_desktops()."""
+
+    def test_json_contains_only_reference(self, data_file, sample_desktops):
+        """Test: desktops.json enthält keine Inline-Icons mehr."""
+        save_desktops(sample_desktops)
+
+        data = json.loads(data_file.read_text(encoding="utf-8"))["desktops"]
+        assert all("icon_positionen" not in item for item in data)
+        assert data[0]["icon_layout"]
+        assert "icon_layout" not in data[2]  # Desktop ohne Icons braucht kein Layout
+
+    def test_icons_roundtrip(self, data_file, sample_desktops):
+        """Test: Icons überstehen Speichern und Laden."""
+        save_desktops(sample_desktops)
+        loaded = load_desktops()
+
+        for orig, restored in zip(sample_desktops, loaded):
+            assert restored.icon_positionen == orig.icon_positionen
+
+    def test_icons_are_loaded_lazily(self, data_file, sample_desktops):
+        """Test: Layout-Dateien werden erst beim Zugriff gelesen."""
+        save_desktops(sample_desktops)
+
+        with patch.object(icon_layout_store, "read_layout", wraps=icon_layout_store.read_layout) as spy:
+            loaded = load_desktops()
+            assert spy.call_count == 0
+            assert not loaded[0].icons_loaded
+
+            assert len(loaded[1].icon_positionen) == 2
+            loaded[1].icon_positionen
+            assert spy.call_count == 1
+
+    def test_identical_layouts_are_shared(self, data_file, sample_icons):
+        """Test: Gleiche Layouts landen in derselben Datei."""
+        save_desktops([Desktop("A", "C:\\A", icon_positionen=sample_icons), Desktop("B", "C:\\B", icon_positionen=sample_icons)])
+        assert len(_layout_files(data_file)) == 1
+
+    def test_changed_layout_replaces_file(self, data_file, sample_desktops):
+        """Test: Nach einer Änderung wird das alte Layout entfernt."""
+        save_desktops(sample_desktops)
+        before = _layout_files(data_file)
+
+        loaded = load_desktops()
+        loaded[0].icon_positionen = [IconPosition(0, "Neu", 1, 2)]
+        save_desktops(loaded)
+
+        after = _layout_files(data_file)
+        assert len(after) == len(before)
+        assert after != before
+        assert load_desktops()[0].icon_positionen == [IconPosition(0, "Neu", 1, 2)]
+
+    def test_missing_layout_file_gives_empty_icons(self, data_file, sample_desktops):
+        """Test: Fehlende Layout-Datei führt zu leerer Icon-Liste statt Absturz."""
+        save_desktops(sample_desktops)
+        for path in (data_file.parent / icon_layout_store.LAYOUT_DIR_NAME).iterdir():
+            path.unlink()
+
+        assert load_desktops()[0].icon_positionen == []
+
+
+class TestMigration:
+    """Tests für die Migration aus dem alten Inline-Format."""
+
+    def test_legacy_file_is_readable(self, data_file, sample_desktops_data):
+        """Test: Alte desktops.json mit Inline-Icons lässt sich weiterhin laden."""
+        data_file.write_text(json.dumps(sample_desktops_data), encoding="utf-8")
+
+        loaded = load_desktops()
+        assert len(loaded[1].icon_positionen) == 2
+
+    def test_migrate_icon_layouts(self, data_file, sample_desktops_data):
+        """Test: migrate_icon_layouts() verschiebt Inline-Icons in Layout-Dateien."""
+        data_file.write_text(json.dumps(sample_desktops_data), encoding="utf-8")
+
+        assert migrate_icon_layouts() == 2
+
+        data = json.loads(data_file.read_text(encoding="utf-8"))["desktops"]
+        assert all("icon_positionen" not in item for item in data)
+        assert len(_layout_files(data_file)) == 2
+        assert load_desktops()[1].icon_positionen[0].name == sample_desktops_data[1]["icon_positionen"][0]["name"]
+
+    def test_migrate_is_noop_afterwards(self, data_file, sample_desktops_data):
+        """Test: Eine zweite Migration hat nichts mehr zu tun."""
+        data_file.write_text(json.dumps(sample_desktops_data), encoding="utf-8")
+        migrate_icon_layouts()
+
+        with patch.object(file_operations, "write_atomic") as mock_write:
+            assert migrate_icon_layouts() == 0
+        mock_write.assert_not_called()
@@ -0,0 +1,254 @@
+# Dateipfad: tests/test_journal_engine.py
+"""
+Unit-Tests für smartdesk.core.storage.journal_engine
+
+Testet:
+- Roundtrip, Reihenfolge und Lazy Loading der Icon-Layouts
+- Ein Speichervorgang hängt nur die geänderten Desktops an
+- Umbenennen, Löschen, Icon-Update einzelner Desktops
+- Lesen nur des neuen Journal-Endes, abgebrochene letzte Zeile
+- Kompaktierung (auch im Hintergrund) und Schreiben aus zwei Instanzen
+- Auswahl der Engine über SMARTDESK_STORAGE_ENGINE
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop, IconPosition
+from smartdesk.core.storage import file_operations
+from smartdesk.core.storage.journal_engine import JournalStorageEngine, apply_ops, diff_ops, get_journal_path, replay_journal
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """desktops.json in tmp_path als Snapshot-Pfad."""
+    path = tmp_path / "desktops.json"
+    with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(path)):
+        yield path
+
+
+@pytest.fixture
+def engine(data_file):
+    return JournalStorageEngine()
+
+
+def _desktops(count=3, icons=2):
+    return [
+        Desktop(
+            f"Desktop {i}",
+            f"C:\\Desktops\\D{i}",
+            i == 0,
+            icon_positionen=[IconPosition(j, f"Icon {j}", j * 10, i) for j in range(icons)],
+        )
+        for i in range(count)
+    ]
+
+
+def _journal_lines(data_file):
+    path = get_journal_path(str(data_file))
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestDiff:
+    """Tests für diff_ops/apply_ops."""
+
+    def test_diff_applies_to_target(self):
+        """Test: apply_ops(diff_ops(a, b)) ergibt b inkl. Reihenfolge."""
+        state = {name: {"name": name, "v": 1} for name in ("A", "B", "C")}
+        target = [{"name": "C", "v": 1}, {"name": "X", "v": 1}, {"name": "A", "v": 2}]
+
+        apply_ops(state, diff_ops(state, target))
+
+        assert list(state.values()) == target
+
+    def test_no_changes_no_ops(self):
+        """Test: Unveränderter Stand erzeugt keine Operationen."""
+        state = {"A": {"name": "A"}, "B": {"name": "B"}}
+        assert diff_ops(state, [{"name": "A"}, {"name": "B"}]) == []
+
+    def test_replay_is_idempotent(self):
+        """Test: Doppeltes Anwenden (Absturz während Kompaktierung) ändert nichts."""
+        state = {"A": {"name": "A"}, "B": {"name": "B"}}
+        ops = diff_ops(state, [{"name": "B", "x": 1}, {"name": "C"}])
+        apply_ops(state, ops)
+        once = list(state.values())
+        apply_ops(state, ops)
+        assert list(state.values()) == once
+
+
+class TestJournalEngine:
+    """Tests für Lesen und Schreiben über Snapshot + Journal."""
+
+    def test_roundtrip(self, engine):
+        """Test: Geschriebene Desktops werden inkl. Icons und Reihenfolge gelesen."""
+        engine.write_desktops(_desktops())
+
+        desktops, signature = JournalStorageEngine().read_desktops()
+
+        assert [d.name for d in desktops] == ["Desktop 0", "Desktop 1", "Desktop 2"]
+        assert not desktops[1].icons_loaded
+        assert desktops[1].icon_positionen == [IconPosition(0, "Icon 0", 0, 1), IconPosition(1, "Icon 1", 10, 1)]
+        assert signature is not None
+
+    def test_switch_appends_only_changed_desktops(self, engine, data_file):
+        """Test: is_active-Wechsel hängt genau zwei put-Operationen an, desktops.json bleibt."""
+        desktops = _desktops(count=20, icons=50)
+        engine.write_desktops(desktops)
+        engine.compact()
+        snapshot = data_file.read_bytes()
+
+        desktops[0].is_active = False
+        desktops[5].is_active = True
+        engine.write_desktops(desktops)
+
+        lines = _journal_lines(data_file)
+        assert len(lines) == 1
+        assert [(op[0], op[1]["name"]) for op in lines[0]["ops"]] == [("put", "Desktop 0"), ("put", "Desktop 5")]
+        assert "icon_positionen" not in lines[0]["ops"][0][1]
+        assert data_file.read_bytes() == snapshot
+
+    def test_identical_save_skipped(self, engine, data_file):
+        """Test: Unveränderte Desktops schreiben nichts ins Journal."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+        size = (data_file.parent / "desktops.journal").stat().st_size
+
+        engine.write_desktops(desktops)
+
+        assert (data_file.parent / "desktops.journal").stat().st_size == size
+
+    def test_rename_and_delete(self, engine):
+        """Test: Umbenennen und Löschen bleiben beim Lesen erhalten."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+
+        desktops[1].name = "Neu"
+        del desktops[2]
+        engine.write_desktops(desktops)
+
+        loaded, _ = JournalStorageEngine().read_desktops()
+        assert [d.name for d in loaded] == ["Desktop 0", "Neu"]
+        assert loaded[1].icon_positionen == [IconPosition(0, "Icon 0", 0, 1), IconPosition(1, "Icon 1", 10, 1)]
+
+    def test_update_icon_layout(self, engine):
+        """Test: update_icon_layout ändert nur den einen Desktop."""
+        engine.write_desktops(_desktops())
+
+        assert engine.update_icon_layout("Desktop 2", [IconPosition(0, "Neu", 1, 2)])
+        assert not engine.update_icon_layout("Fehlt", [])
+
+        loaded = JournalStorageEngine().get_desktop("Desktop 2")
+        assert loaded.icon_positionen == [IconPosition(0, "Neu", 1, 2)]
+
+    def test_reader_replays_only_tail(self, engine):
+        """Test: Ein zweiter Leser parst den Snapshot nur einmal und liest dann das Journal-Ende."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+        reader = JournalStorageEngine()
+        reader.read_desktops()
+
+        desktops[0].is_active = False
+        desktops[1].is_active = True
+        engine.write_desktops(desktops)
+        loaded, _ = reader.read_desktops()
+
+        assert reader.snapshot_loads == 1
+        assert [d.is_active for d in loaded] == [False, True, False]
+
+    def test_torn_tail_ignored_and_repaired(self, engine, data_file):
+        """Test: Eine abgebrochene letzte Zeile wird ignoriert und vor dem Anhängen abgeschnitten."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+        with open(get_journal_path(str(data_file)), "ab") as f:
+            f.write(b'{"ops": [["del", "Desk')
+
+        writer = JournalStorageEngine()
+        loaded, _ = writer.read_desktops()
+        assert len(loaded) == 3
+
+        loaded[2].is_active = True
+        writer.write_desktops(loaded)
+
+        assert len(_journal_lines(data_file)) == 2
+        reread, _ = JournalStorageEngine().read_desktops()
+        assert [d.is_active for d in reread] == [True, False, True]
+
+
+class TestCompaction:
+    """Tests für die Kompaktierung."""
+
+    def test_compact_folds_journal_into_snapshot(self, engine, data_file):
+        """Test: Nach compact() steht alles in desktops.json, das Journal ist leer."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+        desktops[2].name = "Umbenannt"
+        engine.write_desktops(desktops)
+
+        assert engine.compact()
+        assert not engine.compact()
+
+        assert (data_file.parent / "desktops.journal").stat().st_size == 0
+        snapshot, _ = file_operations.read_desktops_file(str(data_file))
+        assert [d.name for d in snapshot] == ["Desktop 0", "Desktop 1", "Umbenannt"]
+        assert snapshot[2].icon_positionen == [IconPosition(0, "Icon 0", 0, 2), IconPosition(1, "Icon 1", 10, 2)]
+
+    def test_background_compaction_over_threshold(self, data_file):
+        """Test: Überschreitet das Journal den Schwellwert, wird im Hintergrund kompaktiert."""
+        engine = JournalStorageEngine(compact_threshold=1)
+        desktops = _desktops()
+
+        engine.write_desktops(desktops)
+        engine.wait_for_compaction(5)
+
+        assert engine.compactions == 1
+        assert (data_file.parent / "desktops.journal").stat().st_size == 0
+        loaded, _ = JournalStorageEngine().read_desktops()
+        assert [d.name for d in loaded] == [d.name for d in desktops]
+
+    def test_other_instance_sees_compaction(self, engine):
+        """Test: Ein Leser mit altem Offset baut nach fremder Kompaktierung neu auf."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+        reader = JournalStorageEngine()
+        reader.read_desktops()
+
+        desktops[1].is_active = True
+        engine.write_desktops(desktops)
+        engine.compact()
+        desktops[2].is_active = True
+        engine.write_desktops(desktops)
+
+        loaded, _ = reader.read_desktops()
+        assert [d.is_active for d in loaded] == [True, True, True]
+
+    def test_replay_journal_for_external_readers(self, engine, data_file):
+        """Test: replay_journal liefert den Stand für Leser ohne Engine (Übersicht)."""
+        desktops = _desktops()
+        engine.write_desktops(desktops)
+        engine.compact()
+        desktops[0].is_active = False
+        engine.write_desktops(desktops)
+
+        records = json.loads(data_file.read_text(encoding="utf-8"))["desktops"]
+        result = replay_journal(records, get_journal_path(str(data_file)))
+
+        assert [r["is_active"] for r in result] == [False, False, False]
+
+
+class TestEngineSelection:
+    """Tests für die Auswahl über die Konfiguration."""
+
+    def test_env_selects_journal(self, data_file, monkeypatch):
+        """Test: SMARTDESK_STORAGE_ENGINE=journal wählt die Journal-Engine."""
+        monkeypatch.setenv(file_operations.STORAGE_ENGINE_ENV, "journal")
+        file_operations.set_storage_engine(None)
+        try:
+            assert file_operations.get_storage_engine().name == "journal"
+            assert file_operations.save_desktops(_desktops())
+            assert [d.name for d in file_operations.load_desktops()] == ["Desktop 0", "Desktop 1", "Desktop 2"]
+        finally:
+            monkeypatch.delenv(file_operations.STORAGE_ENGINE_ENV)
+            file_operations.set_storage_engine(None)
@@ -0,0 +1,142 @@
+# Dateipfad: tests/test_listview_session.py
+"""
+Unit-Tests für ListViewSession und Win32ListView (icon_service.py)
+
+Testet gegen SimulatedWin32Api (platform/simulated_win32.py):
+- Namen und Positionen, auch negative Koordinaten, Umlaute, Emoji, lange Namen
+- Wiederverwendung von Prozess-Handle und Arena über mehrere Lesevorgänge
+- Neue Sitzung nach Explorer-Neustart (neue PID) und nach Lesefehlern
+- Setzen von Positionen
+
+conftest.py ersetzt ctypes durch einen Platzhalter; die Sitzung kopiert
+aber echte Strukturen und Puffer. Die Module werden deshalb mit dem
+echten ctypes neu importiert.
+"""
+
+import importlib
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+from smartdesk.core.models.desktop import IconPosition
+
+ITEMS = [("bericht.docx", 0, 0), ("Übersicht 😀.lnk", -120, 340), ("notizen.txt", 75, -3)]
+
+
+@pytest.fixture
+def modules(monkeypatch):
+    """icon_service und simulated_win32 mit echtem ctypes (nach dem Test wiederhergestellt)."""
+    import smartdesk.core.services
+    import smartdesk.platform
+
+    for name in ("ctypes", "ctypes.util", "ctypes.wintypes", "smartdesk.core.services.icon_service", "smartdesk.platform.simulated_win32"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    import ctypes
+
+    monkeypatch.setattr(ctypes, "windll", MagicMock(), raising=False)
+    monkeypatch.setattr(smartdesk.core.services, "icon_service", None, raising=False)
+    monkeypatch.setattr(smartdesk.platform, "simulated_win32", None, raising=False)
+    icon_service = importlib.import_module("smartdesk.core.services.icon_service")
+    simulated_win32 = importlib.import_module("smartdesk.platform.simulated_win32")
+    return icon_service, simulated_win32
+
+
+@pytest.fixture
+def api(modules):
+    return modules[1].SimulatedWin32Api(ITEMS)
+
+
+@pytest.fixture
+def listview(modules, api):
+    listview = modules[0].Win32ListView(api)
+    yield listview
+    listview.close()
+
+
+class TestListViewSession:
+    """Lesen über eine Sitzung im Speicher des Explorers."""
+
+    def test_reads_names_and_positions(self, api, listview):
+        """Test: Namen und Positionen kommen vollständig an, auch negative Koordinaten und Emoji."""
+        assert listview.read_items(api.handle) == [IconPosition(index=i, name=name, x=x, y=y) for i, (name, x, y) in enumerate(ITEMS)]
+
+    def test_session_is_reused(self, api, listview):
+        """Test: Prozess und Arena werden einmal geöffnet; je Icon genau ein ReadProcessMemory."""
+        for _ in range(3):
+            assert len(listview.read_items(api.handle)) == 3
+
+        assert api.calls["OpenProcess"] == 1
+        assert api.calls["VirtualAllocEx"] == 1
+        assert api.calls["VirtualFreeEx"] == 0
+        assert api.calls["ReadProcessMemory"] == 3 * len(ITEMS)
+        assert api.calls["WriteProcessMemory"] == 3
+        assert listview.session(api.handle).reads == 3
+
+    def test_explorer_restart_opens_new_session(self, api, listview):
+        """Test: Nach einem Explorer-Neustart (neue PID) wird die alte Sitzung verworfen und eine neue geöffnet."""
+        old = listview.session(api.handle)
+        listview.read_items(api.handle)
+
+        api.restart()
+        icons = listview.read_items(api.handle)
+
+        assert [icon.name for icon in icons] == [name for name, _, _ in ITEMS]
+        assert old.closed
+        assert listview.session(api.handle) is not old
+        assert listview.session(api.handle).pid == api.pid
+        assert api.calls["OpenProcess"] == 2
+        assert api.allocations == 1
+
+    def test_read_failure_closes_session(self, api, listview):
+        """Test: Schlägt das Lesen fehl, gibt es [] und die Sitzung wird geschlossen; danach eine neue."""
+        old = listview.session(api.handle)
+        api.fail_reads = True
+
+        assert listview.read_items(api.handle) == []
+        assert old.closed
+        assert api.allocations == 0 and api.open_handles == 0
+
+        api.fail_reads = False
+        assert len(listview.read_items(api.handle)) == 3
+        assert api.calls["OpenProcess"] == 2
+
+    def test_open_failure(self, modules, api, listview):
+        """Test: Lässt sich der Prozess nicht öffnen, gibt es keine Sitzung und keine Icons."""
+        api.open_process = lambda access, inherit, pid: 0
+
+        assert listview.read_items(api.handle) == []
+        assert listview.session(api.handle) is None
+        with pytest.raises(OSError):
+            modules[0].ListViewSession(api, api.pid)
+
+    def test_long_names_are_truncated(self, modules):
+        """Test: Namen über 259 Zeichen werden auf die Puffergröße gekürzt."""
+        api = modules[1].SimulatedWin32Api([("x" * 400, 5, 6)])
+        listview = modules[0].Win32ListView(api)
+
+        (icon,) = listview.read_items(api.handle)
+        listview.close()
+
+        assert icon.name == "x" * 259
+        assert (icon.x, icon.y) == (5, 6)
+
+    def test_close_releases_memory(self, api, listview):
+        """Test: close() gibt Arena und Prozess-Handle frei, mehrfach aufrufbar."""
+        listview.read_items(api.handle)
+        session = listview.session(api.handle)
+
+        session.close()
+        session.close()
+
+        assert session.closed
+        assert api.allocations == 0 and api.open_handles == 0
+        with pytest.raises(OSError):
+            session.read_items(api.handle, 3)
+
+    def test_set_item_position(self, api, listview):
+        """Test: set_item_position() verschiebt das Icon im ListView, auch auf negative Koordinaten."""
+        assert listview.set_item_position(api.handle, 1, -40, 900) is True
+
+        assert api.items[1][1:] == [-40, 900]
+        assert listview.read_items(api.handle)[1].x == -40
@@ -0,0 +1,23 @@
+# Dateipfad: tests/test_localization.py
+"""
+Unit-Tests für get_text (localization.py)
+
+Testet, dass die Textbausteine der Watcher-Fallbacks aufgelöst und
+formatiert werden (statt "<... nicht gefunden>" ins Log zu schreiben).
+"""
+
+import pytest
+
+from smartdesk.shared.localization import get_text
+
+
+class TestWatchErrorTexts:
+    """Warnungen, wenn ein Datei-Watcher nicht eingerichtet werden kann."""
+
+    @pytest.mark.parametrize("key", ["gui.overview.watch_error", "gui.control_panel.watch_error", "gui.main.tray.log.watch_error"])
+    def test_key_resolves(self, key):
+        """Test: Der Schlüssel existiert und übernimmt die Fehlermeldung."""
+        text = get_text(key, e="kein Backend")
+
+        assert not text.startswith("<")
+        assert "kein Backend" in text
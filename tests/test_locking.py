@@ -0,0 +1,376 @@
+# Dateipfad: tests/test_locking.py
+"""
+Unit-Tests für smartdesk.core.storage.locking
+
+Testet:
+- Gleichzeitige Lese-Locks, exklusive Schreib-Locks
+- Blockierendes Warten und Timeout
+- Reentranz innerhalb eines Threads
+- Automatische Freigabe beim Tod des Halters
+- Fallback-Backend (O_EXCL-Lock-Datei)
+- Lock-Besitzer, Lease und Übernahme verwaister Locks
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.storage import locking
+from smartdesk.core.storage.locking import (
+    ExclusiveFileBackend,
+    LockOwner,
+    file_lock,
+    get_lock_stats,
+    is_owner_alive,
+    reset_lock_stats,
+    set_lock_backend,
+)
+
+fcntl = pytest.importorskip("fcntl")
+
+
+@pytest.fixture
+def lock_path(tmp_path):
+    """Pfad einer Lock-Datei; das Backend wird nach dem Test zurückgesetzt."""
+    reset_lock_stats()
+    yield str(tmp_path / "test.lock")
+    set_lock_backend(None)
+
+
+def _hold_in_thread(lock_path, shared, release_event, acquired_event):
+    def run():
+        with file_lock(lock_path, shared=shared):
+            acquired_event.set()
+            release_event.wait(5)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    assert acquired_event.wait(2)
+    return thread
+
+
+class TestSharedExclusive:
+    """Tests für die Reader/Writer-Semantik."""
+
+    def test_readers_do_not_block_each_other(self, lock_path):
+        """Test: Zwei Lese-Locks können gleichzeitig gehalten werden."""
+        release, acquired = threading.Event(), threading.Event()
+        thread = _hold_in_thread(lock_path, True, release, acquired)
+
+        start = time.monotonic()
+        with file_lock(lock_path, timeout=1, shared=True):
+            elapsed = time.monotonic() - start
+
+        release.set()
+        thread.join()
+        assert elapsed < 0.5
+
+    def test_writer_blocks_reader(self, lock_path):
+        """Test: Ein Schreib-Lock schließt Leser aus (Timeout)."""
+        release, acquired = threading.Event(), threading.Event()
+        thread = _hold_in_thread(lock_path, False, release, acquired)
+
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.1, shared=True):
+                pass
+
+        release.set()
+        thread.join()
+
+    def test_reader_blocks_writer(self, lock_path):
+        """Test: Ein Lese-Lock schließt Schreiber aus (Timeout)."""
+        release, acquired = threading.Event(), threading.Event()
+        thread = _hold_in_thread(lock_path, True, release, acquired)
+
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.1):
+                pass
+
+        release.set()
+        thread.join()
+
+    def test_waiter_wakes_on_release(self, lock_path):
+        """Test: Wartender Schreiber bekommt das Lock kurz nach der Freigabe."""
+        release, acquired = threading.Event(), threading.Event()
+        thread = _hold_in_thread(lock_path, False, release, acquired)
+
+        threading.Timer(0.1, release.set).start()
+        start = time.monotonic()
+        with file_lock(lock_path, timeout=5):
+            elapsed = time.monotonic() - start
+
+        thread.join()
+        assert 0.05 < elapsed < 1.0
+
+    def test_waiting_writer_blocks_new_readers(self, lock_path):
+        """Test: Wartet ein Schreiber, müssen neue Leser hinter ihm warten."""
+        release, acquired = threading.Event(), threading.Event()
+        reader = _hold_in_thread(lock_path, True, release, acquired)
+
+        writer_waiting = threading.Thread(target=lambda: _try_lock(lock_path, timeout=1), daemon=True)
+        writer_waiting.start()
+        time.sleep(0.05)
+
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.1, shared=True):
+                pass
+
+        release.set()
+        reader.join()
+        writer_waiting.join()
+
+    def test_abandoned_waiter_releases_lock(self, lock_path):
+        """Test: Nach einem Timeout blockiert der Hilfsthread das Lock nicht dauerhaft."""
+        release, acquired = threading.Event(), threading.Event()
+        thread = _hold_in_thread(lock_path, False, release, acquired)
+
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.05):
+                pass
+
+        release.set()
+        thread.join()
+
+        with file_lock(lock_path, timeout=1):
+            pass
+
+
+class TestReentrancy:
+    """Tests für verschachtelte Locks im selben Thread."""
+
+    def test_nested_exclusive(self, lock_path):
+        """Test: Verschachteltes exklusives Lock blockiert nicht."""
+        with file_lock(lock_path, timeout=0.5):
+            with file_lock(lock_path, timeout=0.5, shared=True):
+                pass
+
+    def test_upgrade_raises(self, lock_path):
+        """Test: shared -> exklusiv im selben Thread wird abgelehnt statt zu verklemmen."""
+        with file_lock(lock_path, shared=True):
+            with pytest.raises(RuntimeError):
+                with file_lock(lock_path):
+                    pass
+
+
+class TestCrashRecovery:
+    """Tests für das Verhalten bei abgestürzten Haltern."""
+
+    def test_lock_released_when_holder_dies(self, lock_path):
+        """Test: Das OS gibt das Lock eines beendeten Prozesses frei."""
+        holder = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import fcntl, os, sys, time\n"
+                f"fd = os.open({lock_path!r}, os.O_RDWR | os.O_CREAT)\n"
+                "fcntl.flock(fd, fcntl.LOCK_EX)\n"
+                "print('locked', flush=True)\n"
+                "time.sleep(30)\n",
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            assert holder.stdout.readline().strip() == "locked"
+
+            with pytest.raises(TimeoutError):
+                with file_lock(lock_path, timeout=0.1):
+                    pass
+
+            holder.kill()
+            holder.wait()
+
+            start = time.monotonic()
+            with file_lock(lock_path, timeout=2):
+                pass
+            assert time.monotonic() - start < 0.5
+        finally:
+            holder.kill()
+            holder.wait()
+            holder.stdout.close()
+
+    def test_lock_file_is_kept(self, lock_path):
+        """Test: Die Lock-Datei bleibt bestehen (kein Lösch-Rennen)."""
+        with file_lock(lock_path):
+            pass
+        assert os.path.exists(lock_path)
+
+
+class TestExclusiveFileBackend:
+    """Tests für das O_EXCL-Fallback."""
+
+    def test_fallback_excludes_and_cleans_up(self, lock_path):
+        """Test: Fallback schließt aus und entfernt die Lock-Datei danach."""
+        set_lock_backend(ExclusiveFileBackend())
+
+        with file_lock(lock_path):
+            assert os.path.exists(lock_path)
+            result = []
+            thread = threading.Thread(target=lambda: result.append(_try_lock(lock_path)))
+            thread.start()
+            thread.join()
+            assert result == [False]
+
+        assert not os.path.exists(lock_path)
+
+    def test_detect_backend_on_posix(self):
+        """Test: Auf POSIX wird flock verwendet."""
+        assert isinstance(locking._detect_backend(), locking.FcntlLockBackend)
+
+
+def _try_lock(lock_path, timeout=0.05):
+    try:
+        with file_lock(lock_path, timeout=timeout):
+            return True
+    except TimeoutError:
+        return False
+
+
+def _dead_pid():
+    """PID eines bereits beendeten Prozesses."""
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _write_owner(path, owner):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(owner.to_json())
+
+
+class TestLockOwner:
+    """Tests für LockOwner und die Lebend-Prüfung."""
+
+    def test_json_roundtrip(self):
+        """Test: Besitzer-Eintrag übersteht Serialisierung."""
+        owner = LockOwner.current()
+        assert LockOwner.from_json(owner.to_json()) == owner
+
+    def test_invalid_json_returns_none(self):
+        """Test: Ungültiger Inhalt ergibt None statt Exception."""
+        assert LockOwner.from_json("") is None
+        assert LockOwner.from_json('{"pid": "x"}') is None
+
+    def test_own_process_is_alive(self):
+        """Test: Der eigene Prozess gilt als lebendig."""
+        assert is_owner_alive(LockOwner.current())
+
+    def test_dead_process(self):
+        """Test: Beendeter Prozess gilt als tot."""
+        assert not is_owner_alive(LockOwner(pid=_dead_pid(), create_time=0.0, acquired_at=time.time()))
+
+    def test_reused_pid_is_detected(self):
+        """Test: Gleiche PID mit anderer Startzeit gilt als tot (PID-Wiederverwendung)."""
+        sleeper = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        try:
+            assert not is_owner_alive(LockOwner(pid=sleeper.pid, create_time=1.0, acquired_at=time.time()))
+        finally:
+            sleeper.kill()
+            sleeper.wait()
+
+    def test_lease_expiry(self):
+        """Test: Lease läuft nach acquired_at + lease ab."""
+        owner = LockOwner(pid=1, create_time=0.0, acquired_at=100.0, lease=5.0)
+        assert not owner.is_expired(now=104.0)
+        assert owner.is_expired(now=106.0)
+
+
+class TestStaleLockRecovery:
+    """Tests für die Übernahme verwaister Locks im O_EXCL-Fallback."""
+
+    def test_lock_file_records_owner(self, lock_path):
+        """Test: Die Lock-Datei enthält den aktuellen Prozess als Besitzer."""
+        set_lock_backend(ExclusiveFileBackend())
+
+        with file_lock(lock_path):
+            owner = locking.read_owner(lock_path)
+
+        assert owner.pid == os.getpid()
+
+    def test_dead_owner_is_taken_over(self, lock_path):
+        """Test: Lock eines toten Besitzers wird sofort übernommen."""
+        set_lock_backend(ExclusiveFileBackend())
+        _write_owner(lock_path, LockOwner(pid=_dead_pid(), create_time=0.0, acquired_at=time.time()))
+
+        start = time.monotonic()
+        with file_lock(lock_path, timeout=2):
+            elapsed = time.monotonic() - start
+
+        assert elapsed < 0.1
+        assert get_lock_stats().recoveries == 1
+
+    def test_expired_lease_is_taken_over(self, lock_path):
+        """Test: Lock eines hängenden Besitzers wird nach Ablauf der Lease übernommen."""
+        set_lock_backend(ExclusiveFileBackend())
+        _write_owner(lock_path, LockOwner(pid=os.getpid(), create_time=LockOwner.current().create_time, acquired_at=time.time() - 60))
+
+        with file_lock(lock_path, timeout=1):
+            pass
+
+        assert get_lock_stats().recoveries == 1
+
+    def test_valid_owner_is_respected(self, lock_path):
+        """Test: Lock eines lebenden Besitzers mit gültiger Lease wird nicht übernommen."""
+        set_lock_backend(ExclusiveFileBackend())
+        _write_owner(lock_path, LockOwner.current())
+
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.1):
+                pass
+
+        stats = get_lock_stats()
+        assert stats.recoveries == 0
+        assert stats.timeouts == 1
+
+    def test_legacy_empty_lock_file(self, lock_path):
+        """Test: Alte, leere Lock-Datei wird erst nach Ablauf der Lease übernommen."""
+        set_lock_backend(ExclusiveFileBackend(lease=5.0))
+        open(lock_path, "w").close()
+
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.05):
+                pass
+
+        os.utime(lock_path, (time.time() - 60, time.time() - 60))
+        with file_lock(lock_path, timeout=1):
+            pass
+        assert get_lock_stats().recoveries == 1
+
+
+class TestOwnerRecordWithOsLocks:
+    """Tests für den Besitzer-Eintrag bei OS-Locks."""
+
+    def test_owner_file_exists_only_while_held(self, lock_path):
+        """Test: <lock>.owner existiert nur während ein Schreiber das Lock hält."""
+        with file_lock(lock_path):
+            assert locking.read_owner(lock_path + ".owner").pid == os.getpid()
+        assert not os.path.exists(lock_path + ".owner")
+
+    def test_crashed_holder_is_counted(self, lock_path):
+        """Test: Hinterlassener Eintrag eines toten Halters zählt als Übernahme."""
+        _write_owner(lock_path + ".owner", LockOwner(pid=_dead_pid(), create_time=0.0, acquired_at=time.time()))
+
+        with file_lock(lock_path, timeout=1):
+            pass
+
+        assert get_lock_stats().recoveries == 1
+
+    def test_timeout_reports_owner(self, lock_path):
+        """Test: Beim Timeout wird der Besitzer geloggt."""
+        release, acquired = threading.Event(), threading.Event()
+        thread = _hold_in_thread(lock_path, False, release, acquired)
+
+        with patch.object(locking.logger, "warning") as mock_warning:
+            with pytest.raises(TimeoutError):
+                with file_lock(lock_path, timeout=0.05):
+                    pass
+
+        release.set()
+        thread.join()
+        assert str(os.getpid()) in mock_warning.call_args[0][0]
@@ -5,9 +5,14 @@ Unit-Tests für smartdesk.models.desktop
 Testet die Serialisierung und Deserialisierung von:
 - IconPosition
 - Desktop
+
+sowie den zwischengespeicherten Pfad-Schlüssel und die DesktopList-Indizes.
 """
 
-from smartdesk.core.models.desktop import Desktop, IconPosition
+from unittest.mock import patch
+
+from smartdesk.core.models import desktop as desktop_module
+from smartdesk.core.models.desktop import Desktop, DesktopList, IconPosition
 
 
 class TestIconPosition:
@@ -193,3 +198,166 @@ class TestDesktop:
         """Test: Nur ein Desktop sollte aktiv sein."""
         active_count = sum(1 for d in sample_desktops if d.is_active)
         assert active_count == 1
+
+    def test_desktop_copy_is_independent(self, sample_desktop):
+        """Test: copy() liefert ein unabhängiges Objekt, auch die Icons werden nicht geteilt."""
+        clone = sample_desktop.copy()
+
+        assert clone == sample_desktop
+        assert clone is not sample_desktop
+        assert clone.icon_positionen is not sample_desktop.icon_positionen
+        assert clone.icon_positionen[0] is not sample_desktop.icon_positionen[0]
+
+        clone.is_active = not sample_desktop.is_active
+        assert clone.is_active != sample_desktop.is_active
+
+    def test_copy_does_not_alias_icons(self, sample_desktop):
+        """Test: Änderungen an den Icons der Kopie (auch in-place) erreichen das Original nicht."""
+        original = [icon.to_dict() for icon in sample_desktop.icon_positionen]
+        clone = sample_desktop.copy()
+
+        clone.icon_positionen[0].x = 9999
+        clone.icon_positionen.append(IconPosition(index=99, name="Neu", x=0, y=0))
+
+        assert [icon.to_dict() for icon in sample_desktop.icon_positionen] == original
+
+    def test_copy_keeps_lazy_loader(self):
+        """Test: Eine Kopie eines noch nicht geladenen Desktops lädt erst beim Zugriff."""
+        calls = []
+        desktop = Desktop(name="Lazy", path="C:\\Lazy")
+        desktop.attach_icon_loader(lambda: calls.append(1) or [IconPosition(index=0, name="A", x=1, y=2)])
+
+        clone = desktop.copy()
+        assert calls == [] and not clone.icons_loaded
+        assert clone.icon_positionen[0].name == "A"
+        assert not desktop.icons_loaded
+
+    def test_models_use_slots(self, sample_desktop, sample_icon):
+        """Test: Modelle haben kein Instanz-__dict__ (__slots__)."""
+        assert not hasattr(sample_desktop, "__dict__")
+        assert not hasattr(sample_icon, "__dict__")
+
+    def test_icon_loader_runs_once_on_access(self):
+        """Test: Angehängter Icon-Loader läuft erst beim ersten Zugriff und nur einmal."""
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [IconPosition(index=0, name="Lazy", x=1, y=2)]
+
+        desktop = Desktop(name="Lazy", path="C:\\Lazy")
+        desktop.attach_icon_loader(loader)
+        assert calls == []
+        assert not desktop.icons_dirty
+
+        assert desktop.icon_positionen[0].name == "Lazy"
+        desktop.icon_positionen
+        assert calls == [1]
+
+    def test_icon_assignment_marks_dirty(self):
+        """Test: Zuweisung an icon_positionen markiert die Icons als geändert."""
+        desktop = Desktop(name="Test", path="C:\\Test")
+        assert not desktop.icons_dirty
+
+        desktop.icon_positionen = [IconPosition(index=0, name="A", x=0, y=0)]
+        assert desktop.icons_dirty
+
+    def test_to_dict_without_icons(self, sample_desktop):
+        """Test: to_dict(include_icons=False) liefert nur Metadaten samt Layout-Referenz."""
+        sample_desktop.mark_icons_saved("abc123")
+        result = sample_desktop.to_dict(include_icons=False)
+
+        assert "icon_positionen" not in result
+        assert result["icon_layout"] == "abc123"
+
+
+class TestPathKey:
+    """Tests für den zwischengespeicherten Pfad-Schlüssel."""
+
+    def test_path_key_cached_until_path_changes(self):
+        """Test: path_key wird einmal berechnet und bei neuem Pfad verworfen."""
+        desktop = Desktop(name="Test", path="C:\\Test\\Arbeit")
+
+        with patch.object(desktop_module, "path_key", wraps=desktop_module.path_key) as spy:
+            assert desktop.path_key == "c:\\test\\arbeit"
+            assert desktop.path_key == "c:\\test\\arbeit"
+            assert spy.call_count == 1
+
+            desktop.path = "C:\\Neu"
+            assert desktop.path_key == "c:\\neu"
+            assert spy.call_count == 2
+
+    def test_copy_keeps_cached_key(self):
+        """Test: copy() übernimmt den berechneten Schlüssel."""
+        desktop = Desktop(name="Test", path="C:\\Test")
+        desktop.path_key
+
+        clone = desktop.copy()
+        with patch.object(desktop_module, "path_key") as spy:
+            assert clone.path_key == "c:\\test"
+            spy.assert_not_called()
+
+
+class TestDesktopList:
+    """Tests für die indizierte Desktop-Liste."""
+
+    def _list(self):
+        return DesktopList(
+            [
+                Desktop(name="A", path="C:\\A", is_active=True),
+                Desktop(name="B", path="C:\\B"),
+                Desktop(name="C", path="C:\\C"),
+            ]
+        )
+
+    def test_lookups(self):
+        """Test: Suche nach Name, Pfad (normalisiert) und aktivem Desktop."""
+        desktops = self._list()
+
+        assert desktops.get_by_name("B") is desktops[1]
+        assert desktops.get_by_path("c:\\c") is desktops[2]
+        assert desktops.get_active() is desktops[0]
+        assert desktops.get_by_name("X") is None
+
+    def test_rename_and_list_changes_are_seen(self):
+        """Test: Umbenennen, Pfadänderung, append und remove aktualisieren die Suche."""
+        desktops = self._list()
+        desktops.get_by_name("A")
+
+        desktops[1].name = "B2"
+        desktops[2].path = "C:\\Neu"
+        desktops.append(Desktop(name="D", path="C:\\D"))
+        desktops.remove(desktops[0])
+
+        assert desktops.get_by_name("B") is None
+        assert desktops.get_by_name("B2").path == "C:\\B"
+        assert desktops.get_by_path("C:\\Neu").name == "C"
+        assert desktops.get_by_name("D") is desktops[-1]
+        assert desktops.get_active() is None
+
+    def test_activation_after_empty_lookup_is_seen(self):
+        """Test: Wird nach einer Suche ohne aktiven Desktop einer direkt aktiviert, findet get_active ihn."""
+        desktops = self._list()
+        desktops[0].is_active = False
+        assert desktops.get_active() is None
+
+        desktops[1].is_active = True
+
+        assert desktops.get_active() is desktops[1]
+
+    def test_set_active(self):
+        """Test: set_active setzt genau einen Desktop aktiv und meldet Änderungen."""
+        desktops = self._list()
+        desktops[2].is_active = True  # inkonsistente Daten: zwei aktive
+
+        assert desktops.set_active(desktops[1]) is True
+        assert [d.is_active for d in desktops] == [False, True, False]
+        assert desktops.get_active() is desktops[1]
+        assert desktops.set_active(desktops[1]) is False
+
+    def test_of_wraps_plain_lists_only(self):
+        """Test: DesktopList.of übernimmt DesktopList unverändert."""
+        desktops = self._list()
+        assert DesktopList.of(desktops) is desktops
+        assert DesktopList.of(list(desktops)).get_by_name("A") is desktops[0]
+
@@ -0,0 +1,242 @@
+# Dateipfad: tests/test_platform_simulated.py
+"""
+Unit-Tests für die simulierte Plattform (smartdesk.platform)
+
+Testet:
+- Explorer und ListView: angezeigter Ordner aus der Registry, Neustart,
+  Aktualisieren ohne Neustart, veraltete Handles
+- icon_service, wallpaper_service und Explorer-Neustart über die Plattform
+- Lasttest über desktop_service: keine Verstöße, erkannte Fehler
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import IconPosition
+from smartdesk.core.registry import REG_EXPAND_SZ
+from smartdesk.platform import DesktopListView, SimulatedPlatform, WallpaperSetter, get_platform, restart_explorer
+from smartdesk.platform.loadtest import SwitchLoadTest, check_invariants
+from smartdesk.shared.config import KEY_USER_SHELL, VALUE_NAME
+
+
+def _folder(path, *names):
+    path.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (path / name).write_text(name)
+    return str(path)
+
+
+@pytest.fixture
+def folders(tmp_path):
+    return (
+        _folder(tmp_path / "Arbeit", "bericht.docx", "notizen.txt", ".versteckt"),
+        _folder(tmp_path / "Privat", "urlaub.jpg", "notizen.txt"),
+    )
+
+
+class TestSimulatedExplorer:
+    """Explorer und Desktop-ListView der Simulation."""
+
+    def test_shows_registry_folder(self, folders):
+        """Test: Das ListView zeigt die sichtbaren Einträge des Registry-Ordners, im Raster."""
+        platform = SimulatedPlatform(desktop_path=folders[0])
+
+        assert platform.explorer.shown_path == folders[0]
+        assert platform.listview.names() == ["bericht.docx", "notizen.txt"]
+        assert platform.listview.positions() == {"bericht.docx": (0, 0), "notizen.txt": (0, 100)}
+
+    def test_restart_reads_registry(self, folders):
+        """Test: Nach einem Neustart zeigt der Explorer den neuen Ordner mit neuer PID und neuem Handle."""
+        platform = SimulatedPlatform(desktop_path=folders[0])
+        pid, handle = platform.explorer.pid(), platform.listview.find()
+
+        platform.registry.write_value(KEY_USER_SHELL, VALUE_NAME, folders[1], REG_EXPAND_SZ)
+        assert platform.explorer.shown_path == folders[0]
+        platform.explorer.restart_explorer()
+
+        assert platform.explorer.shown_path == folders[1]
+        assert platform.explorer.pid() != pid
+        assert platform.listview.find() != handle
+        assert platform.listview.read_items(handle) == []
+        assert platform.listview.set_item_position(handle, 0, 5, 5) is False
+
+    def test_restart_latency(self, folders):
+        """Test: Während des Neustarts gibt es weder ListView noch PID."""
+        import threading
+
+        platform = SimulatedPlatform(desktop_path=folders[0], restart_latency=0.2)
+        thread = threading.Thread(target=platform.explorer.restart_explorer)
+        thread.start()
+        time.sleep(0.05)
+
+        assert platform.listview.find() is None
+        assert platform.explorer.pid() is None
+        assert platform.explorer.listview_items() is None
+        thread.join()
+        assert platform.listview.find() is not None
+
+    def test_soft_refresh_after_delay(self, folders):
+        """Test: Nach der Benachrichtigung zeigt der Explorer den neuen Ordner erst nach apply_delay."""
+        platform = SimulatedPlatform(desktop_path=folders[0], apply_delay=0.1)
+        handle = platform.listview.find()
+        platform.registry.write_value(KEY_USER_SHELL, VALUE_NAME, folders[1], REG_EXPAND_SZ)
+
+        platform.explorer.notify_shell_change(folders[1])
+        assert "bericht.docx" in platform.explorer.listview_items()
+        time.sleep(0.2)
+
+        assert platform.explorer.listview_items() == ["notizen.txt", "urlaub.jpg"]
+        assert platform.listview.find() == handle
+        assert platform.explorer.restart_calls == 0
+
+    def test_ignored_notification(self, folders):
+        """Test: soft_refresh_works=False -> Benachrichtigung ohne Wirkung."""
+        platform = SimulatedPlatform(desktop_path=folders[0], soft_refresh_works=False)
+        platform.registry.write_value(KEY_USER_SHELL, VALUE_NAME, folders[1], REG_EXPAND_SZ)
+
+        platform.explorer.notify_shell_change(folders[1])
+
+        assert platform.explorer.shown_path == folders[0]
+        assert platform.explorer.notify_calls == 1
+
+    def test_items_load_asynchronously(self, folders):
+        """Test: Bis load_delay vergangen ist, meldet das ListView keine Icons."""
+        platform = SimulatedPlatform(desktop_path=folders[0], load_delay=0.1)
+        handle = platform.listview.find()
+
+        assert platform.listview.item_count(handle) == 0
+        time.sleep(0.15)
+        assert platform.listview.item_count(handle) == 2
+
+
+def _protocol_members(protocol):
+    return sorted(name for name in vars(protocol) if not name.startswith("_"))
+
+
+class TestBackendProtocols:
+    """Native und simulierte Backends stellen dieselben Operationen bereit."""
+
+    @pytest.mark.parametrize("protocol, module, native, simulated", [
+        (DesktopListView, "smartdesk.core.services.icon_service", "Win32ListView", "SimulatedListView"),
+        (WallpaperSetter, "smartdesk.core.services.wallpaper_service", "Win32Wallpaper", "SimulatedWallpaper"),
+    ])
+    def test_backends_implement_protocol(self, protocol, module, native, simulated):
+        """Test: Jede Methode des Protocols existiert auf dem Win32- und dem simulierten Backend."""
+        import importlib
+
+        import smartdesk.platform
+
+        for backend in (getattr(importlib.import_module(module), native), getattr(smartdesk.platform, simulated)):
+            missing = [name for name in _protocol_members(protocol) if not callable(getattr(backend, name, None))]
+            assert missing == [], f"{backend.__name__}: {missing}"
+
+
+class TestServicesOnPlatform:
+    """icon_service, wallpaper_service und Explorer-Neustart gegen die Simulation."""
+
+    @pytest.fixture
+    def platform(self, folders):
+        platform = SimulatedPlatform(desktop_path=folders[0])
+        with platform.installed():
+            yield platform
+
+    def test_installed(self, platform):
+        """Test: installed() setzt die Plattform prozessweit ein, danach gilt wieder der Standard."""
+        from smartdesk.core.registry import get_cached_value
+        from smartdesk.core.shell import get_shell_refresher
+
+        assert get_platform() is platform
+        assert get_shell_refresher().backend is platform.shell
+        assert get_cached_value(KEY_USER_SHELL, VALUE_NAME) == platform.explorer.shown_path
+
+    def test_read_and_restore_icons(self, platform):
+        """Test: Icons werden über das ListView gelesen und per Namen wiederhergestellt."""
+        from smartdesk.core.services import icon_service
+
+        icons = icon_service.get_current_icon_positions()
+        assert [(icon.index, icon.name) for icon in icons] == [(0, "bericht.docx"), (1, "notizen.txt")]
+
+        icon_service.set_icon_positions([IconPosition(index=7, name="notizen.txt", x=640, y=320), IconPosition(index=0, name="fehlt.txt", x=1, y=1)])
+
+        assert platform.listview.positions()["notizen.txt"] == (640, 320)
+        assert platform.listview.positions()["bericht.docx"] == (0, 0)
+        assert platform.listview.redraws == 1
+
+    def test_set_wallpaper(self, platform, tmp_path):
+        """Test: set_wallpaper() setzt das Bild über die Plattform."""
+        from smartdesk.core.services import wallpaper_service
+
+        image = tmp_path / "bild.png"
+        image.write_bytes(b"png")
+
+        assert wallpaper_service.set_wallpaper(str(image)) is True
+        assert platform.wallpaper.current == str(image)
+        assert wallpaper_service.set_wallpaper(str(tmp_path / "fehlt.png")) is False
+        assert platform.wallpaper.apply_calls == 1
+
+    def test_restart_explorer(self, platform):
+        """Test: restart_explorer() startet den Explorer der Plattform neu."""
+        restart_explorer()
+
+        assert platform.explorer.restart_calls == 1
+
+
+class TestLoadTest:
+    """Lasttest über desktop_service gegen die Simulation."""
+
+    @pytest.fixture
+    def root(self, tmp_path, simulated_environment):
+        """Ordner, unter dem der Lasttest seine Desktops anlegt."""
+        root = tmp_path / "desktops"
+        root.mkdir()
+        return str(root)
+
+    def test_random_operations_keep_invariants(self, root):
+        """Test: Zufällige Wechsel, Neuanlagen, Löschungen usw. verletzen keine Invariante."""
+        platform = SimulatedPlatform()
+
+        report = SwitchLoadTest(platform, root, seed=7).run(80)
+
+        assert report.violations == []
+        assert report.results["switch"].get("ok", 0) > 10
+        assert report.latency("switch").count == sum(report.results["switch"].values())
+        assert report.stage_latency("explorer_restart").count == report.results["switch"]["ok"]
+        assert get_platform() is not platform
+
+    def test_restart_mode(self, root, simulated_environment):
+        """Test: Mit explorer_refresh_mode = "restart" startet jeder Wechsel den simulierten Explorer neu."""
+        simulated_environment["explorer_refresh_mode"] = "restart"
+        platform = SimulatedPlatform()
+
+        report = SwitchLoadTest(platform, root, seed=3, weights={"switch": 1}).run(15)
+
+        assert report.violations == []
+        assert report.explorer_restarts == report.results["switch"]["ok"]
+
+    def test_detects_missing_icon_restore(self, root):
+        """Test: Stellt der Wechsel die Icons nicht wieder her, meldet der Lasttest Verstöße."""
+        platform = SimulatedPlatform()
+
+        with patch("smartdesk.core.services.desktop_service.set_icon_positions"):
+            report = SwitchLoadTest(platform, root, seed=3, weights={"switch": 3, "arrange": 2}, max_icons=5).run(60)
+
+        assert report.violations
+        assert all("nicht wiederhergestellt" in v.message for v in report.violations)
+
+    def test_invariants_detect_stale_explorer(self, folders):
+        """Test: Zeigt der Explorer nach einem Registry-Wechsel noch den alten Ordner, ist das ein Verstoß."""
+        from smartdesk.core.models.desktop import Desktop
+        from smartdesk.shared.config import KEY_LEGACY_SHELL
+
+        platform = SimulatedPlatform(desktop_path=folders[0])
+        desktops = [Desktop(name="Arbeit", path=folders[0]), Desktop(name="Privat", path=folders[1], is_active=True)]
+        assert check_invariants(platform, desktops) == [f"Aktiver Desktop 'Privat' ({folders[1]}) != Registry {folders[0]!r}"]
+
+        platform.registry.write_value(KEY_USER_SHELL, VALUE_NAME, folders[1], REG_EXPAND_SZ)
+        platform.registry.write_value(KEY_LEGACY_SHELL, VALUE_NAME, folders[1])
+
+        assert check_invariants(platform, desktops) == [f"Explorer zeigt {folders[0]!r} statt {folders[1]!r}"]
+        platform.explorer.restart_explorer()
+        assert check_invariants(platform, desktops) == []
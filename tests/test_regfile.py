@@ -0,0 +1,173 @@
+# Dateipfad: tests/test_regfile.py
+"""
+Unit-Tests für smartdesk.core.registry.regfile
+
+Testet:
+- Parsen von REG_SZ (mit Escapes) und REG_EXPAND_SZ (hex(2), auch umbrochen)
+- Dateien aus build_backup_content() und aus der Zeit vor dem Index
+- Ablehnung nicht unterstützter oder fehlerhafter Einträge
+- Eigenschaftstests: Roundtrip generierter Werte, zufällig veränderte
+  Dateien führen nur zu RegFileError, nie zu anderen Exceptions
+"""
+
+import random
+
+import pytest
+
+from smartdesk.core.registry import REG_EXPAND_SZ, REG_SZ, RegFileError, RegistryValue, parse_reg, parse_reg_bytes
+from smartdesk.core.utils.backup_service import _string_to_reg_hex, build_backup_content
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+SEEDS = range(25)
+
+HEADER = "Windows Registry Editor Version 5.00\r\n\r\n"
+
+# Zeichen, die in Pfaden vorkommen können (inkl. Escapes und Nicht-ASCII)
+_ALPHABET = "abcXYZ 019_-.,;=[]()%äöüß€\\/\"'😀"
+
+
+def _random_text(rng, max_len=30):
+    return "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(1, max_len)))
+
+
+class TestParseValues:
+    """Tests für die unterstützten Werttypen."""
+
+    def test_reg_sz_with_escapes(self):
+        """Test: \\\\ und \\" in Textwerten werden aufgelöst."""
+        text = HEADER + '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"="C:\\\\Pfad mit \\"Zitat\\""\r\n'
+
+        (entry,) = parse_reg(text)
+
+        assert (entry.key_path, entry.value_name) == ("Software\\Test", "Name")
+        assert entry.value == RegistryValue('C:\\Pfad mit "Zitat"', REG_SZ)
+        assert entry.line == 4
+
+    def test_hex2_from_string_to_reg_hex(self):
+        """Test: hex(2) aus _string_to_reg_hex() ergibt den Text ohne Null-Terminator."""
+        hex_data = _string_to_reg_hex("%USERPROFILE%\\Desktop")
+        text = HEADER + f'[HKCU\\Software\\Test]\r\n"Desktop"=hex(2):{hex_data}\r\n'
+
+        (entry,) = parse_reg(text)
+
+        assert entry.value == RegistryValue("%USERPROFILE%\\Desktop", REG_EXPAND_SZ)
+
+    def test_wrapped_hex_lines(self):
+        """Test: Von regedit umbrochene hex-Werte (",\\" am Zeilenende) werden zusammengefügt."""
+        parts = _string_to_reg_hex("C:\\Desktop").split(",")
+        wrapped = ",".join(parts[:6]) + ",\\\r\n  " + ",".join(parts[6:])
+        text = HEADER + f'[HKEY_CURRENT_USER\\Software\\Test]\r\n"Desktop"=hex(2):{wrapped}\r\n"Weiter"="x"\r\n'
+
+        entries = parse_reg(text)
+
+        assert [e.value.data for e in entries] == ["C:\\Desktop", "x"]
+
+    def test_comments_and_utf8(self):
+        """Test: Kommentare werden übersprungen, UTF-8 mit BOM wird gelesen."""
+        text = "REGEDIT4\n; Kommentar\n[HKEY_CURRENT_USER\\Software\\Test]\n; noch einer\n\"Name\"=\"ä\"\n"
+
+        (entry,) = parse_reg_bytes(b"\xef\xbb\xbf" + text.encode("utf-8"))
+
+        assert entry.value.data == "ä"
+
+
+class TestBackupFiles:
+    """Tests mit Dateien, wie SmartDesk sie schreibt."""
+
+    def test_backup_content_roundtrip(self):
+        """Test: build_backup_content() wird zu beiden Werten mit den richtigen Typen geparst."""
+        entries = parse_reg_bytes(build_backup_content("C:\\Desktops\\A", 'C:\\Desktops\\"B"'))
+
+        assert [(e.key_path, e.value_name, e.value) for e in entries] == [
+            (KEY_USER_SHELL, VALUE_NAME, RegistryValue("C:\\Desktops\\A", REG_EXPAND_SZ)),
+            (KEY_LEGACY_SHELL, VALUE_NAME, RegistryValue('C:\\Desktops\\"B"', REG_SZ)),
+        ]
+
+    def test_legacy_backup_file(self):
+        """Test: Backups vor dem Index (open(encoding="utf-16"), LF, Metadaten-Kommentare)."""
+        hex_data = _string_to_reg_hex("C:\\Alt")
+        text = (
+            "Windows Registry Editor Version 5.00\n\n"
+            f"[HKEY_CURRENT_USER\\{KEY_USER_SHELL}]\n"
+            f'"{VALUE_NAME}"=hex(2):{hex_data}\n\n'
+            f"[HKEY_CURRENT_USER\\{KEY_LEGACY_SHELL}]\n"
+            f'"{VALUE_NAME}"="C:\\\\Alt"\n\n'
+            "; Backup erstellt: 2025-01-01T12:00:00\n"
+            "; Grund: before_switch\n"
+        )
+
+        entries = parse_reg_bytes(text.encode("utf-16"))
+
+        assert [e.value.data for e in entries] == ["C:\\Alt", "C:\\Alt"]
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_generated_values_roundtrip(self, seed):
+        """Test: Zufällige Pfade überstehen build_backup_content() -> parse_reg_bytes()."""
+        rng = random.Random(seed)
+        user_shell, legacy_shell = _random_text(rng), _random_text(rng)
+
+        entries = parse_reg_bytes(build_backup_content(user_shell, legacy_shell))
+
+        assert [e.value.data for e in entries] == [user_shell, legacy_shell]
+
+    @pytest.mark.parametrize("seed", SEEDS)
+    def test_mutated_files_only_raise_regfile_error(self, seed):
+        """Test: Zufällig veränderte Backups werden geparst oder mit RegFileError abgelehnt."""
+        rng = random.Random(seed)
+        original = build_backup_content(_random_text(rng), _random_text(rng)).decode("utf-16")
+
+        for _ in range(200):
+            chars = list(original)
+            for _ in range(rng.randint(1, 4)):
+                position = rng.randrange(len(chars))
+                action = rng.random()
+                if action < 0.4:
+                    del chars[position]
+                elif action < 0.8:
+                    chars[position] = rng.choice(_ALPHABET + "\r\n\0")
+                else:
+                    chars.insert(position, rng.choice(_ALPHABET + "\r\n"))
+            data = b"\xff\xfe" + "".join(chars).encode("utf-16-le", "surrogatepass")
+            if rng.random() < 0.1:
+                data = data[: rng.randrange(len(data))]
+            try:
+                entries = parse_reg_bytes(data)
+            except RegFileError:
+                continue
+            assert all(isinstance(e.value.data, str) for e in entries)
+
+
+class TestRejected:
+    """Tests für abgelehnte Inhalte."""
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            '[HKEY_LOCAL_MACHINE\\Software\\Test]\r\n"Name"="x"',
+            '[-HKEY_CURRENT_USER\\Software\\Test]',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"=dword:00000001',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"=-',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"="offen',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"="a\\b"',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"=hex(2):4,00',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"=hex(2):41,00,42',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"=hex(2):41,00,\\',
+            '[HKEY_CURRENT_USER\\Software\\Test]\r\n@="Standardwert"',
+            '"Name"="ohne Schlüssel"',
+        ],
+    )
+    def test_unsupported_or_broken(self, body):
+        """Test: Nicht unterstützte oder fehlerhafte Einträge ergeben RegFileError."""
+        with pytest.raises(RegFileError):
+            parse_reg(HEADER + body + "\r\n")
+
+    def test_missing_header(self):
+        """Test: Ohne Kopfzeile wird die Datei abgelehnt."""
+        with pytest.raises(RegFileError) as excinfo:
+            parse_reg('[HKEY_CURRENT_USER\\Software\\Test]\r\n"Name"="x"\r\n')
+        assert excinfo.value.line == 1
+
+    def test_invalid_encoding(self):
+        """Test: Ungültiges UTF-16 ergibt RegFileError statt UnicodeDecodeError."""
+        with pytest.raises(RegFileError):
+            parse_reg_bytes(b"\xff\xfe\x00\xd8")
@@ -0,0 +1,382 @@
+# Dateipfad: tests/test_registry_cache.py
+"""
+Unit-Tests für smartdesk.core.registry (Cache und In-Memory-Backend)
+
+Testet:
+- Cache-Treffer ohne erneutes Lesen des Backends
+- Invalidierung durch Änderungs-Benachrichtigungen und eigene Schreibzugriffe
+- Listener für Änderungen von außen
+- Direktes Lesen, wenn das Backend nicht beobachten kann oder es verliert
+- _KeyChangeWatcher: watch_key() kehrt erst nach dem Scharfschalten zurück
+- Anbindung von desktop_service und backup_service
+"""
+
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop
+from smartdesk.core.registry import REG_EXPAND_SZ, InMemoryRegistryBackend, RegistryValue, RegistryValueCache, set_registry_cache
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+
+@pytest.fixture
+def backend():
+    backend = InMemoryRegistryBackend()
+    backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\A", REG_EXPAND_SZ)
+    backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Desktops\\A")
+    return backend
+
+
+@pytest.fixture
+def cache(backend):
+    """Prozessweiter Cache auf dem In-Memory-Backend."""
+    cache = RegistryValueCache(backend)
+    set_registry_cache(cache)
+    yield cache
+    set_registry_cache(None)
+
+
+class _UnwatchableBackend(InMemoryRegistryBackend):
+    def watch_key(self, key_path, callback):
+        raise OSError("keine Benachrichtigungen")
+
+
+class TestRegistryValueCache:
+    """Tests für RegistryValueCache."""
+
+    def test_repeated_reads_hit_cache(self, cache, backend):
+        """Test: Wiederholtes Lesen fragt das Backend nur einmal."""
+        reads = backend.reads
+
+        for _ in range(5):
+            assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Desktops\\A"
+
+        assert backend.reads == reads + 1
+        assert cache.hits == 4
+
+    def test_key_and_value_names_case_insensitive(self, cache, backend):
+        """Test: Schlüssel- und Wertnamen sind wie unter Windows case-insensitiv."""
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+        reads = backend.reads
+
+        assert cache.get(KEY_USER_SHELL.upper(), VALUE_NAME.lower()) == "C:\\Desktops\\A"
+        assert backend.reads == reads
+
+    def test_external_change_invalidates(self, cache, backend):
+        """Test: Eine Änderung von außen ist beim nächsten Lesen sichtbar."""
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B", REG_EXPAND_SZ)
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Desktops\\B"
+        assert cache.get_value(KEY_USER_SHELL, VALUE_NAME).value_type == REG_EXPAND_SZ
+
+    def test_change_only_drops_affected_key(self, cache, backend):
+        """Test: Eine Änderung an User Shell Folders lässt Shell Folders im Cache."""
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+        cache.get(KEY_LEGACY_SHELL, VALUE_NAME)
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B")
+        reads = backend.reads
+
+        cache.get(KEY_LEGACY_SHELL, VALUE_NAME)
+
+        assert backend.reads == reads
+
+    def test_missing_value_is_cached_as_empty(self, cache, backend):
+        """Test: Fehlende Werte liefern "" und werden ebenfalls gecacht."""
+        assert cache.get(KEY_USER_SHELL, "Fehlt") == ""
+        reads = backend.reads
+
+        assert cache.get(KEY_USER_SHELL, "Fehlt") == ""
+        assert backend.reads == reads
+
+    def test_uncached_key_reads_through(self, cache, backend):
+        """Test: Andere Schlüssel werden nicht gecacht."""
+        backend.write_value("Software\\SmartDesk", "TrayPID", 42)
+        reads = backend.reads
+
+        cache.get("Software\\SmartDesk", "TrayPID")
+        cache.get("Software\\SmartDesk", "TrayPID")
+
+        assert backend.reads == reads + 2
+        assert backend.watch_count("Software\\SmartDesk") == 0
+
+    def test_unwatchable_backend_reads_every_time(self):
+        """Test: Ohne Benachrichtigungen wird nie ein veralteter Wert geliefert."""
+        backend = _UnwatchableBackend()
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\A")
+        cache = RegistryValueCache(backend)
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\A"
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\B")
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\B"
+        assert cache.hits == 0
+
+    def test_change_during_read_is_not_cached(self, backend):
+        """Test: Ein Wert, der während des Lesens geändert wurde, landet nicht im Cache."""
+
+        class RacingBackend(InMemoryRegistryBackend):
+            def read_value(self, key_path, value_name):
+                value = super().read_value(key_path, value_name)
+                if self.reads == 1:
+                    self.write_value(key_path, value_name, "C:\\Neu")
+                return value
+
+        racing = RacingBackend()
+        racing.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Alt")
+        cache = RegistryValueCache(racing)
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Alt"
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Neu"
+
+    def test_invalidate_after_own_write(self, cache, backend):
+        """Test: update_registry_key() verwirft den Wert im prozessweiten Cache."""
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+        # Backend ohne Benachrichtigung ändern (wie vor Eintreffen der asynchronen Meldung)
+        backend._keys[KEY_USER_SHELL.lower()][VALUE_NAME.lower()] = RegistryValue("C:\\Desktops\\B")
+
+        with patch("smartdesk.core.utils.registry_operations.winreg"):
+            from smartdesk.core.utils.registry_operations import update_registry_key
+
+            assert update_registry_key(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B")
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Desktops\\B"
+
+    def test_close_cancels_watches(self, cache, backend):
+        """Test: close() meldet alle Beobachtungen beim Backend ab."""
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+        assert backend.watch_count(KEY_USER_SHELL) == 1
+
+        cache.close()
+
+        assert backend.watch_count(KEY_USER_SHELL) == 0
+
+    def test_lost_watch_reads_through(self, cache, backend):
+        """Test: Verliert das Backend die Beobachtung, wird verworfen und ab dann direkt gelesen."""
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+
+        backend.lose_watches(KEY_USER_SHELL)
+        # Ohne Beobachtung kommen Änderungen nicht mehr als Benachrichtigung an
+        for path in ("C:\\Desktops\\B", "C:\\Desktops\\C"):
+            backend.write_value(KEY_USER_SHELL, VALUE_NAME, path)
+            assert cache.get(KEY_USER_SHELL, VALUE_NAME) == path
+        assert backend.watch_count(KEY_USER_SHELL) == 0
+
+    def test_unexpected_watch_error_reads_through(self):
+        """Test: Auch andere Fehler als OSError beim Beobachten schalten nur den Cache ab."""
+
+        class BrokenBackend(InMemoryRegistryBackend):
+            def watch_key(self, key_path, callback):
+                raise RuntimeError("kaputt")
+
+        backend = BrokenBackend()
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\A")
+        cache = RegistryValueCache(backend)
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\A"
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\A"
+        assert cache.hits == 0
+
+
+class TestListeners:
+    """Tests für Änderungs-Listener."""
+
+    def test_listener_called_on_external_change(self, cache, backend):
+        """Test: Listener erfahren sofort von Änderungen, ohne vorher zu lesen."""
+        calls = []
+        cache.add_listener(calls.append, KEY_USER_SHELL)
+
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B")
+        backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Desktops\\B")
+
+        assert calls == [KEY_USER_SHELL]
+
+    def test_listener_without_key_gets_all_cached_keys(self, cache, backend):
+        """Test: Ohne key_path werden alle gecachten Schlüssel gemeldet."""
+        calls = []
+        cache.add_listener(calls.append)
+
+        backend.write_value(KEY_LEGACY_SHELL.upper(), VALUE_NAME, "C:\\Desktops\\B")
+
+        assert calls == [KEY_LEGACY_SHELL]
+
+    def test_cancelled_listener_not_called(self, cache, backend):
+        """Test: Nach cancel() wird der Listener nicht mehr aufgerufen."""
+        calls = []
+        listener = cache.add_listener(calls.append, KEY_USER_SHELL)
+
+        listener.cancel()
+        listener.cancel()
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B")
+
+        assert calls == []
+
+    def test_failing_listener_does_not_block_others(self, cache, backend):
+        """Test: Eine Exception in einem Listener stoppt die übrigen nicht."""
+        calls = []
+
+        def broken(_key_path):
+            raise RuntimeError("kaputt")
+
+        cache.add_listener(broken, KEY_USER_SHELL)
+        cache.add_listener(calls.append, KEY_USER_SHELL)
+
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B")
+
+        assert calls == [KEY_USER_SHELL]
+
+
+class TestServiceIntegration:
+    """Tests für desktop_service und backup_service."""
+
+    def test_watch_active_desktop_syncs_on_external_change(self, cache, backend):
+        """Test: Verschiebt der Explorer den Desktop, wird der aktive Desktop sofort gespeichert."""
+        from smartdesk.core.services import desktop_service
+
+        desktops = [Desktop("A", "C:\\Desktops\\A", is_active=True), Desktop("B", "C:\\Desktops\\B")]
+        with patch.object(desktop_service, "get_all_desktops", return_value=desktops), patch.object(desktop_service, "save_desktops") as save:
+            listener = desktop_service.watch_active_desktop()
+            backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Desktops\\B", REG_EXPAND_SZ)
+            listener.cancel()
+
+        save.assert_called_once()
+        assert [d.name for d in desktops if d.is_active] == ["B"]
+
+    def test_sync_reads_registry_once(self, cache, backend):
+        """Test: Mehrere Syncs hintereinander lesen die Registry nur einmal."""
+        from smartdesk.core.services import desktop_service
+
+        desktops = [Desktop("A", "C:\\Desktops\\A"), Desktop("B", "C:\\Desktops\\B")]
+        reads = backend.reads
+
+        with patch.object(desktop_service, "save_desktops"):
+            for _ in range(3):
+                desktop_service.synchronize_desktops_with_registry(desktops)
+
+        assert backend.reads == reads + 1
+        assert desktops[0].is_active
+
+    def test_backup_reads_through_cache(self, cache, backend):
+        """Test: Backups lesen über den Cache."""
+        from smartdesk.core.utils import backup_service
+
+        cache.get(KEY_USER_SHELL, VALUE_NAME)
+        reads = backend.reads
+
+        assert backup_service._read_registry_value(KEY_USER_SHELL, VALUE_NAME) == "C:\\Desktops\\A"
+        assert backend.reads == reads
+        assert backup_service._read_registry_value(KEY_USER_SHELL, "Fehlt") is None
+
+
+class _FakeEvent:
+    """Auto-Reset-Event für den Fake von win32event."""
+
+    def __init__(self, condition):
+        self._condition = condition
+        self.signaled = False
+
+    def set(self):
+        with self._condition:
+            self.signaled = True
+            self._condition.notify_all()
+
+
+class _FakeWin32:
+    """pywintypes/win32api/win32con/win32event gerade so weit, wie _KeyChangeWatcher sie nutzt."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.error = type("error", (Exception,), {})
+        self.arm_delay = 0.0
+        self.fail_arm = set()
+        self.armed = []
+        self.events = {}
+
+    def modules(self):
+        return {
+            "pywintypes": SimpleNamespace(error=self.error),
+            "win32api": SimpleNamespace(RegOpenKeyEx=self.open_key, RegNotifyChangeKeyValue=self.arm),
+            "win32con": SimpleNamespace(HKEY_CURRENT_USER=1),
+            "win32event": SimpleNamespace(
+                CreateEvent=lambda *args: _FakeEvent(self.condition),
+                SetEvent=lambda event: event.set(),
+                WaitForMultipleObjects=self.wait,
+                WAIT_OBJECT_0=0,
+                INFINITE=-1,
+            ),
+        }
+
+    def open_key(self, root, key_path, reserved, access):
+        return SimpleNamespace(key_path=key_path.lower(), Close=lambda: None)
+
+    def arm(self, hkey, subtree, notify_filter, event, asynchronous):
+        threading.Event().wait(self.arm_delay)
+        if hkey.key_path in self.fail_arm:
+            raise self.error(5, "RegNotifyChangeKeyValue", "Zugriff verweigert")
+        self.events[hkey.key_path] = event
+        self.armed.append(hkey.key_path)
+
+    def wait(self, events, wait_all, timeout):
+        with self.condition:
+            while not any(event.signaled for event in events):
+                self.condition.wait()
+            index = next(i for i, event in enumerate(events) if event.signaled)
+            events[index].signaled = False
+            return index
+
+    def change(self, key_path):
+        self.events[key_path.lower()].set()
+
+
+@pytest.fixture
+def win32(monkeypatch):
+    fake = _FakeWin32()
+    monkeypatch.setattr(sys, "platform", "win32")
+    for name, module in fake.modules().items():
+        monkeypatch.setitem(sys.modules, name, module)
+    return fake
+
+
+@pytest.fixture
+def watcher(win32):
+    from smartdesk.core.registry.implementations import _KeyChangeWatcher
+
+    watcher = _KeyChangeWatcher()
+    yield watcher
+    watcher.stop()
+
+
+class TestKeyChangeWatcher:
+    """Tests für _KeyChangeWatcher mit nachgebildetem pywin32."""
+
+    def test_subscribe_returns_after_arming(self, win32, watcher):
+        """Test: subscribe() kehrt erst zurück, wenn RegNotifyChangeKeyValue gelaufen ist."""
+        win32.arm_delay = 0.05
+
+        watch = watcher.subscribe(KEY_USER_SHELL, lambda key_path: None)
+
+        assert win32.armed == [KEY_USER_SHELL.lower()]
+        assert watch.active
+
+    def test_arm_failure_raises(self, win32, watcher):
+        """Test: Lässt sich der Schlüssel nicht scharf schalten, wirft subscribe() OSError."""
+        win32.fail_arm.add(KEY_USER_SHELL.lower())
+
+        with pytest.raises(OSError):
+            watcher.subscribe(KEY_USER_SHELL, lambda key_path: None)
+
+    def test_lost_rearm_deactivates_watch(self, win32, watcher):
+        """Test: Scheitert das erneute Scharfschalten, wird der Abonnent benachrichtigt und inaktiv."""
+        notified = threading.Event()
+        watch = watcher.subscribe(KEY_USER_SHELL, lambda key_path: notified.set())
+
+        win32.fail_arm.add(KEY_USER_SHELL.lower())
+        win32.change(KEY_USER_SHELL)
+
+        assert notified.wait(2)
+        assert not watch.active
@@ -0,0 +1,140 @@
+# Dateipfad: tests/test_registry_transaction.py
+"""
+Unit-Tests für smartdesk.core.registry.transaction
+
+Testet:
+- Schreiben beider Shell-Folder-Werte als Einheit
+- Rollback bei Schreibfehlern und bei fehlgeschlagener Prüfung
+- Rollback auch bei unerwarteten Exceptions, die danach weitergereicht werden
+- Löschen von Werten, die vorher nicht existierten
+- Meldung, wenn der Rollback selbst fehlschlägt
+- Invalidierung des Registry-Caches
+"""
+
+import pytest
+
+from smartdesk.core.registry import (
+    REG_EXPAND_SZ,
+    REG_SZ,
+    InMemoryRegistryBackend,
+    RegistryTransaction,
+    RegistryValue,
+    RegistryVerificationError,
+    get_registry_cache,
+    write_desktop_path,
+)
+from smartdesk.shared.config import KEY_LEGACY_SHELL, KEY_USER_SHELL, VALUE_NAME
+
+
+def _values(backend):
+    return (backend.read_value(KEY_USER_SHELL, VALUE_NAME), backend.read_value(KEY_LEGACY_SHELL, VALUE_NAME))
+
+
+class TestWriteDesktopPath:
+    """Tests für write_desktop_path()."""
+
+    def test_writes_both_keys_with_types(self, memory_registry):
+        """Test: User Shell Folders als REG_EXPAND_SZ, Shell Folders als REG_SZ."""
+        result = write_desktop_path("C:\\Target")
+
+        assert result.success
+        assert _values(memory_registry) == (RegistryValue("C:\\Target", REG_EXPAND_SZ), RegistryValue("C:\\Target", REG_SZ))
+
+    def test_second_write_fails_rolls_back_first(self, memory_registry):
+        """Test: Schlägt der zweite Schlüssel fehl, wird der erste zurückgesetzt."""
+        before = _values(memory_registry)
+        memory_registry.fail_writes(KEY_LEGACY_SHELL)
+
+        result = write_desktop_path("C:\\Target")
+
+        assert not result.success
+        assert result.rolled_back
+        assert isinstance(result.error, PermissionError)
+        assert _values(memory_registry) == before
+
+    def test_first_write_fails_leaves_registry_untouched(self, memory_registry):
+        """Test: Schlägt schon der erste Schlüssel fehl, bleibt alles beim Alten."""
+        before = _values(memory_registry)
+        memory_registry.fail_writes(KEY_USER_SHELL)
+
+        result = write_desktop_path("C:\\Target")
+
+        assert not result.success
+        assert result.rolled_back
+        assert _values(memory_registry) == before
+
+    def test_verification_mismatch_rolls_back(self, memory_registry):
+        """Test: Kommt ein Wert anders an als geschrieben, werden beide zurückgesetzt."""
+
+        class TruncatingBackend(InMemoryRegistryBackend):
+            def write_value(self, key_path, value_name, data, value_type=REG_SZ):
+                if key_path == KEY_LEGACY_SHELL and data == "C:\\Target":
+                    data = "C:\\Tar"
+                super().write_value(key_path, value_name, data, value_type)
+
+        backend = TruncatingBackend()
+        backend.write_value(KEY_USER_SHELL, VALUE_NAME, "C:\\Current", REG_EXPAND_SZ)
+        backend.write_value(KEY_LEGACY_SHELL, VALUE_NAME, "C:\\Current")
+
+        result = write_desktop_path("C:\\Target", backend)
+
+        assert not result.success
+        assert isinstance(result.error, RegistryVerificationError)
+        assert result.rolled_back
+        assert _values(backend) == (RegistryValue("C:\\Current", REG_EXPAND_SZ), RegistryValue("C:\\Current", REG_SZ))
+
+    def test_failed_rollback_is_reported(self, memory_registry):
+        """Test: Scheitert auch der Rollback, meldet das Ergebnis rolled_back=False."""
+        memory_registry.fail_writes(KEY_LEGACY_SHELL)
+        # Erster Schreibzugriff gelingt, das Zurücksetzen danach nicht
+        memory_registry.fail_writes(KEY_USER_SHELL, after=1)
+
+        result = write_desktop_path("C:\\Target")
+
+        assert not result.success
+        assert not result.rolled_back
+        assert memory_registry.read_value(KEY_USER_SHELL, VALUE_NAME).data == "C:\\Target"
+
+    def test_cache_sees_new_value(self, memory_registry):
+        """Test: Der Registry-Cache liefert nach dem Commit den neuen Pfad."""
+        cache = get_registry_cache()
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Current"
+
+        write_desktop_path("C:\\Target")
+
+        assert cache.get(KEY_USER_SHELL, VALUE_NAME) == "C:\\Target"
+
+
+class TestRegistryTransaction:
+    """Tests für RegistryTransaction."""
+
+    def test_missing_value_deleted_on_rollback(self):
+        """Test: Ein vorher fehlender Wert wird beim Rollback wieder gelöscht."""
+        backend = InMemoryRegistryBackend()
+        backend.fail_writes("Software\\B")
+
+        result = RegistryTransaction(backend).set_value("Software\\A", "Neu", "x").set_value("Software\\B", "Neu", "y").commit()
+
+        assert not result.success
+        assert result.rolled_back
+        assert backend.read_value("Software\\A", "Neu") is None
+
+    def test_unexpected_error_rolls_back_and_propagates(self):
+        """Test: Auch eine Exception außer OSError setzt alles zurück und wird danach weitergereicht."""
+        backend = InMemoryRegistryBackend()
+        backend.write_value("Software\\A", "Wert", "alt")
+        backend.fail_writes("Software\\B", error=RuntimeError("Backend-Fehler"))
+
+        transaction = RegistryTransaction(backend).set_value("Software\\A", "Wert", "neu").set_value("Software\\B", "Wert", "neu")
+        with pytest.raises(RuntimeError):
+            transaction.commit()
+
+        assert backend.read_value("Software\\A", "Wert") == RegistryValue("alt")
+        assert backend.read_value("Software\\B", "Wert") is None
+
+    def test_empty_transaction_succeeds(self):
+        """Test: Eine leere Transaktion ist erfolgreich und schreibt nichts."""
+        backend = InMemoryRegistryBackend()
+
+        assert RegistryTransaction(backend).commit().success
+        assert backend.writes == 0
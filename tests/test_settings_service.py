@@ -0,0 +1,43 @@
+# Dateipfad: tests/test_settings_service.py
+"""
+Unit-Tests für smartdesk.core.services.settings_service
+
+Testet:
+- Standardwerte ohne settings.json (Neuinstallation)
+- Abweichende Standardwerte für bestehende settings.json (LEGACY_DEFAULTS)
+"""
+
+import json
+
+import pytest
+
+from smartdesk.core.services import settings_service
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    path = tmp_path / "settings.json"
+    monkeypatch.setattr(settings_service, "SETTINGS_FILE", str(path))
+    return path
+
+
+class TestExplorerRefreshMode:
+    """Tests für den Standard von explorer_refresh_mode."""
+
+    def test_new_install_uses_soft_refresh(self, settings_file):
+        """Test: Ohne settings.json wird der Explorer ohne Neustart aktualisiert."""
+        assert settings_service.get_setting("explorer_refresh_mode") == "soft"
+
+    def test_existing_install_keeps_restart(self, settings_file):
+        """Test: Eine bestehende settings.json ohne den Schlüssel behält den Explorer-Neustart."""
+        settings_file.write_text(json.dumps({"theme": "light"}), encoding="utf-8")
+
+        assert settings_service.get_setting("explorer_refresh_mode") == "restart"
+
+    def test_opt_in_is_kept(self, settings_file):
+        """Test: Ein ausdrücklich gesetzter Wert gilt und bleibt nach dem Speichern anderer Werte erhalten."""
+        settings_file.write_text(json.dumps({"theme": "light"}), encoding="utf-8")
+        settings_service.set_setting("explorer_refresh_mode", "soft")
+        settings_service.set_setting("theme", "dark")
+
+        assert settings_service.get_setting("explorer_refresh_mode") == "soft"
@@ -0,0 +1,149 @@
+# Dateipfad: tests/test_shell_refresh.py
+"""
+Unit-Tests für smartdesk.core.shell
+
+Testet mit SimulatedShellBackend:
+- Prüfung, ob das ListView den neuen Ordner zeigt
+- Aktualisierung ohne Neustart, Eskalation zum Neustart, nicht prüfbare Ordner
+- Zeitverhalten (Eskalation nach verify_timeout)
+"""
+
+import time
+
+import pytest
+
+from smartdesk.core.shell import (
+    RestartRefresher,
+    SimulatedShellBackend,
+    SoftRefresher,
+    can_verify,
+    get_shell_refresher,
+    listview_shows_folder,
+    set_shell_refresher,
+)
+
+OLD = "C:\\Users\\me\\Desktop"
+NEW = "D:\\Desktops\\Arbeit"
+FOLDERS = {
+    OLD: ["Spiele.lnk", "Notizen.txt", "Gemeinsam.txt"],
+    NEW: ["Projekt.docx", "Tool.lnk", "Gemeinsam.txt"],
+}
+
+
+def _backend(**kwargs):
+    return SimulatedShellBackend(folders=FOLDERS, shown_path=OLD, **kwargs)
+
+
+class TestListviewShowsFolder:
+    """Namensvergleich zwischen ListView und Ordnerinhalt."""
+
+    def test_new_folder_shown(self):
+        """Test: Nur Einträge des neuen Ordners sichtbar -> bestätigt."""
+        assert listview_shows_folder(["Projekt.docx", "Tool", "Gemeinsam.txt", "Papierkorb"], FOLDERS[NEW], FOLDERS[OLD])
+
+    def test_old_entry_still_shown(self):
+        """Test: Ein Eintrag, den es nur im alten Ordner gibt, ist noch sichtbar -> nicht bestätigt."""
+        assert not listview_shows_folder(["Projekt.docx", "Spiele"], FOLDERS[NEW], FOLDERS[OLD])
+
+    def test_extensions_hidden(self):
+        """Test: Explorer zeigt bekannte Endungen nicht an (Notizen statt Notizen.txt)."""
+        assert not listview_shows_folder(["Notizen"], FOLDERS[NEW], FOLDERS[OLD])
+        assert listview_shows_folder(["projekt"], FOLDERS[NEW], FOLDERS[OLD])
+
+    def test_shared_entry_proves_nothing(self):
+        """Test: Ein Eintrag, der in beiden Ordnern liegt, bestätigt den Wechsel nicht."""
+        assert not listview_shows_folder(["Gemeinsam.txt"], FOLDERS[NEW], FOLDERS[OLD])
+
+    def test_no_listview(self):
+        """Test: Ohne ListView (Explorer startet gerade) gibt es keine Bestätigung."""
+        assert not listview_shows_folder(None, FOLDERS[NEW], FOLDERS[OLD])
+
+    def test_can_verify(self):
+        """Test: Gleiche oder leere Ordner lassen sich nicht unterscheiden."""
+        assert can_verify(FOLDERS[NEW], FOLDERS[OLD])
+        assert can_verify([], FOLDERS[OLD])
+        assert not can_verify([], [])
+        assert not can_verify(["A.txt"], ["a.TXT"])
+
+
+class TestSoftRefresher:
+    """Aktualisierung ohne Neustart mit Eskalation."""
+
+    def test_soft_refresh_without_restart(self):
+        """Test: Übernimmt die Shell den Ordner, wird der Explorer nicht neu gestartet."""
+        backend = _backend(apply_delay=0.05)
+
+        result = SoftRefresher(backend, verify_timeout=2, poll_interval=0.01).refresh(NEW, OLD)
+
+        assert result.method == "soft"
+        assert result.verified
+        assert backend.notify_calls == 1
+        assert backend.restart_calls == 0
+        assert backend.shown_path == NEW
+        assert 40 <= result.duration_ms < 1000
+
+    def test_escalates_when_notification_is_ignored(self):
+        """Test: Zeigt das ListView nach verify_timeout noch den alten Ordner, folgt ein Neustart."""
+        backend = _backend(soft_refresh_works=False)
+
+        start = time.monotonic()
+        result = SoftRefresher(backend, verify_timeout=0.2, poll_interval=0.01).refresh(NEW, OLD)
+        elapsed = time.monotonic() - start
+
+        assert result.method == "escalated"
+        assert not result.verified
+        assert backend.restart_calls == 1
+        assert backend.shown_path == NEW
+        assert 0.2 <= elapsed < 1.0
+
+    def test_not_verifiable_restarts_directly(self):
+        """Test: Zwei leere Ordner: kein Benachrichtigungsversuch, sofort Neustart."""
+        backend = SimulatedShellBackend(folders={OLD: [], NEW: []}, shown_path=OLD)
+
+        result = SoftRefresher(backend, verify_timeout=5).refresh(NEW, OLD)
+
+        assert result.method == "restart"
+        assert backend.notify_calls == 0
+        assert backend.restart_calls == 1
+
+    def test_without_old_path(self):
+        """Test: Ohne bisherigen Ordner genügt ein sichtbarer Eintrag des neuen Ordners."""
+        backend = _backend()
+
+        result = SoftRefresher(backend, verify_timeout=1, poll_interval=0.01).refresh(NEW)
+
+        assert result.method == "soft"
+        assert backend.restart_calls == 0
+
+
+class TestRefresherSelection:
+    """Neustart-Strategie und prozessweiter Refresher."""
+
+    def test_restart_refresher(self):
+        """Test: RestartRefresher startet immer neu, ohne Benachrichtigung."""
+        backend = _backend(restart_duration=0.05)
+        backend.set_registry_path(NEW)
+
+        result = RestartRefresher(backend).refresh(NEW, OLD)
+
+        assert result.method == "restart"
+        assert result.duration_ms >= 40
+        assert backend.notify_calls == 0
+        assert backend.shown_path == NEW
+
+    @pytest.fixture
+    def reset_refresher(self):
+        set_shell_refresher(None)
+        yield
+        set_shell_refresher(None)
+
+    def test_default_and_override(self, reset_refresher):
+        """Test: Standard ist SoftRefresher (Linux: simuliert); set_shell_refresher ersetzt ihn."""
+        default = get_shell_refresher()
+        assert isinstance(default, SoftRefresher)
+        assert isinstance(default.backend, SimulatedShellBackend)
+        assert get_shell_refresher() is default
+
+        custom = RestartRefresher(_backend())
+        set_shell_refresher(custom)
+        assert get_shell_refresher() is custom
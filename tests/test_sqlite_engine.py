@@ -0,0 +1,317 @@
+# Dateipfad: tests/test_sqlite_engine.py
+"""
+Unit-Tests für smartdesk.core.storage.sqlite_engine
+
+Testet:
+- Roundtrip, Reihenfolge und Lazy Loading der Icon-Layouts
+- Zeilenweise Updates (nur geänderte Desktops/Layouts werden geschrieben)
+- Umbenennen, Löschen (inkl. Layout) und Rollback bei Fehlern
+- WAL-Modus, Indizes, Signatur bei Schreibvorgängen anderer Verbindungen
+- Import aus desktops.json/rules.json
+- Auswahl der Engine und Zusammenspiel mit load/save_desktops, Repository
+  und AutoSwitchService
+"""
+
+import json
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop, IconPosition
+from smartdesk.core.storage import file_operations
+from smartdesk.core.storage.desktop_repository import DesktopRepository, set_desktop_repository
+from smartdesk.core.storage.sqlite_engine import SqliteStorageEngine, import_from_json
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite-Engine auf einer leeren Datenbank in tmp_path."""
+    eng = SqliteStorageEngine(str(tmp_path / "smartdesk.db"))
+    yield eng
+    eng.close()
+
+
+@pytest.fixture
+def active_engine(engine):
+    """engine als prozessweit konfigurierte Speicher-Engine."""
+    file_operations.set_storage_engine(engine)
+    yield engine
+    file_operations.set_storage_engine(None)
+
+
+def _desktops(count=3, icons=2):
+    return [
+        Desktop(
+            f"Desktop {i}",
+            f"C:\\Desktops\\D{i}",
+            i == 0,
+            icon_positionen=[IconPosition(j, f"Icon {j}", j * 10, i) for j in range(icons)],
+        )
+        for i in range(count)
+    ]
+
+
+def _traced_writes(engine):
+    """Sammelt alle schreibenden SQL-Anweisungen der Thread-Verbindung."""
+    statements = []
+    engine._conn().set_trace_callback(
+        lambda sql: statements.append(sql) if sql.split()[0] in ("INSERT", "UPDATE", "DELETE") else None
+    )
+    return statements
+
+
+class TestRoundtrip:
+    """Tests für read_desktops()/write_desktops()."""
+
+    def test_empty_database(self, engine):
+        """Test: Leere Datenbank liefert keine Desktops."""
+        desktops, signature = engine.read_desktops()
+        assert desktops == []
+        assert signature is not None
+
+    def test_roundtrip_keeps_order_and_fields(self, engine):
+        """Test: Gespeicherte Desktops werden gleich und in Reihenfolge gelesen."""
+        original = _desktops()
+        original[2].protected = True
+        original[2].created_at = "2024-01-01T00:00:00"
+        engine.write_desktops([d.copy() for d in original])
+
+        loaded, _ = engine.read_desktops()
+        assert loaded == original
+
+    def test_icons_are_lazy(self, engine):
+        """Test: Icon-Layouts werden erst beim Zugriff gelesen."""
+        engine.write_desktops(_desktops())
+
+        loaded, _ = engine.read_desktops()
+        assert not any(d.icons_loaded for d in loaded)
+        assert loaded[1].icon_positionen[1] == IconPosition(1, "Icon 1", 10, 1)
+
+    def test_lookup_by_name_and_path(self, engine):
+        """Test: Einzelabfragen über Name bzw. normalisierten Pfad."""
+        engine.write_desktops(_desktops())
+
+        assert engine.get_desktop("Desktop 2").path == "C:\\Desktops\\D2"
+        assert engine.find_desktop_by_path("c:\\desktops\\d1").name == "Desktop 1"
+        assert engine.get_desktop("Fehlt") is None
+
+    def test_indexes_and_wal(self, engine):
+        """Test: WAL-Modus aktiv, Name und Pfad indiziert."""
+        conn = engine._conn()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        plan = " ".join(str(r) for r in conn.execute("EXPLAIN QUERY PLAN SELECT * FROM desktops WHERE path_key = 'x'"))
+        assert "idx_desktops_path_key" in plan
+
+
+class TestRowUpdates:
+    """Tests für das zeilenweise Schreiben."""
+
+    def test_switch_only_updates_changed_rows(self, engine):
+        """Test: Ein Wechsel ändert genau zwei Zeilen, Layouts bleiben unberührt."""
+        engine.write_desktops(_desktops(count=5))
+        loaded, _ = engine.read_desktops()
+        loaded[0].is_active = False
+        loaded[3].is_active = True
+
+        writes = _traced_writes(engine)
+        engine.write_desktops(loaded)
+
+        assert len(writes) == 2
+        assert all(sql.startswith("UPDATE desktops") for sql in writes)
+        assert not any(d.icons_loaded for d in loaded)
+
+    def test_icon_change_rewrites_single_layout(self, engine):
+        """Test: Geänderte Icons schreiben nur das eine Layout."""
+        engine.write_desktops(_desktops(count=5))
+        loaded, _ = engine.read_desktops()
+        loaded[2].icon_positionen = [IconPosition(0, "Neu", 1, 2)]
+
+        writes = _traced_writes(engine)
+        engine.write_desktops(loaded)
+
+        assert len(writes) == 1
+        assert "icon_layouts" in writes[0]
+        assert engine.get_desktop("Desktop 2").icon_positionen == [IconPosition(0, "Neu", 1, 2)]
+
+    def test_update_icon_layout(self, engine):
+        """Test: update_icon_layout() ersetzt nur das Layout des Desktops."""
+        engine.write_desktops(_desktops())
+
+        assert engine.update_icon_layout("Desktop 1", [IconPosition(0, "A", 5, 5)]) is True
+        assert engine.update_icon_layout("Fehlt", []) is False
+        assert engine.get_desktop("Desktop 1").icon_positionen == [IconPosition(0, "A", 5, 5)]
+        assert len(engine.get_desktop("Desktop 0").icon_positionen) == 2
+
+    def test_rename_keeps_layout(self, engine):
+        """Test: Umbenennen aktualisiert die Zeile, das Layout bleibt erhalten."""
+        engine.write_desktops(_desktops())
+        loaded, _ = engine.read_desktops()
+        loaded[1].name = "Umbenannt"
+        engine.write_desktops(loaded)
+
+        renamed = engine.get_desktop("Umbenannt")
+        assert renamed is not None
+        assert len(renamed.icon_positionen) == 2
+        assert engine.get_desktop("Desktop 1") is None
+
+    def test_numeric_json_ref_is_not_a_row_id(self, engine):
+        """Test: Eine JSON-Layout-Referenz nur aus Ziffern wird nicht als Datensatz-ID gelesen."""
+        engine.write_desktops(_desktops())
+        loaded, _ = engine.read_desktops()
+        assert loaded[0].icon_layout.startswith("sqlite:")
+
+        from_json = Desktop("Aus JSON", "C:\\Json", icon_layout="1")
+        engine.write_desktops(loaded + [from_json])
+
+        desktops, _ = engine.read_desktops()
+        assert [d.name for d in desktops] == ["Desktop 0", "Desktop 1", "Desktop 2", "Aus JSON"]
+        assert from_json.icon_layout not in {d.icon_layout for d in loaded}
+
+    def test_delete_removes_layout(self, engine):
+        """Test: Gelöschte Desktops verlieren auch ihr Layout."""
+        engine.write_desktops(_desktops())
+        loaded, _ = engine.read_desktops()
+        engine.write_desktops([loaded[0], loaded[2]])
+
+        conn = engine._conn()
+        assert conn.execute("SELECT COUNT(*) FROM desktops").fetchone()[0] == 2
+        assert conn.execute("SELECT COUNT(*) FROM icon_layouts").fetchone()[0] == 2
+
+    def test_failed_write_rolls_back(self, engine):
+        """Test: Ein Fehler mitten im Schreiben lässt den alten Stand unverändert."""
+        engine.write_desktops(_desktops())
+        loaded, _ = engine.read_desktops()
+        loaded[0].is_active = False
+        new = Desktop("Neu", "C:\\Neu", True, icon_positionen=[IconPosition(0, "X", 0, 0)])
+
+        with patch("smartdesk.core.storage.icon_layout_store.encode_layout", side_effect=ValueError("kaputt")):
+            with pytest.raises(ValueError):
+                engine.write_desktops(loaded + [new])
+
+        desktops, _ = engine.read_desktops()
+        assert [d.name for d in desktops] == ["Desktop 0", "Desktop 1", "Desktop 2"]
+        assert desktops[0].is_active is True
+        assert new.icon_layout == ""
+
+
+class TestSignature:
+    """Tests für die Änderungserkennung."""
+
+    def test_signature_stable_without_writes(self, engine):
+        """Test: Ohne Schreibvorgang bleibt die Signatur gleich."""
+        assert engine.signature() == engine.signature()
+
+    def test_signature_changes_on_foreign_write(self, engine):
+        """Test: Schreibvorgang einer anderen Verbindung ändert die Signatur."""
+        engine.write_desktops(_desktops())
+        before = engine.signature()
+
+        other = sqlite3.connect(engine.db_path)
+        other.execute("UPDATE desktops SET name = 'Extern' WHERE position = 0")
+        other.commit()
+        other.close()
+
+        assert engine.signature() != before
+
+
+class TestImport:
+    """Tests für import_from_json()."""
+
+    def test_import_desktops_layouts_and_rules(self, engine, tmp_path):
+        """Test: Desktops inkl. Layout-Dateien und Regeln werden übernommen."""
+        json_file = tmp_path / "desktops.json"
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            file_operations.save_desktops(_desktops())
+        rules_file = tmp_path / "rules.json"
+        rules_file.write_text(json.dumps({"code.exe": "Desktop 1"}), encoding="utf-8")
+
+        assert import_from_json(engine, str(json_file), str(rules_file)) == (3, 1)
+
+        loaded, _ = engine.read_desktops()
+        assert loaded == _desktops()
+        assert engine.load_rules() == {"code.exe": "Desktop 1"}
+
+    def test_import_replaces_existing_rows(self, engine, tmp_path):
+        """Test: Ein erneuter Import ersetzt den Datenbankinhalt."""
+        engine.write_desktops(_desktops(count=5))
+        json_file = tmp_path / "desktops.json"
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            file_operations.save_desktops(_desktops(count=2))
+
+        import_from_json(engine, str(json_file))
+
+        assert [d.name for d in engine.read_desktops()[0]] == ["Desktop 0", "Desktop 1"]
+
+
+class TestIntegration:
+    """Tests für die Einbindung in file_operations, Repository und Auto-Switch."""
+
+    def test_engine_selected_from_environment(self, tmp_path, monkeypatch):
+        """Test: SMARTDESK_STORAGE_ENGINE=sqlite wählt die SQLite-Engine."""
+        monkeypatch.setenv(file_operations.STORAGE_ENGINE_ENV, "sqlite")
+        file_operations.set_storage_engine(None)
+        try:
+            with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(tmp_path / "desktops.json")):
+                engine = file_operations.get_storage_engine()
+            assert engine.name == "sqlite"
+            assert engine.location() == str(tmp_path / "smartdesk.db")
+            engine.close()
+        finally:
+            file_operations.set_storage_engine(None)
+
+    def test_first_start_imports_json(self, tmp_path, monkeypatch):
+        """Test: Beim ersten Start mit SQLite werden vorhandene JSON-Daten übernommen."""
+        json_file = tmp_path / "desktops.json"
+        with patch("smartdesk.core.storage.file_operations.get_data_file_path", return_value=str(json_file)):
+            file_operations.save_desktops(_desktops())
+            monkeypatch.setenv(file_operations.STORAGE_ENGINE_ENV, "sqlite")
+            file_operations.set_storage_engine(None)
+            try:
+                assert len(file_operations.load_desktops()) == 3
+                file_operations.get_storage_engine().close()
+            finally:
+                file_operations.set_storage_engine(None)
+
+    def test_load_save_and_batch_use_engine(self, active_engine):
+        """Test: load/save_desktops und save_batch arbeiten über die Engine."""
+        with file_operations.save_batch():
+            file_operations.save_desktops(_desktops(count=1))
+            file_operations.save_desktops(_desktops(count=2))
+
+        assert [d.name for d in file_operations.load_desktops()] == ["Desktop 0", "Desktop 1"]
+        assert file_operations.save_icon_layout("Desktop 1", []) is True
+        assert active_engine.get_desktop("Desktop 1").icon_positionen == []
+
+    def test_repository_caches_and_revalidates(self, active_engine):
+        """Test: Repository liest nur nach fremden Änderungen neu."""
+        repo = DesktopRepository()
+        set_desktop_repository(repo)
+        try:
+            file_operations.save_desktops(_desktops())
+            repo.get_all()
+            repo.get_all()
+            assert repo.reloads == 0
+
+            other = sqlite3.connect(active_engine.db_path)
+            other.execute("UPDATE desktops SET is_active = 0")
+            other.commit()
+            other.close()
+
+            assert repo.get_active() is None
+            assert repo.reloads == 1
+        finally:
+            set_desktop_repository(None)
+
+    def test_auto_switch_rules_in_database(self, active_engine, tmp_path):
+        """Test: AutoSwitchService speichert Regeln in der Datenbank statt rules.json."""
+        from smartdesk.core.services import auto_switch_service
+
+        rules_file = tmp_path / "rules.json"
+        with patch.object(auto_switch_service, "RULES_FILE", str(rules_file)):
+            service = auto_switch_service.AutoSwitchService()
+            service.add_rule("Code.exe", "Desktop 1")
+
+            assert not rules_file.exists()
+            assert active_engine.load_rules() == {"code.exe": "Desktop 1"}
+            assert auto_switch_service.AutoSwitchService().get_rules() == {"code.exe": "Desktop 1"}
@@ -0,0 +1,198 @@
+# Dateipfad: tests/test_stage_graph.py
+"""
+Unit-Tests für smartdesk.core.utils.stage_graph
+
+Testet:
+- Parallele Ausführung unabhängiger Stufen, Reihenfolge nach Abhängigkeiten
+- Abbruch (False) und Exceptions
+- Inline-Stufen im aufrufenden Thread, contextvars in Pool-Stufen
+- Prüfung des Graphen (Duplikate, unbekannte Abhängigkeiten, Zyklen)
+- Festgelegte Reihenfolgen beim Desktop-Wechsel
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.utils.stage_graph import Stage, run_stages, validate_stages
+from smartdesk.core.utils.stage_timer import StageTimer
+
+
+class _Recorder:
+    """Protokolliert Beginn und Ende von Stufen."""
+
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def stage(self, name, delay=0.0, result=True):
+        def run():
+            with self._lock:
+                self.events.append(("start", name))
+            time.sleep(delay)
+            with self._lock:
+                self.events.append(("end", name))
+            return result
+
+        return run
+
+    def index(self, kind, name):
+        return self.events.index((kind, name))
+
+
+class TestRunStages:
+    """Tests für run_stages()."""
+
+    def test_independent_stages_overlap(self):
+        """Test: Unabhängige Stufen laufen gleichzeitig, die Gesamtdauer ist die längste Kette."""
+        rec = _Recorder()
+        stages = [Stage("a", rec.stage("a", 0.2)), Stage("b", rec.stage("b", 0.2)), Stage("c", rec.stage("c", 0.2))]
+
+        start = time.perf_counter()
+        assert run_stages(stages) is True
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.45
+        assert {e[1] for e in rec.events} == {"a", "b", "c"}
+
+    def test_dependencies_are_respected(self):
+        """Test: Eine Stufe beginnt erst, wenn alle Vorgänger beendet sind."""
+        rec = _Recorder()
+        stages = [
+            Stage("slow", rec.stage("slow", 0.05)),
+            Stage("fast", rec.stage("fast")),
+            Stage("join", rec.stage("join"), after=("slow", "fast")),
+        ]
+
+        assert run_stages(stages) is True
+
+        assert rec.index("start", "join") > rec.index("end", "slow")
+        assert rec.index("start", "join") > rec.index("end", "fast")
+
+    def test_abort_stops_dependents_and_waits_for_running(self):
+        """Test: False startet keine weiteren Stufen; laufende werden noch beendet."""
+        rec = _Recorder()
+        stages = [
+            Stage("check", rec.stage("check", result=False)),
+            Stage("parallel", rec.stage("parallel", 0.05)),
+            Stage("after_check", rec.stage("after_check"), after=("check",)),
+        ]
+
+        assert run_stages(stages) is False
+
+        assert ("end", "parallel") in rec.events
+        assert ("start", "after_check") not in rec.events
+
+    def test_exception_is_reraised_after_running_stages(self):
+        """Test: Die Exception einer Stufe wird weitergereicht, nachdem laufende Stufen fertig sind."""
+        rec = _Recorder()
+
+        def boom():
+            raise RuntimeError("kaputt")
+
+        stages = [Stage("boom", boom), Stage("parallel", rec.stage("parallel", 0.05)), Stage("after", rec.stage("after"), after=("boom",))]
+
+        with pytest.raises(RuntimeError, match="kaputt"):
+            run_stages(stages)
+
+        assert ("end", "parallel") in rec.events
+        assert ("start", "after") not in rec.events
+
+    def test_inline_stage_runs_in_caller_thread(self):
+        """Test: inline=True läuft im aufrufenden Thread, andere Stufen im Pool."""
+        threads = {}
+        stages = [
+            Stage("inline", lambda: threads.__setitem__("inline", threading.current_thread()), inline=True),
+            Stage("pool", lambda: threads.__setitem__("pool", threading.current_thread())),
+        ]
+
+        run_stages(stages)
+
+        assert threads["inline"] is threading.current_thread()
+        assert threads["pool"] is not threading.current_thread()
+
+    def test_context_and_timer(self):
+        """Test: Pool-Stufen sehen die contextvars des Aufrufers; der Timer misst jede Stufe."""
+        var = ContextVar("test_var", default=None)
+        seen = []
+        timer = StageTimer()
+        var.set("switch")
+
+        run_stages([Stage("a", lambda: seen.append(var.get())), Stage("b", lambda: seen.append(var.get()), after=("a",))], timer=timer)
+
+        assert seen == ["switch", "switch"]
+        assert set(timer.durations_ms) == {"a", "b"}
+
+
+class TestValidateStages:
+    """Tests für validate_stages()."""
+
+    @pytest.mark.parametrize(
+        "stages",
+        [
+            [Stage("a", lambda: None), Stage("a", lambda: None)],
+            [Stage("a", lambda: None, after=("fehlt",))],
+            [Stage("a", lambda: None, after=("b",)), Stage("b", lambda: None, after=("a",))],
+        ],
+    )
+    def test_invalid_graphs(self, stages):
+        """Test: Duplikate, unbekannte Abhängigkeiten und Zyklen ergeben ValueError."""
+        with pytest.raises(ValueError):
+            validate_stages(stages)
+
+    def test_switch_stages_are_valid(self):
+        """Test: Der Graph des Desktop-Wechsels ist gültig und enthält die festen Reihenfolgen."""
+        from smartdesk.core.services.desktop_service import SWITCH_STAGES
+
+        validate_stages(SWITCH_STAGES)
+        after = {stage.name: stage.after for stage in SWITCH_STAGES}
+        assert "icons" in after["registry"]
+        assert "backup" in after["registry"]
+        assert {"registry", "animation"} <= set(after["explorer_restart"])
+
+
+class TestSwitchOrdering:
+    """Festgelegte Reihenfolgen beim Desktop-Wechsel mit simulierten Laufzeiten."""
+
+    def test_icon_capture_before_registry_write(self, switch_harness):
+        """Test: Die Registry wird erst geschrieben, wenn die Icons gesichert sind."""
+        from smartdesk.core.registry import write_desktop_path
+
+        rec = _Recorder()
+        capture = rec.stage("capture", 0.05, result=[])
+
+        def write(path):
+            rec.events.append(("start", "registry_write"))
+            return write_desktop_path(path)
+
+        module = "smartdesk.core.services.desktop_service"
+        with switch_harness() as desktop_service, patch(f"{module}.get_current_icon_positions", side_effect=lambda timeout_seconds: capture()), patch(
+            f"{module}.write_desktop_path", side_effect=write
+        ):
+            assert desktop_service.switch_to_desktop("Target") is True
+
+        assert rec.index("start", "registry_write") > rec.index("end", "capture")
+
+    def test_listview_before_icon_restore(self):
+        """Test: Icons werden erst nach dem ListView gesetzt, das Wallpaper parallel dazu."""
+        from smartdesk.core.models.desktop import Desktop
+        from smartdesk.core.services import desktop_service
+
+        rec = _Recorder()
+        desktops = [Desktop(name="Target", path="C:\\Target", is_active=True, wallpaper_path="C:\\bild.jpg")]
+        module = "smartdesk.core.services.desktop_service"
+        with patch(f"{module}.get_all_desktops", return_value=desktops), patch(f"{module}.synchronize_desktops_with_registry"), patch(
+            f"{module}.wait_for_desktop_listview", side_effect=lambda **kw: rec.stage("listview", 0.05, result=1)()
+        ), patch(f"{module}.wallpaper_service.set_wallpaper", side_effect=lambda path: rec.stage("wallpaper", 0.1)()), patch(
+            f"{module}.set_icon_positions", side_effect=lambda icons: rec.stage("icons", 0.1)()
+        ):
+            desktop_service.sync_desktop_state_and_apply_icons()
+
+        assert rec.index("start", "icons") > rec.index("end", "listview")
+        assert rec.index("start", "wallpaper") > rec.index("end", "listview")
+        # Wallpaper und Icons überlappen sich
+        assert rec.index("start", "icons") < rec.index("end", "wallpaper")
+        assert rec.index("start", "wallpaper") < rec.index("end", "icons")
@@ -0,0 +1,301 @@
+# Dateipfad: tests/test_switch_broker.py
+"""
+Unit-Tests für smartdesk.core.services.switch_broker
+
+Testet:
+- Ausführung einer einzelnen Anfrage mit Warteschlangen-Attributen
+- Zusammenfassen schneller Folgen zum letzten Ziel (superseded/cancelled)
+- Anschluss an einen laufenden Wechsel mit gleichem Ziel
+- Fehler und abgebrochene Besitzer
+- Mehrere Prozesse mit gemeinsamer Warteschlange
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from smartdesk.core.services.switch_broker import SwitchBroker, get_switch_broker, set_switch_broker
+
+
+class FakeExecutor:
+    """Zeichnet Wechsel auf; Ziele in block_on warten auf release, bevor sie abfragen, ob sie abbrechen sollen."""
+
+    def __init__(self, block_on=(), fail_on=()):
+        self.block_on = set(block_on)
+        self.fail_on = set(fail_on)
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.calls = []
+
+    def __call__(self, desktop_name, parent, cancelled, trace_attrs):
+        self.calls.append({"desktop": desktop_name, "parent": parent, "attrs": trace_attrs})
+        self.started.set()
+        if desktop_name in self.fail_on:
+            raise RuntimeError("Explorer nicht erreichbar")
+        if desktop_name in self.block_on:
+            assert self.release.wait(5)
+        return not cancelled()
+
+    @property
+    def desktops(self):
+        return [call["desktop"] for call in self.calls]
+
+
+@pytest.fixture
+def queue_files(tmp_path):
+    return str(tmp_path / "switch_queue.json"), str(tmp_path / "switch_owner.lock")
+
+
+def _broker(queue_files, executor):
+    queue_file, owner_lock_file = queue_files
+    return SwitchBroker(queue_file=queue_file, owner_lock_file=owner_lock_file, execute=executor)
+
+
+def _wait_for(broker, seq, timeout=5):
+    deadline = time.monotonic() + timeout
+    while (outcome := broker.outcome(seq)) is None:
+        assert time.monotonic() < deadline, f"Kein Ergebnis für Anfrage {seq}"
+        time.sleep(0.01)
+    return outcome
+
+
+def _read_queue(queue_files):
+    try:
+        with open(queue_files[0], encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+class TestSingleRequest:
+    """Eine Anfrage ohne Konkurrenz."""
+
+    def test_request_runs_and_reports(self, queue_files):
+        """Test: Der Wechsel läuft im aufrufenden Prozess; Ergebnis und Trace-Attribute stimmen."""
+        executor = FakeExecutor()
+        broker = _broker(queue_files, executor)
+
+        outcome = broker.request("Arbeit", source="gui")
+
+        assert outcome.success
+        assert outcome.status == "ok"
+        assert outcome.queue_depth == 1
+        assert outcome.queue_wait_ms >= 0
+        assert executor.desktops == ["Arbeit"]
+        attrs = executor.calls[0]["attrs"]
+        assert attrs["queue_seq"] == outcome.seq
+        assert attrs["queue_depth"] == 1
+        assert attrs["source"] == "gui"
+        assert "queue_wait_ms" in attrs
+        assert _read_queue(queue_files)["running"] is None
+
+    def test_parent_is_passed(self, queue_files):
+        """Test: Das Eltern-Widget erreicht den Wechsel, wenn dieser Prozess ihn ausführt."""
+        executor = FakeExecutor()
+        parent = object()
+
+        _broker(queue_files, executor).request("Arbeit", parent=parent)
+
+        assert executor.calls[0]["parent"] is parent
+
+    def test_execute_error_is_failed(self, queue_files):
+        """Test: Eine Ausnahme im Wechsel ergibt "failed", die Warteschlange bleibt benutzbar."""
+        executor = FakeExecutor(fail_on={"Arbeit"})
+        broker = _broker(queue_files, executor)
+
+        assert broker.request("Arbeit").status == "failed"
+        assert broker.request("Spiele").success
+
+    def test_sequence_numbers_increase(self, queue_files):
+        """Test: Aufeinanderfolgende Anfragen erhalten neue Nummern."""
+        broker = _broker(queue_files, FakeExecutor())
+
+        first = broker.request("Arbeit")
+        second = broker.request("Arbeit")
+
+        assert second.seq > first.seq
+
+
+class TestCoalescing:
+    """Schnelle Folgen von Anfragen, während ein Wechsel läuft."""
+
+    def test_burst_runs_only_latest_target(self, queue_files):
+        """Test: A läuft, B, C, D kommen: A wird abgebrochen, B und C entfallen, nur D läuft."""
+        executor = FakeExecutor(block_on={"A"})
+        broker = _broker(queue_files, executor)
+
+        a = broker.request("A", wait=False)
+        assert executor.started.wait(5)
+        b = broker.request("B", wait=False)
+        c = broker.request("C", wait=False)
+        d = broker.request("D", wait=False)
+        executor.release.set()
+
+        assert _wait_for(broker, a.seq).status == "cancelled"
+        assert _wait_for(broker, b.seq).status == "superseded"
+        assert _wait_for(broker, c.seq).status == "superseded"
+        final = _wait_for(broker, d.seq)
+        assert final.status == "ok"
+        assert final.queue_depth == 3
+        assert executor.desktops == ["A", "D"]
+
+    def test_same_target_joins_running(self, queue_files):
+        """Test: Eine Anfrage für das laufende Ziel wartet auf denselben Wechsel."""
+        executor = FakeExecutor(block_on={"A"})
+        broker = _broker(queue_files, executor)
+
+        first = broker.request("A", wait=False)
+        assert executor.started.wait(5)
+        second = broker.request("A", wait=False)
+        executor.release.set()
+
+        assert second.seq == first.seq
+        assert _wait_for(broker, first.seq).success
+        assert executor.desktops == ["A"]
+
+    def test_return_to_running_target_drops_pending(self, queue_files):
+        """Test: A läuft, B wartet, dann wieder A: B entfällt und A wird nicht abgebrochen."""
+        executor = FakeExecutor(block_on={"A"})
+        broker = _broker(queue_files, executor)
+
+        a = broker.request("A", wait=False)
+        assert executor.started.wait(5)
+        b = broker.request("B", wait=False)
+        again = broker.request("A", wait=False)
+        executor.release.set()
+
+        assert again.seq == a.seq
+        assert _wait_for(broker, b.seq).status == "superseded"
+        assert _wait_for(broker, a.seq).success
+        assert executor.desktops == ["A"]
+
+    def test_waiting_request_gets_result_of_other_thread(self, queue_files):
+        """Test: wait=True blockiert, bis der Besitzer die Anfrage ausgeführt hat."""
+        executor = FakeExecutor(block_on={"A"})
+        broker = _broker(queue_files, executor)
+
+        broker.request("A", wait=False)
+        assert executor.started.wait(5)
+        threading.Timer(0.1, executor.release.set).start()
+
+        outcome = broker.request("B")
+
+        assert outcome.success
+        assert outcome.queue_wait_ms >= 50
+        assert executor.desktops == ["A", "B"]
+
+
+class TestRecovery:
+    """Zustand nach abgebrochenen Besitzern."""
+
+    def test_interrupted_running_is_failed(self, queue_files):
+        """Test: Ein "running"-Eintrag ohne Lock-Halter wird als fehlgeschlagen verbucht."""
+        state = {
+            "next_seq": 5,
+            "pending": None,
+            "running": {"seq": 4, "desktop": "Alt", "source": "listener", "pid": 1, "requested": time.time(), "count": 1, "started": time.time()},
+            "results": {},
+        }
+        with open(queue_files[0], "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        broker = _broker(queue_files, FakeExecutor())
+
+        outcome = broker.request("Neu")
+
+        assert outcome.success
+        assert outcome.seq == 5
+        assert broker.outcome(4).status == "failed"
+
+    def test_corrupt_queue_file(self, queue_files):
+        """Test: Eine unlesbare Warteschlange wird neu begonnen."""
+        with open(queue_files[0], "w", encoding="utf-8") as f:
+            f.write("{kaputt")
+
+        assert _broker(queue_files, FakeExecutor()).request("Arbeit").success
+
+    def test_default_broker(self):
+        """Test: get_switch_broker liefert eine Instanz; set_switch_broker ersetzt sie."""
+        try:
+            set_switch_broker(None)
+            default = get_switch_broker()
+            assert get_switch_broker() is default
+
+            custom = SwitchBroker(execute=FakeExecutor())
+            set_switch_broker(custom)
+            assert get_switch_broker() is custom
+        finally:
+            set_switch_broker(None)
+
+
+# Fordert einen Wechsel an und gibt den Status aus. Der Wechsel schreibt
+# "start"/"end" in das Protokoll; das Ziel "A" wartet auf die Freigabe-Datei.
+CLIENT = """
+import os, sys, time
+sys.path.insert(0, {tests_dir!r})
+import conftest  # Windows-Module mocken
+from smartdesk.core.services.switch_broker import SwitchBroker
+
+queue_file, owner_lock_file, log_file, release_file, target = sys.argv[1:6]
+
+def execute(desktop_name, parent, cancelled, trace_attrs):
+    with open(log_file, "a") as f:
+        f.write(f"start {{desktop_name}} {{os.getpid()}}\\n")
+    if desktop_name == "A":
+        while not os.path.exists(release_file):
+            time.sleep(0.01)
+    ok = not cancelled()
+    with open(log_file, "a") as f:
+        f.write(f"end {{desktop_name}} {{ok}}\\n")
+    return ok
+
+broker = SwitchBroker(queue_file=queue_file, owner_lock_file=owner_lock_file, execute=execute)
+print(broker.request(target, timeout=20).status, flush=True)
+"""
+
+
+class TestMultiProcess:
+    """Anfragen aus mehreren Prozessen (Listener, Tray, GUI)."""
+
+    def test_burst_across_processes(self, queue_files, tmp_path):
+        """Test: Vier Prozesse fordern A, B, C, D an: ein Prozess führt aus, nur A (abgebrochen) und D laufen."""
+        log_file = tmp_path / "executions.log"
+        release_file = tmp_path / "release"
+        script = CLIENT.format(tests_dir=os.path.dirname(os.path.abspath(__file__)))
+        env = dict(os.environ)
+
+        def spawn(target):
+            args = [sys.executable, "-c", script, *queue_files, str(log_file), str(release_file), target]
+            return subprocess.Popen(args, stdout=subprocess.PIPE, text=True, env=env)
+
+        def wait_until(condition):
+            deadline = time.monotonic() + 15
+            while not condition():
+                assert time.monotonic() < deadline
+                time.sleep(0.01)
+
+        procs = {}
+        try:
+            procs["A"] = spawn("A")
+            wait_until(lambda: log_file.exists() and "start A" in log_file.read_text())
+            for target in "BCD":
+                procs[target] = spawn(target)
+                wait_until(lambda: (_read_queue(queue_files).get("pending") or {}).get("desktop") == target)
+            release_file.touch()
+
+            statuses = {target: proc.communicate(timeout=20)[0].strip() for target, proc in procs.items()}
+        finally:
+            for proc in procs.values():
+                proc.kill()
+                proc.wait()
+                proc.stdout.close()
+
+        assert statuses == {"A": "cancelled", "B": "superseded", "C": "superseded", "D": "ok"}
+        lines = log_file.read_text().splitlines()
+        assert [line.split()[:2] for line in lines] == [["start", "A"], ["end", "A"], ["start", "D"], ["end", "D"]]
+        # D läuft im Prozess, der das Besitzer-Lock schon hatte
+        assert lines[0].split()[2] == lines[2].split()[2] == str(procs["A"].pid)
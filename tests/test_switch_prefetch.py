@@ -0,0 +1,315 @@
+# Dateipfad: tests/test_switch_prefetch.py
+"""
+Unit-Tests für die Vorausberechnung der Wiederherstellung (switch_prefetch.py)
+
+Testet:
+- SwitchHistory: Vorhersage, Speichern und Laden
+- RestorePayload / SwitchPrefetcher: Treffer, Fehlgriffe, veraltete Payloads,
+  Leerlauf-Thread
+- IconRestorePlan, pack_position() und prepare_wallpaper()
+- Wechsel gegen die simulierte Plattform: prefetch im Trace
+- smartdesk-trace --prefetch
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.models.desktop import Desktop, IconPosition
+from smartdesk.core.services import wallpaper_service
+from smartdesk.core.services.icon_service import IconRestorePlan
+from smartdesk.core.services.switch_prefetch import RestorePayload, SwitchHistory, SwitchPrefetcher
+from smartdesk.core.utils import trace_report
+from smartdesk.core.utils.trace_report import PrefetchStats, summarize_prefetch
+from smartdesk.core.utils.tracing import read_trace_records, write_trace_record
+from smartdesk.platform import SimulatedPlatform, pack_position, unpack_position
+
+
+def _desktop(name, icons=(), wallpaper="", layout=""):
+    desktop = Desktop(name=name, path=f"C:\\Desktops\\{name}", wallpaper_path=wallpaper)
+    desktop.icon_positionen = [IconPosition(index=i, name=n, x=x, y=y) for i, (n, x, y) in enumerate(icons)]
+    if layout:
+        desktop.mark_icons_saved(layout)
+    return desktop
+
+
+class TestSwitchHistory:
+    """Wechsel-Historie und Vorhersage."""
+
+    def test_predicts_recent_transitions_first(self):
+        """Test: Wechsel vom aktuellen Desktop zählen, neuere mehr als ältere."""
+        history = SwitchHistory(path=None)
+        history.record("Arbeit", "Spiele", "hotkey:3")
+        history.record("Arbeit", "Privat", "hotkey:2")
+        history.record("Privat", "Arbeit", "hotkey:1")
+
+        assert history.predict("Arbeit", ["Arbeit", "Privat", "Spiele"]) == ["Privat", "Spiele"]
+        assert history.predict("Arbeit", ["Arbeit", "Privat", "Spiele"], limit=1) == ["Privat"]
+
+    def test_frequency_without_transitions(self):
+        """Test: Ohne Wechsel vom aktuellen Desktop entscheidet die Häufigkeit je Quelle."""
+        history = SwitchHistory(path=None)
+        for _ in range(3):
+            history.record("Arbeit", "Spiele", "hotkey:3")
+        history.record("Arbeit", "Privat", "gui")
+
+        assert history.predict("Neu", ["Neu", "Privat", "Spiele"]) == ["Spiele", "Privat"]
+        assert history.frequency == {"hotkey:3": {"Spiele": 3}, "gui": {"Privat": 1}}
+
+    def test_ignores_current_and_unknown_desktops(self):
+        """Test: Der aktuelle und gelöschte Desktops werden nie vorgeschlagen."""
+        history = SwitchHistory(path=None)
+        history.record("Arbeit", "Gelöscht", "gui")
+        history.record("Privat", "Arbeit", "gui")
+
+        assert history.predict("Arbeit", ["Arbeit", "Privat"]) == []
+
+    def test_keeps_last_transitions(self):
+        """Test: Es bleiben nur die letzten length Wechsel erhalten."""
+        history = SwitchHistory(path=None, length=3)
+        for i in range(5):
+            history.record("A", f"D{i}", "gui")
+
+        assert [t.to_desktop for t in history.transitions] == ["D2", "D3", "D4"]
+
+    def test_save_and_reload(self, tmp_path):
+        """Test: Gespeicherte Historie wird von einer anderen Instanz (Prozess) übernommen."""
+        path = str(tmp_path / "switch_history.json")
+        first = SwitchHistory(path=path)
+        first.record("Arbeit", "Privat", "hotkey:2")
+        assert first.save() is True
+
+        second = SwitchHistory(path=path)
+        assert second.predict("Arbeit", ["Privat"]) == ["Privat"]
+
+        second.record("Privat", "Arbeit", "tray")
+        second.save()
+        first.record("Arbeit", "Spiele", "gui")
+        assert [t.to_desktop for t in first.transitions] == ["Privat", "Arbeit", "Spiele"]
+
+    def test_corrupt_file(self, tmp_path):
+        """Test: Eine kaputte Datei führt zu einer leeren Historie, nicht zu einer Ausnahme."""
+        path = tmp_path / "switch_history.json"
+        path.write_text("{kaputt")
+
+        assert SwitchHistory(path=str(path)).transitions == []
+
+
+class TestRestorePayload:
+    """Payloads und ihre Gültigkeit."""
+
+    def test_build(self, tmp_path):
+        """Test: Das Payload enthält Positionen und gepackte lParam-Werte."""
+        payload = RestorePayload.build(_desktop("Arbeit", [("a.txt", 10, 20), ("b.txt", -5, 300)], layout="abc"))
+
+        assert payload.plan.positions == {"a.txt": (10, 20), "b.txt": (-5, 300)}
+        assert payload.plan.lparams["b.txt"] == pack_position(-5, 300)
+        assert payload.layout_key == "abc"
+        assert payload.wallpaper_path == ""
+
+    def test_layout_change_makes_payload_stale(self):
+        """Test: Ändert sich das Layout (Referenz bzw. Icons), passt das Payload nicht mehr."""
+        desktop = _desktop("Arbeit", [("a.txt", 10, 20)])
+        payload = RestorePayload.build(desktop)
+        assert payload.matches(desktop)
+
+        desktop.icon_positionen = [IconPosition(index=0, name="a.txt", x=11, y=20)]
+        assert not payload.matches(desktop)
+
+    def test_wallpaper_change_makes_payload_stale(self, tmp_path):
+        """Test: Ein geändertes Hintergrundbild macht das Payload ungültig."""
+        image = tmp_path / "bild.png"
+        image.write_bytes(b"png")
+        desktop = _desktop("Arbeit", wallpaper=str(image))
+        payload = RestorePayload.build(desktop)
+        assert payload.matches(desktop)
+
+        image.write_bytes(b"neues png")
+        assert not payload.matches(desktop)
+
+
+class TestSwitchPrefetcher:
+    """take(), prefetch_now() und Leerlauf-Thread."""
+
+    @pytest.fixture
+    def desktops(self):
+        desktops = [
+            _desktop("Arbeit", [("a.txt", 1, 2)]),
+            _desktop("Privat", [("p.txt", 3, 4)]),
+            _desktop("Spiele", [("s.txt", 5, 6)]),
+        ]
+        desktops[0].is_active = True
+        with patch("smartdesk.core.services.desktop_service.get_all_desktops", return_value=desktops):
+            yield desktops
+
+    def test_prefetch_and_take(self, desktops):
+        """Test: Vorausberechnet wird für die vorhergesagten Ziele; take() zählt Treffer und Fehlgriffe."""
+        prefetcher = SwitchPrefetcher(history=SwitchHistory(path=None), idle_delay=None, targets=1)
+        prefetcher.record_switch("Arbeit", "Privat", "hotkey:2")
+
+        assert prefetcher.prefetch_now() == ["Privat"]
+
+        payload, status = prefetcher.take(desktops[1])
+        assert status == "hit"
+        assert payload.plan.positions == {"p.txt": (3, 4)}
+        assert prefetcher.take(desktops[1]) == (None, "miss")
+        assert (prefetcher.hits, prefetcher.misses, prefetcher.saved_ms) == (1, 1, payload.build_ms)
+
+    def test_stale_payload(self, desktops):
+        """Test: Ein Payload für geänderte Icons wird verworfen ("stale")."""
+        prefetcher = SwitchPrefetcher(history=SwitchHistory(path=None), idle_delay=None)
+        prefetcher.record_switch("Arbeit", "Privat", "gui")
+        prefetcher.prefetch_now()
+
+        desktops[1].icon_positionen = [IconPosition(index=0, name="p.txt", x=30, y=40)]
+        assert prefetcher.take(desktops[1]) == (None, "stale")
+        assert prefetcher.stale == 1
+
+    def test_drops_unpredicted_payloads(self, desktops):
+        """Test: Payloads für Desktops, die nicht mehr vorhergesagt werden, entfallen."""
+        prefetcher = SwitchPrefetcher(history=SwitchHistory(path=None), idle_delay=None, targets=1)
+        prefetcher.record_switch("Arbeit", "Privat", "gui")
+        prefetcher.prefetch_now()
+        prefetcher.record_switch("Arbeit", "Spiele", "gui")
+        prefetcher.record_switch("Arbeit", "Spiele", "gui")
+
+        assert prefetcher.prefetch_now() == ["Spiele"]
+        assert prefetcher.payload_names() == ["Spiele"]
+
+    def test_idle_thread_waits_for_switch(self, desktops):
+        """Test: Der Leerlauf-Thread rechnet erst idle_delay nach dem Ende des Wechsels."""
+        prefetcher = SwitchPrefetcher(history=SwitchHistory(path=None), idle_delay=0.05)
+        try:
+            prefetcher.hold()
+            prefetcher.record_switch("Arbeit", "Privat", "gui")
+            time.sleep(0.15)
+            assert prefetcher.payload_names() == []
+
+            prefetcher.release()
+            deadline = time.monotonic() + 2.0
+            while not prefetcher.payload_names() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert prefetcher.payload_names() == ["Privat"]
+        finally:
+            prefetcher.shutdown()
+
+
+class TestRestoreHelpers:
+    """IconRestorePlan, lParam-Packen und Skalieren des Hintergrundbilds."""
+
+    @pytest.mark.parametrize("x, y", [(0, 0), (1280, 720), (-75, 100), (-1, -32768)])
+    def test_pack_roundtrip(self, x, y):
+        """Test: unpack_position() kehrt pack_position() um (auch negative Koordinaten)."""
+        assert unpack_position(pack_position(x, y)) == (x, y)
+
+    def test_plan_last_duplicate_wins(self):
+        """Test: Bei doppelten Namen gilt die letzte Position."""
+        plan = IconRestorePlan.of([IconPosition(0, "a", 1, 1), IconPosition(1, "a", 2, 2)])
+
+        assert len(plan) == 1
+        assert plan.positions == {"a": (2, 2)}
+
+    def test_prepare_without_pillow(self, tmp_path):
+        """Test: Ohne Pillow gibt es kein skaliertes Bild."""
+        image = tmp_path / "bild.png"
+        image.write_bytes(b"png")
+
+        with patch.object(wallpaper_service, "Image", None):
+            assert wallpaper_service.prepare_wallpaper(str(image), (100, 50)) is None
+
+    def test_prepare_scales_to_screen(self, tmp_path):
+        """Test: Das Bild wird auf Bildschirmgröße zugeschnitten und zwischengespeichert."""
+        Image = pytest.importorskip("PIL.Image")
+        source = tmp_path / "bild.png"
+        Image.new("RGB", (400, 100), "red").save(source)
+
+        with patch.object(wallpaper_service, "WALLPAPERS_DIR", str(tmp_path / "wallpapers")):
+            scaled = wallpaper_service.prepare_wallpaper(str(source), (160, 90))
+            assert wallpaper_service.prepare_wallpaper(str(source), (160, 90)) == scaled
+
+        with Image.open(scaled) as image:
+            assert image.size == (160, 90)
+            assert image.format == "BMP"
+
+
+class TestPrefetchInSwitch:
+    """Wechsel über desktop_service gegen die simulierte Plattform."""
+
+    def _setup(self, tmp_path):
+        from smartdesk.core.services import desktop_service
+
+        paths = {}
+        for name in ("Arbeit", "Privat"):
+            folder = tmp_path / name
+            folder.mkdir()
+            for i in range(3):
+                (folder / f"{name.lower()}{i}.txt").write_text("x")
+            paths[name] = str(folder)
+        platform = SimulatedPlatform(desktop_path=paths["Arbeit"])
+        return platform, desktop_service
+
+    def test_hit_and_miss_in_trace(self, tmp_path, simulated_environment, trace_file, switch_prefetcher):
+        """Test: Erster Wechsel ohne Payload ("miss"), nach prefetch_now() ein Treffer mit eingesparter Zeit."""
+        platform, desktop_service = self._setup(tmp_path)
+
+        with platform.installed():
+            for name in ("Arbeit", "Privat"):
+                desktop_service.create_desktop(name, str(tmp_path / name))
+            desktop_service.get_all_desktops()
+            assert desktop_service.switch_to_desktop("Privat")
+            platform.listview.drag("privat1.txt", 300, 400)
+            assert desktop_service.switch_to_desktop("Arbeit")
+
+            assert switch_prefetcher.prefetch_now() == ["Privat"]
+            assert desktop_service.switch_to_desktop("Privat")
+
+        assert platform.listview.positions()["privat1.txt"] == (300, 400)
+        records = [r for r in read_trace_records(trace_file) if r["kind"] == "switch"]
+        assert [r["attrs"]["prefetch"] for r in records] == ["miss", "miss", "hit"]
+        assert records[-1]["attrs"]["prefetch_saved_ms"] >= 0
+        assert switch_prefetcher.history.predict("Arbeit", ["Privat"]) == ["Privat"]
+
+    def test_disabled(self, tmp_path, simulated_environment, trace_file):
+        """Test: Mit switch_prefetch = False gibt es weder Historie noch prefetch im Trace."""
+        simulated_environment["switch_prefetch"] = False
+        platform, desktop_service = self._setup(tmp_path)
+
+        with platform.installed():
+            for name in ("Arbeit", "Privat"):
+                desktop_service.create_desktop(name, str(tmp_path / name))
+            desktop_service.get_all_desktops()
+            assert desktop_service.switch_to_desktop("Privat")
+
+        records = [r for r in read_trace_records(trace_file) if r["kind"] == "switch"]
+        assert "prefetch" not in records[-1]["attrs"]
+
+
+class TestPrefetchReport:
+    """Auswertung mit smartdesk-trace --prefetch."""
+
+    @staticmethod
+    def _record(status, saved=None):
+        attrs = {"prefetch": status}
+        if saved is not None:
+            attrs["prefetch_saved_ms"] = saved
+        return {"kind": "switch", "outcome": "ok", "attrs": attrs, "stages": []}
+
+    def test_summarize(self):
+        """Test: Trefferquote und eingesparte Zeit; Datensätze ohne prefetch zählen nicht."""
+        records = [self._record("hit", 4.0), self._record("hit", 2.0), self._record("miss"), self._record("stale"), {"kind": "switch", "attrs": {}}]
+
+        assert summarize_prefetch(records) == PrefetchStats(2, 1, 1, 0.5, 6.0, 2.0)
+        assert summarize_prefetch([{"kind": "switch", "attrs": {}}]) is None
+
+    def test_main(self, trace_file, capsys):
+        """Test: --prefetch gibt die Zusammenfassung als Text bzw. JSON aus."""
+        for record in (self._record("hit", 3.0), self._record("miss")):
+            write_trace_record(record, trace_file)
+
+        assert trace_report.main(["--prefetch"]) == 0
+        assert "1 Treffer, 1 Fehlgriffe" in capsys.readouterr().out
+
+        assert trace_report.main(["--prefetch", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out)["hit_rate"] == 0.5
@@ -1,121 +1,209 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch
-import time
 import psutil
 
 from smartdesk.core.services import system_service
 
-def test_restart_explorer_kills_and_waits(mocker):
-    """
-    Verifies that restart_explorer:
-    1. Finds 'explorer.exe' processes.
-    2. Calls kill() on them.
-    3. Calls wait_procs() on them.
-    4. Waits for restart (simulated).
-    """
-
-    # Mock processes
-    mock_proc = MagicMock()
-    mock_proc.name.return_value = "explorer.exe"
-
-    # Mock psutil.process_iter
-    mock_iter = mocker.patch("psutil.process_iter")
 
-    # Mock psutil.wait_procs
-    mock_wait = mocker.patch("psutil.wait_procs", return_value=([], []))
+@pytest.fixture
+def fast_restart(mocker):
+    """Kurze Zeitlimits, kein Desktop-ListView (win32gui ist gemockt), keine Ausgabe."""
+    mocker.patch("smartdesk.core.services.system_service.get_text", return_value="test info")
+    mocker.patch.object(system_service, "RESPAWN_TIMEOUT", 0.1)
+    mocker.patch.object(system_service, "READY_TIMEOUT", 0.1)
+    mocker.patch.object(system_service, "POLL_INTERVAL", 0.005)
+    mocker.patch.object(system_service, "_desktop_ready", return_value=True)
 
-    # Mock time.sleep to run fast
-    mocker.patch("time.sleep")
 
-    # Mock get_text
-    mocker.patch("smartdesk.core.services.system_service.get_text", return_value="test info")
+def _explorer(pid):
+    proc = MagicMock()
+    proc.pid = pid
+    proc.name.return_value = "explorer.exe"
+    return proc
 
-    # Setup side effects for process_iter:
-    # 1. First call: Finding processes to kill -> returns [mock_proc]
-    # 2. Second call: Checking if restarted (loop 1) -> returns [] (not yet)
-    # 3. Third call: Checking if restarted (loop 2) -> returns [mock_proc] (restarted)
 
-    # Note: loop uses process_iter(['name']).
-    new_proc = MagicMock()
-    new_proc.name.return_value = "explorer.exe"
+def _other(pid):
+    proc = MagicMock()
+    proc.pid = pid
+    proc.name.return_value = "svchost.exe"
+    return proc
 
-    mock_iter.side_effect = [
-        [mock_proc], # Finding to kill
-        [],          # Restart check loop iteration 1
-        [new_proc]   # Restart check loop iteration 2 (success)
-    ]
 
-    # Execute
-    system_service.restart_explorer()
+def test_restart_explorer_kills_and_waits(mocker, fast_restart):
+    """
+    Verifies that restart_explorer:
+    1. Finds 'explorer.exe' processes in a single scan.
+    2. Calls kill() on them.
+    3. Waits for their termination via wait_procs() (handles outside Windows).
+    4. Detects the new explorer among processes created after the kill.
+    """
+    old = _explorer(100)
+    mock_iter = mocker.patch("psutil.process_iter", return_value=[_other(1), old])
+    mock_wait = mocker.patch("psutil.wait_procs", return_value=([old], []))
+    mocker.patch("psutil.pids", side_effect=[[1], [1, 200]])
+    mocker.patch("psutil.Process", side_effect=lambda pid: _explorer(pid))
+    mock_popen = mocker.patch("subprocess.Popen")
 
-    # Verify kill called
-    mock_proc.kill.assert_called_once()
+    result = system_service.restart_explorer()
 
-    # Verify wait_procs called
+    mock_iter.assert_called_once()
+    old.kill.assert_called_once()
     mock_wait.assert_called_once()
     args, kwargs = mock_wait.call_args
-    assert args[0] == [mock_proc]
-    assert kwargs['timeout'] == 5
+    assert args[0] == [old]
+    assert kwargs["timeout"] == 5
+    mock_popen.assert_not_called()
+    assert result.killed_pids == [100]
+    assert result.new_pid == 200
+    assert result.started_by == "system"
+    assert result.exited_ms <= result.respawn_ms <= result.ready_ms
 
-def test_restart_explorer_no_process_found(mocker):
+
+def test_restart_explorer_no_process_found(mocker, fast_restart):
     """
     Verifies that if no explorer process is found initially,
-    we skip kill/wait and go straight to restart check/start.
+    we skip kill/wait and start explorer after the respawn timeout.
     """
-    mock_iter = mocker.patch("psutil.process_iter")
+    mocker.patch("psutil.process_iter", return_value=[_other(1)])
     mock_wait = mocker.patch("psutil.wait_procs")
-    mocker.patch("smartdesk.core.services.system_service.get_text", return_value="test info")
-    mocker.patch("time.sleep")
-
-    # Mock fallback Popen
+    mocker.patch("psutil.pids", return_value=[1])
     mock_popen = mocker.patch("subprocess.Popen")
+    mock_popen.return_value.pid = 300
 
-    # Side effects:
-    # 1. Finding -> []
-    # 2. Restart check -> []
-    # 3. Restart check -> [] ... until timeout
-
-    mock_iter.side_effect = [[], [], [], [], [], [], [], [], [], [], []] # enough for loop
-
-    # Force timeout in loop
-    mocker.patch("time.time", side_effect=[0, 0, 10]) # Start check, loop check (fail), loop check (fail/timeout)
+    result = system_service.restart_explorer()
 
-    system_service.restart_explorer()
-
-    # Verify NO kill/wait
     mock_wait.assert_not_called()
-
-    # Verify fallback start was attempted
     mock_popen.assert_called_with("explorer.exe")
+    assert result.new_pid == 300
+    assert result.started_by == "fallback"
+
 
-def test_restart_explorer_kill_permission_error(mocker):
+def test_restart_explorer_kill_permission_error(mocker, fast_restart):
     """
     Verifies that if kill fails with NoSuchProcess, we continue safely.
     """
-    mock_proc = MagicMock()
-    mock_proc.name.return_value = "explorer.exe"
-    mock_proc.kill.side_effect = psutil.NoSuchProcess(123)
+    old = _explorer(100)
+    old.kill.side_effect = psutil.NoSuchProcess(100)
+    mocker.patch("psutil.process_iter", return_value=[old])
+    mock_wait = mocker.patch("psutil.wait_procs", return_value=([old], []))
+    mocker.patch("psutil.pids", return_value=[200])
+    mocker.patch("psutil.Process", side_effect=lambda pid: _explorer(pid))
 
-    mock_iter = mocker.patch("psutil.process_iter", return_value=[mock_proc])
-    mock_wait = mocker.patch("psutil.wait_procs", return_value=([], []))
-    mocker.patch("smartdesk.core.services.system_service.get_text", return_value="test info")
-    mocker.patch("time.sleep")
-
-    # Handle the restart check loop
-    new_proc = MagicMock()
-    new_proc.name.return_value = "explorer.exe"
-    mock_iter.side_effect = [
-        [mock_proc],
-        [new_proc] # Restarted immediately
-    ]
-
-    system_service.restart_explorer()
-
-    mock_proc.kill.assert_called_once()
-    # Should still wait (even if kill failed, we added it to list)
-    # Actually if kill fails with NoSuchProcess, it means it's gone?
-    # Logic:
-    # try: p.kill() except NoSuchProcess: pass
-    # procs.append(p) happened BEFORE kill attempt.
-    # So wait_procs is called with it.
+    result = system_service.restart_explorer()
+
+    old.kill.assert_called_once()
+    # Bereits beendete Prozesse stehen trotzdem in der Warteliste
     mock_wait.assert_called_once()
+    assert result.new_pid == 200
+
+
+class TestRespawnDetection:
+    """Erkennung des neuen Explorers anhand neu entstandener Prozesse."""
+
+    def test_reused_pid_is_detected(self, mocker, fast_restart):
+        """Test: Vergibt Windows die PID des alten Explorers neu, zählt sie als neuer Prozess."""
+        old = _explorer(100)
+        mocker.patch("psutil.process_iter", return_value=[old])
+        mocker.patch("psutil.wait_procs", return_value=([old], []))
+        mocker.patch("psutil.pids", return_value=[100])
+        mocker.patch("psutil.Process", side_effect=lambda pid: _explorer(pid))
+
+        assert system_service.restart_explorer().new_pid == 100
+
+    def test_only_new_pids_are_inspected(self, mocker, fast_restart):
+        """Test: Bekannte Prozesse werden nicht erneut geöffnet, neue nur einmal."""
+        old = _explorer(100)
+        mocker.patch("psutil.process_iter", return_value=[_other(1), _other(2), old])
+        mocker.patch("psutil.wait_procs", return_value=([old], []))
+        mocker.patch("psutil.pids", side_effect=[[1, 2, 50], [1, 2, 50], [1, 2, 50, 60]])
+        opened = []
+
+        def process(pid):
+            opened.append(pid)
+            return _explorer(pid) if pid == 60 else _other(pid)
+
+        mocker.patch("psutil.Process", side_effect=process)
+
+        assert system_service.restart_explorer().new_pid == 60
+        assert opened == [50, 60]
+
+    def test_stages_are_traced(self, mocker, fast_restart, trace_file):
+        """Test: Kill, Neustart und Bereitschaft erscheinen als Stufen im laufenden Trace."""
+        from smartdesk.core.utils.tracing import Trace
+
+        old = _explorer(100)
+        mocker.patch("psutil.process_iter", return_value=[old])
+        mocker.patch("psutil.wait_procs", return_value=([old], []))
+        mocker.patch("psutil.pids", return_value=[200])
+        mocker.patch("psutil.Process", side_effect=lambda pid: _explorer(pid))
+
+        trace = Trace("switch")
+        with trace.activate():
+            system_service.restart_explorer()
+
+        record = trace.finish("ok")
+        assert [s["name"] for s in record["stages"]] == ["explorer_kill", "explorer_respawn", "explorer_ready"]
+        starts = [s["start_ms"] for s in record["stages"]]
+        assert starts == sorted(starts)
+        assert record["attrs"]["explorer_pid"] == 200
+        assert record["attrs"]["explorer_started_by"] == "system"
+
+
+# Startet "explorer.exe" (Python unter anderem Namen) und startet es nach
+# dem Beenden wie Windows nach respawn_delay neu, bis die Stop-Datei existiert.
+SUPERVISOR = textwrap.dedent(
+    """
+    import os, subprocess, sys, time
+    exe, stop, respawn_delay = sys.argv[1], sys.argv[2], float(sys.argv[3])
+    while not os.path.exists(stop):
+        p = subprocess.Popen([exe, "-c", "import time; time.sleep(60)"])
+        while p.poll() is None and not os.path.exists(stop):
+            time.sleep(0.005)
+        if p.poll() is None:
+            p.kill()
+            p.wait()
+            break
+        time.sleep(respawn_delay)
+    """
+)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Beendet sonst den echten Explorer")
+class TestRestartWithProcesses:
+    """Neustart gegen echte Prozesse namens explorer.exe."""
+
+    @pytest.fixture
+    def fake_explorer(self, tmp_path):
+        exe = tmp_path / "explorer.exe"
+        exe.symlink_to(os.path.realpath(sys.executable))
+        script = tmp_path / "supervisor.py"
+        script.write_text(SUPERVISOR)
+        stop = tmp_path / "stop"
+        supervisor = subprocess.Popen([sys.executable, str(script), str(exe), str(stop), "0.05"])
+
+        deadline = time.monotonic() + 5
+        while not any(c.name() == "explorer.exe" for c in psutil.Process(supervisor.pid).children()):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        yield supervisor
+        stop.touch()
+        supervisor.wait(5)
+
+    def test_respawn_detected_within_event_latency(self, fake_explorer, mocker, fast_restart):
+        """Test: Der neu gestartete Prozess wird kurz nach dem Neustart erkannt, nicht erst nach 0,5 s."""
+        mocker.patch.object(system_service, "RESPAWN_TIMEOUT", 5)
+        (old,) = [c for c in psutil.Process(fake_explorer.pid).children() if c.name() == "explorer.exe"]
+
+        result = system_service.restart_explorer()
+
+        assert result.killed_pids == [old.pid]
+        assert result.started_by == "system"
+        assert result.new_pid in [c.pid for c in psutil.Process(fake_explorer.pid).children()]
+        # 50 ms Neustart-Verzögerung + Abfrageintervall, großzügig für langsame Rechner
+        assert result.respawn_ms - result.exited_ms < 400
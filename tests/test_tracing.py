@@ -0,0 +1,201 @@
+# Dateipfad: tests/test_tracing.py
+"""
+Unit-Tests für smartdesk.core.utils.tracing und trace_report
+
+Testet:
+- Trace-Datensätze mit Stufen, Ergebnis und Prozessrolle
+- Weitergabe der Trace-ID über contextvars und an Kindprozesse
+- Rotation und Lesen der Trace-Datei (kaputte Zeilen)
+- Desktop-Wechsel schreibt einen Datensatz mit allen Stufen
+- Auswertung (p50/p95 je Stufe, getrennt nach Prozess)
+"""
+
+import json
+import os
+import threading
+from contextvars import copy_context
+from unittest.mock import patch
+
+import pytest
+
+from smartdesk.core.utils import trace_report, tracing
+from smartdesk.core.utils.trace_report import StageStats, format_report, summarize
+from smartdesk.core.utils.tracing import TRACE_ENV, Trace, current_trace_id, get_current_trace, read_trace_records, write_trace_record
+
+
+def _record(process, stages, duration_ms, outcome="ok", kind="switch"):
+    return {
+        "trace_id": "x",
+        "kind": kind,
+        "process": process,
+        "outcome": outcome,
+        "duration_ms": duration_ms,
+        "stages": [{"name": name, "start_ms": 0.0, "duration_ms": ms} for name, ms in stages],
+    }
+
+
+class TestTrace:
+    """Tests für Trace und die Trace-Datei."""
+
+    def test_finish_writes_record(self, trace_file):
+        """Test: finish() hängt genau einen Datensatz mit Stufen und Attributen an."""
+        trace = Trace("switch", desktop="Arbeit")
+        with trace.stage("sync"):
+            pass
+        with pytest.raises(RuntimeError):
+            with trace.stage("registry"):
+                raise RuntimeError("kaputt")
+        trace.finish("failed")
+        trace.finish("ok")
+
+        (record,) = read_trace_records(trace_file)
+        assert record["trace_id"] == trace.trace_id
+        assert record["outcome"] == "failed"
+        assert record["attrs"] == {"desktop": "Arbeit"}
+        assert record["pid"] == os.getpid()
+        assert [s["name"] for s in record["stages"]] == ["sync", "registry"]
+        assert record["stages"][1]["error"] == "RuntimeError"
+        assert record["stages"][0]["start_ms"] <= record["stages"][1]["start_ms"]
+
+    def test_process_role(self, trace_file):
+        """Test: Die gesetzte Prozessrolle steht im Datensatz."""
+        with patch.object(tracing, "_process_role", None):
+            tracing.set_process_role("tray")
+            record = Trace("switch").finish("ok")
+
+        assert record["process"] == "tray"
+
+    def test_activate_propagates_via_context(self):
+        """Test: Der aktive Trace ist im Block und in kopierten Kontexten (Threads) sichtbar."""
+        trace = Trace("switch")
+        seen = []
+
+        with trace.activate():
+            assert get_current_trace() is trace
+            ctx = copy_context()
+            worker = threading.Thread(target=lambda: seen.append(ctx.run(current_trace_id)))
+            worker.start()
+            worker.join()
+
+        assert seen == [trace.trace_id]
+        assert get_current_trace() is None
+
+    def test_env_passes_id_to_child(self):
+        """Test: Ein Trace im Kindprozess übernimmt die ID des Elternprozesses als parent_id."""
+        parent = Trace("switch")
+
+        with patch.dict(os.environ, {TRACE_ENV: parent.env()[TRACE_ENV]}):
+            child = Trace("animation")
+            assert current_trace_id() == parent.trace_id
+
+        assert child.to_record("ok")["parent_id"] == parent.trace_id
+
+    def test_rotation_and_corrupt_lines(self, trace_file):
+        """Test: Große Dateien werden nach .1 verschoben; kaputte Zeilen werden übersprungen."""
+        with patch.object(tracing, "MAX_TRACE_BYTES", 10):
+            write_trace_record({"n": 1}, trace_file)
+            write_trace_record({"n": 2}, trace_file)
+            with open(trace_file, "a", encoding="utf-8") as f:
+                f.write('{"n": 3, "abgebr')
+            write_trace_record({"n": 4}, trace_file)
+
+        assert os.path.exists(trace_file + ".1")
+        assert [r["n"] for r in read_trace_records(trace_file)] == [1, 2, 4]
+
+    def test_write_failure_is_logged(self, tmp_path):
+        """Test: Ein nicht schreibbarer Pfad ergibt False statt einer Exception."""
+        assert write_trace_record({"n": 1}, str(tmp_path / "fehlt" / "trace.jsonl")) is False
+
+
+class TestSwitchTrace:
+    """Trace-Datensätze des Desktop-Wechsels."""
+
+    @pytest.fixture
+    def switch(self, switch_harness):
+        with switch_harness() as desktop_service:
+            yield desktop_service.switch_to_desktop
+
+    def test_successful_switch_record(self, switch, trace_file):
+        """Test: Ein erfolgreicher Wechsel schreibt einen Datensatz mit allen Stufen."""
+        from smartdesk.core.services.desktop_service import SWITCH_STAGES
+
+        assert switch("Target") is True
+
+        (record,) = read_trace_records(trace_file)
+        assert record["kind"] == "switch"
+        assert record["outcome"] == "ok"
+        assert record["attrs"]["desktop"] == "Target"
+        assert sorted(s["name"] for s in record["stages"]) == sorted(stage.name for stage in SWITCH_STAGES)
+
+    def test_aborted_and_failed_outcomes(self, switch, trace_file, memory_registry):
+        """Test: Abbruch und Registry-Fehler werden mit den erreichten Stufen protokolliert."""
+        from smartdesk.shared.config import KEY_LEGACY_SHELL
+
+        assert switch("Current") is False
+        memory_registry.fail_writes(KEY_LEGACY_SHELL)
+        assert switch("Target") is False
+
+        aborted, failed = read_trace_records(trace_file)
+        assert (aborted["outcome"], [s["name"] for s in aborted["stages"]]) == ("aborted", ["sync"])
+        assert failed["outcome"] == "failed"
+        assert failed["stages"][-1]["name"] == "registry"
+
+    def test_exception_outcome(self, switch, trace_file):
+        """Test: Eine Exception in einer Stufe ergibt outcome "error" und wird weitergereicht."""
+        with patch("smartdesk.core.services.desktop_service.get_shell_refresher", side_effect=RuntimeError("weg")):
+            with pytest.raises(RuntimeError):
+                switch("Target")
+
+        (record,) = read_trace_records(trace_file)
+        assert record["outcome"] == "error"
+        assert (record["stages"][-1]["name"], record["stages"][-1]["error"]) == ("explorer_restart", "RuntimeError")
+
+
+class TestReport:
+    """Tests für die Auswertung (smartdesk-trace)."""
+
+    def test_percentiles_per_stage(self):
+        """Test: p50/p95 nach Nearest-Rank, "total" aus duration_ms, zuletzt."""
+        records = [_record("listener", [("registry", float(ms))], ms * 2.0) for ms in range(1, 21)]
+
+        summary = summarize(records)
+
+        assert list(summary["all"]) == ["registry", "total"]
+        assert summary["all"]["registry"] == StageStats(count=20, p50=10.0, p95=19.0, max=20.0)
+        assert summary["all"]["total"].p50 == 20.0
+
+    def test_by_process_and_filters(self):
+        """Test: Gruppierung nach Prozess; andere Arten und Ergebnisse werden gefiltert."""
+        records = [
+            _record("listener", [("sync", 1.0)], 5.0),
+            _record("tray", [("sync", 3.0)], 7.0),
+            _record("tray", [("sync", 9.0)], 9.0, outcome="aborted"),
+            _record("gui", [("sync", 100.0)], 100.0, kind="animation"),
+        ]
+
+        summary = summarize(records, by_process=True, outcome="ok")
+
+        assert set(summary) == {"listener", "tray"}
+        assert summary["tray"]["sync"].count == 1
+
+    def test_repeated_stage_counts_once(self):
+        """Test: Mehrfach gemessene Stufen eines Datensatzes werden addiert."""
+        summary = summarize([_record("gui", [("icons", 2.0), ("icons", 3.0)], 5.0)])
+
+        assert summary["all"]["icons"] == StageStats(1, 5.0, 5.0, 5.0)
+
+    def test_main_reads_trace_file(self, trace_file, capsys):
+        """Test: smartdesk-trace liest die Datei und gibt JSON bzw. eine Tabelle aus."""
+        for ms in (1.0, 2.0, 3.0):
+            write_trace_record(_record("listener", [("registry", ms)], ms), trace_file)
+
+        assert trace_report.main(["--json", "--last", "2"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert data["all"]["registry"] == {"count": 2, "p50": 2.0, "p95": 3.0, "max": 3.0}
+
+        assert trace_report.main(["--by-process"]) == 0
+        assert "listener" in capsys.readouterr().out
+
+    def test_empty_report(self):
+        """Test: Ohne Datensätze gibt es einen Hinweis statt einer leeren Tabelle."""
+        assert format_report({}) == "Keine Trace-Datensätze gefunden."